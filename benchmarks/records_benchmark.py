@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark compact records against the pydantic models
+Compares construct time and memory per record for synthetic API rows
+"""
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from coinglass.models import OHLCData, PairMarketData, CoinMarketData
+from coinglass.records import parse_records
+
+
+def make_rows(model, count):
+    """Build synthetic rows shaped like API responses (numbers as strings)."""
+    rows = []
+    for i in range(count):
+        row = {}
+        for name in model.__annotations__:
+            if name in ('symbol', 'instrument_id', 'exchange_name'):
+                row[name] = f"{name}-{i % 50}"
+            elif name in ('time', 'next_funding_time'):
+                row[name] = 1745366400000 + i * 60000
+            else:
+                row[name] = str(90000.5 + i)
+        rows.append(row)
+    return rows
+
+
+def measure(rows, model, fast):
+    """Return (seconds, bytes per record) for converting rows."""
+    start = time.perf_counter()
+    parse_records(rows, model, fast=fast)
+    elapsed = time.perf_counter() - start
+    
+    tracemalloc.start()
+    records = parse_records(rows, model, fast=fast)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return elapsed, allocated / len(rows)
+
+
+def main(count=100000):
+    print(f"{'model':<16} {'layer':<10} {'construct (s)':>14} {'bytes/record':>14}")
+    print("-" * 58)
+    for model in (OHLCData, PairMarketData, CoinMarketData):
+        rows = make_rows(model, count)
+        for label, fast in (('pydantic', False), ('slots', True)):
+            elapsed, per_record = measure(rows, model, fast)
+            print(f"{model.__name__:<16} {label:<10} {elapsed:>14.3f} {per_record:>14.0f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,166 @@
+"""
+CoinGlass Analytics
+Vectorized analytics engines built on top of the API modules.
+
+Requires NumPy (install with: pip install coinglass[analytics]).
+"""
+try:
+    import numpy  # noqa: F401
+except ImportError as e:
+    raise ImportError(
+        "coinglass.analytics requires NumPy. Install it with: pip install coinglass[analytics]"
+    ) from e
+
+from .funding_arbitrage import (
+    FundingMatrix,
+    FundingArbitrageScanner,
+    build_funding_matrix,
+    rank_opportunities
+)
+from .weighted_funding import (
+    WeightedFundingEngine,
+    weighted_average
+)
+from .open_interest import (
+    OICube,
+    OpenInterestEngine
+)
+from .heatmap import (
+    LiquidationHeatmap,
+    decode_heatmap,
+    fetch_heatmap
+)
+from .liquidation_map import (
+    LiquidationMapIndex,
+    build_liquidation_map,
+    fetch_liquidation_map
+)
+from .liquidation_stats import (
+    RollingLiquidationStats,
+    LiquidationStatsAggregator,
+    parse_side
+)
+from .orderbook import (
+    DepthHistory,
+    BookHistory,
+    OrderbookEngine,
+    book_metrics
+)
+from .large_orders import (
+    LargeOrderBook,
+    LargeOrderTracker
+)
+from .taker_flow import (
+    TakerFlowEngine
+)
+from .long_short import (
+    LongShortPanel
+)
+from .indicators import (
+    IndicatorEngine,
+    Indicator,
+    SMA,
+    EMA,
+    RSI,
+    ATR,
+    Bollinger,
+    MACD,
+    compute_indicators,
+    default_indicators
+)
+from .basis import (
+    BasisTermEngine,
+    expiry_ms
+)
+from .signal_panel import (
+    SignalPanel,
+    payload_rows,
+    rolling_zscore
+)
+from .resample import (
+    OHLCResampler,
+    resample,
+    bucket_start,
+    can_resample
+)
+from .max_pain import (
+    MaxPainEngine,
+    StrikeGrid,
+    OPTION_EXCHANGES
+)
+from .options_panel import (
+    OptionsExchangePanel,
+    ExchangeSeries
+)
+from .options_recorder import (
+    OptionsInfoRecorder,
+    ColumnLog
+)
+from .etf_flows import (
+    ETFFlowEngine
+)
+from .etf_loader import (
+    ETFBulkLoader
+)
+from .etf_premium import (
+    ETFPremiumMonitor,
+    premium_regimes
+)
+
+__all__ = [
+    'FundingMatrix',
+    'FundingArbitrageScanner',
+    'build_funding_matrix',
+    'rank_opportunities',
+    'WeightedFundingEngine',
+    'weighted_average',
+    'OICube',
+    'OpenInterestEngine',
+    'LiquidationHeatmap',
+    'decode_heatmap',
+    'fetch_heatmap',
+    'LiquidationMapIndex',
+    'build_liquidation_map',
+    'fetch_liquidation_map',
+    'RollingLiquidationStats',
+    'LiquidationStatsAggregator',
+    'parse_side',
+    'DepthHistory',
+    'BookHistory',
+    'OrderbookEngine',
+    'book_metrics',
+    'LargeOrderBook',
+    'LargeOrderTracker',
+    'TakerFlowEngine',
+    'LongShortPanel',
+    'IndicatorEngine',
+    'Indicator',
+    'SMA',
+    'EMA',
+    'RSI',
+    'ATR',
+    'Bollinger',
+    'MACD',
+    'compute_indicators',
+    'default_indicators',
+    'BasisTermEngine',
+    'expiry_ms',
+    'SignalPanel',
+    'payload_rows',
+    'rolling_zscore',
+    'OHLCResampler',
+    'resample',
+    'bucket_start',
+    'can_resample',
+    'MaxPainEngine',
+    'StrikeGrid',
+    'OPTION_EXCHANGES',
+    'OptionsExchangePanel',
+    'ExchangeSeries',
+    'OptionsInfoRecorder',
+    'ColumnLog',
+    'ETFFlowEngine',
+    'ETFBulkLoader',
+    'ETFPremiumMonitor',
+    'premium_regimes',
+]
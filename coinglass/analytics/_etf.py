@@ -0,0 +1,180 @@
+"""
+ETF payload helpers shared by the analytics engines
+Decode per-ticker breakdowns of ETF history payloads into (ticker x day) columns
+"""
+from typing import Optional, List, Dict, Any, Iterable, Sequence, Tuple
+
+import numpy as np
+
+from ._series import (
+    MS_PER_DAY,
+    TIME_FIELDS,
+    first_field,
+    parse_time,
+    rows_to_columns,
+    to_float_array,
+)
+
+# Candidate date fields of ETF rows, tried in order
+ETF_TIME_FIELDS = ('market_date', 'assets_date') + TIME_FIELDS
+
+# Label of a value reported only as a total across tickers
+TOTAL = 'TOTAL'
+
+# Fields naming the ticker of a breakdown entry
+TICKER_FIELDS = ('etf_ticker', 'ticker', 'symbol')
+
+# Fields holding a per-ticker breakdown (list of entries or dict keyed by ticker)
+BREAKDOWN_FIELDS = ('etf_flows', 'etf_breakdown', 'by_etf', 'list')
+
+# Issuer of known spot ETFs by ticker (Hong Kong tickers without the '.HK' suffix)
+ISSUERS = {
+    'IBIT': 'BlackRock', 'ETHA': 'BlackRock',
+    'FBTC': 'Fidelity', 'FETH': 'Fidelity',
+    'GBTC': 'Grayscale', 'BTC': 'Grayscale', 'ETHE': 'Grayscale', 'ETH': 'Grayscale',
+    'ARKB': 'ARK 21Shares', 'CETH': '21Shares',
+    'BITB': 'Bitwise', 'ETHW': 'Bitwise',
+    'HODL': 'VanEck', 'ETHV': 'VanEck',
+    'BRRR': 'CoinShares',
+    'EZBC': 'Franklin Templeton', 'EZET': 'Franklin Templeton',
+    'BTCO': 'Invesco Galaxy', 'QETH': 'Invesco Galaxy',
+    'BTCW': 'WisdomTree',
+    'DEFI': 'Hashdex',
+    '3042': 'ChinaAMC', '3046': 'ChinaAMC',
+    '3439': 'Harvest', '3179': 'Harvest',
+    '3008': 'Bosera HashKey', '3009': 'Bosera HashKey',
+}
+
+
+def day_start(times: np.ndarray) -> np.ndarray:
+    """Floor epoch-millisecond timestamps to UTC midnight."""
+    return np.asarray(times, dtype=np.int64) // MS_PER_DAY * MS_PER_DAY
+
+
+def daily_columns(
+    rows: Optional[List[Dict[str, Any]]],
+    fields: Dict[str, Sequence[str]]
+) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Decode dated ETF rows into columns indexed by UTC day (last row per day wins).
+    
+    Args:
+        rows: Response rows with a date or timestamp field
+        fields: Output column name to candidate row field names
+    
+    Returns:
+        Tuple of (day start times, {column: values})
+    """
+    rows = [row for row in rows or [] if isinstance(row, dict)]
+    time_field = first_field(rows[0], ETF_TIME_FIELDS) if rows else None
+    if rows and time_field is None:
+        raise ValueError("Rows have no timestamp field")
+    times, columns = rows_to_columns(rows, fields, time_field)
+    days = day_start(times)
+    keep = np.ones(len(days), dtype=bool)
+    keep[:-1] = days[1:] != days[:-1]
+    return days[keep], {name: values[keep] for name, values in columns.items()}
+
+
+def issuer_of(ticker: str, issuers: Optional[Dict[str, str]] = None) -> str:
+    """Get the issuer of a ticker, or the ticker itself when unknown."""
+    issuers = ISSUERS if issuers is None else issuers
+    code = ticker.upper()
+    if code.endswith('.HK'):
+        code = code[:-3]
+    return issuers.get(code, ticker)
+
+
+def breakdown_columns(
+    rows: Optional[List[Dict[str, Any]]],
+    value_fields: Sequence[str],
+    total_fields: Sequence[str] = ()
+) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Decode dated rows with a per-ticker breakdown into daily columns.
+    
+    A row's breakdown may be a list of entries ({'etf_ticker': ..., 'flow_usd': ...})
+    or a dict keyed by ticker (values numbers or entries). Rows without a
+    breakdown contribute their total (first of total_fields) under TOTAL.
+    Several rows on the same UTC day keep the last one.
+    
+    Args:
+        rows: Response rows with a timestamp or date field
+        value_fields: Candidate value fields of breakdown entries
+        total_fields: Candidate fields of a row-level total
+    
+    Returns:
+        Tuple of (day start times, {ticker: values}); days a ticker is
+        missing from are NaN
+    """
+    rows = [row for row in rows or [] if isinstance(row, dict)]
+    if not rows:
+        return np.empty(0, dtype=np.int64), {}
+    time_field = first_field(rows[0], ETF_TIME_FIELDS)
+    if time_field is None:
+        raise ValueError("Rows have no timestamp field")
+    days = day_start(np.array([parse_time(row[time_field]) for row in rows], dtype=np.int64))
+    index = np.unique(days)
+    position = np.searchsorted(index, days)
+    
+    columns: Dict[str, np.ndarray] = {}
+    
+    def put(ticker, i, value):
+        column = columns.get(ticker)
+        if column is None:
+            column = columns[ticker] = np.full(len(index), np.nan)
+        column[position[i]] = value
+    
+    for i, row in enumerate(rows):
+        entries = _breakdown(row, value_fields)
+        if entries:
+            for ticker, value in entries:
+                put(ticker, i, value)
+            continue
+        field = first_field(row, total_fields)
+        if field is not None:
+            put(TOTAL, i, to_float_array([row[field]])[0])
+    return index, columns
+
+
+def _breakdown(row: Dict[str, Any], value_fields: Sequence[str]) -> List[Tuple[str, float]]:
+    """(ticker, value) pairs of a row's per-ticker breakdown."""
+    field = first_field(row, BREAKDOWN_FIELDS)
+    breakdown = row.get(field) if field else None
+    if isinstance(breakdown, dict):
+        items = [
+            (str(ticker), _entry_value(entry, value_fields)) for ticker, entry in breakdown.items()
+        ]
+    elif isinstance(breakdown, list):
+        items = []
+        for entry in breakdown:
+            ticker_field = first_field(entry, TICKER_FIELDS) if isinstance(entry, dict) else None
+            if ticker_field is not None:
+                items.append((str(entry[ticker_field]), _entry_value(entry, value_fields)))
+    else:
+        return []
+    values = to_float_array(value for _, value in items)
+    return [(ticker, float(value)) for (ticker, _), value in zip(items, values)]
+
+
+def _entry_value(entry: Any, value_fields: Sequence[str]) -> Any:
+    """Raw value of a breakdown entry (a number or a dict with a value field)."""
+    if isinstance(entry, dict):
+        field = first_field(entry, value_fields)
+        return entry.get(field) if field else None
+    return entry
+
+
+def stack(
+    labels: Iterable[Any],
+    series: Dict[Any, Tuple[np.ndarray, np.ndarray]],
+    index: np.ndarray
+) -> np.ndarray:
+    """Place (days, values) series on a shared day index as a (label x day) matrix (NaN gaps)."""
+    labels = list(labels)
+    matrix = np.full((len(labels), len(index)), np.nan)
+    for row, label in enumerate(labels):
+        days, values = series[label]
+        pos = np.searchsorted(index, days)
+        matrix[row, pos] = values
+    return matrix
@@ -0,0 +1,77 @@
+"""
+Instrument helpers shared by the analytics engines
+Classify entries of the supported-pairs index (perpetual vs dated, margin type)
+"""
+import re
+from typing import Dict, Optional
+
+# Trailing YYMMDD or YYYYMMDD expiry in instrument ids (BTCUSD_250627, BTC-USD-20250627)
+_EXPIRY_PATTERNS = (
+    re.compile(r'(?:^|[_\-])(\d{2})(\d{2})(\d{2})$'),
+    re.compile(r'(?:^|[_\-])20(\d{2})(\d{2})(\d{2})$'),
+)
+
+# Trailing DDMMMYY expiry used by Deribit and Bybit (BTC-27JUN25, BTC-5JUL24)
+_NAMED_MONTH_PATTERN = re.compile(r'(?:^|[_\-])(\d{1,2})([A-Z]{3})(\d{2})$', re.IGNORECASE)
+
+_MONTHS = ('JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC')
+
+# Quote currencies of inverse (coin-margined) contracts on centralized exchanges
+COIN_MARGIN_QUOTES = ('USD',)
+
+# Exchanges whose USD-quoted perpetuals are margined and settled in USDC, not the coin
+STABLE_SETTLED_EXCHANGES = (
+    'Hyperliquid',
+    'dYdX',
+    'Vertex',
+    'Paradex',
+    'Aevo',
+    'Drift',
+    'GMX',
+    'Lighter',
+)
+
+# Candidate fields naming a pair's margin (settlement) asset or margin type
+MARGIN_FIELDS = ('margin_asset', 'settle_asset', 'settle_currency', 'margin_type')
+
+
+def expiry_code(instrument_id: str) -> Optional[str]:
+    """Get the YYMMDD expiry of a dated instrument, or None for perpetuals."""
+    for pattern in _EXPIRY_PATTERNS:
+        match = pattern.search(instrument_id or '')
+        if match:
+            return ''.join(match.groups())
+    match = _NAMED_MONTH_PATTERN.search(instrument_id or '')
+    if match and match.group(2).upper() in _MONTHS:
+        day, month, year = match.groups()
+        return f"{year}{_MONTHS.index(month.upper()) + 1:02d}{int(day):02d}"
+    return None
+
+
+def is_dated(pair: Dict[str, str]) -> bool:
+    """Check whether a pair-index entry is a dated (delivery) contract."""
+    return expiry_code(pair.get('instrument_id', '')) is not None
+
+
+def is_coin_margined(pair: Dict[str, str]) -> bool:
+    """
+    Check whether a pair-index entry is coin-margined (inverse).
+    
+    Uses the pair's margin asset or margin type when reported. Otherwise the
+    USD-quoted perpetuals of STABLE_SETTLED_EXCHANGES are stablecoin-margined,
+    and elsewhere a USD quote marks an inverse contract.
+    """
+    for field in MARGIN_FIELDS:
+        margin = (pair.get(field) or '').upper()
+        if margin:
+            if field == 'margin_type':
+                return 'COIN' in margin or 'INVERSE' in margin
+            return margin == (pair.get('base_asset') or '').upper()
+    exchange = (pair.get('exchange') or '').upper()
+    if exchange in {name.upper() for name in STABLE_SETTLED_EXCHANGES}:
+        return False
+    quote = (pair.get('quote_asset') or '').upper()
+    if quote:
+        return quote in COIN_MARGIN_QUOTES
+    instrument = (pair.get('instrument_id') or '').upper()
+    return 'USD_' in instrument or '-USD-' in instrument or instrument.endswith('USD')
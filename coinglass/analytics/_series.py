@@ -0,0 +1,217 @@
+"""
+Time-series helpers shared by the analytics engines
+Decode response rows into columnar NumPy arrays and align them on a common time index
+"""
+import calendar
+import time as _time
+from typing import Optional, List, Dict, Any, Iterable, Sequence, Tuple
+
+import numpy as np
+
+# Candidate timestamp fields, tried in order
+TIME_FIELDS = ('time', 'timestamp', 't', 'date', 'create_time')
+
+MS_PER_DAY = 86400000
+
+# Interval name to milliseconds
+INTERVAL_MS = {
+    '1m': 60000,
+    '3m': 180000,
+    '5m': 300000,
+    '15m': 900000,
+    '30m': 1800000,
+    '1h': 3600000,
+    '4h': 14400000,
+    '6h': 21600000,
+    '8h': 28800000,
+    '12h': 43200000,
+    '1d': 86400000,
+    '1w': 604800000,
+}
+
+
+def interval_ms(interval: str) -> int:
+    """Get the length of an interval (e.g., '4h') in milliseconds."""
+    try:
+        return INTERVAL_MS[interval]
+    except KeyError:
+        raise ValueError(f"Unknown interval: {interval}")
+
+
+def parse_time(value: Any) -> int:
+    """
+    Convert an API timestamp to epoch milliseconds.
+    
+    Accepts millisecond or second epochs (int, float or numeric string) and
+    'YYYY-MM-DD' dates (UTC midnight).
+    """
+    if isinstance(value, str):
+        try:
+            value = float(value)
+        except ValueError:
+            parsed = _time.strptime(value[:10], '%Y-%m-%d')
+            return calendar.timegm(parsed) * 1000
+    value = int(value)
+    # Second-resolution epochs are below ~1e11 until the year 5138
+    return value * 1000 if value < 100000000000 else value
+
+
+def find_time_field(row: Dict[str, Any]) -> Optional[str]:
+    """Get the name of the timestamp field of a row."""
+    for field in TIME_FIELDS:
+        if field in row:
+            return field
+    return None
+
+
+def to_float_array(values: Iterable[Any]) -> np.ndarray:
+    """Convert raw values (numbers, numeric strings or None) to float64, NaN for missing."""
+    out = []
+    append = out.append
+    for value in values:
+        if value is None or value == '':
+            append(np.nan)
+        else:
+            try:
+                append(float(value))
+            except (TypeError, ValueError):
+                append(np.nan)
+    return np.array(out, dtype=np.float64)
+
+
+def first_field(row: Dict[str, Any], candidates: Sequence[str]) -> Optional[str]:
+    """Get the first of several candidate field names present in a row."""
+    for field in candidates:
+        if field in row:
+            return field
+    return None
+
+
+def rows_to_columns(
+    rows: Optional[List[Dict[str, Any]]],
+    fields: Dict[str, Sequence[str]],
+    time_field: Optional[str] = None
+) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Decode time-series rows into sorted columnar arrays.
+    
+    Args:
+        rows: Response rows (list of dicts with a timestamp field)
+        fields: Mapping of output column name to candidate row field names,
+            e.g. {'buy': ('taker_buy_volume_usd', 'buy_volume')}
+        time_field: Timestamp field (auto-detected when omitted)
+    
+    Returns:
+        Tuple of (int64 epoch-ms times, {column: float64 values}), sorted by
+        time with duplicate timestamps removed (last wins)
+    """
+    rows = rows or []
+    if not rows:
+        return np.empty(0, dtype=np.int64), {name: np.empty(0) for name in fields}
+    
+    time_field = time_field or find_time_field(rows[0])
+    if time_field is None:
+        raise ValueError("Rows have no timestamp field")
+    times = np.array([parse_time(row[time_field]) for row in rows], dtype=np.int64)
+    
+    columns = {}
+    for name, candidates in fields.items():
+        field = first_field(rows[0], candidates)
+        columns[name] = (
+            to_float_array(row.get(field) for row in rows) if field is not None
+            else np.full(len(rows), np.nan)
+        )
+    
+    order = np.argsort(times, kind='stable')
+    times = times[order]
+    # Keep the last row for each repeated timestamp
+    keep = np.ones(len(times), dtype=bool)
+    keep[:-1] = times[1:] != times[:-1]
+    times = times[keep]
+    columns = {name: values[order][keep] for name, values in columns.items()}
+    return times, columns
+
+
+def union_index(time_arrays: Iterable[np.ndarray]) -> np.ndarray:
+    """Sorted union of several timestamp arrays."""
+    arrays = [t for t in time_arrays if len(t)]
+    if not arrays:
+        return np.empty(0, dtype=np.int64)
+    return np.unique(np.concatenate(arrays))
+
+
+def reindex(
+    times: np.ndarray,
+    values: np.ndarray,
+    index: np.ndarray,
+    fill: str = 'ffill'
+) -> np.ndarray:
+    """
+    Place a series on a target time index.
+    
+    Args:
+        times: Sorted timestamps of the series
+        values: Values of the series (last axis aligned with times)
+        index: Sorted target timestamps
+        fill: 'ffill' to carry the last known value forward, 'none' for NaN gaps
+    
+    Returns:
+        Values on the target index (NaN before the first observation)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out_shape = values.shape[:-1] + (len(index),)
+    if len(times) == 0 or len(index) == 0:
+        return np.full(out_shape, np.nan)
+    
+    if fill == 'ffill':
+        pos = np.searchsorted(times, index, side='right') - 1
+        out = values[..., np.clip(pos, 0, None)]
+        out[..., pos < 0] = np.nan
+        return out
+    if fill == 'none':
+        pos = np.searchsorted(times, index)
+        pos_clipped = np.clip(pos, 0, len(times) - 1)
+        hit = times[pos_clipped] == index
+        out = np.full(out_shape, np.nan)
+        out[..., hit] = values[..., pos_clipped[hit]]
+        return out
+    raise ValueError(f"Unknown fill policy: {fill}")
+
+
+def align(
+    series: Dict[Any, Tuple[np.ndarray, np.ndarray]],
+    index: Optional[np.ndarray] = None,
+    fill: str = 'ffill'
+) -> Tuple[np.ndarray, List[Any], np.ndarray]:
+    """
+    Align several series on one time index.
+    
+    Args:
+        series: Mapping of key to (times, values)
+        index: Target index (union of all series times when omitted)
+        fill: Gap policy passed to reindex
+    
+    Returns:
+        Tuple of (index, keys, matrix of shape (len(keys), len(index)))
+    """
+    keys = list(series)
+    if index is None:
+        index = union_index(times for times, _ in series.values())
+    matrix = np.full((len(keys), len(index)), np.nan)
+    for row, key in enumerate(keys):
+        times, values = series[key]
+        matrix[row] = reindex(times, values, index, fill)
+    return index, keys, matrix
+
+
+def ffill(matrix: np.ndarray) -> np.ndarray:
+    """Forward-fill NaN gaps along the last axis."""
+    matrix = np.asarray(matrix, dtype=np.float64)
+    valid = ~np.isnan(matrix)
+    idx = np.where(valid, np.arange(matrix.shape[-1]), 0)
+    np.maximum.accumulate(idx, axis=-1, out=idx)
+    filled = np.take_along_axis(matrix, idx, axis=-1)
+    # Leading gaps stay NaN
+    seen = np.logical_or.accumulate(valid, axis=-1)
+    filled[~seen] = np.nan
+    return filled
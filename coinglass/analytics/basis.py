@@ -0,0 +1,287 @@
+"""
+Basis term structure
+Aligns perpetual and dated futures basis histories into an (expiry x time) matrix
+for annualized basis, curve slope and roll yield
+"""
+import calendar
+from typing import Optional, List, Dict, Any, Iterable, Tuple
+
+import numpy as np
+
+from ..fanout import api_rate_limiter, run_concurrently
+from ._pairs import expiry_code, is_coin_margined
+from ._series import MS_PER_DAY, rows_to_columns, union_index, reindex
+
+Pair = Tuple[str, str]
+
+# Column name to candidate response fields
+BASIS_FIELDS = {
+    'basis': ('close_basis', 'basis_percent', 'basis'),
+    'change': ('close_change', 'basis_change'),
+}
+
+# Hour (UTC) at which dated contracts settle on most exchanges
+EXPIRY_HOUR_UTC = 8
+
+DAYS_PER_YEAR = 365.0
+
+
+def expiry_ms(instrument_id: str) -> Optional[int]:
+    """Get the settlement time of a dated instrument in milliseconds, or None for perpetuals."""
+    code = expiry_code(instrument_id)
+    if code is None:
+        return None
+    year, month, day = 2000 + int(code[:2]), int(code[2:4]), int(code[4:])
+    return calendar.timegm((year, month, day, EXPIRY_HOUR_UTC, 0, 0)) * 1000
+
+
+class BasisTermEngine:
+    """
+    Basis of every perpetual and dated contract of a coin as (instrument x time) arrays.
+    
+    Instruments are discovered from the supported-pairs index and ordered
+    perpetuals first, then by expiry. Histories are fetched concurrently and
+    appended to C-contiguous matrices on one shared time index; update()
+    refetches the last bar, which may still have been forming, overwrites
+    it and appends newer bars. Values of a contract after its
+    settlement are masked out of every derived series.
+    
+    Example:
+        >>> engine = BasisTermEngine(cg, interval='1h')
+        >>> engine.load(engine.discover('BTC', exchanges=['Binance', 'OKX']), limit=500)
+        >>> engine.annualized()[:, -1]
+        >>> engine.slope()[-24:]
+        >>> engine.roll_yield()[-1]
+    """
+    
+    def __init__(self, api: Any, interval: str = '1h', fill: str = 'ffill'):
+        """
+        Initialize engine.
+        
+        Args:
+            api: CoinGlass instance
+            interval: Bar interval used for every contract
+            fill: Gap policy for missing bars: 'ffill' or 'none'
+        """
+        self.api = api
+        self.interval = interval
+        self.fill = fill
+        self.pairs: List[Pair] = []
+        self.expiries = np.empty(0, dtype=np.float64)
+        self.times = np.empty(0, dtype=np.int64)
+        self.basis = np.empty((0, 0))
+        self.change = np.empty((0, 0))
+        self.errors: Dict[Any, Exception] = {}
+    
+    def discover(
+        self,
+        symbol: str,
+        exchanges: Optional[Iterable[str]] = None,
+        include_perpetual: bool = True,
+        coin_margined: Optional[bool] = None
+    ) -> List[Pair]:
+        """
+        Find the contracts of a coin in the supported-pairs index.
+        
+        Args:
+            symbol: Base asset (e.g., 'BTC')
+            exchanges: Optional exchange subset
+            include_perpetual: Keep perpetual contracts
+            coin_margined: Keep only inverse (True) or only linear (False) contracts;
+                both when None
+        
+        Returns:
+            (exchange, instrument_id) pairs, perpetuals first, then by expiry
+        """
+        index = self.api.fanout.get_pair_index('futures', symbols=[symbol], exchanges=exchanges)
+        pairs = []
+        for pair in index:
+            if coin_margined is not None and is_coin_margined(pair) != coin_margined:
+                continue
+            if not include_perpetual and expiry_code(pair['instrument_id']) is None:
+                continue
+            pairs.append((pair['exchange'], pair['instrument_id']))
+        return sorted(pairs, key=lambda pair: (expiry_ms(pair[1]) or 0, pair))
+    
+    def load(self, pairs: Iterable[Pair], **kwargs) -> 'BasisTermEngine':
+        """
+        Fetch and align the basis history of every contract.
+        
+        Args:
+            pairs: (exchange, instrument_id) pairs
+            **kwargs: Optional parameters for each history call:
+                - startTime (int): Start timestamp in milliseconds
+                - endTime (int): End timestamp in milliseconds
+                - limit (int): Number of results (max: 1000)
+        
+        Returns:
+            self
+        """
+        self.pairs = sorted(pairs, key=lambda pair: (expiry_ms(pair[1]) or 0, pair))
+        self.expiries = np.array(
+            [expiry_ms(instrument) or np.nan for _, instrument in self.pairs], dtype=np.float64
+        )
+        self.times = np.empty(0, dtype=np.int64)
+        self.basis = np.empty((len(self.pairs), 0))
+        self.change = np.empty((len(self.pairs), 0))
+        self._append(self._fetch(kwargs))
+        return self
+    
+    def update(self, **kwargs) -> np.ndarray:
+        """
+        Refetch the last loaded bar, overwrite it and append newer bars.
+        
+        Args:
+            **kwargs: Optional parameters for each history call (e.g., limit)
+        
+        Returns:
+            Timestamps that were written (the overwritten bar first, if refetched)
+        """
+        if len(self.times):
+            kwargs.setdefault('startTime', int(self.times[-1]))
+        return self._append(self._fetch(kwargs))
+    
+    @property
+    def dated(self) -> np.ndarray:
+        """Boolean mask of dated (delivery) contracts."""
+        return ~np.isnan(self.expiries)
+    
+    def days_to_expiry(self) -> np.ndarray:
+        """Days until settlement, (instrument x time); NaN for perpetuals and settled contracts."""
+        with np.errstate(invalid='ignore'):
+            days = (self.expiries[:, None] - self.times[None, :]) / MS_PER_DAY
+            return np.where(days > 0, days, np.nan)
+    
+    def annualized(self) -> np.ndarray:
+        """
+        Basis annualized to a 365-day year, (instrument x time).
+        
+        Perpetual rows carry the raw basis, which has no tenor to annualize by.
+        """
+        days = self.days_to_expiry()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            dated = self.basis * DAYS_PER_YEAR / days
+        return np.where(self.dated[:, None], dated, self.basis)
+    
+    def slope(self) -> np.ndarray:
+        """
+        Least-squares slope of annualized basis against tenor in years, per bar.
+        
+        Returns:
+            Array aligned with self.times; NaN where fewer than two dated
+            contracts have a value
+        """
+        x = self.days_to_expiry() / DAYS_PER_YEAR
+        y = self.annualized()
+        valid = self.dated[:, None] & ~np.isnan(x) & ~np.isnan(y)
+        x = np.where(valid, x, 0.0)
+        y = np.where(valid, y, 0.0)
+        n = valid.sum(axis=0)
+        sx, sy = x.sum(axis=0), y.sum(axis=0)
+        denominator = n * (x * x).sum(axis=0) - sx * sx
+        with np.errstate(invalid='ignore', divide='ignore'):
+            slope = (n * (x * y).sum(axis=0) - sx * sy) / denominator
+        return np.where((n >= 2) & (denominator > 0), slope, np.nan)
+    
+    def roll_yield(self) -> np.ndarray:
+        """
+        Annualized yield of rolling from the nearest to the next expiry, per bar.
+        
+        Uses the futures/spot ratio implied by each basis (1 + basis / 100),
+        so the result is in percent like the basis itself. Contracts sharing
+        an expiry (the same date listed on several exchanges) are averaged
+        into one point of the curve before the two nearest expiries are taken.
+        
+        Returns:
+            Array aligned with self.times; NaN where fewer than two distinct
+            unsettled expiries have a value
+        """
+        days = self.days_to_expiry()
+        valid = self.dated[:, None] & ~np.isnan(days) & ~np.isnan(self.basis)
+        expiries = np.broadcast_to(self.expiries[:, None], valid.shape)
+        near_expiry = np.where(valid, expiries, np.inf).min(axis=0)
+        far_expiry = np.where(valid & (expiries > near_expiry), expiries, np.inf).min(axis=0)
+        near, far = valid & (expiries == near_expiry), valid & (expiries == far_expiry)
+        
+        def mean(values, mask):
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return np.where(mask, values, 0.0).sum(axis=0) / mask.sum(axis=0)
+        
+        ratio = (1 + mean(self.basis, far) / 100) / (1 + mean(self.basis, near) / 100) - 1
+        span = (far_expiry - near_expiry) / MS_PER_DAY
+        with np.errstate(invalid='ignore', divide='ignore'):
+            out = ratio * DAYS_PER_YEAR / span * 100
+        return np.where(np.isfinite(far_expiry), out, np.nan)
+    
+    def curve(self, at: int = -1) -> List[Dict[str, Any]]:
+        """
+        Term structure at one bar.
+        
+        Args:
+            at: Column position (default: the latest bar)
+        
+        Returns:
+            One dict per contract with a value: exchange, instrument_id,
+            days_to_expiry (None for perpetuals), basis and annualized
+        """
+        days = self.days_to_expiry()[:, at]
+        annualized = self.annualized()[:, at]
+        curve = []
+        for row, (exchange, instrument) in enumerate(self.pairs):
+            if np.isnan(self.basis[row, at]) or (self.dated[row] and np.isnan(days[row])):
+                continue
+            curve.append({
+                'exchange': exchange,
+                'instrument_id': instrument,
+                'days_to_expiry': None if np.isnan(days[row]) else float(days[row]),
+                'basis': float(self.basis[row, at]),
+                'annualized': float(annualized[row]),
+            })
+        return curve
+    
+    def _fetch(
+        self, kwargs: Dict[str, Any]
+    ) -> Dict[Pair, Tuple[np.ndarray, Dict[str, np.ndarray]]]:
+        """Fetch every contract concurrently."""
+        futures = self.api.futures
+        
+        def fetch(exchange, instrument):
+            return rows_to_columns(
+                futures.get_basis(exchange, instrument, self.interval, **kwargs), BASIS_FIELDS
+            )
+        
+        calls = [(pair, pair, {}) for pair in self.pairs]
+        results, self.errors = run_concurrently(
+            fetch, calls, rate_limiter=api_rate_limiter(self.api)
+        )
+        return results
+    
+    def _append(self, decoded: Dict[Pair, Tuple[np.ndarray, Dict[str, np.ndarray]]]) -> np.ndarray:
+        """Align new bars, overwrite the last bar if refetched and append the rest."""
+        new_index = union_index(times for times, _ in decoded.values())
+        if len(self.times):
+            new_index = new_index[new_index >= self.times[-1]]
+        if len(new_index) == 0:
+            return new_index
+        overlap = bool(len(self.times)) and new_index[0] == self.times[-1]
+        
+        def block(column, previous):
+            out = np.full((len(self.pairs), len(new_index)), np.nan)
+            for row, pair in enumerate(self.pairs):
+                if pair in decoded:
+                    times, columns = decoded[pair]
+                    out[row] = reindex(times, columns[column], new_index, self.fill)
+                elif overlap:
+                    # A failed contract keeps its previous value of the overwritten bar
+                    out[row, 0] = previous[row, -1]
+            if self.fill == 'ffill' and previous.shape[1]:
+                # Carry values across the boundary with the existing history
+                out = np.where(np.isnan(out), previous[:, -1:], out)
+            return out
+        
+        basis, change = block('basis', self.basis), block('change', self.change)
+        keep = len(self.times) - overlap
+        self.basis = np.ascontiguousarray(np.hstack([self.basis[:, :keep], basis]))
+        self.change = np.ascontiguousarray(np.hstack([self.change[:, :keep], change]))
+        self.times = np.concatenate([self.times[:keep], new_index])
+        return new_index
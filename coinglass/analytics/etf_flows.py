@@ -0,0 +1,247 @@
+"""
+ETF flow aggregation
+Normalizes US and Hong Kong spot ETF flow histories into a (ticker x day) matrix
+for rolling, cumulative and per-issuer flows
+"""
+from typing import Optional, List, Dict, Any, Iterable, Tuple
+
+import numpy as np
+
+from ..fanout import api_rate_limiter, run_concurrently
+from ._etf import ISSUERS, breakdown_columns, issuer_of, stack
+from ._series import MS_PER_DAY, union_index
+
+Label = Tuple[str, str]
+
+# Source name to (API group, asset) attribute path on the client
+SOURCES = {
+    'us_btc': ('etf', 'bitcoin'),
+    'us_eth': ('etf', 'ethereum'),
+    'hk_btc': ('hk_etf', 'bitcoin'),
+    'hk_eth': ('hk_etf', 'ethereum'),
+}
+
+# Candidate fields of a per-ticker flow
+FLOW_FIELDS = ('flow_usd', 'net_flow', 'flow', 'change_usd')
+
+# Candidate fields of a day's total flow when no per-ticker breakdown is reported
+TOTAL_FLOW_FIELDS = ('flow_usd', 'net_flow', 'total_flow_usd', 'flow')
+
+# Sources whose flow history accepts startTime/endTime
+RANGED_GROUPS = ('etf',)
+
+
+class ETFFlowEngine:
+    """
+    Daily net flows of every spot ETF across sources as a (ticker x day) matrix.
+    
+    Flow histories of all sources are fetched concurrently. Each source's
+    per-ticker breakdown becomes one row labelled (source, ticker); days a
+    source reports only a total are kept under the ticker 'TOTAL'. Days
+    without a reported flow count as zero. update() refetches from the last
+    loaded day, which is overwritten since the latest figures are often
+    revised, and appends new days.
+    
+    Example:
+        >>> flows = ETFFlowEngine(cg)
+        >>> flows.load()
+        >>> flows.rolling(5)[:, -1]
+        >>> flows.net('us_btc')
+        >>> issuers, share = flows.issuer_share(window=30)
+        >>> flows.update()
+    """
+    
+    def __init__(
+        self,
+        api: Any,
+        sources: Iterable[str] = tuple(SOURCES),
+        issuers: Optional[Dict[str, str]] = None
+    ):
+        """
+        Initialize engine.
+        
+        Args:
+            api: CoinGlass instance
+            sources: Source names (keys of SOURCES)
+            issuers: Ticker to issuer overrides merged over the built-in map
+        """
+        unknown = [source for source in sources if source not in SOURCES]
+        if unknown:
+            raise ValueError(f"Unknown sources: {unknown}")
+        self.api = api
+        self.sources = list(sources)
+        self.issuers = issuers
+        self.unavailable: List[str] = []
+        self.errors: Dict[str, Exception] = {}
+        self.labels: List[Label] = []
+        self.days = np.empty(0, dtype=np.int64)
+        self.flows = np.empty((0, 0))
+        self._series: Dict[Label, Tuple[np.ndarray, np.ndarray]] = {}
+    
+    def __repr__(self):
+        return f"ETFFlowEngine({len(self.labels)} tickers x {len(self.days)} days)"
+    
+    def __getitem__(self, label: Label) -> np.ndarray:
+        return self.flows[self.labels.index(label)]
+    
+    def load(self, **kwargs) -> 'ETFFlowEngine':
+        """
+        Fetch the flow history of every source concurrently.
+        
+        Args:
+            **kwargs: Optional parameters:
+                - startTime (int): Start timestamp in milliseconds
+                - endTime (int): End timestamp in milliseconds
+        
+        Returns:
+            self
+        """
+        self._series = {}
+        self._fetch(kwargs)
+        return self
+    
+    def update(self) -> 'ETFFlowEngine':
+        """
+        Refetch every source from its last loaded day and merge the result.
+        
+        Sources publish on different calendars, so the fetch starts at the
+        earliest of the sources' last days.
+        
+        Returns:
+            self
+        """
+        last: Dict[str, int] = {}
+        for (source, _), (days, _) in self._series.items():
+            if len(days):
+                last[source] = max(last.get(source, days[-1]), days[-1])
+        if not last:
+            return self.load()
+        self._fetch({'startTime': int(min(last.values()))})
+        return self
+    
+    def tickers(self, source: Optional[str] = None) -> List[str]:
+        """Tickers of one source, or of all sources."""
+        return [ticker for s, ticker in self.labels if source is None or s == source]
+    
+    def net(self, source: Optional[str] = None) -> np.ndarray:
+        """Daily net flow summed over the tickers of one source, or of all sources."""
+        rows = [i for i, (s, _) in enumerate(self.labels) if source is None or s == source]
+        return self.flows[rows].sum(axis=0)
+    
+    def cumulative(self) -> np.ndarray:
+        """Cumulative net flow of every ticker since the first loaded day, (ticker x day)."""
+        return np.cumsum(self.flows, axis=1)
+    
+    def rolling(self, window: int, flows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Trailing sum of daily flows over a window of loaded days.
+        
+        Args:
+            window: Number of days
+            flows: (row x day) flows to sum (default: the ticker matrix)
+        
+        Returns:
+            (row x day) array; the first window - 1 days sum the days available
+        """
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        flows = self.flows if flows is None else flows
+        total = np.cumsum(flows, axis=1)
+        total[:, window:] -= total[:, :-window].copy()
+        return total
+    
+    def issuer_flows(self) -> Tuple[List[str], np.ndarray]:
+        """
+        Daily net flow per issuer across sources.
+        
+        Returns:
+            Tuple of (issuer names, (issuer x day) flows)
+        """
+        owners = [issuer_of(ticker, self._issuer_map()) for _, ticker in self.labels]
+        names = sorted(set(owners))
+        rows = np.searchsorted(names, owners)
+        out = np.zeros((len(names), len(self.days)))
+        np.add.at(out, rows, self.flows)
+        return names, out
+    
+    def issuer_share(self, window: int = 1, gross: bool = True) -> Tuple[List[str], np.ndarray]:
+        """
+        Each issuer's share of flows over a trailing window of days.
+        
+        Args:
+            window: Number of days summed before taking shares
+            gross: Share of absolute daily flows (True) or of the net flow
+                (False; negative or above one when issuers net in opposite directions)
+        
+        Returns:
+            Tuple of (issuer names, (issuer x day) shares); NaN where the total is zero
+        """
+        names, flows = self.issuer_flows()
+        summed = self.rolling(window, np.abs(flows) if gross else flows)
+        total = summed.sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return names, np.where(total != 0, summed / total, np.nan)
+    
+    def _issuer_map(self) -> Optional[Dict[str, str]]:
+        """Built-in issuer map with the user overrides applied (None when there are none)."""
+        if not self.issuers:
+            return None
+        return dict(ISSUERS, **{ticker.upper(): name for ticker, name in self.issuers.items()})
+    
+    def _fetch(self, kwargs: Dict[str, Any]):
+        """Fetch all sources and replace their rows from the earliest fetched day on."""
+        apis = {}
+        self.unavailable = []
+        for source in self.sources:
+            group, asset = SOURCES[source]
+            api = getattr(getattr(self.api, group, None), asset, None)
+            if api is None or not hasattr(api, 'get_flow_history'):
+                self.unavailable.append(source)
+            else:
+                apis[source] = (api, group in RANGED_GROUPS)
+        
+        def fetch(source):
+            api, ranged = apis[source]
+            return api.get_flow_history(**kwargs) if ranged else api.get_flow_history()
+        
+        results, self.errors = run_concurrently(
+            fetch,
+            [(source, (source,), {}) for source in apis],
+            rate_limiter=api_rate_limiter(self.api),
+        )
+        start, end = kwargs.get('startTime'), kwargs.get('endTime')
+        for source, rows in results.items():
+            days, columns = breakdown_columns(rows, FLOW_FIELDS, TOTAL_FLOW_FIELDS)
+            # Unranged sources return their whole history
+            keep = np.ones(len(days), dtype=bool)
+            if start is not None:
+                keep &= days >= start // MS_PER_DAY * MS_PER_DAY
+            if end is not None:
+                keep &= days <= end
+            if not keep.any():
+                continue
+            self._replace(
+                source, days[keep], {ticker: values[keep] for ticker, values in columns.items()}
+            )
+        self._rebuild()
+    
+    def _replace(self, source: str, days: np.ndarray, columns: Dict[str, np.ndarray]):
+        """Drop a source's data from the first fetched day on and store the fetched columns."""
+        first = days[0]
+        for label in [label for label in self._series if label[0] == source]:
+            old_days, old_values = self._series[label]
+            keep = old_days < first
+            self._series[label] = (old_days[keep], old_values[keep])
+        for ticker, values in columns.items():
+            label = (source, ticker)
+            old_days, old_values = self._series.get(label, (days[:0], values[:0]))
+            self._series[label] = (
+                np.concatenate([old_days, days]),
+                np.concatenate([old_values, values]),
+            )
+    
+    def _rebuild(self):
+        """Rebuild the (ticker x day) matrix from the per-label series."""
+        self.labels = sorted(label for label, (days, _) in self._series.items() if len(days))
+        self.days = union_index(self._series[label][0] for label in self.labels)
+        self.flows = np.nan_to_num(stack(self.labels, self._series, self.days))
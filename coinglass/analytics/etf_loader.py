@@ -0,0 +1,301 @@
+"""
+ETF bulk loader
+Fetches the per-ticker histories of every listed Bitcoin ETF concurrently and merges them
+into one columnar (ticker, date, price, NAV, premium, AUM) dataset
+"""
+import time
+from typing import Optional, List, Dict, Any, Iterable, Tuple
+
+import numpy as np
+
+from ..fanout import api_rate_limiter, run_concurrently
+from ._etf import TICKER_FIELDS, breakdown_columns, daily_columns, day_start
+from ._series import MS_PER_DAY, first_field, parse_time, reindex, union_index
+
+# Dataset columns besides ticker and date
+FIELDS = ('price', 'nav', 'premium', 'aum')
+
+# Column name to candidate fields of etf.bitcoin.get_history rows
+HISTORY_FIELDS = {
+    'market_price': ('market_price', 'market_price_usd', 'price', 'price_usd'),
+    'nav': ('nav', 'nav_usd', 'net_asset_value', 'net_asset_value_usd'),
+    'premium': ('premium_discount', 'premium_discount_percent', 'premium_discount_ratio'),
+    'aum': ('net_assets', 'net_assets_usd', 'aum', 'aum_usd'),
+}
+
+# Column name to candidate fields of etf.bitcoin.price.get_history rows
+PRICE_FIELDS = {
+    'close': ('close', 'close_price', 'price', 'price_usd'),
+}
+
+# Candidate fields of etf.bitcoin.net_assets.get_history rows
+NET_ASSETS_FIELDS = ('net_assets_usd', 'net_assets', 'aum_usd')
+
+# Candidate fields of the date of a listed ETF's latest NAV, looked up in 'asset_details'
+# (the listing's top-level update times are live quote times, ahead of any NAV date)
+NAV_DATE_FIELDS = ('update_date', 'nav_date', 'assets_date')
+
+# Price history ranges and the days they span, shortest first
+PRICE_RANGES = (('1d', 1), ('7d', 7), ('30d', 30), ('90d', 90), ('1y', 365))
+
+
+class ETFBulkLoader:
+    """
+    Per-ticker Bitcoin ETF histories of the whole listing, fetched concurrently.
+    
+    Tickers are discovered from etf.bitcoin.get_list(). For every stale
+    ticker, get_history, get_detail and price.get_history are issued
+    together on the fan-out pool (paced by the client's rate limiter),
+    along with one net_assets.get_history call for the complex's total AUM.
+    A ticker is stale when its last date with a NAV is older than the NAV
+    date the listing reports for it (asset_details.update_date) or, when the
+    listing reports none, older than max_age_days. Refreshes refetch stale
+    tickers from their last date, which is overwritten, and append the new
+    dates.
+    
+    Price is the price history's close (the history's market price when
+    missing); premium is the reported premium/discount percent, derived
+    from price and NAV when not reported.
+    
+    Example:
+        >>> loader = ETFBulkLoader(cg)
+        >>> loader.refresh()
+        ['ARKB', 'BITB', 'FBTC', 'GBTC', 'IBIT', ...]
+        >>> data = loader.dataset()
+        >>> data['ticker'], data['date'], data['premium']
+        >>> tickers, days, nav = loader.matrix('nav')
+        >>> loader.refresh()          # only tickers with newer data
+        []
+    """
+    
+    def __init__(self, api: Any, price_range: str = '1y', max_age_days: float = 1.0):
+        """
+        Initialize loader.
+        
+        Args:
+            api: CoinGlass instance
+            price_range: Price history range of a ticker's first load (see PRICE_RANGES)
+            max_age_days: Days after which a ticker without a listed NAV date is stale
+        """
+        if price_range not in dict(PRICE_RANGES):
+            raise ValueError(f"Unknown price range: {price_range}")
+        self.api = api
+        self.price_range = price_range
+        self.max_age_days = max_age_days
+        self.tickers: List[str] = []
+        self.listing: Dict[str, Dict[str, Any]] = {}
+        self.details: Dict[str, Dict[str, Any]] = {}
+        self.total_aum: Tuple[np.ndarray, np.ndarray] = (np.empty(0, dtype=np.int64), np.empty(0))
+        self.errors: Dict[Any, Exception] = {}
+        self._data: Dict[str, Tuple[np.ndarray, Dict[str, np.ndarray]]] = {}
+        self._dataset: Optional[Dict[str, np.ndarray]] = None
+    
+    def __repr__(self):
+        rows = sum(len(days) for days, _ in self._data.values())
+        return f"ETFBulkLoader({len(self._data)} tickers, {rows} rows)"
+    
+    def refresh(self, tickers: Optional[Iterable[str]] = None, force: bool = False) -> List[str]:
+        """
+        Discover listed tickers and fetch every stale one concurrently.
+        
+        Args:
+            tickers: Restrict loading to these tickers (default: the whole listing)
+            force: Refetch the full history of every ticker
+        
+        Returns:
+            Tickers that were fetched successfully
+        """
+        self.listing = {}
+        for row in self.api.etf.bitcoin.get_list() or []:
+            field = first_field(row, TICKER_FIELDS) if isinstance(row, dict) else None
+            if field is not None:
+                self.listing[str(row[field])] = row
+        wanted = list(self.listing) if tickers is None else list(tickers)
+        if force:
+            self._data = {}
+        self.tickers = sorted(set(wanted) | set(self._data))
+        now = time.time() * 1000
+        stale = [ticker for ticker in wanted if self._is_stale(ticker, now)]
+        if not stale:
+            return []
+        
+        starts = {ticker: self._last_day(ticker) for ticker in stale}
+        calls = []
+        for ticker, start in starts.items():
+            history = {} if start is None else {'startTime': start}
+            calls += [
+                (('history', ticker), ('history', ticker), history),
+                (('price', ticker), ('price', ticker), {'range': self._price_range(start, now)}),
+                (('detail', ticker), ('detail', ticker), {}),
+            ]
+        aum_start = self.total_aum[0][-1] if len(self.total_aum[0]) and not force else None
+        calls.append(
+            (
+                ('net_assets',),
+                ('net_assets',),
+                {} if aum_start is None else {'startTime': int(aum_start)},
+            )
+        )
+        results, self.errors = run_concurrently(
+            self._call, calls, rate_limiter=api_rate_limiter(self.api)
+        )
+        
+        aum_rows = results.get(('net_assets',))
+        if aum_rows is not None:
+            self._merge_total_aum(aum_rows, aum_start)
+        loaded = []
+        for ticker, start in starts.items():
+            # The price history alone cannot stand in for NAV, premium and AUM
+            if ('history', ticker) not in results:
+                continue
+            if ('detail', ticker) in results:
+                self.details[ticker] = results[('detail', ticker)]
+            self._merge(
+                ticker,
+                start,
+                results.get(('history', ticker)),
+                results.get(('price', ticker)),
+                aum_rows,
+            )
+            loaded.append(ticker)
+        self._dataset = None
+        return loaded
+    
+    def stale(self, now: Optional[float] = None) -> List[str]:
+        """Listed tickers the next refresh would fetch."""
+        now = time.time() * 1000 if now is None else now
+        return [ticker for ticker in self.listing if self._is_stale(ticker, now)]
+    
+    def dataset(self) -> Dict[str, np.ndarray]:
+        """
+        Merged dataset of every loaded ticker, sorted by ticker then date.
+        
+        Returns:
+            Column name to array: 'ticker' (str), 'date' (int64 day start in
+            milliseconds), 'price', 'nav', 'premium' (percent) and 'aum' (USD)
+        """
+        if self._dataset is None:
+            tickers = sorted(self._data)
+            sizes = [len(self._data[ticker][0]) for ticker in tickers]
+            data = {'ticker': np.repeat(np.array(tickers, dtype=str), sizes)}
+            data['date'] = np.concatenate(
+                [self._data[t][0] for t in tickers] or [np.empty(0, dtype=np.int64)]
+            )
+            for field in FIELDS:
+                data[field] = np.concatenate(
+                    [self._data[t][1][field] for t in tickers] or [np.empty(0)]
+                )
+            self._dataset = data
+        return self._dataset
+    
+    def matrix(self, field: str, fill: str = 'none') -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """
+        One dataset column as a (ticker x day) array on the union of loaded dates.
+        
+        Args:
+            field: 'price', 'nav', 'premium' or 'aum'
+            fill: 'none' for NaN gaps or 'ffill' to carry values forward
+        
+        Returns:
+            Tuple of (tickers, day start times, (ticker x day) values)
+        """
+        if field not in FIELDS:
+            raise ValueError(f"Unknown field: {field}")
+        tickers = sorted(self._data)
+        days = union_index(self._data[ticker][0] for ticker in tickers)
+        values = np.array(
+            [
+                reindex(self._data[ticker][0], self._data[ticker][1][field], days, fill)
+                for ticker in tickers
+            ]
+        ).reshape(len(tickers), len(days))
+        return tickers, days, values
+    
+    def _call(self, kind: str, ticker: Optional[str] = None, **kwargs) -> Any:
+        bitcoin = self.api.etf.bitcoin
+        if kind == 'history':
+            return bitcoin.get_history(ticker, **kwargs)
+        if kind == 'price':
+            return bitcoin.price.get_history(ticker, kwargs['range'])
+        if kind == 'detail':
+            return bitcoin.get_detail(ticker)
+        return bitcoin.net_assets.get_history(**kwargs)
+    
+    def _last_day(self, ticker: str) -> Optional[int]:
+        days = self._data.get(ticker, (np.empty(0),))[0]
+        return int(days[-1]) if len(days) else None
+    
+    def _is_stale(self, ticker: str, now: float) -> bool:
+        if ticker not in self._data:
+            return True
+        days, columns = self._data[ticker]
+        with_nav = days[~np.isnan(columns['nav'])]
+        if len(with_nav) == 0:
+            return True
+        last = int(with_nav[-1])
+        details = (self.listing.get(ticker) or {}).get('asset_details')
+        field = first_field(details, NAV_DATE_FIELDS) if isinstance(details, dict) else None
+        if field is not None and details[field] not in (None, ''):
+            return last < int(day_start(np.array([parse_time(details[field])]))[0])
+        today = now // MS_PER_DAY * MS_PER_DAY
+        return today - last > self.max_age_days * MS_PER_DAY
+    
+    def _price_range(self, start: Optional[int], now: float) -> str:
+        """Shortest price history range reaching back to start (the default on a first load)."""
+        if start is None:
+            return self.price_range
+        days = (now - start) / MS_PER_DAY
+        for name, span in PRICE_RANGES:
+            if span >= days:
+                return name
+        return PRICE_RANGES[-1][0]
+    
+    def _merge(
+        self,
+        ticker: str,
+        start: Optional[int],
+        history_rows: Optional[List[Dict[str, Any]]],
+        price_rows: Optional[List[Dict[str, Any]]],
+        aum_rows: Optional[List[Dict[str, Any]]]
+    ):
+        """Decode a ticker's fetched rows and replace its data from start on."""
+        history_days, history = daily_columns(history_rows, HISTORY_FIELDS)
+        price_days, price = daily_columns(price_rows, PRICE_FIELDS)
+        days = union_index([history_days, price_days])
+        if start is not None:
+            days = days[days >= start]
+        
+        close = reindex(price_days, price['close'], days, 'none')
+        columns = {
+            name: reindex(history_days, values, days, 'none') for name, values in history.items()
+        }
+        columns['price'] = np.where(np.isnan(close), columns.pop('market_price'), close)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            derived = (columns['price'] / columns['nav'] - 1.0) * 100.0
+        columns['premium'] = np.where(np.isnan(columns['premium']), derived, columns['premium'])
+        if aum_rows and np.isnan(columns['aum']).any():
+            aum_days, by_ticker = breakdown_columns(aum_rows, NET_ASSETS_FIELDS)
+            if ticker in by_ticker:
+                listed = reindex(aum_days, by_ticker[ticker], days, 'none')
+                columns['aum'] = np.where(np.isnan(columns['aum']), listed, columns['aum'])
+        
+        old_days, old = self._data.get(ticker, (days[:0], {field: np.empty(0) for field in FIELDS}))
+        keep = old_days < days[0] if len(days) else np.ones(len(old_days), dtype=bool)
+        self._data[ticker] = (
+            np.concatenate([old_days[keep], days]),
+            {field: np.concatenate([old[field][keep], columns[field]]) for field in FIELDS},
+        )
+    
+    def _merge_total_aum(self, rows: List[Dict[str, Any]], start: Optional[int]):
+        """Replace the total AUM series from the first fetched day on."""
+        days, columns = daily_columns(rows, {'aum': NET_ASSETS_FIELDS})
+        values = columns['aum']
+        if start is not None:
+            keep = days >= start
+            days, values = days[keep], values[keep]
+        old_days, old_values = self.total_aum
+        keep = old_days < days[0] if len(days) else np.ones(len(old_days), dtype=bool)
+        self.total_aum = (
+            np.concatenate([old_days[keep], days]),
+            np.concatenate([old_values[keep], values]),
+        )
@@ -0,0 +1,339 @@
+"""
+ETF premium/discount and NAV tracking
+Aligns Bitcoin ETF premium, NAV, market price and AUM on one daily index for
+regime flags, tracking error and the AUM-weighted premium of the complex
+"""
+import time
+from typing import Optional, List, Dict, Any, Iterable, Tuple
+
+import numpy as np
+
+from ..fanout import api_rate_limiter, run_concurrently
+from ._etf import TICKER_FIELDS, breakdown_columns, daily_columns, stack
+from ._series import MS_PER_DAY, first_field, reindex, to_float_array, union_index
+from .etf_loader import ETFBulkLoader
+
+# Candidate fields per column of premium/discount history entries
+PREMIUM_FIELDS = {
+    'premium': ('premium_discount_details', 'premium_discount_percent', 'premium_discount'),
+    'nav': ('nav_usd', 'nav'),
+    'market_price': ('market_price_usd', 'market_price', 'price_usd'),
+    'aum': ('net_assets_usd', 'net_assets', 'aum_usd', 'aum'),
+}
+
+# Candidate fields of a net assets (AUM) value
+AUM_FIELDS = PREMIUM_FIELDS['aum']
+
+# Premium (percent) beyond which an ETF is considered at a premium or discount
+DEFAULT_THRESHOLD = 0.5
+
+# Hour (UTC) after which the previous day's ETF data is expected to be published
+DEFAULT_REFRESH_HOUR_UTC = 0
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+def premium_regimes(premium: np.ndarray, threshold: float = DEFAULT_THRESHOLD) -> np.ndarray:
+    """
+    Premium/discount regime of every value with hysteresis.
+    
+    A series enters the premium regime (1) above +threshold and the discount
+    regime (-1) below -threshold, and stays in it until it crosses the
+    opposite threshold. Values inside the band or missing keep the previous
+    regime; 0 before the first crossing.
+    
+    Args:
+        premium: (row x day) premium/discount in percent
+        threshold: Band half-width in percent
+    
+    Returns:
+        int8 (row x day) regimes
+    """
+    premium = np.atleast_2d(premium)
+    with np.errstate(invalid='ignore'):
+        state = np.where(premium > threshold, 1, np.where(premium < -threshold, -1, 0)).astype(
+            np.int8
+        )
+    positions = np.where(state != 0, np.arange(state.shape[1]), -1)
+    last = np.maximum.accumulate(positions, axis=1)
+    regimes = np.take_along_axis(state, np.clip(last, 0, None), axis=1)
+    regimes[last < 0] = 0
+    return regimes
+
+
+def rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    NaN-aware trailing sample standard deviation along the last axis.
+    
+    Args:
+        values: (row x day) values; NaN are skipped
+        window: Number of days
+    
+    Returns:
+        (row x day) array; NaN where the window has fewer than two values
+    """
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    
+    def window_sum(x):
+        total = np.cumsum(x, axis=-1)
+        total[..., window:] -= total[..., :-window].copy()
+        return total
+    
+    count = window_sum(valid.astype(np.float64))
+    total = window_sum(filled)
+    squares = window_sum(filled * filled)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        variance = (squares - total * total / count) / (count - 1)
+    return np.where(count > 1, np.sqrt(np.clip(variance, 0.0, None)), np.nan)
+
+
+class ETFPremiumMonitor:
+    """
+    Premium/discount versus NAV of every Bitcoin ETF as (ticker x day) arrays.
+    
+    premium_discount.get_history() is fetched concurrently with an
+    ETFBulkLoader refresh (every listed ticker's get_history and
+    price.get_history, plus net_assets.get_history for the total AUM).
+    All series are placed on one daily index. Premium and NAV come from the
+    premium/discount history. Daily AUM per ticker is the net assets of the
+    ticker's own history; the listing's current AUM fills only the latest
+    day when that is missing. Price is the price history's close, falling
+    back to the market price of the ticker history and then of the premium
+    history. Data is fetched at most once per day: refresh() is a no-op
+    until the next daily refresh time, and every derived result is cached
+    until then.
+    
+    Example:
+        >>> monitor = ETFPremiumMonitor(cg)
+        >>> monitor.refresh()
+        >>> monitor.weighted_premium()[-1]
+        >>> monitor.tracking_error(annualize=True)
+        >>> monitor.regime_changes()
+        [('GBTC', 1717200000000, -1, 1), ...]
+    """
+    
+    def __init__(
+        self,
+        api: Any,
+        price_range: str = '1y',
+        threshold: float = DEFAULT_THRESHOLD,
+        refresh_hour_utc: int = DEFAULT_REFRESH_HOUR_UTC
+    ):
+        """
+        Initialize monitor.
+        
+        Args:
+            api: CoinGlass instance
+            price_range: Range of the price histories (e.g., '30d', '90d', '1y')
+            threshold: Premium (percent) delimiting the premium and discount regimes
+            refresh_hour_utc: Hour (UTC) at which cached results expire each day
+        """
+        self.api = api
+        self.loader = ETFBulkLoader(api, price_range)
+        self.threshold = threshold
+        self.refresh_hour_utc = refresh_hour_utc
+        self.errors: Dict[Any, Exception] = {}
+        self.tickers: List[str] = []
+        self.days = np.empty(0, dtype=np.int64)
+        self.premium = np.empty((0, 0))
+        self.nav = np.empty((0, 0))
+        self.price = np.empty((0, 0))
+        self.aum = np.empty((0, 0))
+        self.total_aum = np.empty(0)
+        self.expires = 0.0
+        self._results: Dict[Any, Any] = {}
+    
+    def __repr__(self):
+        return f"ETFPremiumMonitor({len(self.tickers)} tickers x {len(self.days)} days)"
+    
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Fetch and align every series unless the cached data is still current.
+        
+        Args:
+            force: Fetch even before the next daily refresh time
+        
+        Returns:
+            True if the data was fetched
+        """
+        now = time.time()
+        if not force and now < self.expires:
+            return False
+        premium = self.api.etf.bitcoin.premium_discount.get_history
+        calls = {'premium': premium, 'loader': lambda: self.loader.refresh(force=force)}
+        results, errors = run_concurrently(
+            lambda name: calls[name](),
+            [(name, (name,), {}) for name in calls],
+            rate_limiter=api_rate_limiter(self.api),
+        )
+        errors.update(self.loader.errors)
+        self.errors = errors
+        if 'premium' in errors:
+            raise errors['premium']
+        
+        days, columns = self._decode_premium(results['premium'])
+        tickers = sorted(set().union(*(columns[name] for name in columns)))
+        days = union_index([days, self.loader.matrix('price')[1]])
+        self._align(tickers, days, columns)
+        self.expires = self._next_refresh(now)
+        self._results = {}
+        return True
+    
+    def regimes(self) -> np.ndarray:
+        """Premium (1), discount (-1) or undetermined (0) regime per ticker and day."""
+        if 'regimes' not in self._results:
+            self._results['regimes'] = premium_regimes(self.premium, self.threshold)
+        return self._results['regimes']
+    
+    def regime_changes(self) -> List[Tuple[str, int, int, int]]:
+        """
+        Days on which a ticker flipped between the premium and discount regimes.
+        
+        Returns:
+            List of (ticker, day start in milliseconds, old regime, new regime) by day
+        """
+        if 'changes' not in self._results:
+            regimes = self.regimes()
+            flips = (regimes[:, 1:] != regimes[:, :-1]) & (regimes[:, :-1] != 0)
+            rows, cols = np.nonzero(flips)
+            order = np.lexsort((rows, cols))
+            self._results['changes'] = [
+                (self.tickers[r], int(self.days[c + 1]), int(regimes[r, c]), int(regimes[r, c + 1]))
+                for r, c in zip(rows[order], cols[order])
+            ]
+        return self._results['changes']
+    
+    def tracking_error(self, window: Optional[int] = None, annualize: bool = False) -> np.ndarray:
+        """
+        Standard deviation of daily price returns minus daily NAV returns.
+        
+        Args:
+            window: Trailing number of days (default: the whole loaded history)
+            annualize: Scale by the square root of TRADING_DAYS_PER_YEAR
+        
+        Returns:
+            Per-ticker tracking error in percent, or (ticker x day) when window is given
+        """
+        key = ('tracking_error', window, annualize)
+        if key not in self._results:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                price_return = self.price[:, 1:] / self.price[:, :-1] - 1.0
+                nav_return = self.nav[:, 1:] / self.nav[:, :-1] - 1.0
+            active = np.concatenate(
+                [np.full((len(self.tickers), 1), np.nan), price_return - nav_return], axis=1
+            )
+            if window is None:
+                counts = np.sum(~np.isnan(active), axis=1)
+                error = np.full(len(self.tickers), np.nan)
+                rows = counts > 1
+                error[rows] = np.nanstd(active[rows], axis=1, ddof=1)
+            else:
+                error = rolling_std(active, window)
+            scale = np.sqrt(TRADING_DAYS_PER_YEAR) if annualize else 1.0
+            self._results[key] = error * scale * 100.0
+        return self._results[key]
+    
+    def weighted_premium(self) -> np.ndarray:
+        """AUM-weighted premium/discount (percent) of the ETF complex per day."""
+        if 'weighted_premium' not in self._results:
+            valid = ~np.isnan(self.premium) & (self.aum > 0)
+            weights = np.where(valid, self.aum, 0.0)
+            total = weights.sum(axis=0)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                self._results['weighted_premium'] = np.where(
+                    total > 0,
+                    (weights * np.where(valid, self.premium, 0.0)).sum(axis=0) / total,
+                    np.nan,
+                )
+        return self._results['weighted_premium']
+    
+    def _decode_premium(
+        self, rows: Any
+    ) -> Tuple[np.ndarray, Dict[str, Dict[str, Tuple[np.ndarray, np.ndarray]]]]:
+        """Decode premium/discount rows (nested per-ticker lists or flat rows with a ticker)."""
+        rows = [row for row in rows or [] if isinstance(row, dict)]
+        columns: Dict[str, Dict[str, Tuple[np.ndarray, np.ndarray]]] = {
+            name: {} for name in PREMIUM_FIELDS
+        }
+        ticker_field = first_field(rows[0], TICKER_FIELDS) if rows else None
+        if ticker_field is None:
+            for name, fields in PREMIUM_FIELDS.items():
+                days, by_ticker = breakdown_columns(rows, fields)
+                columns[name] = {ticker: (days, values) for ticker, values in by_ticker.items()}
+        else:
+            groups: Dict[str, List[Dict[str, Any]]] = {}
+            for row in rows:
+                groups.setdefault(str(row.get(ticker_field)), []).append(row)
+            for ticker, group in groups.items():
+                days, values = daily_columns(group, PREMIUM_FIELDS)
+                for name in PREMIUM_FIELDS:
+                    columns[name][ticker] = (days, values[name])
+        days = union_index(days for series in columns.values() for days, _ in series.values())
+        return days, columns
+    
+    def _align(
+        self,
+        tickers: List[str],
+        days: np.ndarray,
+        columns: Dict[str, Dict[str, Tuple[np.ndarray, np.ndarray]]],
+    ):
+        """Place the premium history and the loader's per-ticker series on the shared day index."""
+        
+        def matrix(name):
+            series = columns[name]
+            present = [ticker for ticker in tickers if ticker in series]
+            out = np.full((len(tickers), len(days)), np.nan)
+            if present:
+                out[[tickers.index(ticker) for ticker in present]] = stack(present, series, days)
+            return out
+        
+        def loaded(field):
+            loaded_tickers, loaded_days, values = self.loader.matrix(field)
+            out = np.full((len(tickers), len(days)), np.nan)
+            for row, ticker in enumerate(tickers):
+                if ticker in loaded_tickers:
+                    out[row] = reindex(
+                        loaded_days, values[loaded_tickers.index(ticker)], days, 'none'
+                    )
+            return out
+        
+        self.tickers, self.days = tickers, days
+        self.premium, self.nav = matrix('premium'), matrix('nav')
+        price = loaded('price')
+        self.price = np.where(np.isnan(price), matrix('market_price'), price)
+        
+        aum = loaded('aum')
+        aum = np.where(np.isnan(aum), matrix('aum'), aum)
+        if len(days):
+            listed = self._listed_aum(self.loader.listing.values())
+            for row, ticker in enumerate(tickers):
+                if ticker in listed and np.isnan(aum[row, -1]):
+                    aum[row, -1] = listed[ticker]
+        self.aum = aum
+        total_days, total = self.loader.total_aum
+        self.total_aum = (
+            reindex(total_days, total, days, 'none') if len(total_days) else np.nansum(aum, axis=0)
+        )
+    
+    def _listed_aum(self, listing: Iterable[Dict[str, Any]]) -> Dict[str, float]:
+        """Current AUM of every listed ticker (top level or inside 'asset_details')."""
+        out = {}
+        for row in listing or []:
+            if not isinstance(row, dict):
+                continue
+            ticker_field = first_field(row, TICKER_FIELDS)
+            for source in (row, row.get('asset_details') or {}):
+                field = first_field(source, AUM_FIELDS) if isinstance(source, dict) else None
+                if ticker_field is not None and field is not None:
+                    value = to_float_array([source[field]])[0]
+                    if not np.isnan(value):
+                        out[str(row[ticker_field])] = float(value)
+                        break
+        return out
+    
+    def _next_refresh(self, now: float) -> float:
+        """Epoch seconds of the first daily refresh time after now."""
+        offset = self.refresh_hour_utc * 3600
+        day = MS_PER_DAY // 1000
+        return ((now - offset) // day + 1) * day + offset
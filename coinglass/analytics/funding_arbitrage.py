@@ -0,0 +1,309 @@
+"""
+Cross-exchange funding-rate arbitrage scanner
+Computes pairwise funding spreads for every symbol and exchange in one vectorized pass
+using funding_rate.get_exchange_list (plan level 1) instead of get_arbitrage (level 3)
+"""
+from typing import Optional, List, Dict, Any, Iterable
+
+import numpy as np
+
+from ..fanout import api_rate_limiter, run_concurrently
+
+HOURS_PER_YEAR = 24 * 365
+DEFAULT_FUNDING_INTERVAL_HOURS = 8
+
+# Keys of the per-margin exchange lists in funding_rate.get_exchange_list rows
+MARGIN_LISTS = {
+    'stablecoin': 'stablecoin_margin_list',
+    'token': 'token_margin_list',
+}
+
+
+class FundingMatrix:
+    """
+    Funding rates laid out as a (symbol x exchange) matrix.
+    
+    Attributes:
+        symbols: Row labels
+        exchanges: Column labels
+        rates: Funding rate per period as returned by the API (NaN where not listed)
+        interval_hours: Funding interval in hours for each cell
+        annualized: Rates scaled to one year by each cell's funding interval
+    """
+    
+    def __init__(
+        self,
+        symbols: List[str],
+        exchanges: List[str],
+        rates: np.ndarray,
+        interval_hours: np.ndarray
+    ):
+        self.symbols = symbols
+        self.exchanges = exchanges
+        self.rates = rates
+        self.interval_hours = interval_hours
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.annualized = rates * (HOURS_PER_YEAR / interval_hours)
+    
+    @property
+    def shape(self):
+        """(number of symbols, number of exchanges)."""
+        return self.rates.shape
+    
+    def __repr__(self):
+        return f"FundingMatrix({len(self.symbols)} symbols x {len(self.exchanges)} exchanges)"
+    
+    def reindex(self, symbols: List[str], exchanges: List[str]) -> 'FundingMatrix':
+        """
+        Align the matrix to other labels, filling missing cells with NaN.
+        
+        Args:
+            symbols: Target row labels
+            exchanges: Target column labels
+        
+        Returns:
+            New FundingMatrix with the requested axes
+        """
+        rows = _positions(self.symbols, symbols)
+        cols = _positions(self.exchanges, exchanges)
+        rates = np.full((len(symbols), len(exchanges)), np.nan)
+        hours = np.full((len(symbols), len(exchanges)), float(DEFAULT_FUNDING_INTERVAL_HOURS))
+        row_ok = rows >= 0
+        col_ok = cols >= 0
+        src = np.ix_(rows[row_ok], cols[col_ok])
+        dst = np.ix_(np.flatnonzero(row_ok), np.flatnonzero(col_ok))
+        rates[dst] = self.rates[src]
+        hours[dst] = self.interval_hours[src]
+        return FundingMatrix(list(symbols), list(exchanges), rates, hours)
+    
+    def subset(
+        self,
+        symbols: Optional[Iterable[str]] = None,
+        exchanges: Optional[Iterable[str]] = None
+    ) -> 'FundingMatrix':
+        """Restrict the matrix to some symbols and/or exchanges."""
+        if symbols is not None:
+            wanted = set(symbols)
+            symbols = [s for s in self.symbols if s in wanted]
+        if exchanges is not None:
+            wanted = set(exchanges)
+            exchanges = [e for e in self.exchanges if e in wanted]
+        return self.reindex(
+            self.symbols if symbols is None else symbols,
+            self.exchanges if exchanges is None else exchanges
+        )
+
+
+def build_funding_matrix(
+    rows: List[Dict[str, Any]],
+    margin: str = 'stablecoin',
+    default_interval_hours: float = DEFAULT_FUNDING_INTERVAL_HOURS
+) -> FundingMatrix:
+    """
+    Decode a funding_rate.get_exchange_list response into a FundingMatrix.
+    
+    Accepts both the nested per-symbol shape (``stablecoin_margin_list`` /
+    ``token_margin_list``) and flat ``{'exchange', 'funding_rate'}`` rows.
+    
+    Args:
+        rows: Response of get_exchange_list or get_accumulated_exchange_list
+        margin: Which margin list to read: 'stablecoin' or 'token'
+        default_interval_hours: Funding interval used when a row has none
+    
+    Returns:
+        FundingMatrix
+    """
+    if margin not in MARGIN_LISTS:
+        raise ValueError(f"Unknown margin type: {margin}")
+    list_key = MARGIN_LISTS[margin]
+    
+    symbol_index: Dict[str, int] = {}
+    exchange_index: Dict[str, int] = {}
+    row_pos, col_pos, values, hours = [], [], [], []
+    for row in rows or []:
+        symbol = row.get('symbol', '')
+        entries = row.get(list_key) if list_key in row else [row]
+        for entry in entries or []:
+            exchange = entry.get('exchange') or entry.get('exchange_name')
+            rate = entry.get('funding_rate')
+            if exchange is None or rate is None or rate == '':
+                continue
+            row_pos.append(symbol_index.setdefault(symbol, len(symbol_index)))
+            col_pos.append(exchange_index.setdefault(exchange, len(exchange_index)))
+            values.append(float(rate))
+            hours.append(float(entry.get('funding_rate_interval') or default_interval_hours))
+    
+    shape = (len(symbol_index), len(exchange_index))
+    rates = np.full(shape, np.nan)
+    interval_hours = np.full(shape, float(default_interval_hours))
+    if values:
+        rates[row_pos, col_pos] = values
+        interval_hours[row_pos, col_pos] = hours
+    return FundingMatrix(list(symbol_index), list(exchange_index), rates, interval_hours)
+
+
+def rank_opportunities(
+    matrix: FundingMatrix,
+    top_k: int = 20,
+    min_spread: float = 0.0,
+    accumulated: Optional[FundingMatrix] = None
+) -> List[Dict[str, Any]]:
+    """
+    Rank cross-exchange funding spreads.
+    
+    All (symbol, short exchange, long exchange) spreads are computed at once
+    as a (symbol x exchange x exchange) array of annualized differences. The
+    top k are found with a partial partition and only those k are sorted.
+    
+    Args:
+        matrix: FundingMatrix of current rates
+        top_k: Number of opportunities to return
+        min_spread: Minimum annualized spread to report
+        accumulated: Optional FundingMatrix of accumulated rates to attach
+    
+    Returns:
+        List of opportunities sorted by annualized spread, descending. Each holds
+        symbol, short_exchange (higher rate), long_exchange (lower rate), both
+        rates, the per-period spread and the annualized spread.
+    """
+    annualized = matrix.annualized
+    if annualized.size == 0 or top_k <= 0:
+        return []
+    
+    # spread[s, i, j] = annualized[s, i] - annualized[s, j]: short i, long j
+    spread = annualized[:, :, None] - annualized[:, None, :]
+    flat = spread.ravel()
+    with np.errstate(invalid='ignore'):
+        candidates = np.flatnonzero(flat > max(min_spread, 0.0))
+    if candidates.size == 0:
+        return []
+    
+    if candidates.size > top_k:
+        keep = np.argpartition(-flat[candidates], top_k - 1)[:top_k]
+        candidates = candidates[keep]
+    candidates = candidates[np.argsort(-flat[candidates], kind='stable')]
+    s_idx, short_idx, long_idx = np.unravel_index(candidates, spread.shape)
+    
+    if accumulated is not None:
+        accumulated = accumulated.reindex(matrix.symbols, matrix.exchanges)
+    
+    results = []
+    for s, i, j, value in zip(s_idx, short_idx, long_idx, flat[candidates]):
+        item = {
+            'symbol': matrix.symbols[s],
+            'short_exchange': matrix.exchanges[i],
+            'long_exchange': matrix.exchanges[j],
+            'short_funding_rate': float(matrix.rates[s, i]),
+            'long_funding_rate': float(matrix.rates[s, j]),
+            'spread': float(matrix.rates[s, i] - matrix.rates[s, j]),
+            'annualized_spread': float(value),
+        }
+        if accumulated is not None:
+            item['accumulated_spread'] = float(accumulated.rates[s, i] - accumulated.rates[s, j])
+        results.append(item)
+    return results
+
+
+class FundingArbitrageScanner:
+    """
+    Local funding arbitrage engine for any plan level.
+    
+    Pulls funding_rate.get_exchange_list once (and optionally
+    get_accumulated_exchange_list) and ranks spreads across all exchanges
+    and symbols locally.
+    
+    Example:
+        >>> scanner = FundingArbitrageScanner(cg)
+        >>> for opp in scanner.scan(top_k=10):
+        ...     print(opp['symbol'], opp['short_exchange'], opp['long_exchange'],
+        ...           opp['annualized_spread'])
+    """
+    
+    def __init__(self, api: Any, margin: str = 'stablecoin'):
+        """
+        Initialize scanner.
+        
+        Args:
+            api: CoinGlass instance
+            margin: Margin type to compare: 'stablecoin' or 'token'
+        """
+        self.api = api
+        self.margin = margin
+        self.matrix: Optional[FundingMatrix] = None
+        self.accumulated: Optional[FundingMatrix] = None
+        self._refresh_args: Dict[str, Any] = {}
+    
+    def refresh(
+        self,
+        symbol: Optional[str] = None,
+        accumulated_range: Optional[str] = None
+    ) -> FundingMatrix:
+        """
+        Fetch current funding rates (and accumulated rates) concurrently.
+        
+        Min Plan Level: 1
+        
+        Args:
+            symbol: Optional single symbol; all symbols when omitted
+            accumulated_range: Optional range for get_accumulated_exchange_list
+                (e.g., '1d', '7d', '30d')
+        
+        Returns:
+            FundingMatrix of current rates
+        """
+        self._refresh_args = {'symbol': symbol, 'accumulated_range': accumulated_range}
+        funding = self.api.futures.funding_rate
+        kwargs = {'symbol': symbol} if symbol else {}
+        calls = [('current', (), kwargs)]
+        if accumulated_range:
+            calls.append(('accumulated', (accumulated_range,), kwargs))
+        
+        def fetch(*args, **call_kwargs):
+            if args:
+                return funding.get_accumulated_exchange_list(*args, **call_kwargs)
+            return funding.get_exchange_list(**call_kwargs)
+        
+        results, errors = run_concurrently(fetch, calls, rate_limiter=api_rate_limiter(self.api))
+        if 'current' in errors:
+            raise errors['current']
+        self.matrix = build_funding_matrix(results['current'], self.margin)
+        self.accumulated = (
+            build_funding_matrix(results['accumulated'], self.margin)
+            if 'accumulated' in results else None
+        )
+        return self.matrix
+    
+    def scan(
+        self,
+        top_k: int = 20,
+        min_spread: float = 0.0,
+        symbols: Optional[Iterable[str]] = None,
+        exchanges: Optional[Iterable[str]] = None,
+        refresh: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank funding arbitrage opportunities.
+        
+        Args:
+            top_k: Number of opportunities to return
+            min_spread: Minimum annualized spread to report
+            symbols: Optional symbols to restrict to
+            exchanges: Optional exchanges to restrict to
+            refresh: Fetch fresh rates even if a matrix is already loaded, with the
+                symbol and accumulated_range of the previous refresh()
+        
+        Returns:
+            Ranked opportunities (see rank_opportunities)
+        """
+        if refresh or self.matrix is None:
+            self.refresh(**self._refresh_args)
+        matrix = self.matrix
+        if symbols is not None or exchanges is not None:
+            matrix = matrix.subset(symbols, exchanges)
+        return rank_opportunities(matrix, top_k, min_spread, self.accumulated)
+
+
+def _positions(labels: List[str], targets: Iterable[str]) -> np.ndarray:
+    """Map target labels to positions in labels (-1 when absent)."""
+    index = {label: i for i, label in enumerate(labels)}
+    return np.array([index.get(t, -1) for t in targets], dtype=np.intp)
@@ -0,0 +1,256 @@
+"""
+Liquidation heatmap decoding
+Turns heatmap model 1/2/3 payloads into price x time matrices with explicit axes
+"""
+from typing import Optional, List, Dict, Any, Tuple
+
+import numpy as np
+
+from ._series import parse_time
+
+# Candidate payload keys, tried in order
+PRICE_AXIS_KEYS = ('y_axis', 'yAxis', 'y')
+CELL_KEYS = ('liquidation_leverage_data', 'data', 'z')
+CANDLE_KEYS = ('price_candlesticks', 'candlesticks', 'price_candles')
+CANDLE_FIELDS = ('time', 'open', 'high', 'low', 'close', 'volume')
+
+MODELS = (1, 2, 3)
+
+
+class LiquidationHeatmap:
+    """
+    Liquidation heatmap as a sparse (price level x time) matrix.
+    
+    Cells are kept in coordinate form and converted to a dense array or CSR
+    arrays on demand (both cached). Price-profile queries use prefix sums,
+    so cumulative liquidation above or below a price is a binary search.
+    
+    Attributes:
+        prices: Price level of each row, ascending
+        times: Epoch-millisecond timestamp of each column
+        rows: Row index of each non-empty cell
+        cols: Column index of each non-empty cell
+        values: Liquidation value of each non-empty cell
+        candles: Price candles as columnar arrays (time, open, high, low, close, volume)
+    """
+    
+    def __init__(
+        self,
+        prices: np.ndarray,
+        times: np.ndarray,
+        rows: np.ndarray,
+        cols: np.ndarray,
+        values: np.ndarray,
+        candles: Optional[Dict[str, np.ndarray]] = None
+    ):
+        self.prices = prices
+        self.times = times
+        self.rows = rows
+        self.cols = cols
+        self.values = values
+        self.candles = candles or {field: np.empty(0) for field in CANDLE_FIELDS}
+        self._dense: Optional[np.ndarray] = None
+        self._csr: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        self._prefix: Optional[np.ndarray] = None
+    
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """(number of price levels, number of timestamps)."""
+        return len(self.prices), len(self.times)
+    
+    @property
+    def nnz(self) -> int:
+        """Number of non-empty cells."""
+        return len(self.values)
+    
+    def __repr__(self):
+        return (
+            f"LiquidationHeatmap({len(self.prices)} prices x {len(self.times)} times, "
+            f"{self.nnz} cells)"
+        )
+    
+    def dense(self) -> np.ndarray:
+        """Get the full (price x time) matrix; empty cells are 0."""
+        if self._dense is None:
+            matrix = np.zeros(self.shape)
+            np.add.at(matrix, (self.rows, self.cols), self.values)
+            self._dense = matrix
+        return self._dense
+    
+    def csr(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the matrix in compressed sparse row form.
+        
+        Returns:
+            Tuple of (indptr, indices, data) with rows as price levels, the
+            same layout scipy.sparse.csr_matrix accepts
+        """
+        if self._csr is None:
+            order = np.lexsort((self.cols, self.rows))
+            counts = np.bincount(self.rows, minlength=len(self.prices))
+            indptr = np.concatenate([[0], np.cumsum(counts)])
+            self._csr = (indptr, self.cols[order], self.values[order])
+        return self._csr
+    
+    def to_scipy(self) -> Any:
+        """
+        Convert to a scipy.sparse.csr_matrix.
+        
+        Requires scipy to be installed.
+        """
+        from scipy.sparse import csr_matrix
+        indptr, indices, data = self.csr()
+        return csr_matrix((data, indices, indptr), shape=self.shape)
+    
+    def profile(self, start: Optional[int] = None, end: Optional[int] = None) -> np.ndarray:
+        """
+        Total liquidation per price level over a time range.
+        
+        Args:
+            start: Inclusive start timestamp in milliseconds
+            end: Inclusive end timestamp in milliseconds
+        
+        Returns:
+            Array aligned with self.prices
+        """
+        rows, values = self.rows, self.values
+        if start is not None or end is not None:
+            lo = 0 if start is None else np.searchsorted(self.times, start, side='left')
+            hi = len(self.times) if end is None else np.searchsorted(self.times, end, side='right')
+            mask = (self.cols >= lo) & (self.cols < hi)
+            rows, values = rows[mask], values[mask]
+        return np.bincount(rows, weights=values, minlength=len(self.prices))
+    
+    def column(self, timestamp: int) -> np.ndarray:
+        """Liquidation per price level at the last column at or before a timestamp."""
+        col = int(np.searchsorted(self.times, timestamp, side='right')) - 1
+        if col < 0:
+            return np.zeros(len(self.prices))
+        mask = self.cols == col
+        return np.bincount(self.rows[mask], weights=self.values[mask], minlength=len(self.prices))
+    
+    def cumulative_below(self, price: float) -> float:
+        """Total liquidation at price levels strictly below a price (all times)."""
+        prefix = self._profile_prefix()
+        return float(prefix[np.searchsorted(self.prices, price, side='left')])
+    
+    def cumulative_above(self, price: float) -> float:
+        """Total liquidation at price levels at or above a price (all times)."""
+        prefix = self._profile_prefix()
+        return float(prefix[-1] - prefix[np.searchsorted(self.prices, price, side='left')])
+    
+    def cumulative_between(self, low: float, high: float) -> float:
+        """Total liquidation at price levels in [low, high] (all times)."""
+        prefix = self._profile_prefix()
+        lo = np.searchsorted(self.prices, low, side='left')
+        hi = np.searchsorted(self.prices, high, side='right')
+        return float(prefix[hi] - prefix[lo]) if hi > lo else 0.0
+    
+    def _profile_prefix(self) -> np.ndarray:
+        """Prefix sums of the all-time price profile (length = levels + 1)."""
+        if self._prefix is None:
+            self._prefix = np.concatenate([[0.0], np.cumsum(self.profile())])
+        return self._prefix
+
+
+def decode_heatmap(payload: Dict[str, Any]) -> LiquidationHeatmap:
+    """
+    Decode a heatmap model 1/2/3 (or aggregated heatmap) payload.
+    
+    Cells are ``[x, y, value]`` triplets where y indexes the price axis and x
+    indexes the candles (or is a timestamp when no candles are included).
+    Price levels are sorted ascending; duplicate cells are summed.
+    
+    Args:
+        payload: Response of heatmap.get_modelN or aggregated_heatmap.get_modelN
+    
+    Returns:
+        LiquidationHeatmap
+    """
+    payload = payload or {}
+    raw_prices = _first(payload, PRICE_AXIS_KEYS) or []
+    cells = _first(payload, CELL_KEYS) or []
+    candles = _decode_candles(_first(payload, CANDLE_KEYS) or [])
+    
+    prices = np.array([float(p) for p in raw_prices], dtype=np.float64)
+    cells = np.array(
+        [
+            (float(c[0]), float(c[1]), float(c[2]))
+            for c in cells
+            if len(c) >= 3 and c[2] not in (None, '')
+        ],
+        dtype=np.float64,
+    ).reshape(-1, 3)
+    x, y, values = cells[:, 0], cells[:, 1].astype(np.intp), cells[:, 2]
+    
+    if len(candles['time']):
+        times = candles['time'].astype(np.int64)
+        cols = x.astype(np.intp)
+    else:
+        # No candles: x holds timestamps
+        stamps = np.array([parse_time(v) for v in x], dtype=np.int64)
+        times, cols = np.unique(stamps, return_inverse=True)
+    
+    keep = (y >= 0) & (y < len(prices)) & (cols >= 0) & (cols < len(times)) & ~np.isnan(values)
+    y, cols, values = y[keep], cols[keep], values[keep]
+    
+    # Sort the price axis ascending and remap row indices
+    order = np.argsort(prices, kind='stable')
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return LiquidationHeatmap(prices[order], times, rank[y], cols.astype(np.intp), values, candles)
+
+
+def fetch_heatmap(
+    api: Any,
+    symbol: str,
+    model: int = 1,
+    exchange: Optional[str] = None
+) -> LiquidationHeatmap:
+    """
+    Fetch and decode a liquidation heatmap.
+    
+    Min Plan Level: 4
+    
+    Args:
+        api: CoinGlass instance
+        symbol: Pair symbol (e.g., 'BTCUSDT') with an exchange, or coin
+            (e.g., 'BTC') for the aggregated heatmap
+        model: Heatmap model: 1, 2 or 3
+        exchange: Exchange name; the aggregated heatmap is used when omitted
+    
+    Returns:
+        LiquidationHeatmap
+    """
+    if model not in MODELS:
+        raise ValueError(f"Unknown heatmap model: {model}")
+    liquidation = api.futures.liquidation
+    if exchange is None:
+        payload = getattr(liquidation.aggregated_heatmap, f'get_model{model}')(symbol)
+    else:
+        payload = getattr(liquidation.heatmap, f'get_model{model}')(exchange, symbol)
+    return decode_heatmap(payload)
+
+
+def _first(payload: Dict[str, Any], keys: Tuple[str, ...]) -> Any:
+    """Get the value of the first present key."""
+    for key in keys:
+        if key in payload:
+            return payload[key]
+    return None
+
+
+def _decode_candles(candles: List[Any]) -> Dict[str, np.ndarray]:
+    """Decode candles given as [time, open, high, low, close, volume] lists or dicts."""
+    columns: Dict[str, List[float]] = {field: [] for field in CANDLE_FIELDS}
+    for candle in candles:
+        if isinstance(candle, dict):
+            candle = [candle.get(field) for field in CANDLE_FIELDS]
+        for field, value in zip(CANDLE_FIELDS, list(candle) + [None] * len(CANDLE_FIELDS)):
+            if field == 'time':
+                columns[field].append(parse_time(value))
+            else:
+                columns[field].append(np.nan if value in (None, '') else float(value))
+    decoded = {field: np.array(values, dtype=np.float64) for field, values in columns.items()}
+    decoded['time'] = np.array(columns['time'], dtype=np.int64)
+    return decoded
@@ -0,0 +1,534 @@
+"""
+Local technical indicators over (symbol x time) price arrays
+RSI, EMA/SMA, ATR, Bollinger bands and MACD with O(1) incremental updates per bar
+"""
+import copy
+from typing import Optional, List, Dict, Any, Iterable, Tuple
+
+import numpy as np
+
+from ..fanout import api_rate_limiter, run_concurrently
+from ._series import rows_to_columns, union_index, reindex
+
+OHLC = ('open', 'high', 'low', 'close')
+OHLC_FIELDS = {name: (name,) for name in OHLC}
+
+Pair = Tuple[str, str]
+
+
+class _Smoother:
+    """
+    Recursive moving average over a vector of series.
+    
+    Each series is seeded with the mean of its first ``period`` valid values;
+    afterwards ``state += alpha * (x - state)``. NaN inputs leave the state
+    unchanged and produce NaN.
+    """
+    
+    def __init__(self, period: int, alpha: float):
+        self.period = period
+        self.alpha = alpha
+        self.state: Optional[np.ndarray] = None
+        self._count: Optional[np.ndarray] = None
+        self._sum: Optional[np.ndarray] = None
+    
+    def update(self, x: np.ndarray) -> np.ndarray:
+        if self.state is None:
+            self.state = np.full(x.shape, np.nan)
+            self._count = np.zeros(x.shape, dtype=np.int64)
+            self._sum = np.zeros(x.shape)
+        valid = ~np.isnan(x)
+        seeding = valid & (self._count < self.period)
+        self._count[seeding] += 1
+        self._sum[seeding] += x[seeding]
+        seeded = seeding & (self._count == self.period)
+        self.state[seeded] = self._sum[seeded] / self.period
+        running = valid & ~seeding
+        self.state[running] += self.alpha * (x[running] - self.state[running])
+        return np.where(valid, self.state, np.nan)
+    
+    def checkpoint(self) -> Any:
+        """State needed to undo the next update (None before the first one)."""
+        if self.state is None:
+            return None
+        return self.state.copy(), self._count.copy(), self._sum.copy()
+    
+    def restore(self, checkpoint: Any):
+        """Roll back to a checkpoint()."""
+        if checkpoint is None:
+            self.state = self._count = self._sum = None
+        else:
+            self.state, self._count, self._sum = (values.copy() for values in checkpoint)
+
+
+class _Window:
+    """
+    Fixed-length ring buffer of the last ``period`` values of a vector of series.
+    
+    NaN inputs are stored as gaps; a series reports NaN until its window
+    holds ``period`` valid values.
+    """
+    
+    def __init__(self, period: int):
+        self.period = period
+        self.count = 0
+        self.buffer: Optional[np.ndarray] = None
+        self.valid: Optional[np.ndarray] = None
+        self.sum: Optional[np.ndarray] = None
+        self.sum_sq: Optional[np.ndarray] = None
+        self.n_valid: Optional[np.ndarray] = None
+    
+    def update(self, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Push a value and return the (mean, population variance) of the window."""
+        if self.buffer is None:
+            self.buffer = np.zeros((self.period,) + x.shape)
+            self.valid = np.zeros((self.period,) + x.shape, dtype=bool)
+            self.sum = np.zeros(x.shape)
+            self.sum_sq = np.zeros(x.shape)
+            self.n_valid = np.zeros(x.shape, dtype=np.int64)
+        slot = self.count % self.period
+        valid = ~np.isnan(x)
+        value = np.where(valid, x, 0.0)
+        old = self.buffer[slot]
+        self.sum += value - old
+        self.sum_sq += value * value - old * old
+        self.n_valid += valid.astype(np.int64) - self.valid[slot]
+        self.buffer[slot] = value
+        self.valid[slot] = valid
+        self.count += 1
+        full = self.n_valid == self.period
+        mean = np.where(full, self.sum / self.period, np.nan)
+        variance = np.where(full, np.maximum(self.sum_sq / self.period - mean * mean, 0.0), np.nan)
+        return mean, variance
+    
+    def checkpoint(self) -> Any:
+        """State needed to undo the next update: the slot it overwrites and the running sums."""
+        if self.buffer is None:
+            return None
+        slot = self.count % self.period
+        return (
+            self.count, self.buffer[slot].copy(), self.valid[slot].copy(),
+            self.sum.copy(), self.sum_sq.copy(), self.n_valid.copy(),
+        )
+    
+    def restore(self, checkpoint: Any):
+        """Roll back to a checkpoint()."""
+        if checkpoint is None:
+            self.count = 0
+            self.buffer = self.valid = self.sum = self.sum_sq = self.n_valid = None
+            return
+        self.count, value, valid, total, total_sq, n_valid = checkpoint
+        slot = self.count % self.period
+        self.buffer[slot] = value
+        self.valid[slot] = valid
+        self.sum, self.sum_sq, self.n_valid = total.copy(), total_sq.copy(), n_valid.copy()
+
+
+class Indicator:
+    """
+    Base class for indicators.
+    
+    ``update`` consumes one bar (1-D arrays, one value per symbol) in O(1)
+    per symbol; ``batch`` runs a full (symbol x time) history and leaves the
+    state ready for further updates. ``checkpoint``/``restore`` undo the next
+    update: _Smoother and _Window attributes save only what it overwrites,
+    other attributes are kept by reference, so subclasses must replace
+    (not modify in place) any other array state.
+    """
+    
+    def outputs(self) -> List[str]:
+        """Names of the produced series."""
+        raise NotImplementedError
+    
+    def update(self, bar: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Consume one bar and return the latest values."""
+        raise NotImplementedError
+    
+    def batch(self, data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Compute over (symbol x time) arrays."""
+        steps = data['close'].shape[1]
+        out = {name: np.full(data['close'].shape, np.nan) for name in self.outputs()}
+        for t in range(steps):
+            values = self.update({field: column[:, t] for field, column in data.items()})
+            for name, value in values.items():
+                out[name][:, t] = value
+        return out
+    
+    def checkpoint(self) -> Dict[str, Any]:
+        """State needed to undo the next update(), O(1) per symbol."""
+        return {
+            name: value.checkpoint() if isinstance(value, (_Smoother, _Window)) else value
+            for name, value in vars(self).items()
+        }
+    
+    def restore(self, checkpoint: Dict[str, Any]):
+        """Roll back to a checkpoint()."""
+        for name, saved in checkpoint.items():
+            current = getattr(self, name)
+            if isinstance(current, (_Smoother, _Window)):
+                current.restore(saved)
+            else:
+                setattr(self, name, saved)
+
+
+class SMA(Indicator):
+    """Simple moving average."""
+    
+    def __init__(self, period: int = 20, field: str = 'close'):
+        self.period = period
+        self.field = field
+        self._window = _Window(period)
+    
+    def outputs(self) -> List[str]:
+        return [f'sma_{self.period}']
+    
+    def update(self, bar: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        mean, _ = self._window.update(bar[self.field])
+        return {f'sma_{self.period}': mean}
+    
+    def batch(self, data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        x = data[self.field]
+        out = _rolling_mean(x, self.period)
+        for t in range(max(0, x.shape[1] - self.period), x.shape[1]):
+            self._window.update(x[:, t])
+        return {f'sma_{self.period}': out}
+
+
+class EMA(Indicator):
+    """Exponential moving average (alpha = 2 / (period + 1)), seeded with the SMA."""
+    
+    def __init__(self, period: int = 20, field: str = 'close'):
+        self.period = period
+        self.field = field
+        self._smoother = _Smoother(period, 2.0 / (period + 1))
+    
+    def outputs(self) -> List[str]:
+        return [f'ema_{self.period}']
+    
+    def update(self, bar: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        return {f'ema_{self.period}': self._smoother.update(bar[self.field])}
+
+
+class RSI(Indicator):
+    """Relative strength index with Wilder smoothing."""
+    
+    def __init__(self, period: int = 14, field: str = 'close'):
+        self.period = period
+        self.field = field
+        self._gain = _Smoother(period, 1.0 / period)
+        self._loss = _Smoother(period, 1.0 / period)
+        self._previous: Optional[np.ndarray] = None
+    
+    def outputs(self) -> List[str]:
+        return [f'rsi_{self.period}']
+    
+    def update(self, bar: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        close = bar[self.field]
+        previous = self._previous if self._previous is not None else np.full(close.shape, np.nan)
+        change = close - previous
+        self._previous = np.where(np.isnan(close), previous, close)
+        gain = self._gain.update(np.where(np.isnan(change), np.nan, np.maximum(change, 0.0)))
+        loss = self._loss.update(np.where(np.isnan(change), np.nan, np.maximum(-change, 0.0)))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rsi = np.where(
+                loss == 0, np.where(gain == 0, 50.0, 100.0), 100 - 100 / (1 + gain / loss)
+            )
+        return {f'rsi_{self.period}': np.where(np.isnan(gain) | np.isnan(loss), np.nan, rsi)}
+
+
+class ATR(Indicator):
+    """Average true range with Wilder smoothing."""
+    
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._smoother = _Smoother(period, 1.0 / period)
+        self._previous: Optional[np.ndarray] = None
+    
+    def outputs(self) -> List[str]:
+        return [f'atr_{self.period}']
+    
+    def update(self, bar: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        high, low, close = bar['high'], bar['low'], bar['close']
+        previous = self._previous if self._previous is not None else close
+        previous = np.where(np.isnan(previous), close, previous)
+        true_range = np.fmax(high - low, np.fmax(np.abs(high - previous), np.abs(low - previous)))
+        true_range = np.where(np.isnan(high) | np.isnan(low) | np.isnan(close), np.nan, true_range)
+        self._previous = np.where(np.isnan(close), previous, close)
+        return {f'atr_{self.period}': self._smoother.update(true_range)}
+
+
+class Bollinger(Indicator):
+    """Bollinger bands: SMA plus/minus k population standard deviations."""
+    
+    def __init__(self, period: int = 20, k: float = 2.0, field: str = 'close'):
+        self.period = period
+        self.k = k
+        self.field = field
+        self._window = _Window(period)
+    
+    def outputs(self) -> List[str]:
+        n = self.period
+        return [f'bb_mid_{n}', f'bb_upper_{n}', f'bb_lower_{n}', f'bb_width_{n}']
+    
+    def update(self, bar: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        mean, variance = self._window.update(bar[self.field])
+        return self._bands(mean, variance)
+    
+    def batch(self, data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        x = data[self.field]
+        mean = _rolling_mean(x, self.period)
+        variance = np.maximum(_rolling_mean(x * x, self.period) - mean * mean, 0.0)
+        for t in range(max(0, x.shape[1] - self.period), x.shape[1]):
+            self._window.update(x[:, t])
+        return self._bands(mean, variance)
+    
+    def _bands(self, mean: np.ndarray, variance: np.ndarray) -> Dict[str, np.ndarray]:
+        n = self.period
+        band = self.k * np.sqrt(variance)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            width = 2 * band / mean
+        return {
+            f'bb_mid_{n}': mean,
+            f'bb_upper_{n}': mean + band,
+            f'bb_lower_{n}': mean - band,
+            f'bb_width_{n}': width,
+        }
+
+
+class MACD(Indicator):
+    """Moving average convergence divergence: EMA(fast) - EMA(slow) with a signal EMA."""
+    
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9, field: str = 'close'):
+        self.field = field
+        self._fast = _Smoother(fast, 2.0 / (fast + 1))
+        self._slow = _Smoother(slow, 2.0 / (slow + 1))
+        self._signal = _Smoother(signal, 2.0 / (signal + 1))
+    
+    def outputs(self) -> List[str]:
+        return ['macd', 'macd_signal', 'macd_hist']
+    
+    def update(self, bar: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        x = bar[self.field]
+        macd = self._fast.update(x) - self._slow.update(x)
+        signal = self._signal.update(macd)
+        return {'macd': macd, 'macd_signal': signal, 'macd_hist': macd - signal}
+
+
+def default_indicators() -> List[Indicator]:
+    """RSI(14), EMA(20), SMA(50), ATR(14), Bollinger(20, 2) and MACD(12, 26, 9)."""
+    return [RSI(14), EMA(20), SMA(50), ATR(14), Bollinger(20, 2.0), MACD(12, 26, 9)]
+
+
+class IndicatorEngine:
+    """
+    Compute indicators locally for many symbols from price history.
+    
+    OHLC histories are fetched concurrently and aligned into (symbol x time)
+    arrays; every indicator is computed across all symbols at once.
+    update() refetches the last loaded bar, which may still have been
+    forming, rolls the indicators back to their state before it, and
+    advances them in O(1) per symbol per bar over the refetched and newer
+    bars. Works on any plan level, unlike rsi.get_list.
+    
+    Example:
+        >>> engine = IndicatorEngine(cg, interval='1h', indicators=[RSI(14), RSI(6), MACD()])
+        >>> engine.load([('Binance', 'BTCUSDT'), ('Binance', 'ETHUSDT')], limit=500)
+        >>> engine.values['rsi_14'][:, -1]
+        >>> engine.update()
+    """
+    
+    MARKETS = ('futures', 'spot')
+    
+    def __init__(
+        self,
+        api: Any,
+        interval: str = '1h',
+        indicators: Optional[Iterable[Indicator]] = None,
+        market: str = 'futures'
+    ):
+        """
+        Initialize engine.
+        
+        Args:
+            api: CoinGlass instance
+            interval: Candlestick interval
+            indicators: Indicator instances (default: default_indicators())
+            market: 'futures' or 'spot' price history
+        """
+        if market not in self.MARKETS:
+            raise ValueError(f"Unknown market: {market}")
+        self.api = api
+        self.interval = interval
+        self.market = market
+        self.indicators = list(indicators) if indicators is not None else default_indicators()
+        # Unused copies restored by every load()
+        self._initial = copy.deepcopy(self.indicators)
+        self.pairs: List[Pair] = []
+        self.times = np.empty(0, dtype=np.int64)
+        self.ohlc: Dict[str, np.ndarray] = {}
+        self.values: Dict[str, np.ndarray] = {}
+        self.errors: Dict[Any, Exception] = {}
+        self._before_last: Optional[List[Dict[str, Any]]] = None
+    
+    def load(self, pairs: Iterable[Pair], **kwargs) -> Dict[str, np.ndarray]:
+        """
+        Fetch price history for every pair and compute all indicators.
+        
+        Args:
+            pairs: (exchange, symbol) pairs
+            **kwargs: Optional parameters for each history call:
+                - startTime (int): Start timestamp in milliseconds
+                - endTime (int): End timestamp in milliseconds
+                - limit (int): Number of results (max: 1000)
+        
+        Returns:
+            Indicator name to (symbol x time) array
+        """
+        self.pairs = list(pairs)
+        self.indicators = copy.deepcopy(self._initial)
+        times, ohlc = self._fetch(kwargs)
+        # The last bar is pushed separately so its state can be rolled back by update()
+        self.times = times[:-1]
+        self.ohlc = {field: values[:, :-1] for field, values in ohlc.items()}
+        self.values = compute_indicators(self.ohlc, self.indicators)
+        self._before_last = None
+        if len(times):
+            self.push({field: values[:, -1] for field, values in ohlc.items()}, times[-1])
+        return self.values
+    
+    def update(self, **kwargs) -> np.ndarray:
+        """
+        Refetch the last loaded bar, overwrite it and advance every indicator over newer bars.
+        
+        Args:
+            **kwargs: Optional parameters for each history call (e.g., limit)
+        
+        Returns:
+            Timestamps that were written (the overwritten bar first, if refetched)
+        """
+        if len(self.times):
+            kwargs.setdefault('startTime', int(self.times[-1]))
+        times, ohlc = self._fetch(kwargs, previous=self.ohlc)
+        if len(self.times):
+            keep = times >= self.times[-1]
+            times = times[keep]
+            ohlc = {field: values[:, keep] for field, values in ohlc.items()}
+            if len(times) and times[0] == self.times[-1]:
+                self._drop_last()
+        for t in range(len(times)):
+            bar = {field: values[:, t] for field, values in ohlc.items()}
+            if t == len(times) - 1:
+                self.push(bar, times[t])
+            else:
+                self._advance(bar, times[t])
+        return times
+    
+    def push(self, bar: Dict[str, np.ndarray], time: int) -> Dict[str, np.ndarray]:
+        """
+        Append one bar given as 1-D arrays (one value per pair) and update indicators.
+        
+        Args:
+            bar: Field name ('open', 'high', 'low', 'close') to values
+            time: Bar timestamp in milliseconds
+        
+        Returns:
+            Latest indicator values
+        """
+        self._before_last = [indicator.checkpoint() for indicator in self.indicators]
+        return self._advance(bar, time)
+    
+    def _advance(self, bar: Dict[str, np.ndarray], time: int) -> Dict[str, np.ndarray]:
+        """Append one bar and update indicators without keeping their previous state."""
+        latest = {}
+        for indicator in self.indicators:
+            latest.update(indicator.update(bar))
+        self.times = np.append(self.times, time)
+        for field in OHLC:
+            self.ohlc[field] = np.hstack([self.ohlc[field], bar[field][:, None]])
+        for name, value in latest.items():
+            self.values[name] = np.hstack([self.values[name], value[:, None]])
+        return latest
+    
+    def _drop_last(self):
+        """Remove the last bar and restore every indicator's state from before it."""
+        for indicator, checkpoint in zip(self.indicators, self._before_last):
+            indicator.restore(checkpoint)
+        self._before_last = None
+        self.times = self.times[:-1]
+        self.ohlc = {field: values[:, :-1] for field, values in self.ohlc.items()}
+        self.values = {name: values[:, :-1] for name, values in self.values.items()}
+    
+    def _fetch(
+        self,
+        kwargs: Dict[str, Any],
+        previous: Optional[Dict[str, np.ndarray]] = None
+    ) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Fetch OHLC for every pair concurrently and align it (forward-filled)."""
+        price = getattr(self.api, self.market).price
+        
+        def fetch(exchange, symbol):
+            rows = price.get_history(
+                symbol=symbol, interval=self.interval, exchange=exchange, **kwargs
+            )
+            return rows_to_columns(rows, OHLC_FIELDS)
+        
+        calls = [(pair, pair, {}) for pair in self.pairs]
+        results, self.errors = run_concurrently(
+            fetch, calls, rate_limiter=api_rate_limiter(self.api)
+        )
+        index = union_index(times for times, _ in results.values())
+        ohlc = {field: np.full((len(self.pairs), len(index)), np.nan) for field in OHLC}
+        for row, pair in enumerate(self.pairs):
+            if pair not in results:
+                continue
+            times, columns = results[pair]
+            for field in OHLC:
+                ohlc[field][row] = reindex(times, columns[field], index, 'ffill')
+        if previous and previous['close'].shape[1]:
+            # Carry the last known bar into leading gaps of the new block
+            for field in OHLC:
+                ohlc[field] = np.where(np.isnan(ohlc[field]), previous[field][:, -1:], ohlc[field])
+        return index, ohlc
+
+
+def compute_indicators(
+    ohlc: Dict[str, np.ndarray],
+    indicators: Optional[Iterable[Indicator]] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Compute indicators over (symbol x time) OHLC arrays.
+    
+    Args:
+        ohlc: Field name ('open', 'high', 'low', 'close') to (symbol x time) arrays
+        indicators: Indicator instances (default: default_indicators()); they
+            keep their state for later update() calls
+    
+    Returns:
+        Indicator name to (symbol x time) array
+    """
+    indicators = default_indicators() if indicators is None else indicators
+    data = {field: np.asarray(values, dtype=np.float64) for field, values in ohlc.items()}
+    values = {}
+    for indicator in indicators:
+        values.update(indicator.batch(data))
+    return values
+
+
+def _rolling_mean(x: np.ndarray, period: int) -> np.ndarray:
+    """Trailing mean over the last axis via cumulative sums (NaN unless the window is all valid)."""
+    out = np.full(x.shape, np.nan)
+    if x.shape[-1] < period:
+        return out
+    valid = ~np.isnan(x)
+    sums = _window_sums(np.where(valid, x, 0.0), period)
+    counts = _window_sums(valid.astype(np.float64), period)
+    out[..., period - 1:] = np.where(counts == period, sums / period, np.nan)
+    return out
+
+
+def _window_sums(x: np.ndarray, period: int) -> np.ndarray:
+    """Sums of every complete trailing window along the last axis."""
+    cumsum = np.cumsum(x, axis=-1)
+    window = cumsum[..., period - 1:].copy()
+    window[..., 1:] -= cumsum[..., :-period]
+    return window
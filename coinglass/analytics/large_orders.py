@@ -0,0 +1,370 @@
+"""
+Large limit order tracker
+Diffs successive large-order snapshots into lifecycle events, indexed by side and price
+"""
+import time
+import bisect
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple, Hashable
+
+from ..endpoints import EndpointRegistry
+from ..fanout import api_rate_limiter, run_concurrently
+from ..polling import DEFAULT_POLL_INTERVAL
+
+PLACED = 'placed'
+PARTIAL = 'partially_filled'
+FILLED = 'filled'
+CANCELLED = 'cancelled'
+
+BID = 'bid'
+ASK = 'ask'
+
+# Raw order_side values: 1 is an ask (sell wall), 2 a bid (buy wall)
+_SIDES = {1: ASK, '1': ASK, 'ask': ASK, 'sell': ASK, 2: BID, '2': BID, 'bid': BID, 'buy': BID}
+# Raw order_state values: 2 filled, 3 cancelled
+_STATES = {2: FILLED, '2': FILLED, 3: CANCELLED, '3': CANCELLED}
+
+# Remaining fraction below which a vanished order counts as filled
+DEFAULT_FILL_TOLERANCE = 0.05
+
+
+def order_key(order: Dict[str, Any]) -> Hashable:
+    """Identity of a large order: its id, or (side, price, start time) without one."""
+    order_id = order.get('id', order.get('order_id'))
+    if order_id is not None:
+        return order_id
+    return (order.get('order_side'), _float(order.get('price')), order.get('start_time'))
+
+
+class LargeOrderBook:
+    """
+    Resting large orders of one market, indexed by side and price.
+    
+    Each side keeps a price-sorted list, so walls within a price band are a
+    pair of binary searches. apply() diffs a new snapshot against the
+    current state and returns lifecycle events.
+    
+    Attributes:
+        orders: Current orders by identity
+    """
+    
+    def __init__(self, fill_tolerance: float = DEFAULT_FILL_TOLERANCE):
+        """
+        Initialize an empty book.
+        
+        Args:
+            fill_tolerance: Remaining fraction of the start quantity below which
+                an order that disappears is reported as filled rather than cancelled
+        """
+        self.fill_tolerance = fill_tolerance
+        self.orders: Dict[Hashable, Dict[str, Any]] = {}
+        self._index: Dict[str, List[Tuple[float, Any]]] = {BID: [], ASK: []}
+        self._index_keys: Dict[Hashable, Tuple[str, Tuple[float, Any]]] = {}
+    
+    def __len__(self) -> int:
+        return len(self.orders)
+    
+    def apply(
+        self, snapshot: Iterable[Dict[str, Any]], now: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Replace the state with a new snapshot and report what changed.
+        
+        Args:
+            snapshot: Current large orders (get_large_limit_order response)
+            now: Event time in milliseconds for vanished orders (default: wall clock)
+        
+        Returns:
+            Events, each a dict with 'event', 'key', 'side', 'price' and 'order'
+            (the latest known order); partial fills also carry 'filled_quantity'
+        """
+        now = int(time.time() * 1000) if now is None else now
+        events = []
+        current = {}
+        for order in snapshot or []:
+            key = order_key(order)
+            current[key] = order
+            previous = self.orders.get(key)
+            state = _STATES.get(order.get('order_state'))
+            if state is not None:
+                if previous is not None:
+                    events.append(_event(state, key, order, now))
+                    self._remove(key)
+                continue
+            if previous is None:
+                events.append(_event(PLACED, key, order, now))
+                self._add(key, order)
+                continue
+            before = _remaining(previous)
+            after = _remaining(order)
+            if after < before:
+                event = _event(PARTIAL, key, order, now)
+                event['filled_quantity'] = before - after
+                events.append(event)
+            self.orders[key] = order
+        
+        for key in [key for key in self.orders if key not in current]:
+            order = self.orders[key]
+            start = _float(order.get('start_quantity'))
+            remaining = _remaining(order)
+            filled = start > 0 and remaining <= start * self.fill_tolerance
+            events.append(_event(FILLED if filled else CANCELLED, key, order, now))
+            self._remove(key)
+        return events
+    
+    def walls(self, side: str, low: float, high: float) -> List[Dict[str, Any]]:
+        """
+        Orders on one side with price in [low, high], ascending by price.
+        
+        Args:
+            side: 'bid' or 'ask'
+            low: Lower price bound
+            high: Upper price bound
+        
+        Returns:
+            List of orders
+        """
+        index = self._index[side]
+        lo = bisect.bisect_left(index, (low,))
+        hi = bisect.bisect_right(index, (high, _Top()))
+        return [self.orders[entry[1].key] for entry in index[lo:hi]]
+    
+    def walls_near(
+        self, pct: float, mid: Optional[float] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Orders within a percent distance of a reference price.
+        
+        Args:
+            pct: Distance in percent (e.g., 1.0 for +/-1%)
+            mid: Reference price; the midpoint of the innermost bid and ask walls when omitted
+        
+        Returns:
+            Dict with 'bid' and 'ask' order lists
+        """
+        if mid is None:
+            mid = self.mid()
+            if mid is None:
+                return {BID: [], ASK: []}
+        band = mid * pct / 100
+        return {BID: self.walls(BID, mid - band, mid), ASK: self.walls(ASK, mid, mid + band)}
+    
+    def mid(self) -> Optional[float]:
+        """Midpoint between the highest bid wall and the lowest ask wall."""
+        bids, asks = self._index[BID], self._index[ASK]
+        if not bids or not asks:
+            return None
+        return (bids[-1][0] + asks[0][0]) / 2
+    
+    def _add(self, key: Hashable, order: Dict[str, Any]):
+        self.orders[key] = order
+        side = _SIDES.get(order.get('order_side'))
+        if side is None:
+            return
+        entry = (_float(order.get('price')), _Sortable(key))
+        bisect.insort(self._index[side], entry)
+        self._index_keys[key] = (side, entry)
+    
+    def _remove(self, key: Hashable):
+        self.orders.pop(key, None)
+        located = self._index_keys.pop(key, None)
+        if located is None:
+            return
+        side, entry = located
+        index = self._index[side]
+        pos = bisect.bisect_left(index, entry)
+        if pos < len(index) and index[pos][1].key == key:
+            del index[pos]
+
+
+class LargeOrderTracker:
+    """
+    Track large limit orders for many (exchange, symbol) markets.
+    
+    Each poll fetches the current large orders of every market concurrently
+    (paced by the plan-level limiter, see api_rate_limiter) and diffs them
+    against the per-market LargeOrderBook. Iteration polls every interval
+    seconds, by default the endpoint's 10-second cache time, since polling
+    faster only refetches the same snapshot.
+    
+    Example:
+        >>> tracker = LargeOrderTracker(cg, [('Binance', 'BTCUSDT'), ('OKX', 'BTC-USDT-SWAP')])
+        >>> for event in tracker:
+        ...     print(event['exchange'], event['event'], event['side'], event['price'])
+        >>> tracker.walls_near('Binance', 'BTCUSDT', pct=1.0, mid=65000)
+    """
+    
+    MARKETS = ('futures', 'spot')
+    
+    def __init__(
+        self,
+        api: Any,
+        pairs: Iterable[Tuple[str, str]],
+        market: str = 'futures',
+        interval: Optional[float] = None,
+        fill_tolerance: float = DEFAULT_FILL_TOLERANCE,
+        max_errors: int = 3
+    ):
+        """
+        Initialize tracker.
+        
+        Args:
+            api: CoinGlass instance
+            pairs: (exchange, symbol) markets to track
+            market: 'futures' or 'spot'
+            interval: Poll period in seconds (default: the endpoint's cache time)
+            fill_tolerance: See LargeOrderBook
+            max_errors: Consecutive failed polls of all markets tolerated before raising
+        """
+        if market not in self.MARKETS:
+            raise ValueError(f"Unknown market: {market}")
+        self.api = api
+        self.market = market
+        self.pairs = list(pairs)
+        self.endpoint = f'{market}.orderbook.get_large_limit_order'
+        self.interval = (
+            interval or EndpointRegistry.get_cache_seconds(self.endpoint) or DEFAULT_POLL_INTERVAL
+        )
+        self.max_errors = max_errors
+        self.books: Dict[Tuple[str, str], LargeOrderBook] = {
+            pair: LargeOrderBook(fill_tolerance) for pair in self.pairs
+        }
+        self.errors: Dict[Tuple[str, str], Exception] = {}
+        self._stopped = False
+    
+    def poll_once(self) -> List[Dict[str, Any]]:
+        """Fetch every market once and return the lifecycle events."""
+        orderbook = getattr(self.api, self.market).orderbook
+        calls = [(pair, (pair[1], pair[0]), {}) for pair in self.pairs]
+        results, self.errors = run_concurrently(
+            orderbook.get_large_limit_order, calls, rate_limiter=api_rate_limiter(self.api)
+        )
+        now = int(time.time() * 1000)
+        events = []
+        for pair in self.pairs:
+            if pair not in results:
+                continue
+            for event in self.books[pair].apply(results[pair], now):
+                event['exchange'], event['symbol'] = pair
+                events.append(event)
+        return events
+    
+    def stop(self):
+        """Stop iteration after the current poll."""
+        self._stopped = True
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Yield events until stopped."""
+        failures = 0
+        while not self._stopped:
+            events = self.poll_once()
+            if self.errors and len(self.errors) == len(self.pairs):
+                failures += 1
+                if failures > self.max_errors:
+                    raise next(iter(self.errors.values()))
+            else:
+                failures = 0
+            for event in events:
+                yield event
+            if not self._stopped:
+                time.sleep(self.interval)
+    
+    def walls_near(
+        self,
+        exchange: str,
+        symbol: str,
+        pct: float,
+        mid: Optional[float] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Orders of one market within pct percent of mid (see LargeOrderBook.walls_near)."""
+        return self.books[(exchange, symbol)].walls_near(pct, mid)
+    
+    def history_events(
+        self, exchange: str, symbol: str, interval: str = '1h', **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        Reconstruct lifecycle events from get_large_limit_order_history.
+        
+        Each historical order yields a 'placed' event at its start time and,
+        once closed, a 'filled' or 'cancelled' event at its last update.
+        
+        Args:
+            exchange: Exchange name (e.g., 'Binance')
+            symbol: Pair symbol (e.g., 'BTCUSDT')
+            interval: Interval (futures only)
+            **kwargs: startTime, endTime
+        
+        Returns:
+            Events sorted by time
+        """
+        orderbook = getattr(self.api, self.market).orderbook
+        if self.market == 'futures':
+            rows = orderbook.get_large_limit_order_history(symbol, exchange, interval, **kwargs)
+        else:
+            rows = orderbook.get_large_limit_order_history(symbol, exchange, **kwargs)
+        events = []
+        for order in rows or []:
+            key = order_key(order)
+            start = order.get('start_time')
+            events.append(dict(_event(PLACED, key, order, start), exchange=exchange, symbol=symbol))
+            state = _STATES.get(order.get('order_state'))
+            if state is not None:
+                end = order.get('current_time', start)
+                events.append(
+                    dict(_event(state, key, order, end), exchange=exchange, symbol=symbol)
+                )
+        events.sort(key=lambda event: event['time'] or 0)
+        return events
+
+
+def _event(event: str, key: Hashable, order: Dict[str, Any], when: Any) -> Dict[str, Any]:
+    """Build a lifecycle event."""
+    return {
+        'event': event,
+        'key': key,
+        'side': _SIDES.get(order.get('order_side')),
+        'price': _float(order.get('price')),
+        'time': when,
+        'order': order,
+    }
+
+
+class _Sortable:
+    """Wrap order identities of mixed types so index tuples stay comparable."""
+    
+    __slots__ = ('key',)
+    
+    def __init__(self, key: Hashable):
+        self.key = key
+    
+    def __lt__(self, other: Any) -> bool:
+        if isinstance(other, _Top):
+            return True
+        return repr(self.key) < repr(other.key)
+    
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, _Sortable) and self.key == other.key
+
+
+class _Top:
+    """Sentinel that sorts after every identity."""
+    
+    def __lt__(self, other: Any) -> bool:
+        return False
+    
+    def __gt__(self, other: Any) -> bool:
+        return True
+
+
+def _float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _remaining(order: Dict[str, Any]) -> float:
+    """Remaining quantity of an order."""
+    current = order.get('current_quantity')
+    if current is None:
+        return _float(order.get('start_quantity')) - _float(order.get('executed_volume'))
+    return _float(current)
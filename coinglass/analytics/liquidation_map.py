@@ -0,0 +1,229 @@
+"""
+Liquidation map level index
+Sorted price levels with per-leverage prefix sums for O(log n) range queries
+"""
+from typing import Optional, List, Dict, Any, Iterable, Tuple
+
+import numpy as np
+
+
+class LiquidationMapIndex:
+    """
+    Liquidation map clusters indexed by price level and leverage.
+    
+    Built once per refresh. Amounts are stored as a (price level x leverage)
+    array with prefix sums along the price axis, so any price-range total is
+    two binary searches and a subtraction.
+    
+    Levels below the reference price are liquidations of longs, levels above
+    are liquidations of shorts.
+    
+    Attributes:
+        prices: Price levels, ascending
+        leverages: Leverage buckets, ascending
+        amounts: Liquidation amount per (price level, leverage)
+    """
+    
+    def __init__(self, prices: np.ndarray, leverages: np.ndarray, amounts: np.ndarray):
+        self.prices = prices
+        self.leverages = leverages
+        self.amounts = amounts
+        self.level_totals = amounts.sum(axis=1)
+        zero = np.zeros((1, amounts.shape[1]))
+        self._prefix = np.concatenate([zero, np.cumsum(amounts, axis=0)])
+        self._total_prefix = self._prefix.sum(axis=1)
+    
+    def __len__(self) -> int:
+        return len(self.prices)
+    
+    def __repr__(self):
+        return f"LiquidationMapIndex({len(self.prices)} levels x {len(self.leverages)} leverages)"
+    
+    def range_sum(
+        self,
+        low: float,
+        high: float,
+        leverages: Optional[Iterable[float]] = None
+    ) -> float:
+        """
+        Total liquidation amount at price levels in [low, high].
+        
+        Args:
+            low: Lower price bound (inclusive)
+            high: Upper price bound (inclusive)
+            leverages: Optional leverage buckets to include (all when omitted)
+        
+        Returns:
+            Total amount
+        """
+        lo = int(np.searchsorted(self.prices, low, side='left'))
+        hi = int(np.searchsorted(self.prices, high, side='right'))
+        if hi <= lo:
+            return 0.0
+        if leverages is None:
+            return float(self._total_prefix[hi] - self._total_prefix[lo])
+        cols = self._leverage_columns(leverages)
+        return float((self._prefix[hi, cols] - self._prefix[lo, cols]).sum())
+    
+    def long_liquidations(self, low: float, high: float, price: float, **kwargs) -> float:
+        """Long liquidations in [low, high], i.e. levels below the reference price."""
+        return self.range_sum(low, min(high, np.nextafter(price, -np.inf)), **kwargs)
+    
+    def short_liquidations(self, low: float, high: float, price: float, **kwargs) -> float:
+        """Short liquidations in [low, high], i.e. levels above the reference price."""
+        return self.range_sum(max(low, np.nextafter(price, np.inf)), high, **kwargs)
+    
+    def nearest_above(self, price: float, min_amount: float = 0.0) -> Optional[Tuple[float, float]]:
+        """
+        First cluster strictly above a price.
+        
+        Args:
+            price: Reference price (e.g., spot)
+            min_amount: Minimum level total for a level to count as a cluster
+        
+        Returns:
+            (price level, amount) or None
+        """
+        start = int(np.searchsorted(self.prices, price, side='right'))
+        hits = np.flatnonzero(self.level_totals[start:] > min_amount)
+        if not len(hits):
+            return None
+        i = start + hits[0]
+        return float(self.prices[i]), float(self.level_totals[i])
+    
+    def nearest_below(self, price: float, min_amount: float = 0.0) -> Optional[Tuple[float, float]]:
+        """
+        First cluster strictly below a price.
+        
+        Args:
+            price: Reference price (e.g., spot)
+            min_amount: Minimum level total for a level to count as a cluster
+        
+        Returns:
+            (price level, amount) or None
+        """
+        end = int(np.searchsorted(self.prices, price, side='left'))
+        hits = np.flatnonzero(self.level_totals[:end] > min_amount)
+        if not len(hits):
+            return None
+        i = hits[-1]
+        return float(self.prices[i]), float(self.level_totals[i])
+    
+    def top_clusters(self, k: int = 10) -> List[Tuple[float, float]]:
+        """The k largest price levels as (price level, amount), largest first."""
+        if k <= 0 or not len(self.prices):
+            return []
+        k = min(k, len(self.prices))
+        idx = np.argpartition(-self.level_totals, k - 1)[:k]
+        idx = idx[np.argsort(-self.level_totals[idx], kind='stable')]
+        return [(float(self.prices[i]), float(self.level_totals[i])) for i in idx]
+    
+    def diff(self, previous: 'LiquidationMapIndex') -> Dict[str, Any]:
+        """
+        Compare with an earlier snapshot.
+        
+        Args:
+            previous: Index built from the earlier snapshot
+        
+        Returns:
+            Dict with the union price axis ('prices'), per-level change
+            ('delta'), levels that appeared ('added') or vanished ('removed'),
+            and the change of the amount-weighted mean price ('center_shift')
+        """
+        prices = np.union1d(previous.prices, self.prices)
+        before = _on_axis(previous.prices, previous.level_totals, prices)
+        after = _on_axis(self.prices, self.level_totals, prices)
+        return {
+            'prices': prices,
+            'delta': after - before,
+            'added': prices[(before == 0) & (after > 0)],
+            'removed': prices[(before > 0) & (after == 0)],
+            'center_shift': self.center() - previous.center(),
+        }
+    
+    def center(self) -> float:
+        """Amount-weighted mean price of all clusters (NaN when empty)."""
+        total = self.level_totals.sum()
+        if total <= 0:
+            return float('nan')
+        return float((self.prices * self.level_totals).sum() / total)
+    
+    def _leverage_columns(self, leverages: Iterable[float]) -> np.ndarray:
+        """Column positions of leverage buckets that exist in the index."""
+        wanted = np.asarray(list(leverages), dtype=np.float64)
+        pos = np.searchsorted(self.leverages, wanted)
+        pos = np.clip(pos, 0, max(len(self.leverages) - 1, 0))
+        return pos[self.leverages[pos] == wanted] if len(self.leverages) else pos[:0]
+
+
+def build_liquidation_map(payload: Any) -> LiquidationMapIndex:
+    """
+    Build an index from a get_map or get_aggregated_map response.
+    
+    Accepts the price-keyed shape ``{price: [[price, amount, leverage, ...], ...]}``
+    (optionally wrapped in ``{'data': ...}``) and flat rows of
+    ``{'price', 'amount'/'liquidation_amount', 'leverage'}`` dicts.
+    
+    Args:
+        payload: Liquidation map response
+    
+    Returns:
+        LiquidationMapIndex
+    """
+    if isinstance(payload, dict) and isinstance(payload.get('data'), (dict, list)):
+        payload = payload['data']
+    entries = payload.values() if isinstance(payload, dict) else [payload or []]
+    
+    prices, amounts, leverages = [], [], []
+    for group in entries:
+        for item in group:
+            if isinstance(item, dict):
+                price = item.get('price')
+                amount = item.get('liquidation_amount', item.get('amount'))
+                leverage = item.get('leverage')
+            else:
+                price, amount = item[0], item[1]
+                leverage = item[2] if len(item) > 2 else None
+            if price is None or amount in (None, ''):
+                continue
+            prices.append(float(price))
+            amounts.append(float(amount))
+            leverages.append(float(leverage) if leverage not in (None, '') else 0.0)
+    
+    level_axis, rows = np.unique(np.array(prices, dtype=np.float64), return_inverse=True)
+    leverage_axis, cols = np.unique(np.array(leverages, dtype=np.float64), return_inverse=True)
+    matrix = np.zeros((len(level_axis), len(leverage_axis)))
+    np.add.at(matrix, (rows, cols), np.array(amounts, dtype=np.float64))
+    return LiquidationMapIndex(level_axis, leverage_axis, matrix)
+
+
+def fetch_liquidation_map(
+    api: Any,
+    symbol: str,
+    exchange: Optional[str] = None
+) -> LiquidationMapIndex:
+    """
+    Fetch a liquidation map and index it.
+    
+    Min Plan Level: 4
+    
+    Args:
+        api: CoinGlass instance
+        symbol: Pair symbol (e.g., 'BTCUSDT') with an exchange, or coin
+            (e.g., 'BTC') for the aggregated map
+        exchange: Exchange name; the aggregated map is used when omitted
+    
+    Returns:
+        LiquidationMapIndex
+    """
+    liquidation = api.futures.liquidation
+    if exchange is None:
+        return build_liquidation_map(liquidation.get_aggregated_map(symbol))
+    return build_liquidation_map(liquidation.get_map(exchange, symbol))
+
+
+def _on_axis(prices: np.ndarray, values: np.ndarray, axis: np.ndarray) -> np.ndarray:
+    """Place per-level values on a superset price axis (0 where absent)."""
+    out = np.zeros(len(axis))
+    out[np.searchsorted(axis, prices)] = values
+    return out
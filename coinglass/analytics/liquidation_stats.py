@@ -0,0 +1,344 @@
+"""
+Incremental rolling statistics over liquidation order streams
+Ring-buffer time windows and top-k heaps updated in O(1) amortized time per order
+"""
+import heapq
+from collections import OrderedDict, deque
+from typing import Optional, List, Dict, Any, Iterable, Tuple, Hashable
+
+# Window label to length in seconds
+DEFAULT_WINDOWS = {'1m': 60, '5m': 300, '1h': 3600}
+DEFAULT_MAX_KEYS = 1000
+
+# Raw side values of liquidation orders; side 1 is a liquidated long, 2 a liquidated short
+_LONG_SIDES = {1, '1', 'long', 'Long', 'LONG', 'sell', 'Sell', 'SELL'}
+_SHORT_SIDES = {2, '2', 'short', 'Short', 'SHORT', 'buy', 'Buy', 'BUY'}
+
+
+def parse_side(value: Any) -> Optional[str]:
+    """Map a raw liquidation side to 'long' or 'short' (None if unknown)."""
+    if value in _LONG_SIDES:
+        return 'long'
+    if value in _SHORT_SIDES:
+        return 'short'
+    return None
+
+
+class RollingLiquidationStats:
+    """
+    Rolling long/short liquidation sums, counts and largest orders for one market.
+    
+    Orders are added to a ring of fixed-width time buckets covering the
+    longest window. Each window keeps running sums that are updated when an
+    order arrives and when buckets fall out of the window, so both adding an
+    order and reading a window are O(1) amortized. The largest order per
+    window is tracked with a monotonic deque; each bucket keeps a small
+    min-heap of its k largest orders for top-k queries.
+    
+    Example:
+        >>> stats = RollingLiquidationStats()
+        >>> stats.add(1700000000000, 'long', 250000.0)
+        >>> stats.snapshot()['5m']['long_usd']
+        250000.0
+    """
+    
+    def __init__(
+        self,
+        windows: Optional[Dict[str, float]] = None,
+        resolution: float = 1.0,
+        top_k: int = 5
+    ):
+        """
+        Initialize rolling statistics.
+        
+        Args:
+            windows: Mapping of window label to length in seconds (default: 1m, 5m, 1h)
+            resolution: Bucket width in seconds
+            top_k: Number of largest orders kept per bucket for top-k queries
+        """
+        windows = windows or DEFAULT_WINDOWS
+        if resolution <= 0:
+            raise ValueError("resolution must be positive")
+        self.resolution_ms = int(resolution * 1000)
+        self.windows = {
+            label: max(1, int(round(seconds / resolution))) for label, seconds in windows.items()
+        }
+        self.size = max(self.windows.values())
+        self.top_k = top_k
+        
+        self._long: List[float] = []
+        self._short: List[float] = []
+        self._long_count: List[int] = []
+        self._short_count: List[int] = []
+        self._heaps: List[List[Tuple[float, int, int]]] = []
+        self._sums: Dict[str, List[float]] = {}
+        self._max: Dict[str, deque] = {label: deque() for label in self.windows}
+        self._reset()
+        self._current: Optional[int] = None
+        self._seq = 0
+        self.late = 0
+    
+    def add(self, time_ms: int, side: str, usd_value: float) -> bool:
+        """
+        Add one liquidation order.
+        
+        Args:
+            time_ms: Order timestamp in milliseconds
+            side: 'long' or 'short'
+            usd_value: Order value in USD
+        
+        Returns:
+            False if the order was older than the longest window and dropped
+        """
+        bucket = int(time_ms) // self.resolution_ms
+        if self._current is None or bucket > self._current:
+            self.advance_to(bucket)
+        age = self._current - bucket
+        if age >= self.size:
+            self.late += 1
+            return False
+        
+        slot = bucket % self.size
+        is_long = side == 'long'
+        if is_long:
+            self._long[slot] += usd_value
+            self._long_count[slot] += 1
+        else:
+            self._short[slot] += usd_value
+            self._short_count[slot] += 1
+        
+        self._seq += 1
+        heap = self._heaps[slot]
+        entry = (usd_value, self._seq, int(time_ms))
+        if len(heap) < self.top_k:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+        
+        for label, width in self.windows.items():
+            if age >= width:
+                continue
+            sums = self._sums[label]
+            if is_long:
+                sums[0] += usd_value
+                sums[2] += 1
+            else:
+                sums[1] += usd_value
+                sums[3] += 1
+            _push_max(self._max[label], bucket, usd_value)
+        return True
+    
+    def advance_to(self, bucket: int):
+        """Move the window end to a bucket, expiring buckets that fall out."""
+        if self._current is None:
+            self._current = bucket
+            return
+        steps = bucket - self._current
+        if steps <= 0:
+            return
+        if steps >= self.size:
+            self._reset()
+            self._current = bucket
+            return
+        
+        for step in range(self._current + 1, bucket + 1):
+            for label, width in self.windows.items():
+                expired = (step - width) % self.size
+                sums = self._sums[label]
+                sums[0] -= self._long[expired]
+                sums[1] -= self._short[expired]
+                sums[2] -= self._long_count[expired]
+                sums[3] -= self._short_count[expired]
+            slot = step % self.size
+            self._long[slot] = 0.0
+            self._short[slot] = 0.0
+            self._long_count[slot] = 0
+            self._short_count[slot] = 0
+            self._heaps[slot] = []
+        self._current = bucket
+        
+        for label, width in self.windows.items():
+            window_max = self._max[label]
+            while window_max and window_max[0][0] <= bucket - width:
+                window_max.popleft()
+    
+    def advance(self, now_ms: int):
+        """Expire buckets up to a wall-clock time in milliseconds."""
+        self.advance_to(int(now_ms) // self.resolution_ms)
+    
+    def window(self, label: str) -> Dict[str, float]:
+        """
+        Get the statistics of one window.
+        
+        Returns:
+            Dict with long_usd, short_usd, long_count, short_count, net_usd
+            (long minus short) and largest (largest single order value)
+        """
+        long_usd, short_usd, long_count, short_count = self._sums[label]
+        window_max = self._max[label]
+        return {
+            'long_usd': max(long_usd, 0.0),
+            'short_usd': max(short_usd, 0.0),
+            'long_count': long_count,
+            'short_count': short_count,
+            'net_usd': long_usd - short_usd,
+            'largest': window_max[0][1] if window_max else 0.0,
+        }
+    
+    def snapshot(self, now_ms: Optional[int] = None) -> Dict[str, Dict[str, float]]:
+        """Get the statistics of every window, optionally expiring up to now_ms first."""
+        if now_ms is not None:
+            self.advance(now_ms)
+        return {label: self.window(label) for label in self.windows}
+    
+    def top(self, label: str, k: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        Largest orders within a window.
+        
+        Args:
+            label: Window label
+            k: Number of orders (at most top_k; default: top_k)
+        
+        Returns:
+            List of (time_ms, usd_value), largest first
+        """
+        if self._current is None:
+            return []
+        k = min(k or self.top_k, self.top_k)
+        width = self.windows[label]
+        heaps = (self._heaps[(self._current - age) % self.size] for age in range(width))
+        best = heapq.nlargest(k, (entry for heap in heaps for entry in heap))
+        return [(time_ms, value) for value, _, time_ms in best]
+    
+    def _reset(self):
+        """Clear all buckets and window state."""
+        size = self.size
+        self._long = [0.0] * size
+        self._short = [0.0] * size
+        self._long_count = [0] * size
+        self._short_count = [0] * size
+        self._heaps = [[] for _ in range(size)]
+        for label in self.windows:
+            self._sums[label] = [0.0, 0.0, 0, 0]
+            self._max[label].clear()
+
+
+class LiquidationStatsAggregator:
+    """
+    Rolling liquidation statistics for many (exchange, symbol) markets.
+    
+    Consumes de-duplicated liquidation orders (e.g., batches from a Poller
+    over futures.liquidation.get_order) and routes each to the rolling
+    statistics of its market. The number of markets is bounded; the least
+    recently updated market is evicted first.
+    
+    Example:
+        >>> aggregator = LiquidationStatsAggregator()
+        >>> poller = Poller.for_endpoint(cg, 'futures.liquidation.get_order',
+        ...                              ex='Binance', symbol='BTC')
+        >>> for order in poller:
+        ...     aggregator.consume([order])
+        ...     print(aggregator.get('Binance', 'BTCUSDT').window('5m'))
+    """
+    
+    def __init__(
+        self,
+        windows: Optional[Dict[str, float]] = None,
+        resolution: float = 1.0,
+        top_k: int = 5,
+        max_keys: int = DEFAULT_MAX_KEYS
+    ):
+        """
+        Initialize aggregator.
+        
+        Args:
+            windows: Mapping of window label to length in seconds (default: 1m, 5m, 1h)
+            resolution: Bucket width in seconds
+            top_k: Number of largest orders kept per bucket
+            max_keys: Maximum number of (exchange, symbol) markets tracked
+        """
+        if max_keys <= 0:
+            raise ValueError("max_keys must be positive")
+        self.windows = windows or DEFAULT_WINDOWS
+        self.resolution = resolution
+        self.top_k = top_k
+        self.max_keys = max_keys
+        self.skipped = 0
+        self._stats: "OrderedDict[Hashable, RollingLiquidationStats]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._stats)
+    
+    def keys(self) -> List[Hashable]:
+        """Tracked (exchange, symbol) keys."""
+        return list(self._stats)
+    
+    def get(self, exchange: str, symbol: str) -> Optional[RollingLiquidationStats]:
+        """Get the rolling statistics of one market."""
+        return self._stats.get((exchange, symbol))
+    
+    def consume(self, orders: Iterable[Dict[str, Any]], exchange: Optional[str] = None) -> int:
+        """
+        Add liquidation orders.
+        
+        Args:
+            orders: Liquidation order dicts (exchange_name, symbol, side, usd_value, time)
+            exchange: Exchange to use when orders carry no exchange field
+        
+        Returns:
+            Number of orders added
+        """
+        added = 0
+        for order in orders:
+            side = parse_side(order.get('side'))
+            value = order.get('usd_value', order.get('amount'))
+            time_ms = order.get('time', order.get('timestamp'))
+            if side is None or value in (None, '') or time_ms is None:
+                self.skipped += 1
+                continue
+            key = (
+                order.get('exchange_name') or order.get('exchange') or exchange,
+                order.get('symbol'),
+            )
+            if self._stats_for(key).add(int(time_ms), side, float(value)):
+                added += 1
+        return added
+    
+    def snapshot(self, now_ms: Optional[int] = None) -> Dict[Hashable, Dict[str, Dict[str, float]]]:
+        """Window statistics for every market, optionally expiring up to now_ms first."""
+        return {key: stats.snapshot(now_ms) for key, stats in self._stats.items()}
+    
+    def _stats_for(self, key: Hashable) -> RollingLiquidationStats:
+        """Get or create the statistics of a market, evicting the stalest market if full."""
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = RollingLiquidationStats(
+                self.windows, self.resolution, self.top_k
+            )
+            while len(self._stats) > self.max_keys:
+                self._stats.popitem(last=False)
+        else:
+            self._stats.move_to_end(key)
+        return stats
+
+
+def _push_max(window_max: deque, bucket: int, value: float):
+    """
+    Add an order to a sliding-window maximum deque.
+    
+    The deque holds (bucket, value) pairs with buckets increasing and values
+    decreasing, so the window maximum is always at the left.
+    """
+    if not window_max or window_max[-1][0] <= bucket:
+        while window_max and window_max[-1][1] <= value:
+            window_max.pop()
+        window_max.append((bucket, value))
+        return
+    # Out-of-order order: rebuild, keeping entries not dominated by a later, larger one
+    entries = sorted(list(window_max) + [(bucket, value)], key=lambda entry: entry[0])
+    kept = []
+    for entry in reversed(entries):
+        if not kept or entry[1] > kept[-1][1]:
+            kept.append(entry)
+    window_max.clear()
+    window_max.extend(reversed(kept))
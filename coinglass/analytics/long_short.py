@@ -0,0 +1,143 @@
+"""
+Long/short ratio panel
+Global account, top account and top position ratios on one time index with derived spreads
+"""
+from typing import List, Dict, Any, Iterable, Tuple
+
+import numpy as np
+
+from ..fanout import api_rate_limiter, run_concurrently
+from ._series import rows_to_columns, union_index, reindex
+
+Pair = Tuple[str, str]
+
+# Source name to (futures API attribute, column name to candidate response fields)
+SOURCES = {
+    'global': ('global_long_short_account_ratio', {
+        'global_long_pct': ('global_account_long_percent', 'long_percent'),
+        'global_short_pct': ('global_account_short_percent', 'short_percent'),
+        'global_ratio': ('global_account_long_short_ratio', 'long_short_ratio'),
+    }),
+    'top_account': ('top_long_short_account_ratio', {
+        'top_account_long_pct': ('top_account_long_percent', 'long_percent'),
+        'top_account_short_pct': ('top_account_short_percent', 'short_percent'),
+        'top_account_ratio': ('top_account_long_short_ratio', 'long_short_ratio'),
+    }),
+    'top_position': ('top_long_short_position_ratio', {
+        'top_position_long_pct': ('top_position_long_percent', 'long_percent'),
+        'top_position_short_pct': ('top_position_short_percent', 'short_percent'),
+        'top_position_ratio': ('top_position_long_short_ratio', 'long_short_ratio'),
+    }),
+}
+
+COLUMNS = tuple(name for _, fields in SOURCES.values() for name in fields)
+
+
+class LongShortPanel:
+    """
+    Long/short ratios for one or more (exchange, symbol) pairs as (pair x time) arrays.
+    
+    All three ratio histories of every pair are fetched concurrently and
+    placed on one shared time index, built once from the union of all
+    series. Spreads between top traders and the global crowd are computed
+    with array arithmetic over the whole panel.
+    
+    Example:
+        >>> pairs = [('Binance', 'BTCUSDT'), ('OKX', 'BTC-USDT-SWAP')]
+        >>> panel = LongShortPanel.fetch(cg, pairs, '1h')
+        >>> panel['top_position_ratio'][:, -1]
+        >>> panel.spreads()['top_position_vs_global'][:, -24:]
+    """
+    
+    def __init__(self, pairs: List[Pair], times: np.ndarray, columns: Dict[str, np.ndarray]):
+        """
+        Initialize panel.
+        
+        Args:
+            pairs: Row labels
+            times: Epoch-millisecond timestamps
+            columns: Column name to (pair x time) array
+        """
+        self.pairs = pairs
+        self.times = times
+        self.columns = columns
+        self.errors: Dict[Any, Exception] = {}
+    
+    @classmethod
+    def fetch(
+        cls,
+        api: Any,
+        pairs: Iterable[Pair],
+        interval: str,
+        fill: str = 'ffill',
+        **kwargs
+    ) -> 'LongShortPanel':
+        """
+        Fetch all three ratio histories for every pair concurrently.
+        
+        Args:
+            api: CoinGlass instance
+            pairs: (exchange, symbol) pairs (e.g., [('Binance', 'BTCUSDT')])
+            interval: Interval shared by every series
+            fill: Gap policy for missing bars: 'ffill' or 'none'
+            **kwargs: Optional parameters for each history call:
+                - startTime (int): Start timestamp in milliseconds
+                - endTime (int): End timestamp in milliseconds
+                - limit (int): Number of results (max: 1000)
+        
+        Returns:
+            LongShortPanel
+        """
+        pairs = list(pairs)
+        futures = api.futures
+        
+        def fetch(source, exchange, symbol):
+            attribute, fields = SOURCES[source]
+            rows = getattr(futures, attribute).get_history(exchange, symbol, interval, **kwargs)
+            return rows_to_columns(rows, fields)
+        
+        calls = [((source,) + pair, (source,) + pair, {}) for pair in pairs for source in SOURCES]
+        results, errors = run_concurrently(fetch, calls, rate_limiter=api_rate_limiter(api))
+        
+        index = union_index(times for times, _ in results.values())
+        columns = {name: np.full((len(pairs), len(index)), np.nan) for name in COLUMNS}
+        rows = {pair: i for i, pair in enumerate(pairs)}
+        for (source, exchange, symbol), (times, values) in results.items():
+            row = rows[(exchange, symbol)]
+            for name, series in values.items():
+                columns[name][row] = reindex(times, series, index, fill)
+        
+        panel = cls(pairs, index, columns)
+        panel.errors = errors
+        return panel
+    
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+    
+    def __repr__(self):
+        return f"LongShortPanel({len(self.pairs)} pairs x {len(self.times)} bars)"
+    
+    def row(self, exchange: str, symbol: str) -> Dict[str, np.ndarray]:
+        """Get every column of one pair as 1-D arrays."""
+        i = self.pairs.index((exchange, symbol))
+        return {name: values[i] for name, values in self.columns.items()}
+    
+    def spreads(self) -> Dict[str, np.ndarray]:
+        """
+        Positioning spreads of top traders against the crowd, (pair x time) each.
+        
+        Returns:
+            Dict with:
+                - top_position_vs_global: top position long % minus global long %
+                - top_account_vs_global: top account long % minus global long %
+                - position_vs_account: top position long % minus top account long %
+                - log_ratio_spread: log(top position ratio) - log(global ratio)
+        """
+        c = self.columns
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return {
+                'top_position_vs_global': c['top_position_long_pct'] - c['global_long_pct'],
+                'top_account_vs_global': c['top_account_long_pct'] - c['global_long_pct'],
+                'position_vs_account': c['top_position_long_pct'] - c['top_account_long_pct'],
+                'log_ratio_spread': np.log(c['top_position_ratio']) - np.log(c['global_ratio']),
+            }
@@ -0,0 +1,366 @@
+"""
+Options max pain analytics
+Strike-grid payoff matrices and cross-exchange aggregation of per-expiry max pain
+"""
+from typing import Optional, List, Dict, Any, Iterable, Sequence
+
+import numpy as np
+
+from ..fanout import api_rate_limiter, run_concurrently
+from ._pairs import expiry_code
+from ._series import first_field, to_float_array
+
+# Option exchanges covered by the max pain endpoint
+OPTION_EXCHANGES = ('Deribit', 'OKX', 'Binance', 'Bybit')
+
+# Column name to candidate fields of max pain rows
+MAX_PAIN_FIELDS = {
+    'call_oi': ('call_open_interest',),
+    'put_oi': ('put_open_interest',),
+    'call_notional': ('call_open_interest_notional',),
+    'put_notional': ('put_open_interest_notional',),
+    'call_market_value': ('call_open_interest_market_value',),
+    'put_market_value': ('put_open_interest_market_value',),
+    'max_pain': ('max_pain_price',),
+}
+
+
+class StrikeGrid:
+    """
+    Open interest by (expiry x strike) with payoffs computed as matrix products.
+    
+    Payout to option holders at settlement price S is
+    call_oi @ max(S - K, 0) + put_oi @ max(K - S, 0), evaluated for a whole
+    vector of settlement prices at once. Max pain is the settlement price
+    on the grid with the smallest payout.
+    
+    Example:
+        >>> grid = StrikeGrid(['250627'], strikes, call_oi[None, :], put_oi[None, :])
+        >>> grid.max_pain()
+        >>> grid.scenario(spot=65000, moves=np.linspace(-0.2, 0.2, 41))
+    """
+    
+    def __init__(
+        self, expiries: List[str], strikes: np.ndarray, call_oi: np.ndarray, put_oi: np.ndarray
+    ):
+        """
+        Initialize grid.
+        
+        Args:
+            expiries: Row labels (e.g., YYMMDD expiry codes)
+            strikes: Ascending strike prices
+            call_oi: Call open interest in contracts, (expiry x strike)
+            put_oi: Put open interest in contracts, (expiry x strike)
+        """
+        self.expiries = list(expiries)
+        self.strikes = np.asarray(strikes, dtype=np.float64)
+        self.call_oi = np.nan_to_num(np.asarray(call_oi, dtype=np.float64))
+        self.put_oi = np.nan_to_num(np.asarray(put_oi, dtype=np.float64))
+    
+    def __repr__(self):
+        return f"StrikeGrid({len(self.expiries)} expiries x {len(self.strikes)} strikes)"
+    
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[Dict[str, Any]],
+        expiry_fields: Sequence[str] = ('expiry', 'expiry_date', 'date'),
+        strike_fields: Sequence[str] = ('strike', 'strike_price'),
+        call_fields: Sequence[str] = ('call_open_interest', 'call_oi'),
+        put_fields: Sequence[str] = ('put_open_interest', 'put_oi')
+    ) -> 'StrikeGrid':
+        """
+        Build a grid from per-strike rows (e.g., an exchange option chain).
+        
+        Rows sharing an (expiry, strike) are summed.
+        
+        Args:
+            rows: Dicts with expiry, strike, call OI and put OI fields
+            expiry_fields: Candidate expiry field names
+            strike_fields: Candidate strike field names
+            call_fields: Candidate call open interest field names
+            put_fields: Candidate put open interest field names
+        
+        Returns:
+            StrikeGrid
+        """
+        rows = list(rows or [])
+        if not rows:
+            return cls([], np.empty(0), np.empty((0, 0)), np.empty((0, 0)))
+        fields = [first_field(rows[0], candidates) for candidates in (expiry_fields, strike_fields)]
+        expiry_field, strike_field = fields
+        if expiry_field is None or strike_field is None:
+            raise ValueError("Rows have no expiry or strike field")
+        expiries = sorted({str(row[expiry_field]) for row in rows}, key=_expiry_sort_key)
+        strikes = np.unique(to_float_array(row[strike_field] for row in rows))
+        call_oi = np.zeros((len(expiries), len(strikes)))
+        put_oi = np.zeros((len(expiries), len(strikes)))
+        row_of = {expiry: i for i, expiry in enumerate(expiries)}
+        e = np.array([row_of[str(row[expiry_field])] for row in rows], dtype=np.intp)
+        k = np.searchsorted(strikes, to_float_array(row[strike_field] for row in rows))
+        for target, candidates in ((call_oi, call_fields), (put_oi, put_fields)):
+            field = first_field(rows[0], candidates)
+            if field is not None:
+                np.add.at(
+                    target, (e, k), np.nan_to_num(to_float_array(row.get(field) for row in rows))
+                )
+        return cls(expiries, strikes, call_oi, put_oi)
+    
+    @classmethod
+    def combine(cls, grids: Iterable['StrikeGrid']) -> 'StrikeGrid':
+        """Sum several grids (e.g., one per exchange) on the union of expiries and strikes."""
+        grids = list(grids)
+        expiries = sorted(
+            {expiry for grid in grids for expiry in grid.expiries}, key=_expiry_sort_key
+        )
+        strikes = (
+            np.unique(np.concatenate([grid.strikes for grid in grids])) if grids else np.empty(0)
+        )
+        call_oi = np.zeros((len(expiries), len(strikes)))
+        put_oi = np.zeros((len(expiries), len(strikes)))
+        row_of = {expiry: i for i, expiry in enumerate(expiries)}
+        for grid in grids:
+            rows = np.array([row_of[expiry] for expiry in grid.expiries], dtype=np.intp)
+            cols = np.searchsorted(strikes, grid.strikes)
+            call_oi[np.ix_(rows, cols)] += grid.call_oi
+            put_oi[np.ix_(rows, cols)] += grid.put_oi
+        return cls(expiries, strikes, call_oi, put_oi)
+    
+    def payout(self, settlements: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        Intrinsic value owed to option holders, (expiry x settlement price).
+        
+        Args:
+            settlements: Settlement prices (default: the strikes)
+        
+        Returns:
+            Dict with 'call', 'put' and 'total' payout matrices
+        """
+        settlements = (
+            self.strikes if settlements is None else np.asarray(settlements, dtype=np.float64)
+        )
+        diff = settlements[None, :] - self.strikes[:, None]
+        call = self.call_oi @ np.maximum(diff, 0.0)
+        put = self.put_oi @ np.maximum(-diff, 0.0)
+        return {'call': call, 'put': put, 'total': call + put}
+    
+    def max_pain(
+        self, settlements: Optional[np.ndarray] = None, combined: bool = False
+    ) -> np.ndarray:
+        """
+        Settlement price minimizing the payout to option holders.
+        
+        Args:
+            settlements: Candidate settlement prices (default: the strikes)
+            combined: Return one price for all expiries together instead of one per expiry
+        
+        Returns:
+            Array of shape (expiry,), or a 1-element array when combined;
+            NaN for expiries without open interest
+        """
+        settlements = (
+            self.strikes if settlements is None else np.asarray(settlements, dtype=np.float64)
+        )
+        total = self.payout(settlements)['total']
+        if combined:
+            total = total.sum(axis=0, keepdims=True)
+            empty = np.array([not (self.call_oi.any() or self.put_oi.any())])
+        else:
+            empty = ~(self.call_oi.any(axis=1) | self.put_oi.any(axis=1))
+        if total.shape[1] == 0:
+            return np.full(total.shape[0], np.nan)
+        return np.where(empty, np.nan, settlements[np.argmin(total, axis=1)])
+    
+    def walls(self, n: int = 1) -> Dict[str, np.ndarray]:
+        """
+        Strikes with the largest call and put open interest per expiry.
+        
+        Args:
+            n: Number of strikes per side
+        
+        Returns:
+            Dict with 'call' and 'put' arrays of shape (expiry x n), largest first
+        """
+        n = min(n, len(self.strikes))
+        call = np.argsort(-self.call_oi, axis=1, kind='stable')[:, :n]
+        put = np.argsort(-self.put_oi, axis=1, kind='stable')[:, :n]
+        return {'call': self.strikes[call], 'put': self.strikes[put]}
+    
+    def notional(self, spot: float) -> Dict[str, np.ndarray]:
+        """Call and put notional (contracts x spot) per expiry."""
+        return {'call': self.call_oi.sum(axis=1) * spot, 'put': self.put_oi.sum(axis=1) * spot}
+    
+    def scenario(self, spot: float, moves: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Payout to option holders if spot settles after hypothetical moves.
+        
+        Args:
+            spot: Current spot price
+            moves: Relative moves (e.g., np.linspace(-0.2, 0.2, 41))
+        
+        Returns:
+            Dict with 'settlement' (per move) and 'call', 'put', 'total'
+            payouts of shape (expiry x move)
+        """
+        settlements = spot * (1 + np.asarray(moves, dtype=np.float64))
+        return dict(self.payout(settlements), settlement=settlements)
+
+
+class MaxPainEngine:
+    """
+    Per-expiry max pain, open interest and notional aggregated across option exchanges.
+    
+    get_max_pain is fetched for every exchange concurrently and decoded into
+    (exchange x expiry) arrays on the union of expiries. The endpoint reports
+    per-expiry totals rather than open interest by strike; payoffs over a
+    strike grid are available through StrikeGrid when strike-level data is
+    at hand.
+    
+    Example:
+        >>> engine = MaxPainEngine(cg).load('BTC')
+        >>> summary = engine.by_expiry()
+        >>> summary['weighted_max_pain'], summary['put_call_ratio']
+        >>> engine.distance(spot=65000, moves=[-0.1, 0, 0.1])
+    """
+    
+    def __init__(self, api: Any, exchanges: Iterable[str] = OPTION_EXCHANGES):
+        """
+        Initialize engine.
+        
+        Args:
+            api: CoinGlass instance
+            exchanges: Option exchanges to aggregate
+        """
+        self.api = api
+        self.exchanges = list(exchanges)
+        self.symbol: Optional[str] = None
+        self.expiries: List[str] = []
+        self.columns: Dict[str, np.ndarray] = {}
+        self.errors: Dict[str, Exception] = {}
+    
+    def load(self, symbol: str = 'BTC') -> 'MaxPainEngine':
+        """
+        Fetch max pain rows of every exchange concurrently.
+        
+        Args:
+            symbol: Underlying (e.g., 'BTC')
+        
+        Returns:
+            self
+        """
+        option = self.api.option
+        calls = [(exchange, (symbol, exchange), {}) for exchange in self.exchanges]
+        results, self.errors = run_concurrently(
+            option.get_max_pain, calls, rate_limiter=api_rate_limiter(self.api)
+        )
+        self.symbol = symbol
+        
+        decoded = {}
+        for exchange, rows in results.items():
+            rows = [row for row in rows or [] if row.get('date') is not None]
+            decoded[exchange] = (
+                [str(row['date']) for row in rows],
+                {name: _column(rows, candidates) for name, candidates in MAX_PAIN_FIELDS.items()},
+            )
+        self.expiries = sorted(
+            {e for expiries, _ in decoded.values() for e in expiries}, key=_expiry_sort_key
+        )
+        col_of = {expiry: i for i, expiry in enumerate(self.expiries)}
+        self.columns = {
+            name: np.full((len(self.exchanges), len(self.expiries)), np.nan)
+            for name in MAX_PAIN_FIELDS
+        }
+        for row, exchange in enumerate(self.exchanges):
+            if exchange not in decoded:
+                continue
+            expiries, values = decoded[exchange]
+            cols = np.array([col_of[expiry] for expiry in expiries], dtype=np.intp)
+            for name, column in values.items():
+                self.columns[name][row, cols] = column
+        return self
+    
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+    
+    def by_expiry(self) -> Dict[str, Any]:
+        """
+        Aggregate every exchange per expiry.
+        
+        Returns:
+            Dict with 'expiries' and arrays aligned with them:
+                - call_oi, put_oi, call_notional, put_notional: sums across exchanges
+                - notional: call plus put notional
+                - put_call_ratio: put OI divided by call OI
+                - weighted_max_pain: average of the exchanges' max pain prices weighted
+                  by their open interest (not the max pain of the combined book,
+                  which needs strike-level open interest; see StrikeGrid.combine)
+                - max_pain_low, max_pain_high: range of exchange max pain prices
+        """
+        c = self.columns
+        sums = {
+            name: np.nansum(c[name], axis=0)
+            for name in ('call_oi', 'put_oi', 'call_notional', 'put_notional')
+        }
+        weights = np.nan_to_num(c['call_oi']) + np.nan_to_num(c['put_oi'])
+        valid = ~np.isnan(c['max_pain']) & (weights > 0)
+        w = np.where(valid, weights, 0.0)
+        total = w.sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weighted_max_pain = np.where(
+                total > 0, (np.where(valid, c['max_pain'], 0.0) * w).sum(axis=0) / total, np.nan
+            )
+            put_call = np.where(sums['call_oi'] > 0, sums['put_oi'] / sums['call_oi'], np.nan)
+        masked = np.where(valid, c['max_pain'], np.nan)
+        any_valid = valid.any(axis=0)
+        low = np.full(len(self.expiries), np.nan)
+        high = np.full(len(self.expiries), np.nan)
+        low[any_valid] = np.nanmin(masked[:, any_valid], axis=0)
+        high[any_valid] = np.nanmax(masked[:, any_valid], axis=0)
+        return dict(
+            sums,
+            expiries=list(self.expiries),
+            notional=sums['call_notional'] + sums['put_notional'],
+            put_call_ratio=put_call,
+            weighted_max_pain=weighted_max_pain,
+            max_pain_low=low,
+            max_pain_high=high,
+        )
+    
+    def notional_share(self) -> np.ndarray:
+        """Each exchange's share of total notional per expiry, (exchange x expiry)."""
+        notional = np.nan_to_num(self.columns['call_notional']) + np.nan_to_num(
+            self.columns['put_notional']
+        )
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return notional / notional.sum(axis=0)
+    
+    def distance(self, spot: float, moves: Optional[Iterable[float]] = None) -> np.ndarray:
+        """
+        Relative distance from settlement scenarios to the OI-weighted max pain.
+        
+        This only measures how far each hypothetical settlement price lies from
+        the fixed weighted_max_pain of by_expiry(); payouts are not re-evaluated
+        under the shifted spot, since the endpoint carries no strike-level open
+        interest. Use StrikeGrid.scenario() for that when an option chain is at hand.
+        
+        Args:
+            spot: Current spot price
+            moves: Relative spot moves (default: [0.0])
+        
+        Returns:
+            (expiry x move) array of max_pain / (spot * (1 + move)) - 1
+        """
+        moves = np.asarray([0.0] if moves is None else list(moves), dtype=np.float64)
+        return self.by_expiry()['weighted_max_pain'][:, None] / (spot * (1 + moves))[None, :] - 1
+
+
+def _column(rows: List[Dict[str, Any]], candidates: Sequence[str]) -> np.ndarray:
+    field = first_field(rows[0], candidates) if rows else None
+    if field is None:
+        return np.full(len(rows), np.nan)
+    return to_float_array(row.get(field) for row in rows)
+
+
+def _expiry_sort_key(expiry: str) -> str:
+    """Sort expiries chronologically whether given as YYMMDD, YYYYMMDD or other labels."""
+    return expiry_code(expiry) or expiry
@@ -0,0 +1,228 @@
+"""
+Open interest aggregation across exchanges and margin types
+Builds (label x time x OHLC) cubes from per-pair and aggregated OI histories
+"""
+from typing import Optional, List, Dict, Any, Iterable, Tuple
+
+import numpy as np
+
+from ..fanout import api_rate_limiter, run_concurrently
+from ._series import rows_to_columns, union_index, reindex
+
+OHLC = ('open', 'high', 'low', 'close')
+OHLC_FIELDS = {name: (name,) for name in OHLC}
+MARGIN_TYPES = ('stablecoin', 'coin')
+
+
+class OICube:
+    """
+    Open interest laid out as a (label x time x OHLC) array.
+    
+    Labels are exchanges for per-exchange cubes and margin types for margin
+    cubes. Slicing returns views where possible.
+    
+    Attributes:
+        labels: Row labels
+        times: Epoch-millisecond timestamps
+        values: Array of shape (len(labels), len(times), 4)
+    """
+    
+    def __init__(self, labels: List[str], times: np.ndarray, values: np.ndarray):
+        self.labels = labels
+        self.times = times
+        self.values = values
+    
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        """(number of labels, number of timestamps, 4)."""
+        return self.values.shape
+    
+    def __repr__(self):
+        return f"OICube({len(self.labels)} labels x {len(self.times)} bars)"
+    
+    def field(self, name: str) -> np.ndarray:
+        """Get one OHLC field as a (label x time) array."""
+        return self.values[:, :, OHLC.index(name)]
+    
+    @property
+    def close(self) -> np.ndarray:
+        """Closing open interest as a (label x time) array."""
+        return self.values[:, :, 3]
+    
+    def loc(self, label: str) -> np.ndarray:
+        """Get the (time x OHLC) array of one label."""
+        return self.values[self.labels.index(label)]
+    
+    def select(self, labels: Iterable[str]) -> 'OICube':
+        """Restrict the cube to some labels (in the given order)."""
+        labels = list(labels)
+        rows = [self.labels.index(label) for label in labels]
+        return OICube(labels, self.times, self.values[rows])
+    
+    def between(self, start: Optional[int] = None, end: Optional[int] = None) -> 'OICube':
+        """
+        Restrict the cube to a time range.
+        
+        Args:
+            start: Inclusive start timestamp in milliseconds
+            end: Inclusive end timestamp in milliseconds
+        
+        Returns:
+            OICube sharing memory with this one
+        """
+        lo = 0 if start is None else int(np.searchsorted(self.times, start, side='left'))
+        hi = len(self.times) if end is None else int(np.searchsorted(self.times, end, side='right'))
+        return OICube(self.labels, self.times[lo:hi], self.values[:, lo:hi])
+    
+    def total(self, field: str = 'close') -> np.ndarray:
+        """Sum of a field over all labels (NaN where no label has a value)."""
+        return _nansum(self.field(field), axis=0)
+    
+    def share(self, field: str = 'close') -> np.ndarray:
+        """Each label's share of the total, as a (label x time) array."""
+        values = self.field(field)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return values / _nansum(values, axis=0)
+
+
+class OpenInterestEngine:
+    """
+    Market-wide open interest per exchange and per margin type.
+    
+    For every symbol, the per-pair OHLC histories from
+    open_interest.get_history and the stablecoin/coin-margined aggregated
+    histories are fetched concurrently, aligned on one time index and
+    summed into an exchange cube and a margin cube.
+    
+    Example:
+        >>> engine = OpenInterestEngine(cg, interval='4h')
+        >>> engine.load(['BTC', 'ETH'], exchanges=['Binance', 'OKX', 'Bybit'], limit=500)
+        >>> engine.exchange_share('BTC')[:, -1]
+        >>> engine.margin_split('BTC')[-1]
+    """
+    
+    def __init__(self, api: Any, interval: str = '4h', fill: str = 'ffill'):
+        """
+        Initialize engine.
+        
+        Args:
+            api: CoinGlass instance
+            interval: Candlestick interval used for every series
+            fill: Gap policy for missing bars: 'ffill' or 'none'
+        """
+        self.api = api
+        self.interval = interval
+        self.fill = fill
+        self.exchange_cubes: Dict[str, OICube] = {}
+        self.margin_cubes: Dict[str, OICube] = {}
+        self.errors: Dict[Any, Exception] = {}
+    
+    def load(
+        self,
+        symbols: Iterable[str],
+        exchanges: Optional[Iterable[str]] = None,
+        **kwargs
+    ) -> Dict[str, OICube]:
+        """
+        Fetch and build cubes for some symbols.
+        
+        Args:
+            symbols: Base assets (e.g., ['BTC', 'ETH'])
+            exchanges: Optional exchange subset for the per-exchange cube
+            **kwargs: Optional parameters for each history call:
+                - startTime (int): Start timestamp in milliseconds
+                - endTime (int): End timestamp in milliseconds
+                - limit (int): Number of results (max: 1000)
+        
+        Returns:
+            Per-exchange cubes by symbol
+        """
+        symbols = [symbol.upper() for symbol in symbols]
+        index = self.api.fanout.get_pair_index('futures', symbols=symbols, exchanges=exchanges)
+        oi = self.api.futures.open_interest
+        
+        calls = []
+        for pair in index:
+            key = ('pair', pair['base_asset'].upper(), pair['exchange'], pair['instrument_id'])
+            calls.append((key, (oi.get_history, pair['exchange'], pair['instrument_id']), {}))
+        for symbol in symbols:
+            calls.append(
+                (('stablecoin', symbol), (oi.get_aggregated_stablecoin_margin_history, symbol), {})
+            )
+            calls.append((('coin', symbol), (oi.get_aggregated_coin_margin_history, symbol), {}))
+        
+        def fetch(func, *args):
+            return rows_to_columns(func(*args, self.interval, **kwargs), OHLC_FIELDS)
+        
+        results, self.errors = run_concurrently(
+            fetch, calls, rate_limiter=api_rate_limiter(self.api)
+        )
+        
+        for symbol in symbols:
+            pair_series = {
+                key[2:]: series for key, series in results.items()
+                if key[0] == 'pair' and key[1] == symbol
+            }
+            margin_series = {
+                margin: results[(margin, symbol)]
+                for margin in MARGIN_TYPES if (margin, symbol) in results
+            }
+            index_times = union_index(
+                times for times, _ in list(pair_series.values()) + list(margin_series.values())
+            )
+            self.exchange_cubes[symbol] = self._exchange_cube(pair_series, index_times)
+            self.margin_cubes[symbol] = self._cube(margin_series, index_times)
+        return {symbol: self.exchange_cubes[symbol] for symbol in symbols}
+    
+    def exchange_share(self, symbol: str, field: str = 'close') -> np.ndarray:
+        """Each exchange's share of total open interest, as an (exchange x time) array."""
+        return self.exchange_cubes[symbol.upper()].share(field)
+    
+    def margin_split(self, symbol: str, field: str = 'close') -> np.ndarray:
+        """Stablecoin-margined fraction of margin-split open interest over time."""
+        cube = self.margin_cubes[symbol.upper()]
+        if 'stablecoin' not in cube.labels:
+            return np.full(len(cube.times), np.nan)
+        return cube.share(field)[cube.labels.index('stablecoin')]
+    
+    def _cube(
+        self, series: Dict[str, Tuple[np.ndarray, Dict[str, np.ndarray]]], index: np.ndarray
+    ) -> OICube:
+        """Align OHLC series on the index into a cube (one row per key)."""
+        labels = list(series)
+        values = np.full((len(labels), len(index), len(OHLC)), np.nan)
+        for row, label in enumerate(labels):
+            times, columns = series[label]
+            stacked = np.stack([columns[name] for name in OHLC])
+            values[row] = reindex(times, stacked, index, self.fill).T
+        return OICube(labels, index, values)
+    
+    def _exchange_cube(
+        self,
+        pair_series: Dict[Tuple[str, str], Tuple[np.ndarray, Dict[str, np.ndarray]]],
+        index: np.ndarray
+    ) -> OICube:
+        """Sum aligned per-pair series into one row per exchange."""
+        pairs = self._cube(pair_series, index)
+        exchanges: List[str] = []
+        groups = []
+        for exchange, _ in pairs.labels:
+            if exchange not in exchanges:
+                exchanges.append(exchange)
+            groups.append(exchanges.index(exchange))
+        groups = np.array(groups, dtype=np.intp)
+        
+        values = np.zeros((len(exchanges), len(index), len(OHLC)))
+        seen = np.zeros(values.shape, dtype=bool)
+        present = ~np.isnan(pairs.values)
+        np.add.at(values, groups, np.where(present, pairs.values, 0.0))
+        np.logical_or.at(seen, groups, present)
+        values[~seen] = np.nan
+        return OICube(exchanges, index, values)
+
+
+def _nansum(values: np.ndarray, axis: int) -> np.ndarray:
+    """Sum ignoring NaN, NaN where every value is NaN."""
+    present = ~np.isnan(values)
+    total = np.where(present, values, 0.0).sum(axis=axis)
+    return np.where(present.any(axis=axis), total, np.nan)
@@ -0,0 +1,263 @@
+"""
+Options exchange panel
+Decodes exchange-keyed options open interest and volume histories into (exchange x time) arrays
+"""
+import time
+from typing import Optional, List, Dict, Any, Iterable, Tuple
+
+import numpy as np
+
+from ..endpoints import EndpointRegistry
+from ..fanout import api_rate_limiter, run_concurrently
+from ._series import find_time_field, parse_time, to_float_array
+from .max_pain import MaxPainEngine, OPTION_EXCHANGES
+
+# Refresh period used for endpoints without a documented cache time
+DEFAULT_CACHE_SECONDS = 60
+
+# Keys of non-exchange values in history payloads
+_META_FIELDS = {'time', 'timestamp', 'date', 'price', 'symbol', 'unit'}
+
+
+class ExchangeSeries:
+    """
+    One exchange-keyed history as an (exchange x time) array.
+    
+    Attributes:
+        exchanges: Row labels
+        times: Epoch-millisecond timestamps
+        values: (exchange x time) array
+        price: Underlying price aligned with times (NaN when not reported)
+    """
+    
+    def __init__(
+        self,
+        exchanges: List[str],
+        times: np.ndarray,
+        values: np.ndarray,
+        price: Optional[np.ndarray] = None,
+    ):
+        self.exchanges = exchanges
+        self.times = times
+        self.values = values
+        self.price = price if price is not None else np.full(len(times), np.nan)
+    
+    def __repr__(self):
+        return f"ExchangeSeries({len(self.exchanges)} exchanges x {len(self.times)} points)"
+    
+    def __getitem__(self, exchange: str) -> np.ndarray:
+        return self.values[self.exchanges.index(exchange)]
+    
+    @classmethod
+    def from_payload(cls, payload: Any) -> 'ExchangeSeries':
+        """
+        Decode an exchange OI or volume history payload.
+        
+        Accepts {'time_list': [...], 'price_list': [...], 'data_map': {exchange: [...]}}
+        as well as a list of rows like {'time': ..., 'Deribit': ..., 'OKX': ...}.
+        """
+        if isinstance(payload, dict):
+            data_map = payload.get('data_map') or {}
+            times = np.array(
+                [parse_time(t) for t in payload.get('time_list') or []], dtype=np.int64
+            )
+            exchanges = sorted(data_map)
+            values = np.full((len(exchanges), len(times)), np.nan)
+            for row, exchange in enumerate(exchanges):
+                series = to_float_array(data_map[exchange] or [])[:len(times)]
+                values[row, :len(series)] = series
+            price = to_float_array(payload.get('price_list') or [])[:len(times)]
+            price = np.concatenate([price, np.full(len(times) - len(price), np.nan)])
+            return cls(exchanges, times, values, price)
+        
+        rows = payload or []
+        if not rows:
+            return cls([], np.empty(0, dtype=np.int64), np.empty((0, 0)))
+        time_field = find_time_field(rows[0])
+        if time_field is None:
+            raise ValueError("Rows have no timestamp field")
+        exchanges = sorted(
+            {key for row in rows for key in row if key not in _META_FIELDS and key != time_field}
+        )
+        times = np.array([parse_time(row[time_field]) for row in rows], dtype=np.int64)
+        order = np.argsort(times, kind='stable')
+        values = np.array(
+            [to_float_array(row.get(exchange) for row in rows) for exchange in exchanges]
+        )
+        price = to_float_array(row.get('price') for row in rows)
+        return cls(
+            exchanges,
+            times[order],
+            values.reshape(len(exchanges), len(rows))[:, order],
+            price[order],
+        )
+    
+    def total(self) -> np.ndarray:
+        """Sum across exchanges per timestamp."""
+        return np.nansum(self.values, axis=0)
+    
+    def share(self) -> np.ndarray:
+        """Each exchange's share of the total per timestamp, (exchange x time)."""
+        total = self.total()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(total > 0, np.nan_to_num(self.values) / total, np.nan)
+    
+    def latest_share(self) -> Dict[str, float]:
+        """Market share of every exchange at the last timestamp."""
+        if len(self.times) == 0:
+            return {}
+        share = self.share()[:, -1]
+        return {exchange: float(value) for exchange, value in zip(self.exchanges, share)}
+
+
+class OptionsExchangePanel:
+    """
+    Options open interest and volume by exchange for several underlyings.
+    
+    All requested (series, symbol, unit, range) combinations are fetched
+    concurrently and decoded into ExchangeSeries. Results are cached per
+    combination for the endpoint's refresh period (DEFAULT_CACHE_SECONDS when
+    it documents none), so repeated calls within it do not hit the API.
+    
+    Example:
+        >>> panel = OptionsExchangePanel(cg)
+        >>> panel.load(['BTC', 'ETH', 'SOL'], units=['USD', 'coin'], ranges=['1h', '1d'])
+        >>> panel.oi('BTC', 'USD').share()[:, -1]
+        >>> panel.volume('ETH').latest_share()
+        >>> panel.put_call('BTC')
+    """
+    
+    OI_ENDPOINT = 'option.get_exchange_oi_history'
+    VOLUME_ENDPOINT = 'option.get_exchange_vol_history'
+    MAX_PAIN_ENDPOINT = 'option.get_max_pain'
+    
+    def __init__(
+        self,
+        api: Any,
+        range: str = '1h',
+        time_type: str = '1d',
+        exchanges: Iterable[str] = OPTION_EXCHANGES
+    ):
+        """
+        Initialize panel.
+        
+        Args:
+            api: CoinGlass instance
+            range: Default range of the open interest history (e.g., '1h', '4h', '1d')
+            time_type: Aggregation of the volume history (see constants.TimeType)
+            exchanges: Option exchanges used for put/call ratios
+        """
+        self.api = api
+        self.range = range
+        self.time_type = time_type
+        self.exchanges = list(exchanges)
+        self.errors: Dict[Any, Exception] = {}
+        self._cache: Dict[Tuple[str, ...], Tuple[float, Any]] = {}
+    
+    def load(
+        self,
+        symbols: Iterable[str] = ('BTC', 'ETH', 'SOL'),
+        units: Iterable[str] = ('USD',),
+        ranges: Optional[Iterable[str]] = None,
+        volume: bool = True
+    ) -> Dict[Tuple[str, ...], ExchangeSeries]:
+        """
+        Fetch every stale combination of series, symbol, unit and range concurrently.
+        
+        Args:
+            symbols: Underlyings (e.g., ['BTC', 'ETH', 'SOL'])
+            units: Open interest units (e.g., ['USD', 'coin'])
+            ranges: Open interest ranges (default: the panel range)
+            volume: Also fetch the volume history of every symbol
+        
+        Returns:
+            Cache key ('oi', symbol, unit, range) or ('volume', symbol) to ExchangeSeries
+        """
+        symbols, units = list(symbols), list(units)
+        ranges = [self.range] if ranges is None else list(ranges)
+        keys = [('oi', symbol, unit, r) for symbol in symbols for unit in units for r in ranges]
+        if volume:
+            keys += [('volume', symbol) for symbol in symbols]
+        self._refresh(keys)
+        return {key: self._cache[key][1] for key in keys if key in self._cache}
+    
+    def oi(
+        self, symbol: str = 'BTC', unit: str = 'USD', range: Optional[str] = None
+    ) -> ExchangeSeries:
+        """Open interest by exchange, fetched when the cached copy is stale."""
+        return self._get(('oi', symbol, unit, range or self.range))
+    
+    def volume(self, symbol: str = 'BTC') -> ExchangeSeries:
+        """Volume by exchange, fetched when the cached copy is stale."""
+        return self._get(('volume', symbol))
+    
+    def put_call(self, symbol: str = 'BTC') -> Dict[str, float]:
+        """
+        Put/call open interest ratio by exchange and overall.
+        
+        The exchange histories carry no put/call split, so this sums the
+        per-expiry call and put open interest of option.get_max_pain.
+        
+        Args:
+            symbol: Underlying (e.g., 'BTC')
+        
+        Returns:
+            Exchange name (and 'all') to put OI divided by call OI
+        """
+        engine = self._get(('max_pain', symbol))
+        call = np.nansum(engine['call_oi'], axis=1)
+        put = np.nansum(engine['put_oi'], axis=1)
+        ratios = {
+            exchange: float(p / c) for exchange, c, p in zip(engine.exchanges, call, put) if c > 0
+        }
+        if call.sum() > 0:
+            ratios['all'] = float(put.sum() / call.sum())
+        return ratios
+    
+    def invalidate(self):
+        """Drop every cached result."""
+        self._cache.clear()
+    
+    def _get(self, key: Tuple[str, ...]) -> Any:
+        self._refresh([key])
+        if key not in self._cache:
+            raise self.errors[key]
+        return self._cache[key][1]
+    
+    def _refresh(self, keys: List[Tuple[str, ...]]):
+        """Fetch the given keys whose cached copy is older than their endpoint's refresh period."""
+        now = time.time()
+        stale = [
+            key
+            for key in keys
+            if key not in self._cache or now - self._cache[key][0] >= self._ttl(key[0])
+        ]
+        if not stale:
+            return
+        option = self.api.option
+        
+        def fetch(kind, symbol, unit=None, range=None):
+            if kind == 'oi':
+                return ExchangeSeries.from_payload(
+                    option.get_exchange_oi_history(symbol, unit, range)
+                )
+            if kind == 'volume':
+                return ExchangeSeries.from_payload(
+                    option.get_exchange_vol_history(symbol, self.time_type)
+                )
+            return MaxPainEngine(self.api, self.exchanges).load(symbol)
+        
+        results, errors = run_concurrently(
+            fetch, [(key, key, {}) for key in stale], rate_limiter=api_rate_limiter(self.api)
+        )
+        fetched = time.time()
+        for key, value in results.items():
+            self._cache[key] = (fetched, value)
+        self.errors = errors
+    
+    def _ttl(self, kind: str) -> float:
+        endpoint = {'oi': self.OI_ENDPOINT, 'volume': self.VOLUME_ENDPOINT}.get(
+            kind, self.MAX_PAIN_ENDPOINT
+        )
+        seconds = EndpointRegistry.get_cache_seconds(endpoint)
+        return DEFAULT_CACHE_SECONDS if seconds is None else seconds
@@ -0,0 +1,394 @@
+"""
+Options info recorder
+Samples option.get_info on its cache cadence into an append-only, memory-mapped columnar log
+"""
+import os
+import json
+import time
+import logging
+import threading
+from typing import Optional, List, Dict, Any, Iterable, Tuple
+
+import numpy as np
+
+from ..endpoints import EndpointRegistry
+from ..fanout import api_rate_limiter, run_concurrently
+from ._series import first_field, to_float_array
+
+logger = logging.getLogger(__name__)
+
+# Column name to candidate fields of get_info rows (per-exchange rows or one summary dict)
+INFO_FIELDS = {
+    'open_interest': ('open_interest',),
+    'open_interest_usd': ('open_interest_usd', 'total_open_interest_usd'),
+    'oi_market_share': ('oi_market_share',),
+    'open_interest_change_24h': ('open_interest_change_24h',),
+    'volume_usd_24h': ('volume_usd_24h', 'total_volume_24h_usd'),
+    'volume_change_percent_24h': ('volume_change_percent_24h',),
+    'put_call_ratio_oi': ('put_call_ratio_oi',),
+    'put_call_ratio_vol': ('put_call_ratio_vol',),
+    'implied_volatility': ('implied_volatility',),
+}
+
+# Exchange label of summary payloads that are not broken down by exchange
+ALL_EXCHANGES = 'All'
+
+_META_FILE = 'meta.json'
+_KEY_COLUMNS = {'time': np.dtype('<i8'), 'symbol': np.dtype('<u2'), 'exchange': np.dtype('<u2')}
+_VALUE_DTYPE = np.dtype('<f8')
+
+
+class ColumnLog:
+    """
+    Append-only columnar log on disk.
+    
+    Each column is a raw little-endian array in its own file under one
+    directory: 'time' (int64 ms), 'symbol' and 'exchange' (uint16 codes
+    into the label lists in meta.json) and one float64 file per value
+    field. Appends write to the end of every file; reads memory-map the
+    files, so a time-range query is a binary search on the time column and
+    a slice of each column. A torn final write is ignored because the row
+    count is the shortest column.
+    
+    Rows are expected in non-decreasing time order.
+    
+    Example:
+        >>> log = ColumnLog('/data/options_info', fields=['open_interest_usd'])
+        >>> log.append([t], ['BTC'], ['Deribit'], {'open_interest_usd': [1.2e10]})
+        >>> log.read(start=t - 3600000, symbol='BTC')['open_interest_usd']
+    """
+    
+    def __init__(self, path: str, fields: Optional[Iterable[str]] = None):
+        """
+        Open or create a log.
+        
+        Args:
+            path: Directory of the log
+            fields: Value columns; required when creating, checked when opening
+        """
+        self.path = path
+        meta_path = os.path.join(path, _META_FILE)
+        created = not os.path.exists(meta_path)
+        if not created:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if fields is not None and list(fields) != meta['fields']:
+                raise ValueError(f"Log at {path} has fields {meta['fields']}")
+        else:
+            if fields is None:
+                raise ValueError("fields are required to create a log")
+            os.makedirs(path, exist_ok=True)
+            meta = {'fields': list(fields), 'symbols': [], 'exchanges': []}
+        self.fields: List[str] = meta['fields']
+        self.symbols: List[str] = meta['symbols']
+        self.exchanges: List[str] = meta['exchanges']
+        self.dtypes = dict(_KEY_COLUMNS, **{field: _VALUE_DTYPE for field in self.fields})
+        self._lock = threading.Lock()
+        self._maps: Dict[str, np.ndarray] = {}
+        # Opening an existing log never writes: a reader must not overwrite
+        # labels a concurrent writer has added since meta.json was read
+        if created:
+            self._write_meta()
+    
+    def __len__(self) -> int:
+        return min(self._rows(column) for column in self.dtypes)
+    
+    def __repr__(self):
+        return f"ColumnLog({self.path!r}, {len(self)} rows x {len(self.fields)} fields)"
+    
+    def append(
+        self,
+        times: Iterable[int],
+        symbols: Iterable[str],
+        exchanges: Iterable[str],
+        values: Dict[str, Iterable[float]]
+    ) -> int:
+        """
+        Append rows.
+        
+        Args:
+            times: Epoch-millisecond timestamps
+            symbols: Symbol of each row
+            exchanges: Exchange of each row
+            values: Field name to values (missing fields are written as NaN)
+        
+        Returns:
+            Number of rows written
+        """
+        times = np.asarray(list(times), dtype=np.int64)
+        n = len(times)
+        if n == 0:
+            return 0
+        with self._lock:
+            # Pick up labels added through other handles on the same log
+            self._reload_labels()
+            columns = {
+                'time': times,
+                'symbol': np.array([self._code(self.symbols, s) for s in symbols], dtype=np.uint16),
+                'exchange': np.array(
+                    [self._code(self.exchanges, e) for e in exchanges], dtype=np.uint16
+                ),
+            }
+            for field in self.fields:
+                column = values.get(field)
+                columns[field] = (
+                    np.full(n, np.nan)
+                    if column is None
+                    else np.asarray(list(column), dtype=np.float64)
+                )
+            if any(len(column) != n for column in columns.values()):
+                raise ValueError("All columns must have the same length")
+            # Labels first, so every written code can be resolved
+            self._write_meta()
+            rows = len(self)
+            for name, column in columns.items():
+                with open(
+                    self._file(name), 'r+b' if os.path.exists(self._file(name)) else 'wb'
+                ) as f:
+                    # Drop the tail of a torn earlier write
+                    f.truncate(rows * self.dtypes[name].itemsize)
+                    f.seek(0, os.SEEK_END)
+                    f.write(column.astype(self.dtypes[name]).tobytes())
+        return n
+    
+    def read(
+        self,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        symbol: Optional[str] = None,
+        exchange: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Read rows with start <= time < end.
+        
+        Args:
+            start: Start timestamp in milliseconds (inclusive)
+            end: End timestamp in milliseconds (exclusive)
+            symbol: Keep one symbol
+            exchange: Keep one exchange
+            fields: Value columns to return (default: all)
+        
+        Returns:
+            Dict with 'time', 'symbol', 'exchange' (label arrays) and the value columns
+        """
+        fields = self.fields if fields is None else list(fields)
+        if (symbol is not None and symbol not in self.symbols) or \
+                (exchange is not None and exchange not in self.exchanges):
+            self._reload_labels()
+        times = self._map('time')
+        lo = 0 if start is None else int(np.searchsorted(times, start, side='left'))
+        hi = len(times) if end is None else int(np.searchsorted(times, end, side='left'))
+        mask = np.ones(hi - lo, dtype=bool)
+        symbol_codes = self._map('symbol')[lo:hi]
+        exchange_codes = self._map('exchange')[lo:hi]
+        if (len(symbol_codes) and symbol_codes.max() >= len(self.symbols)) or \
+                (len(exchange_codes) and exchange_codes.max() >= len(self.exchanges)):
+            # Another process appended new labels
+            self._reload_labels()
+        if symbol is not None:
+            mask &= symbol_codes == self._lookup(self.symbols, symbol)
+        if exchange is not None:
+            mask &= exchange_codes == self._lookup(self.exchanges, exchange)
+        out = {
+            'time': np.array(times[lo:hi][mask]),
+            'symbol': np.array(self.symbols + [''], dtype=object)[symbol_codes[mask]],
+            'exchange': np.array(self.exchanges + [''], dtype=object)[exchange_codes[mask]],
+        }
+        for field in fields:
+            out[field] = np.array(self._map(field)[lo:hi][mask])
+        return out
+    
+    def series(
+        self,
+        field: str,
+        symbol: str,
+        exchange: str = ALL_EXCHANGES,
+        start: Optional[int] = None,
+        end: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Get (times, values) of one field for one symbol and exchange."""
+        rows = self.read(start, end, symbol=symbol, exchange=exchange, fields=[field])
+        return rows['time'], rows[field]
+    
+    def _rows(self, column: str) -> int:
+        try:
+            size = os.path.getsize(self._file(column))
+        except OSError:
+            return 0
+        return size // self.dtypes[column].itemsize
+    
+    def _map(self, column: str) -> np.ndarray:
+        """Memory-map a column, remapping when the log has grown."""
+        rows = len(self)
+        mapped = self._maps.get(column)
+        if mapped is None or len(mapped) < rows:
+            if rows == 0:
+                return np.empty(0, dtype=self.dtypes[column])
+            mapped = np.memmap(
+                self._file(column), dtype=self.dtypes[column], mode='r', shape=(self._rows(column),)
+            )
+            self._maps[column] = mapped
+        return mapped[:rows]
+    
+    def _file(self, column: str) -> str:
+        return os.path.join(self.path, f'{column}.bin')
+    
+    def _code(self, labels: List[str], label: str) -> int:
+        try:
+            return labels.index(label)
+        except ValueError:
+            labels.append(label)
+            return len(labels) - 1
+    
+    def _lookup(self, labels: List[str], label: str) -> int:
+        """Code of a label, or a code that matches no row."""
+        return labels.index(label) if label in labels else len(labels)
+    
+    def _reload_labels(self):
+        with open(os.path.join(self.path, _META_FILE)) as f:
+            meta = json.load(f)
+        self.symbols[:] = meta['symbols']
+        self.exchanges[:] = meta['exchanges']
+    
+    def _write_meta(self):
+        meta = {'fields': self.fields, 'symbols': self.symbols, 'exchanges': self.exchanges}
+        tmp = os.path.join(self.path, _META_FILE + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(self.path, _META_FILE))
+
+
+def info_rows(payload: Any) -> List[Dict[str, Any]]:
+    """Normalize a get_info payload into rows with an 'exchange' label."""
+    if not payload:
+        return []
+    if isinstance(payload, dict):
+        return [dict(payload, exchange=ALL_EXCHANGES)]
+    rows = []
+    for row in payload:
+        exchange = row.get('exchange_name') or row.get('exchange') or ALL_EXCHANGES
+        rows.append(dict(row, exchange=exchange))
+    return rows
+
+
+class OptionsInfoRecorder:
+    """
+    Record option.get_info snapshots for several symbols into a ColumnLog.
+    
+    Every sample fetches all symbols concurrently and appends one row per
+    (symbol, exchange) with a shared timestamp. start() samples in a daemon
+    thread just after each server cache refresh (every 30 seconds).
+    
+    Example:
+        >>> recorder = OptionsInfoRecorder(cg, '/data/options_info', symbols=['BTC', 'ETH'])
+        >>> recorder.start()
+        >>> ...
+        >>> times, oi = recorder.log.series('open_interest_usd', 'BTC', 'Deribit', start=t0)
+        >>> recorder.stop()
+    """
+    
+    ENDPOINT = 'option.get_info'
+    
+    def __init__(
+        self,
+        api: Any,
+        path: str,
+        symbols: Iterable[str] = ('BTC', 'ETH'),
+        interval: Optional[float] = None,
+        max_errors: int = 10
+    ):
+        """
+        Initialize recorder.
+        
+        Args:
+            api: CoinGlass instance
+            path: Directory of the log (created on first use)
+            symbols: Symbols to sample
+            interval: Sample period in seconds (default: the endpoint's cache time)
+            max_errors: Consecutive fully failed samples before the thread gives up
+        """
+        self.api = api
+        self.symbols = list(symbols)
+        self.interval = interval or EndpointRegistry.get_cache_seconds(self.ENDPOINT) or 30
+        self.max_errors = max_errors
+        self.log = ColumnLog(path, fields=list(INFO_FIELDS))
+        self.errors: Dict[str, Exception] = {}
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def record_once(self, now: Optional[int] = None) -> int:
+        """
+        Take one sample of every symbol and append it.
+        
+        Args:
+            now: Sample timestamp in milliseconds (default: wall clock)
+        
+        Returns:
+            Number of rows written
+        """
+        calls = [(symbol, (), {'symbol': symbol}) for symbol in self.symbols]
+        results, self.errors = run_concurrently(
+            self.api.option.get_info, calls, rate_limiter=api_rate_limiter(self.api)
+        )
+        now = int(time.time() * 1000) if now is None else now
+        symbols, exchanges, rows = [], [], []
+        for symbol in self.symbols:
+            for row in info_rows(results.get(symbol)):
+                symbols.append(symbol)
+                exchanges.append(row['exchange'])
+                rows.append(row)
+        values = {}
+        for field, candidates in INFO_FIELDS.items():
+            values[field] = to_float_array(_value(row, candidates) for row in rows)
+        written = self.log.append([now] * len(rows), symbols, exchanges, values)
+        self.samples += 1
+        return written
+    
+    def start(self) -> 'OptionsInfoRecorder':
+        """Start sampling in a background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='options-info-recorder', daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the background thread and wait for it to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def __enter__(self) -> 'OptionsInfoRecorder':
+        return self.start()
+    
+    def __exit__(self, *exc):
+        self.stop()
+    
+    def _run(self):
+        failures = 0
+        while not self._stop.is_set():
+            try:
+                self.record_once()
+                failures = failures + 1 if len(self.errors) == len(self.symbols) else 0
+            except Exception as e:
+                failures += 1
+                logger.warning(f"Options info sample failed: {e}")
+            if failures > self.max_errors:
+                logger.error("Options info recorder stopped after repeated failures")
+                return
+            self._stop.wait(self._seconds_to_next_tick())
+    
+    def _seconds_to_next_tick(self) -> float:
+        """Time until just after the next cache refresh boundary."""
+        now = time.time()
+        offset = min(0.1 * self.interval, 0.25)
+        return max(0.0, (int(now // self.interval) + 1) * self.interval + offset - now)
+
+
+def _value(row: Dict[str, Any], candidates: Iterable[str]) -> Any:
+    field = first_field(row, candidates)
+    return None if field is None else row[field]
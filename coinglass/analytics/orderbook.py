@@ -0,0 +1,454 @@
+"""
+Orderbook depth history engine
+Columnar bid/ask depth series and delta-encoded book snapshots with vectorized metrics
+"""
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple
+
+import numpy as np
+
+from ._series import rows_to_columns, parse_time
+
+# Column name to candidate ask/bid history fields (plain and aggregated)
+DEPTH_FIELDS = {
+    'bids_usd': ('bids_usd', 'aggregated_bids_usd'),
+    'asks_usd': ('asks_usd', 'aggregated_asks_usd'),
+    'bids_quantity': ('bids_quantity', 'aggregated_bids_quantity'),
+    'asks_quantity': ('asks_quantity', 'aggregated_asks_quantity'),
+}
+
+DEFAULT_BANDS = (0.5, 1.0, 2.0)
+DEFAULT_KEYFRAME_EVERY = 100
+
+BID = 0
+ASK = 1
+
+
+class DepthHistory:
+    """
+    Bid/ask depth within a fixed range over time, as columnar arrays.
+    
+    Attributes:
+        times: Epoch-millisecond timestamps
+        bids_usd, asks_usd: Resting bid/ask value in USD
+        bids_quantity, asks_quantity: Resting bid/ask quantity
+    """
+    
+    def __init__(self, times: np.ndarray, columns: Dict[str, np.ndarray]):
+        self.times = times
+        self.bids_usd = columns['bids_usd']
+        self.asks_usd = columns['asks_usd']
+        self.bids_quantity = columns['bids_quantity']
+        self.asks_quantity = columns['asks_quantity']
+    
+    @classmethod
+    def from_rows(cls, rows: List[Dict[str, Any]]) -> 'DepthHistory':
+        """Decode get_ask_bids_history or get_aggregated_ask_bids_history rows."""
+        times, columns = rows_to_columns(rows, DEPTH_FIELDS)
+        return cls(times, columns)
+    
+    def __len__(self) -> int:
+        return len(self.times)
+    
+    def __repr__(self):
+        return f"DepthHistory({len(self.times)} bars)"
+    
+    @property
+    def imbalance(self) -> np.ndarray:
+        """(bids - asks) / (bids + asks) in USD, in [-1, 1]."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return (self.bids_usd - self.asks_usd) / (self.bids_usd + self.asks_usd)
+    
+    @property
+    def bid_ask_ratio(self) -> np.ndarray:
+        """Bids divided by asks in USD."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.bids_usd / self.asks_usd
+
+
+class BookHistory:
+    """
+    Full orderbook snapshots stored as per-level deltas.
+    
+    Each snapshot stores only the (side, price, quantity) levels that changed
+    since the previous snapshot (quantity 0 removes a level), with a full
+    keyframe every ``keyframe_every`` snapshots so any snapshot can be
+    rebuilt without replaying the whole history. Metrics are computed over
+    chunks of rebuilt snapshots laid out as padded (snapshot x level) arrays.
+    
+    Example:
+        >>> book = BookHistory.from_rows(cg.futures.orderbook.get_history('BTCUSDT', 'Binance'))
+        >>> metrics = book.metrics(bands=(0.5, 1.0))
+        >>> metrics['imbalance'], metrics['liquidity_1']
+    """
+    
+    def __init__(self, keyframe_every: int = DEFAULT_KEYFRAME_EVERY):
+        """
+        Initialize an empty history.
+        
+        Args:
+            keyframe_every: Store a full snapshot every this many snapshots
+        """
+        if keyframe_every <= 0:
+            raise ValueError("keyframe_every must be positive")
+        self.keyframe_every = keyframe_every
+        self._times: List[int] = []
+        self._indptr: List[int] = [0]
+        self._sides: List[np.ndarray] = []
+        self._prices: List[np.ndarray] = []
+        self._quantities: List[np.ndarray] = []
+        self._packed: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        self._previous: Tuple[np.ndarray, np.ndarray] = _empty_side(), _empty_side()
+        self._metrics: Dict[Tuple[float, ...], Dict[str, np.ndarray]] = {}
+    
+    @classmethod
+    def from_rows(
+        cls, rows: Iterable[Any], keyframe_every: int = DEFAULT_KEYFRAME_EVERY
+    ) -> 'BookHistory':
+        """
+        Build a history from orderbook.get_history rows.
+        
+        Rows are ``[time, bids, asks]`` lists or ``{'time', 'bids', 'asks'}``
+        dicts where bids and asks are lists of ``[price, quantity]``.
+        """
+        book = cls(keyframe_every)
+        for row in rows or []:
+            if isinstance(row, dict):
+                book.append(row.get('time'), row.get('bids') or [], row.get('asks') or [])
+            else:
+                book.append(row[0], row[1] or [], row[2] or [])
+        return book
+    
+    def __len__(self) -> int:
+        return len(self._times)
+    
+    def __repr__(self):
+        return f"BookHistory({len(self)} snapshots, {self.delta_count} level deltas)"
+    
+    @property
+    def times(self) -> np.ndarray:
+        """Epoch-millisecond timestamp of each snapshot."""
+        return np.array(self._times, dtype=np.int64)
+    
+    @property
+    def delta_count(self) -> int:
+        """Number of stored level deltas."""
+        return self._indptr[-1]
+    
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the encoded deltas, in bytes."""
+        sides, prices, quantities = self._pack()
+        return sides.nbytes + prices.nbytes + quantities.nbytes + 8 * len(self._indptr)
+    
+    def append(self, time: Any, bids: List[Any], asks: List[Any]):
+        """
+        Append one snapshot.
+        
+        Args:
+            time: Snapshot timestamp (seconds or milliseconds)
+            bids: [price, quantity] bid levels
+            asks: [price, quantity] ask levels
+        """
+        current = _decode_side(bids), _decode_side(asks)
+        keyframe = len(self._times) % self.keyframe_every == 0
+        count = 0
+        for side in (BID, ASK):
+            previous = _empty_side() if keyframe else self._previous[side]
+            prices, quantities = _side_delta(previous, current[side])
+            if len(prices):
+                self._sides.append(np.full(len(prices), side, dtype=np.int8))
+                self._prices.append(prices)
+                self._quantities.append(quantities)
+                count += len(prices)
+        self._previous = current
+        self._times.append(parse_time(time))
+        self._indptr.append(self._indptr[-1] + count)
+        self._packed = None
+        self._metrics = {}
+    
+    def snapshot(self, index: int) -> Dict[str, np.ndarray]:
+        """
+        Rebuild one snapshot.
+        
+        Returns:
+            Dict with bid_prices (descending), bid_quantities, ask_prices
+            (ascending) and ask_quantities
+        """
+        if index < 0:
+            index += len(self)
+        start = index - index % self.keyframe_every
+        for position, book in enumerate(self._replay(start, index + 1), start):
+            if position == index:
+                return book
+        raise IndexError(index)
+    
+    def metrics(
+        self, bands: Iterable[float] = DEFAULT_BANDS, levels: int = 10, chunk: int = 512
+    ) -> Dict[str, np.ndarray]:
+        """
+        Compute book metrics for every snapshot.
+        
+        Args:
+            bands: Percent distances from mid for liquidity and slope
+            levels: Levels per side used for the depth-weighted mid
+            chunk: Snapshots rebuilt and processed per vectorized step
+        
+        Returns:
+            Dict of arrays aligned with self.times: mid, spread, imbalance,
+            weighted_mid, and for each band X: 'bid_liquidity_X',
+            'ask_liquidity_X', 'liquidity_X' (USD within +/-X% of mid),
+            'imbalance_X' and 'slope_X' (average USD per percent of distance)
+        """
+        bands = tuple(float(band) for band in bands)
+        cache_key = bands + (float(levels),)
+        cached = self._metrics.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        parts: List[Dict[str, np.ndarray]] = []
+        for padded in self._padded_chunks(chunk):
+            parts.append(book_metrics(*padded, bands=bands, levels=levels))
+        if parts:
+            result = {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+        else:
+            result = book_metrics(*(np.empty((0, 0)),) * 4, bands=bands, levels=levels)
+        self._metrics[cache_key] = result
+        return result
+    
+    def _pack(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Concatenate delta chunks into flat arrays (cached until the next append)."""
+        if self._packed is None:
+            if self._prices:
+                self._sides = [np.concatenate(self._sides)]
+                self._prices = [np.concatenate(self._prices)]
+                self._quantities = [np.concatenate(self._quantities)]
+                self._packed = (self._sides[0], self._prices[0], self._quantities[0])
+            else:
+                self._packed = (np.empty(0, dtype=np.int8), np.empty(0), np.empty(0))
+        return self._packed
+    
+    def _replay(self, start: int, stop: int) -> Iterator[Dict[str, np.ndarray]]:
+        """Rebuild snapshots start..stop-1; start must be a keyframe."""
+        sides, prices, quantities = self._pack()
+        state: List[Dict[float, float]] = [{}, {}]
+        for index in range(start, stop):
+            if index % self.keyframe_every == 0:
+                state = [{}, {}]
+            lo, hi = self._indptr[index], self._indptr[index + 1]
+            for side, price, quantity in zip(
+                sides[lo:hi].tolist(), prices[lo:hi].tolist(), quantities[lo:hi].tolist()
+            ):
+                if quantity > 0:
+                    state[side][price] = quantity
+                else:
+                    state[side].pop(price, None)
+            bid_prices = np.array(sorted(state[BID], reverse=True))
+            ask_prices = np.array(sorted(state[ASK]))
+            yield {
+                'bid_prices': bid_prices,
+                'bid_quantities': np.array([state[BID][p] for p in bid_prices.tolist()]),
+                'ask_prices': ask_prices,
+                'ask_quantities': np.array([state[ASK][p] for p in ask_prices.tolist()]),
+            }
+    
+    def _padded_chunks(
+        self, chunk: int
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+        """Yield (bid_px, bid_qty, ask_px, ask_qty) NaN-padded arrays for chunks of snapshots."""
+        books = []
+        for book in self._replay(0, len(self)):
+            books.append(book)
+            if len(books) == chunk:
+                yield _pad(books)
+                books = []
+        if books:
+            yield _pad(books)
+
+
+def book_metrics(
+    bid_px: np.ndarray,
+    bid_qty: np.ndarray,
+    ask_px: np.ndarray,
+    ask_qty: np.ndarray,
+    bands: Iterable[float] = DEFAULT_BANDS,
+    levels: int = 10
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized book metrics over NaN-padded (snapshot x level) arrays.
+    
+    Bid arrays are sorted by descending price and ask arrays by ascending
+    price; quantities are in base units and converted to USD by price.
+    
+    Args:
+        bid_px, bid_qty, ask_px, ask_qty: Padded level arrays
+        bands: Percent distances from mid
+        levels: Levels per side used for the depth-weighted mid
+    
+    Returns:
+        Dict of per-snapshot arrays (see BookHistory.metrics)
+    """
+    n = bid_px.shape[0]
+    bid_usd = np.nan_to_num(bid_px * bid_qty)
+    ask_usd = np.nan_to_num(ask_px * ask_qty)
+    best_bid = bid_px[:, 0] if bid_px.shape[1] else np.full(n, np.nan)
+    best_ask = ask_px[:, 0] if ask_px.shape[1] else np.full(n, np.nan)
+    mid = (best_bid + best_ask) / 2
+    
+    total_bid = bid_usd.sum(axis=1)
+    total_ask = ask_usd.sum(axis=1)
+    top_bid_qty = np.nan_to_num(bid_qty[:, :levels])
+    top_ask_qty = np.nan_to_num(ask_qty[:, :levels])
+    weighted = (
+        (np.nan_to_num(bid_px[:, :levels]) * top_bid_qty).sum(axis=1)
+        + (np.nan_to_num(ask_px[:, :levels]) * top_ask_qty).sum(axis=1)
+    )
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result = {
+            'mid': mid,
+            'spread': best_ask - best_bid,
+            'imbalance': (total_bid - total_ask) / (total_bid + total_ask),
+            'weighted_mid': weighted / (top_bid_qty.sum(axis=1) + top_ask_qty.sum(axis=1)),
+        }
+        # Distance of each level from mid in percent (NaN for padding)
+        bid_dist = (mid[:, None] - bid_px) / mid[:, None] * 100
+        ask_dist = (ask_px - mid[:, None]) / mid[:, None] * 100
+        for band in bands:
+            label = f'{band:g}'
+            bid_in = np.where(bid_dist <= band, bid_usd, 0.0).sum(axis=1)
+            ask_in = np.where(ask_dist <= band, ask_usd, 0.0).sum(axis=1)
+            result[f'bid_liquidity_{label}'] = bid_in
+            result[f'ask_liquidity_{label}'] = ask_in
+            result[f'liquidity_{label}'] = bid_in + ask_in
+            result[f'imbalance_{label}'] = (bid_in - ask_in) / (bid_in + ask_in)
+            result[f'slope_{label}'] = (bid_in + ask_in) / (2 * band)
+    return result
+
+
+class OrderbookEngine:
+    """
+    Load orderbook depth and snapshot histories for futures or spot.
+    
+    Example:
+        >>> engine = OrderbookEngine(cg, market='futures')
+        >>> depth = engine.depth('Binance', 'BTCUSDT', '1h', limit=1000)
+        >>> depth.imbalance[-24:]
+        >>> book = engine.book('Binance', 'BTCUSDT')
+        >>> book.metrics()['weighted_mid']
+    """
+    
+    MARKETS = ('futures', 'spot')
+    
+    def __init__(
+        self, api: Any, market: str = 'futures', keyframe_every: int = DEFAULT_KEYFRAME_EVERY
+    ):
+        """
+        Initialize engine.
+        
+        Args:
+            api: CoinGlass instance
+            market: 'futures' or 'spot'
+            keyframe_every: Keyframe interval for book snapshot storage
+        """
+        if market not in self.MARKETS:
+            raise ValueError(f"Unknown market: {market}")
+        self.api = api
+        self.market = market
+        self.keyframe_every = keyframe_every
+    
+    @property
+    def _orderbook(self) -> Any:
+        return getattr(self.api, self.market).orderbook
+    
+    def depth(self, exchange: str, symbol: str, interval: str, **kwargs) -> DepthHistory:
+        """
+        Load bid/ask depth history for one pair.
+        
+        Args:
+            exchange: Exchange name (e.g., 'Binance')
+            symbol: Pair symbol (e.g., 'BTCUSDT')
+            interval: Interval (1m, 3m, 5m, 15m, 30m, 1h, 4h, 6h, 8h, 12h, 1d, 1w)
+            **kwargs: startTime, endTime, limit
+        
+        Returns:
+            DepthHistory
+        """
+        return DepthHistory.from_rows(
+            self._orderbook.get_ask_bids_history(exchange, symbol, interval, **kwargs)
+        )
+    
+    def aggregated_depth(
+        self, exchanges: Iterable[str], symbol: str, interval: str, **kwargs
+    ) -> DepthHistory:
+        """
+        Load bid/ask depth history aggregated across exchanges.
+        
+        Args:
+            exchanges: Exchange names (e.g., ['Binance', 'OKX'])
+            symbol: Coin symbol (e.g., 'BTC')
+            interval: Interval (1m, 3m, 5m, 15m, 30m, 1h, 4h, 6h, 8h, 12h, 1d, 1w)
+            **kwargs: startTime, endTime, limit
+        
+        Returns:
+            DepthHistory
+        """
+        rows = self._orderbook.get_aggregated_ask_bids_history(
+            ','.join(exchanges), symbol, interval, **kwargs
+        )
+        return DepthHistory.from_rows(rows)
+    
+    def book(self, exchange: str, symbol: str, **kwargs) -> BookHistory:
+        """
+        Load full book snapshots into delta-encoded storage.
+        
+        Args:
+            exchange: Exchange name (e.g., 'Binance')
+            symbol: Pair symbol (e.g., 'BTCUSDT')
+            **kwargs: startTime, endTime, limit
+        
+        Returns:
+            BookHistory
+        """
+        rows = self._orderbook.get_history(symbol, exchange, **kwargs)
+        return BookHistory.from_rows(rows, self.keyframe_every)
+
+
+def _empty_side() -> Tuple[np.ndarray, np.ndarray]:
+    return np.empty(0), np.empty(0)
+
+
+def _decode_side(levels: List[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """Decode [price, quantity] levels into price-sorted arrays, dropping empty levels."""
+    if not levels:
+        return _empty_side()
+    data = np.array([(float(level[0]), float(level[1])) for level in levels], dtype=np.float64)
+    data = data[data[:, 1] > 0]
+    prices, first = np.unique(data[:, 0], return_index=True)
+    return prices, data[first, 1]
+
+
+def _side_delta(
+    previous: Tuple[np.ndarray, np.ndarray],
+    current: Tuple[np.ndarray, np.ndarray]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Levels whose quantity changed between two price-sorted sides (0 = removed)."""
+    prices = np.union1d(previous[0], current[0])
+    before = np.zeros(len(prices))
+    after = np.zeros(len(prices))
+    before[np.searchsorted(prices, previous[0])] = previous[1]
+    after[np.searchsorted(prices, current[0])] = current[1]
+    changed = before != after
+    return prices[changed], after[changed]
+
+
+def _pad(
+    books: List[Dict[str, np.ndarray]],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Stack rebuilt snapshots into NaN-padded (snapshot x level) arrays."""
+    out = []
+    for field in ('bid_prices', 'bid_quantities', 'ask_prices', 'ask_quantities'):
+        width = max(len(book[field]) for book in books)
+        matrix = np.full((len(books), width), np.nan)
+        for row, book in enumerate(books):
+            matrix[row, :len(book[field])] = book[field]
+        out.append(matrix)
+    return tuple(out)
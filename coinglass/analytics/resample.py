@@ -0,0 +1,329 @@
+"""
+Multi-interval OHLC resampling
+Builds coarser candles (price, volume and open interest OHLC) from a cached finer series
+and falls back to the API only when the cached data cannot cover a request
+"""
+import time
+from typing import Optional, Dict, Any, Iterable, Tuple
+
+import numpy as np
+
+from ._series import MS_PER_DAY, interval_ms, rows_to_columns
+
+# Weekly candles open on Monday 00:00 UTC (the epoch began on a Thursday)
+WEEK_OFFSET_MS = 4 * MS_PER_DAY
+
+# Column name to candidate response fields per series kind
+KIND_FIELDS = {
+    'price': {
+        'open': ('open',),
+        'high': ('high',),
+        'low': ('low',),
+        'close': ('close',),
+        'volume_usd': ('volume_usd', 'volume'),
+    },
+    'oi': {
+        'open': ('open',),
+        'high': ('high',),
+        'low': ('low',),
+        'close': ('close',),
+    },
+}
+
+# Column name to aggregation ('first', 'max', 'min', 'last' or 'sum'); other columns use 'last'
+AGGREGATIONS = {
+    'open': 'first',
+    'high': 'max',
+    'low': 'min',
+    'close': 'last',
+    'volume': 'sum',
+    'volume_usd': 'sum',
+}
+
+# Most bars one history call returns
+MAX_LIMIT = 1000
+
+# Bars assumed for a request without limit or startTime (the API maximum)
+DEFAULT_LIMIT = MAX_LIMIT
+
+Series = Tuple[np.ndarray, Dict[str, np.ndarray]]
+
+
+def bucket_start(times: np.ndarray, interval: str) -> np.ndarray:
+    """
+    Open time of the UTC-aligned candle containing each timestamp.
+    
+    Args:
+        times: Epoch-millisecond timestamps
+        interval: Candle interval (e.g., '4h'); '1w' candles open on Monday
+    
+    Returns:
+        int64 array of candle open times
+    """
+    step = interval_ms(interval)
+    offset = WEEK_OFFSET_MS if interval == '1w' else 0
+    times = np.asarray(times, dtype=np.int64)
+    return (times - offset) // step * step + offset
+
+
+def can_resample(source: str, target: str) -> bool:
+    """Check whether candles of one interval tile candles of another exactly."""
+    source_ms, target_ms = interval_ms(source), interval_ms(target)
+    return target_ms > source_ms and target_ms % source_ms == 0
+
+
+def resample(
+    times: np.ndarray,
+    columns: Dict[str, np.ndarray],
+    target: str,
+    source: Optional[str] = None,
+    aggregations: Optional[Dict[str, str]] = None
+) -> Tuple[np.ndarray, Dict[str, np.ndarray], np.ndarray]:
+    """
+    Aggregate sorted candles into coarser UTC-aligned candles.
+    
+    Each column is reduced over its candle with one reduceat pass. High/low
+    ignore NaN; sums treat NaN as zero.
+    
+    Args:
+        times: Sorted candle open times in milliseconds
+        columns: Column name to values aligned with times
+        target: Target interval (e.g., '1h')
+        source: Interval of the input candles; when given, candles with
+            missing input bars are reported as incomplete
+        aggregations: Per-column overrides of AGGREGATIONS
+    
+    Returns:
+        Tuple of (candle open times, {column: values}, complete flags)
+    """
+    times = np.asarray(times, dtype=np.int64)
+    if len(times) == 0:
+        return times, {name: np.empty(0) for name in columns}, np.empty(0, dtype=bool)
+    how = dict(AGGREGATIONS, **(aggregations or {}))
+    buckets = bucket_start(times, target)
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(times)]
+    
+    out = {}
+    for name, values in columns.items():
+        values = np.asarray(values, dtype=np.float64)
+        method = how.get(name, 'last')
+        if method == 'first':
+            out[name] = values[starts]
+        elif method == 'last':
+            out[name] = values[ends - 1]
+        elif method == 'max':
+            out[name] = np.fmax.reduceat(values, starts)
+        elif method == 'min':
+            out[name] = np.fmin.reduceat(values, starts)
+        elif method == 'sum':
+            out[name] = np.add.reduceat(np.nan_to_num(values), starts)
+        else:
+            raise ValueError(f"Unknown aggregation: {method}")
+    
+    if source is None:
+        complete = np.ones(len(starts), dtype=bool)
+    else:
+        complete = (ends - starts) == interval_ms(target) // interval_ms(source)
+    return buckets[starts], out, complete
+
+
+class OHLCResampler:
+    """
+    Fetch candles at several intervals while calling the API as little as possible.
+    
+    Every series fetched from the API is cached per (kind, exchange, symbol,
+    interval). A request for a coarser interval is answered by resampling
+    the finest fresh cached series that tiles it and covers the requested
+    range; otherwise the API is called and its result cached in turn.
+    get_many() plans the calls: the finest interval is fetched far enough
+    back to cover every coarser interval it tiles within one call.
+    
+    Example:
+        >>> resampler = OHLCResampler(cg)
+        >>> candles = resampler.get_many('BTCUSDT', 'Binance', ['1m', '5m', '15m', '1h'], limit=60)
+        >>> times, columns = candles['15m']
+        >>> resampler.stats
+        {'api': 2, 'resampled': 2}
+    """
+    
+    MARKETS = ('futures', 'spot')
+    
+    def __init__(self, api: Any, market: str = 'futures', max_age: float = 60.0):
+        """
+        Initialize resampler.
+        
+        Args:
+            api: CoinGlass instance
+            market: 'futures' or 'spot' (open interest is futures only)
+            max_age: Seconds a cached series may be reused as a resampling source
+        """
+        if market not in self.MARKETS:
+            raise ValueError(f"Unknown market: {market}")
+        self.api = api
+        self.market = market
+        self.max_age = max_age
+        self.stats = {'api': 0, 'resampled': 0}
+        self._cache: Dict[Tuple[str, str, str, str], Tuple[float, Series]] = {}
+    
+    def get(
+        self, symbol: str, exchange: str, interval: str, kind: str = 'price', **kwargs
+    ) -> Series:
+        """
+        Get candles of one interval, resampled from cached data when possible.
+        
+        Args:
+            symbol: Pair symbol (e.g., 'BTCUSDT')
+            exchange: Exchange name (e.g., 'Binance')
+            interval: Candle interval
+            kind: 'price' (OHLC and volume) or 'oi' (open interest OHLC)
+            **kwargs: Optional parameters:
+                - startTime (int): Start timestamp in milliseconds
+                - endTime (int): End timestamp in milliseconds
+                - limit (int): Number of results (max: 1000)
+        
+        Returns:
+            Tuple of (candle open times, {column: values})
+        """
+        if kind not in KIND_FIELDS:
+            raise ValueError(f"Unknown kind: {kind}")
+        resampled = self._from_cache(kind, exchange, symbol, interval, kwargs)
+        if resampled is not None:
+            self.stats['resampled'] += 1
+            return resampled
+        series = self._fetch(kind, exchange, symbol, interval, kwargs)
+        self.stats['api'] += 1
+        self._cache[(kind, exchange, symbol, interval)] = (time.time(), series)
+        return series
+    
+    def get_many(
+        self,
+        symbol: str,
+        exchange: str,
+        intervals: Iterable[str],
+        kind: str = 'price',
+        **kwargs
+    ) -> Dict[str, Series]:
+        """
+        Get candles of several intervals with as few API calls as possible.
+        
+        The finest pending interval is fetched once, with its limit raised
+        (up to MAX_LIMIT bars) so that it also covers every coarser interval
+        it tiles; those are resampled from it. Intervals it cannot cover start
+        the next group.
+        
+        Args:
+            symbol: Pair symbol (e.g., 'BTCUSDT')
+            exchange: Exchange name (e.g., 'Binance')
+            intervals: Candle intervals (e.g., Interval.ALL)
+            kind: 'price' or 'oi'
+            **kwargs: Optional parameters shared by every interval (see get)
+        
+        Returns:
+            Interval to (candle open times, {column: values})
+        """
+        pending = sorted(set(intervals), key=interval_ms)
+        out = {}
+        while pending:
+            base = pending[0]
+            bars = _bars_needed(base, base, kwargs)
+            group = [base]
+            for interval in pending[1:]:
+                needed = _bars_needed(base, interval, kwargs)
+                if can_resample(base, interval) and needed <= MAX_LIMIT:
+                    group.append(interval)
+                    bars = max(bars, needed)
+            params = dict(kwargs, limit=min(max(bars, kwargs.get('limit') or 0), MAX_LIMIT))
+            times, columns = self.get(symbol, exchange, base, kind, **params)
+            limit = kwargs.get('limit')
+            if limit and 'startTime' not in kwargs:
+                times, columns = times[-limit:], {
+                    name: values[-limit:] for name, values in columns.items()
+                }
+            out[base] = (times, columns)
+            for interval in group[1:]:
+                out[interval] = self.get(symbol, exchange, interval, kind, **kwargs)
+            pending = [interval for interval in pending if interval not in group]
+        return {interval: out[interval] for interval in sorted(out, key=interval_ms)}
+    
+    def clear(self):
+        """Drop all cached series."""
+        self._cache.clear()
+    
+    def _from_cache(
+        self,
+        kind: str,
+        exchange: str,
+        symbol: str,
+        interval: str,
+        kwargs: Dict[str, Any]
+    ) -> Optional[Series]:
+        """Resample the finest fresh cached series that covers the request, if any."""
+        now = time.time()
+        sources = sorted(
+            (interval_ms(source), source, series)
+            for (k, e, s, source), (fetched, series) in self._cache.items()
+            if (k, e, s) == (kind, exchange, symbol)
+            and now - fetched <= self.max_age and can_resample(source, interval)
+        )
+        for _, source, (times, columns) in sources:
+            starts, values, complete = resample(times, columns, interval, source)
+            selected = _select(starts, complete, kwargs)
+            if selected is not None:
+                return starts[selected], {name: column[selected] for name, column in values.items()}
+        return None
+    
+    def _fetch(
+        self, kind: str, exchange: str, symbol: str, interval: str, kwargs: Dict[str, Any]
+    ) -> Series:
+        """Fetch one series from the API."""
+        if kind == 'oi':
+            rows = self.api.futures.open_interest.get_history(exchange, symbol, interval, **kwargs)
+        else:
+            price = getattr(self.api, self.market).price
+            rows = price.get_history(symbol=symbol, interval=interval, exchange=exchange, **kwargs)
+        return rows_to_columns(rows, KIND_FIELDS[kind])
+
+
+def _bars_needed(source: str, target: str, kwargs: Dict[str, Any]) -> int:
+    """Source candles needed to answer a request for target candles."""
+    ratio = interval_ms(target) // interval_ms(source)
+    start = kwargs.get('startTime')
+    if start is None:
+        return (kwargs.get('limit') or DEFAULT_LIMIT) * ratio
+    end = kwargs.get('endTime') or int(time.time() * 1000)
+    return int((end - int(bucket_start(np.array([start]), target)[0])) // interval_ms(source)) + 1
+
+
+def _select(
+    starts: np.ndarray, complete: np.ndarray, kwargs: Dict[str, Any]
+) -> Optional[np.ndarray]:
+    """
+    Pick the resampled candles answering a request, or None if they fall short.
+    
+    The leading candle is dropped when incomplete (the cached series began
+    inside it); the trailing one may be partial, like the API's live candle.
+    """
+    if len(starts) and not complete[0]:
+        starts, offset = starts[1:], 1
+    else:
+        offset = 0
+    positions = np.arange(offset, offset + len(starts))
+    end = kwargs.get('endTime')
+    if end is not None:
+        keep = starts <= end
+        starts, positions = starts[keep], positions[keep]
+    if len(starts) == 0:
+        return None
+    start = kwargs.get('startTime')
+    limit = kwargs.get('limit')
+    if start is not None:
+        # The cached candles must reach back to startTime
+        if starts[0] > start:
+            return None
+        positions = positions[starts >= start]
+        return positions[:limit] if limit else positions
+    needed = limit or DEFAULT_LIMIT
+    if len(positions) < needed:
+        return None
+    return positions[-needed:]
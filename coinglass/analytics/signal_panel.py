@@ -0,0 +1,278 @@
+"""
+Composite signal panel
+Joins the whale index, CGDI and CDRI histories with price on one time axis
+and keeps rolling z-scores up to date incrementally
+"""
+from typing import List, Dict, Any, Tuple
+
+import numpy as np
+
+from ..fanout import api_rate_limiter, run_concurrently
+from ._series import rows_to_columns, union_index, reindex
+
+# Source name to candidate response fields of its value
+VALUE_FIELDS = {
+    'whale_index': ('whale_index_value', 'index_value', 'value'),
+    'cgdi': ('cgdi_index_value', 'index_value', 'value', 'data'),
+    'cdri': ('cdri_index_value', 'index_value', 'value', 'data'),
+    'price': ('close', 'price'),
+}
+
+SOURCES = tuple(VALUE_FIELDS)
+
+# Keys of the timestamp list in parallel-array payloads
+_TIME_LISTS = ('time_list', 'times', 'date_list', 'dates')
+
+
+def payload_rows(payload: Any) -> List[Dict[str, Any]]:
+    """
+    Normalize an index payload into a list of row dicts.
+    
+    Accepts a list of rows, a dict of parallel lists (e.g. {'time_list': [...],
+    'data_list': [...]}, giving rows with 'time' and 'data' fields), a dict
+    wrapping a row list under 'data'/'list', or a single snapshot dict.
+    """
+    if not payload:
+        return []
+    if isinstance(payload, list):
+        return payload
+    for key in ('data', 'list', 'data_list'):
+        if (
+            isinstance(payload.get(key), list)
+            and payload[key]
+            and isinstance(payload[key][0], dict)
+        ):
+            return payload[key]
+    time_key = next((key for key in _TIME_LISTS if isinstance(payload.get(key), list)), None)
+    if time_key is None:
+        return [payload]
+    lists = {
+        key[:-5] if key.endswith('_list') else key: values
+        for key, values in payload.items()
+        if isinstance(values, list) and key != time_key and len(values) == len(payload[time_key])
+    }
+    return [
+        dict({name: values[i] for name, values in lists.items()}, time=t)
+        for i, t in enumerate(payload[time_key])
+    ]
+
+
+def rolling_zscore(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing z-score over the last axis.
+    
+    Args:
+        values: 1-D or (series x time) array
+        window: Number of bars per window (including the current one)
+    
+    Returns:
+        Array of the same shape; NaN until a window holds no gaps, and where
+        the window has zero variance
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(values.shape, np.nan)
+    if values.shape[-1] < window:
+        return out
+    valid = ~np.isnan(values)
+    x = np.where(valid, values, 0.0)
+    
+    def sums(a):
+        cumsum = np.cumsum(a, axis=-1)
+        total = cumsum[..., window - 1:].copy()
+        total[..., 1:] -= cumsum[..., :-window]
+        return total
+    
+    count = sums(valid.astype(np.float64))
+    mean = sums(x) / window
+    variance = np.maximum(sums(x * x) / window - mean * mean, 0.0)
+    std = np.sqrt(variance)
+    current = values[..., window - 1:]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        z = (current - mean) / std
+    out[..., window - 1:] = np.where((count == window) & (std > 0), z, np.nan)
+    return out
+
+
+class SignalPanel:
+    """
+    Whale index, CGDI, CDRI and price of one pair on a common time axis.
+    
+    The four histories are fetched concurrently, normalized from their
+    differing payload shapes and joined as-of (each source carried forward)
+    onto the union of their timestamps. The joined columns are kept between
+    calls; update() refetches each source from its own last timestamp,
+    overwriting that observation (it may still have been forming), and
+    re-joins only from the earliest refetched observation (so a source that
+    publishes late replaces its carried-forward values). Cached z-scores
+    are recomputed from that point on only.
+    
+    Example:
+        >>> panel = SignalPanel(cg, 'Binance', 'BTCUSDT', interval='1d', window=30)
+        >>> panel.load(limit=365)
+        >>> panel['cgdi'][-5:]
+        >>> panel.zscores()['whale_index'][-5:]
+        >>> panel.update()
+    """
+    
+    def __init__(
+        self,
+        api: Any,
+        exchange: str = 'Binance',
+        symbol: str = 'BTCUSDT',
+        interval: str = '1d',
+        window: int = 30,
+        sources: Tuple[str, ...] = SOURCES
+    ):
+        """
+        Initialize panel.
+        
+        Args:
+            api: CoinGlass instance
+            exchange: Exchange of the whale index and price series
+            symbol: Pair symbol of the whale index and price series
+            interval: Interval of the whale index and price series
+            window: Rolling z-score window in bars
+            sources: Subset of 'whale_index', 'cgdi', 'cdri' and 'price'
+        """
+        unknown = set(sources) - set(SOURCES)
+        if unknown:
+            raise ValueError(f"Unknown sources: {sorted(unknown)}")
+        self.api = api
+        self.exchange = exchange
+        self.symbol = symbol
+        self.interval = interval
+        self.window = window
+        self.sources = tuple(sources)
+        self.times = np.empty(0, dtype=np.int64)
+        self.columns: Dict[str, np.ndarray] = {name: np.empty(0) for name in self.sources}
+        self.errors: Dict[str, Exception] = {}
+        self._raw: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._zscores: Dict[str, np.ndarray] = {}
+    
+    def load(self, **kwargs) -> 'SignalPanel':
+        """
+        Fetch every source and build the joined panel.
+        
+        Args:
+            **kwargs: Optional parameters for the whale index and price calls:
+                - startTime (int): Start timestamp in milliseconds
+                - endTime (int): End timestamp in milliseconds
+                - limit (int): Number of results (max: 1000)
+        
+        Returns:
+            self
+        """
+        self.times = np.empty(0, dtype=np.int64)
+        self.columns = {name: np.empty(0) for name in self.sources}
+        self._raw = {}
+        self._zscores = {}
+        self._append(self._fetch(self.sources, kwargs))
+        return self
+    
+    def update(self, **kwargs) -> np.ndarray:
+        """
+        Refetch each source from its last timestamp, overwrite that observation and join newer data.
+        
+        Args:
+            **kwargs: Optional parameters for the whale index and price calls (e.g., limit)
+        
+        Returns:
+            Timestamps added to the panel (past its previous end, or inside it
+            when a lagging source reports a new timestamp)
+        """
+        return self._append(self._fetch(self.sources, kwargs))
+    
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+    
+    def __len__(self) -> int:
+        return len(self.times)
+    
+    def zscores(self) -> Dict[str, np.ndarray]:
+        """
+        Rolling z-score of every column over the panel window.
+        
+        Computed values are cached; after update() only the appended
+        timestamps (and the window of history before them) are processed.
+        
+        Returns:
+            Column name to array aligned with self.times
+        """
+        for name, values in self.columns.items():
+            cached = self._zscores.get(name, np.empty(0))
+            done = len(cached)
+            if done == len(values):
+                continue
+            start = max(0, done - self.window + 1)
+            fresh = rolling_zscore(values[start:], self.window)[done - start:]
+            self._zscores[name] = np.concatenate([cached, fresh])
+        return dict(self._zscores)
+    
+    def to_dict(self) -> Dict[str, np.ndarray]:
+        """Joined panel as columns, with 'time' first."""
+        return dict({'time': self.times}, **self.columns)
+    
+    def _fetch(
+        self, sources: Tuple[str, ...], kwargs: Dict[str, Any]
+    ) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """Fetch the requested sources concurrently."""
+        futures = self.api.futures
+        
+        def fetch(source):
+            params = dict(kwargs)
+            if source in self._raw and len(self._raw[source][0]):
+                params.setdefault('startTime', int(self._raw[source][0][-1]))
+            if source == 'whale_index':
+                payload = futures.get_whale_index(
+                    self.exchange, self.symbol, self.interval, **params
+                )
+            elif source == 'price':
+                payload = futures.price.get_history(
+                    symbol=self.symbol, interval=self.interval, exchange=self.exchange, **params
+                )
+            elif source == 'cgdi':
+                payload = futures.get_cgdi_index()
+            else:
+                payload = futures.get_cdri_index()
+            times, columns = rows_to_columns(payload_rows(payload), {source: VALUE_FIELDS[source]})
+            return times, columns[source]
+        
+        calls = [(source, (source,), {}) for source in sources]
+        results, self.errors = run_concurrently(
+            fetch, calls, rate_limiter=api_rate_limiter(self.api)
+        )
+        return results
+    
+    def _append(self, decoded: Dict[str, Tuple[np.ndarray, np.ndarray]]) -> np.ndarray:
+        """Merge new source rows, overwriting a refetched last row, and re-join from there."""
+        since = None
+        for source, (times, values) in decoded.items():
+            if source in self._raw and len(self._raw[source][0]):
+                old_times, old_values = self._raw[source]
+                keep = times >= old_times[-1]
+                times, values = times[keep], values[keep]
+                end = len(old_times) - int(len(times) > 0 and times[0] == old_times[-1])
+                self._raw[source] = (
+                    np.concatenate([old_times[:end], times]),
+                    np.concatenate([old_values[:end], values]),
+                )
+            else:
+                self._raw[source] = (times, values)
+            if len(times):
+                since = times[0] if since is None else min(since, times[0])
+        if since is None:
+            return np.empty(0, dtype=np.int64)
+        
+        # A lagging source may land inside the joined range; re-join from there
+        start = int(np.searchsorted(self.times, since))
+        index = union_index(times[times >= since] for times, _ in self._raw.values())
+        added = np.setdiff1d(index, self.times[start:])
+        for source in self.sources:
+            times, values = self._raw.get(source, (np.empty(0, dtype=np.int64), np.empty(0)))
+            self.columns[source] = np.concatenate(
+                [self.columns[source][:start], reindex(times, values, index)]
+            )
+        self.times = np.concatenate([self.times[:start], index])
+        for name in self._zscores:
+            self._zscores[name] = self._zscores[name][:start]
+        return added
@@ -0,0 +1,214 @@
+"""
+Taker buy/sell flow analytics
+Merges futures and spot taker volume into one aligned panel with cumulative volume delta
+"""
+from typing import Optional, List, Dict, Any, Iterable, Tuple, Union
+
+import numpy as np
+
+from ..fanout import api_rate_limiter, run_concurrently
+from ._series import rows_to_columns, union_index, reindex
+
+# Column name to candidate response fields (per pair and aggregated)
+FLOW_FIELDS = {
+    'buy': (
+        'taker_buy_volume_usd',
+        'aggregated_buy_volume_usd',
+        'buy_volume_usd',
+        'buy_vol_usd',
+        'buy_volume',
+    ),
+    'sell': (
+        'taker_sell_volume_usd',
+        'aggregated_sell_volume_usd',
+        'sell_volume_usd',
+        'sell_vol_usd',
+        'sell_volume',
+    ),
+}
+
+MARKETS = ('futures', 'spot')
+
+# (market, exchange or list of exchanges, symbol)
+FlowSpec = Tuple[str, Union[str, Iterable[str]], str]
+Label = Tuple[str, str, str]
+
+
+class TakerFlowEngine:
+    """
+    Taker buy/sell volume panel across exchanges and markets.
+    
+    Every series is a (market, exchange, symbol) triple; a list of exchanges
+    selects the aggregated endpoint. All series are fetched concurrently and
+    stored as (series x time) buy and sell arrays on one time index, with
+    bars missing from a series counted as zero volume. update() refetches
+    the last loaded bar, which may still have been forming, overwrites it
+    and appends newer bars; cumulative volume delta continues from the bar
+    before.
+    
+    Example:
+        >>> engine = TakerFlowEngine(cg, interval='1h')
+        >>> engine.load([
+        ...     ('futures', 'Binance', 'BTCUSDT'),
+        ...     ('futures', 'OKX', 'BTC-USDT-SWAP'),
+        ...     ('spot', 'Binance', 'BTCUSDT'),
+        ... ], limit=500)
+        >>> engine.cvd()[:, -1]
+        >>> engine.market_cvd('spot')[-1]
+    """
+    
+    def __init__(self, api: Any, interval: str = '1h'):
+        """
+        Initialize engine.
+        
+        Args:
+            api: CoinGlass instance
+            interval: Bar interval used for every series
+        """
+        self.api = api
+        self.interval = interval
+        self.labels: List[Label] = []
+        self.times = np.empty(0, dtype=np.int64)
+        self.buy = np.empty((0, 0))
+        self.sell = np.empty((0, 0))
+        self.errors: Dict[Any, Exception] = {}
+        self._cvd = np.empty((0, 0))
+    
+    def load(self, specs: Iterable[FlowSpec], **kwargs) -> 'TakerFlowEngine':
+        """
+        Fetch and align every series.
+        
+        Args:
+            specs: (market, exchange, symbol) triples; market is 'futures' or
+                'spot', exchange a name or a list of names for the aggregated series
+            **kwargs: Optional parameters for each history call:
+                - startTime (int): Start timestamp in milliseconds
+                - endTime (int): End timestamp in milliseconds
+                - limit (int): Number of results (max: 1000)
+        
+        Returns:
+            self
+        """
+        self.labels = []
+        for market, exchange, symbol in specs:
+            if market not in MARKETS:
+                raise ValueError(f"Unknown market: {market}")
+            if not isinstance(exchange, str):
+                exchange = ','.join(exchange)
+            self.labels.append((market, exchange, symbol))
+        self.times = np.empty(0, dtype=np.int64)
+        self.buy = np.empty((len(self.labels), 0))
+        self.sell = np.empty((len(self.labels), 0))
+        self._cvd = np.empty((len(self.labels), 0))
+        self._append(self._fetch(kwargs))
+        return self
+    
+    def update(self, **kwargs) -> np.ndarray:
+        """
+        Refetch the last loaded bar, overwrite it and append newer bars.
+        
+        Args:
+            **kwargs: Optional parameters for each history call (e.g., limit)
+        
+        Returns:
+            Timestamps that were written (the overwritten bar first, if refetched)
+        """
+        if len(self.times):
+            kwargs.setdefault('startTime', int(self.times[-1]))
+        return self._append(self._fetch(kwargs))
+    
+    def delta(self) -> np.ndarray:
+        """Buy minus sell volume per bar, (series x time)."""
+        return self.buy - self.sell
+    
+    def cvd(self) -> np.ndarray:
+        """Cumulative volume delta since the first loaded bar, (series x time)."""
+        return self._cvd
+    
+    def buy_ratio(self) -> np.ndarray:
+        """Buy volume divided by total taker volume, (series x time)."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.buy / (self.buy + self.sell)
+    
+    def rows(self, market: Optional[str] = None, symbol: Optional[str] = None) -> np.ndarray:
+        """Row positions of series matching a market and/or symbol."""
+        return np.array([
+            i for i, (m, _, s) in enumerate(self.labels)
+            if (market is None or m == market) and (symbol is None or s == symbol)
+        ], dtype=np.intp)
+    
+    def market_cvd(self, market: Optional[str] = None) -> np.ndarray:
+        """Summed cumulative volume delta of a market ('futures', 'spot' or both)."""
+        return self._cvd[self.rows(market)].sum(axis=0)
+    
+    def contribution(self, market: Optional[str] = None) -> np.ndarray:
+        """
+        Each series' share of the summed volume delta per bar.
+        
+        Args:
+            market: Restrict to one market (rows outside it are NaN)
+        
+        Returns:
+            (series x time) array; NaN where the summed delta is zero
+        """
+        rows = self.rows(market)
+        delta = self.delta()
+        out = np.full(delta.shape, np.nan)
+        total = delta[rows].sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            out[rows] = np.where(total != 0, delta[rows] / total, np.nan)
+        return out
+    
+    def _fetch(
+        self, kwargs: Dict[str, Any]
+    ) -> Dict[Label, Tuple[np.ndarray, Dict[str, np.ndarray]]]:
+        """Fetch every series concurrently."""
+        
+        def fetch(market, exchange, symbol):
+            api = getattr(self.api, market)
+            if ',' in exchange:
+                rows = api.aggregated_taker_buy_sell_volume.get_history(
+                    exchange, symbol, self.interval, **kwargs
+                )
+            else:
+                rows = api.taker_buy_sell_volume.get_history(
+                    exchange, symbol, self.interval, **kwargs
+                )
+            return rows_to_columns(rows, FLOW_FIELDS)
+        
+        calls = [(label, label, {}) for label in self.labels]
+        results, self.errors = run_concurrently(
+            fetch, calls, rate_limiter=api_rate_limiter(self.api)
+        )
+        return results
+    
+    def _append(self, decoded: Dict[Label, Tuple[np.ndarray, Dict[str, np.ndarray]]]) -> np.ndarray:
+        """Align new bars, overwrite the last bar if refetched and extend the cumulative delta."""
+        new_index = union_index(times for times, _ in decoded.values())
+        if len(self.times):
+            new_index = new_index[new_index >= self.times[-1]]
+        if len(new_index) == 0:
+            return new_index
+        overlap = bool(len(self.times)) and new_index[0] == self.times[-1]
+        
+        buy = np.zeros((len(self.labels), len(new_index)))
+        sell = np.zeros((len(self.labels), len(new_index)))
+        for row, label in enumerate(self.labels):
+            if label not in decoded:
+                # A failed series keeps its previous value of the overwritten bar
+                if overlap:
+                    buy[row, 0], sell[row, 0] = self.buy[row, -1], self.sell[row, -1]
+                continue
+            times, columns = decoded[label]
+            buy[row] = np.nan_to_num(reindex(times, columns['buy'], new_index, 'none'))
+            sell[row] = np.nan_to_num(reindex(times, columns['sell'], new_index, 'none'))
+        if overlap:
+            self.buy, self.sell = self.buy[:, :-1], self.sell[:, :-1]
+            self._cvd, self.times = self._cvd[:, :-1], self.times[:-1]
+        
+        last = self._cvd[:, -1:] if self._cvd.shape[1] else np.zeros((len(self.labels), 1))
+        self._cvd = np.hstack([self._cvd, last + np.cumsum(buy - sell, axis=1)])
+        self.buy = np.hstack([self.buy, buy])
+        self.sell = np.hstack([self.sell, sell])
+        self.times = np.concatenate([self.times, new_index])
+        return new_index
@@ -0,0 +1,250 @@
+"""
+Local OI-weighted and volume-weighted funding aggregation
+Joins per-exchange funding, open interest and taker volume series on aligned timestamps
+and computes custom weighted funding rates with incremental updates
+"""
+from typing import Optional, List, Dict, Any, Iterable, Tuple
+
+import numpy as np
+
+from ..fanout import api_rate_limiter, run_concurrently
+from ._pairs import is_coin_margined, is_dated
+from ._series import rows_to_columns, union_index, reindex
+
+Pair = Tuple[str, str]
+
+# Column name to candidate response fields
+FUNDING_FIELDS = {'funding': ('close', 'funding_rate')}
+OI_FIELDS = {'oi': ('close', 'open_interest', 'open_interest_usd')}
+VOLUME_FIELDS = {
+    'buy': ('taker_buy_volume_usd', 'buy_volume_usd', 'buy_volume'),
+    'sell': ('taker_sell_volume_usd', 'sell_volume_usd', 'sell_volume'),
+}
+
+
+def weighted_average(values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Weighted mean over the first axis, ignoring NaN values and non-positive weights.
+    
+    Args:
+        values: Array of shape (series, time)
+        weights: Array of the same shape
+    
+    Returns:
+        Array of shape (time,), NaN where no series has a usable value
+    """
+    valid = ~np.isnan(values) & ~np.isnan(weights) & (weights > 0)
+    w = np.where(valid, weights, 0.0)
+    total = w.sum(axis=0)
+    weighted = np.where(valid, values, 0.0) * w
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(total > 0, weighted.sum(axis=0) / total, np.nan)
+
+
+class WeightedFundingEngine:
+    """
+    Funding rates weighted by open interest or taker volume over a custom pair set.
+    
+    Funding, OI and taker volume histories are fetched concurrently for every
+    selected (exchange, instrument) pair and stored as (pair x time) arrays
+    on one shared time index. Weighted series are computed in one vectorized
+    pass; update() refetches the last bar, which may still have been
+    forming, overwrites it, appends newer bars and only recomputes those
+    timestamps.
+    
+    Example:
+        >>> engine = WeightedFundingEngine(cg, interval='8h')
+        >>> pairs = engine.select_pairs('BTC', exchanges=['Binance', 'OKX', 'Bybit'])
+        >>> engine.load(pairs, limit=500)
+        >>> engine.weighted('oi')[-5:]
+    """
+    
+    WEIGHTINGS = ('oi', 'volume', 'equal')
+    
+    def __init__(self, api: Any, interval: str = '8h', fill: str = 'ffill'):
+        """
+        Initialize engine.
+        
+        Args:
+            api: CoinGlass instance
+            interval: Bar interval used for all three series
+            fill: Gap policy for missing bars: 'ffill' or 'none'
+        """
+        self.api = api
+        self.interval = interval
+        self.fill = fill
+        self.pairs: List[Pair] = []
+        self.times = np.empty(0, dtype=np.int64)
+        self.funding = np.empty((0, 0))
+        self.oi = np.empty((0, 0))
+        self.volume = np.empty((0, 0))
+        self.errors: Dict[Any, Exception] = {}
+        self._weighted: Dict[str, np.ndarray] = {}
+    
+    def select_pairs(
+        self,
+        symbol: str,
+        exchanges: Optional[Iterable[str]] = None,
+        exclude_coin_margined: bool = True
+    ) -> List[Pair]:
+        """
+        Pick perpetual pairs for a coin from the supported-pairs index.
+        
+        Args:
+            symbol: Base asset (e.g., 'BTC')
+            exchanges: Optional exchange subset
+            exclude_coin_margined: Drop inverse (coin-margined) contracts
+        
+        Returns:
+            List of (exchange, instrument_id) pairs
+        """
+        index = self.api.fanout.get_pair_index('futures', symbols=[symbol], exchanges=exchanges)
+        return [
+            (pair['exchange'], pair['instrument_id']) for pair in index
+            if not is_dated(pair) and not (exclude_coin_margined and is_coin_margined(pair))
+        ]
+    
+    def load(self, pairs: Iterable[Pair], **kwargs) -> 'WeightedFundingEngine':
+        """
+        Fetch and align history for every pair.
+        
+        Args:
+            pairs: (exchange, instrument_id) pairs
+            **kwargs: Optional parameters for each history call:
+                - startTime (int): Start timestamp in milliseconds
+                - endTime (int): End timestamp in milliseconds
+                - limit (int): Number of results (max: 1000)
+        
+        Returns:
+            self
+        """
+        self.pairs = list(pairs)
+        self.times = np.empty(0, dtype=np.int64)
+        shape = (len(self.pairs), 0)
+        self.funding, self.oi, self.volume = np.empty(shape), np.empty(shape), np.empty(shape)
+        self._weighted = {}
+        self._append(self._fetch(kwargs))
+        return self
+    
+    def update(self, **kwargs) -> np.ndarray:
+        """
+        Refetch the last loaded bar, overwrite it and append newer bars.
+        
+        Weighted series that were already computed are recomputed for the
+        written timestamps only.
+        
+        Args:
+            **kwargs: Optional parameters for each history call (e.g., limit)
+        
+        Returns:
+            Timestamps that were written (the overwritten bar first, if refetched)
+        """
+        if len(self.times):
+            kwargs.setdefault('startTime', int(self.times[-1]))
+        return self._append(self._fetch(kwargs))
+    
+    def weighted(self, weighting: str = 'oi') -> np.ndarray:
+        """
+        Get the weighted funding series.
+        
+        Args:
+            weighting: 'oi' (open interest), 'volume' (taker volume) or 'equal'
+        
+        Returns:
+            Array aligned with self.times
+        """
+        if weighting not in self.WEIGHTINGS:
+            raise ValueError(f"Unknown weighting: {weighting}")
+        cached = self._weighted.get(weighting)
+        if cached is None or len(cached) != len(self.times):
+            start = 0 if cached is None else len(cached)
+            fresh = self._compute(weighting, start)
+            cached = fresh if cached is None else np.concatenate([cached, fresh])
+            self._weighted[weighting] = cached
+        return cached
+    
+    def weights(self, weighting: str = 'oi') -> np.ndarray:
+        """Get normalized per-pair weights of shape (pair x time)."""
+        raw = self._weight_matrix(weighting, 0)
+        valid = ~np.isnan(self.funding) & ~np.isnan(raw) & (raw > 0)
+        w = np.where(valid, raw, 0.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return w / w.sum(axis=0)
+    
+    def _compute(self, weighting: str, start: int) -> np.ndarray:
+        """Weighted funding for columns from start onwards."""
+        return weighted_average(self.funding[:, start:], self._weight_matrix(weighting, start))
+    
+    def _weight_matrix(self, weighting: str, start: int) -> np.ndarray:
+        """Raw weights for columns from start onwards."""
+        if weighting == 'oi':
+            return self.oi[:, start:]
+        if weighting == 'volume':
+            return self.volume[:, start:]
+        return np.ones_like(self.funding[:, start:])
+    
+    def _fetch(
+        self, kwargs: Dict[str, Any]
+    ) -> Dict[str, Dict[Pair, Tuple[np.ndarray, Dict[str, np.ndarray]]]]:
+        """Fetch the three histories for every pair concurrently."""
+        futures = self.api.futures
+        sources = {
+            'funding': (futures.funding_rate.get_history, FUNDING_FIELDS),
+            'oi': (futures.open_interest.get_history, OI_FIELDS),
+            'volume': (futures.taker_buy_sell_volume.get_history, VOLUME_FIELDS),
+        }
+        
+        def fetch(source, exchange, instrument):
+            func, fields = sources[source]
+            return rows_to_columns(func(exchange, instrument, self.interval, **kwargs), fields)
+        
+        calls = [
+            ((source, pair), (source,) + pair, {})
+            for source in sources for pair in self.pairs
+        ]
+        results, self.errors = run_concurrently(
+            fetch, calls, rate_limiter=api_rate_limiter(self.api)
+        )
+        decoded = {source: {} for source in sources}
+        for (source, pair), columns in results.items():
+            decoded[source][pair] = columns
+        return decoded
+    
+    def _append(self, decoded) -> np.ndarray:
+        """Align freshly decoded series, overwrite the last bar if refetched and append the rest."""
+        last = self.times[-1] if len(self.times) else None
+        new_index = union_index(times for times, _ in decoded['funding'].values())
+        if last is not None:
+            new_index = new_index[new_index >= last]
+        if len(new_index) == 0:
+            return new_index
+        overlap = last is not None and new_index[0] == last
+        
+        def block(source, column, previous):
+            out = np.full((len(self.pairs), len(new_index)), np.nan)
+            for row, pair in enumerate(self.pairs):
+                if overlap and pair not in decoded[source]:
+                    # A failed series keeps its previous value of the overwritten bar
+                    out[row, 0] = previous[row, -1]
+                    continue
+                times, columns = decoded[source].get(pair, (np.empty(0, dtype=np.int64), {}))
+                if column == 'volume':
+                    values = columns['buy'] + columns['sell'] if len(times) else np.empty(0)
+                else:
+                    values = columns.get(column, np.empty(0))
+                out[row] = reindex(times, values, new_index, self.fill)
+            if self.fill == 'ffill' and previous.shape[1]:
+                # Carry values across the boundary with the existing history
+                out = np.where(np.isnan(out), previous[:, -1:], out)
+            return out
+        
+        funding = block('funding', 'funding', self.funding)
+        oi = block('oi', 'oi', self.oi)
+        volume = block('volume', 'volume', self.volume)
+        keep = len(self.times) - overlap
+        self.funding = np.hstack([self.funding[:, :keep], funding])
+        self.oi = np.hstack([self.oi[:, :keep], oi])
+        self.volume = np.hstack([self.volume[:, :keep], volume])
+        self.times = np.concatenate([self.times[:keep], new_index])
+        self._weighted = {weighting: cached[:keep] for weighting, cached in self._weighted.items()}
+        return new_index
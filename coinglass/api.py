@@ -68,7 +68,8 @@ class CoinGlass:
         timeout: int = 30,
         max_retries: int = 3,
         session: Optional[requests.Session] = None,
-        plan_level: Optional[int] = None
+        plan_level: Optional[int] = None,
+        rate_limit: Optional[int] = None
     ):
         """
         Initialize CoinGlass API interface.
@@ -80,20 +81,25 @@ class CoinGlass:
             max_retries: Maximum number of retry attempts for failed requests
             session: Optional requests.Session to use for HTTP requests
             plan_level: Your API plan level (1-5). If not provided, will look for PLAN_LEVEL env var.
+            rate_limit: Maximum requests per minute for every request made through the client.
+                None (the default) or 0 leaves requests unthrottled; the concurrent
+                fan-out helpers (cg.fanout) then pace themselves to the plan level's limit.
         """
+        # Store plan level (default to 1 if not specified)
+        import os
+        self.plan_level = plan_level or int(os.getenv('PLAN_LEVEL', '1'))
+        
         # Initialize base client
+        from .constants import PlanLevel
         self.client = CoinGlassClient(
             api_key=api_key,
             base_url=base_url,
             timeout=timeout,
             max_retries=max_retries,
-            session=session
+            session=session,
+            rate_limit=rate_limit or None
         )
         
-        # Store plan level (default to 1 if not specified)
-        import os
-        self.plan_level = plan_level or int(os.getenv('PLAN_LEVEL', '1'))
-        
         # Initialize endpoint registry
         self.endpoint_registry = EndpointRegistry()
         
@@ -112,6 +118,12 @@ class CoinGlass:
         # Initialize borrow interest rate API
         from .borrow_interest_rate import BorrowInterestRateAPI
         self.borrow_interest_rate = BorrowInterestRateAPI(self.client)
+        
+        # Initialize concurrent multi-pair helpers
+        # (paced to the plan's limit unless the client is already rate limited)
+        from .fanout import FanOutAPI
+        fanout_rate_limit = None if self.client.rate_limiter else PlanLevel.get_rate_limit(self.plan_level)
+        self.fanout = FanOutAPI(self.client, rate_limit=fanout_rate_limit)
     
     # Top-level indicator methods
     def get_coinbase_premium_index(self, interval: Optional[str] = None, **kwargs):
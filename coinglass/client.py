@@ -5,6 +5,7 @@ Base client for interacting with the CoinGlass API v4
 import os
 import time
 import logging
+import threading
 from typing import Optional, Dict, Any, Union
 from urllib.parse import urljoin, urlencode
 import requests
@@ -16,6 +17,39 @@ from .exceptions import CoinGlassAPIError
 logger = logging.getLogger(__name__)
 
 
+class RateLimiter:
+    """
+    Thread-safe request spacer.
+    
+    Spreads requests evenly so that no more than ``requests_per_minute``
+    are issued in any minute, regardless of how many threads share it.
+    """
+    
+    def __init__(self, requests_per_minute: int):
+        """
+        Initialize rate limiter.
+        
+        Args:
+            requests_per_minute: Maximum number of requests per minute
+        """
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be positive")
+        self.requests_per_minute = requests_per_minute
+        self.interval = 60.0 / requests_per_minute
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until the caller may issue its next request."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+
+
 class CoinGlassClient:
     """
     Base client for CoinGlass API v4
@@ -34,7 +68,8 @@ class CoinGlassClient:
         base_url: Optional[str] = None,
         timeout: int = DEFAULT_TIMEOUT,
         max_retries: int = MAX_RETRIES,
-        session: Optional[requests.Session] = None
+        session: Optional[requests.Session] = None,
+        rate_limit: Optional[int] = None
     ):
         """
         Initialize CoinGlass API client.
@@ -45,6 +80,8 @@ class CoinGlassClient:
             timeout: Request timeout in seconds
             max_retries: Maximum number of retry attempts for failed requests
             session: Optional requests.Session to use for HTTP requests
+            rate_limit: Optional maximum requests per minute. Requests are spaced
+                evenly (across threads) when set; unlimited when None.
         """
         self.api_key = api_key or os.environ.get('CG_API_KEY')
         if not self.api_key:
@@ -55,6 +92,7 @@ class CoinGlassClient:
         self.base_url = base_url or self.BASE_URL
         self.timeout = timeout
         self.max_retries = max_retries
+        self.rate_limiter = RateLimiter(rate_limit) if rate_limit else None
         
         # Setup session with retry strategy
         if session is None:
@@ -116,6 +154,10 @@ class CoinGlassClient:
         if 'timeout' not in kwargs:
             kwargs['timeout'] = self.timeout
         
+        # Wait for a free slot under the rate limit
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        
         # Log the request
         logger.debug(f"{method} {url} with params: {params}")
         
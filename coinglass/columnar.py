@@ -0,0 +1,153 @@
+"""
+Columnar tables for CoinGlass responses
+Keeps only the requested fields, stored as compact typed arrays
+"""
+import math
+from array import array
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Union
+
+Column = Union[array, List[Any]]
+
+
+class ColumnTable:
+    """
+    Column-oriented table holding a subset of fields from response rows.
+    
+    Fields whose values are all JSON numbers are stored as ``array('d')``
+    (8 bytes per value, NaN for missing values); other fields, including
+    numeric-looking strings, are kept as lists. Compared to a list of
+    dicts this drops per-row dict overhead and the unused columns, and
+    serializes without repeating field names for every row.
+    
+    Example:
+        >>> table = cg.futures.get_coins_markets(fields=['symbol', 'open_interest_usd'])
+        >>> table['open_interest_usd'][0]
+        55002072334.9376
+    """
+    
+    __slots__ = ('fields', 'columns', '_length')
+    
+    def __init__(self, columns: Dict[str, Column]):
+        """
+        Initialize table from columns.
+        
+        Args:
+            columns: Mapping of field name to column (all of equal length)
+        """
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length")
+        self.fields = list(columns)
+        self.columns = columns
+        self._length = lengths.pop() if lengths else 0
+    
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]], fields: Iterable[str]) -> 'ColumnTable':
+        """
+        Build a table from response rows, keeping only the given fields.
+        
+        Args:
+            rows: Decoded rows (list of dicts)
+            fields: Field names to keep
+        
+        Returns:
+            ColumnTable with one column per field
+        
+        Raises:
+            ValueError: If a field is missing from every row (likely misspelled)
+        """
+        rows = rows if isinstance(rows, list) else list(rows)
+        fields = list(fields)
+        if rows:
+            missing = [field for field in fields if not any(field in row for row in rows)]
+            if missing:
+                raise ValueError(f"Fields missing from every row: {missing}")
+        return cls({field: _build_column([row.get(field) for row in rows]) for field in fields})
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    def __getitem__(self, field: str) -> Column:
+        return self.columns[field]
+    
+    def __contains__(self, field: str) -> bool:
+        return field in self.columns
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over rows as dicts."""
+        for index in range(self._length):
+            yield self.row(index)
+    
+    def __repr__(self):
+        return f"ColumnTable({self._length} rows x {self.fields})"
+    
+    def row(self, index: int) -> Dict[str, Any]:
+        """Get one row as a dict."""
+        return {field: self.columns[field][index] for field in self.fields}
+    
+    def select(self, *fields: str) -> 'ColumnTable':
+        """Get a table with a subset of the columns (columns are shared, not copied)."""
+        return ColumnTable({field: self.columns[field] for field in fields})
+    
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by numeric columns, in bytes."""
+        return sum(
+            column.itemsize * len(column)
+            for column in self.columns.values() if isinstance(column, array)
+        )
+    
+    def to_dict(self) -> Dict[str, List[Any]]:
+        """Convert to a JSON-serializable mapping of field name to list of values."""
+        return {
+            field: [None if value != value else value for value in column]
+            if isinstance(column, array) else list(column)
+            for field, column in self.columns.items()
+        }
+    
+    def to_rows(self) -> List[Dict[str, Any]]:
+        """Convert back to a list of dicts."""
+        return list(self)
+    
+    def to_numpy(self) -> Dict[str, Any]:
+        """
+        Convert columns to NumPy arrays (zero-copy for numeric columns).
+        
+        Requires numpy to be installed.
+        """
+        import numpy as np
+        return {
+            field: np.frombuffer(column, dtype=np.float64) if isinstance(column, array)
+            else np.asarray(column, dtype=object)
+            for field, column in self.columns.items()
+        }
+
+
+def project(rows: Optional[List[Dict[str, Any]]], fields: Optional[Iterable[str]]) -> Any:
+    """
+    Prune rows to the requested fields when a projection is given.
+    
+    Args:
+        rows: Decoded response rows
+        fields: Field names to keep, or None to return rows unchanged
+    
+    Returns:
+        ColumnTable if fields are given, otherwise the rows themselves
+    """
+    if fields is None:
+        return rows
+    return ColumnTable.from_rows(rows or [], fields)
+
+
+def _build_column(values: List[Any]) -> Column:
+    """Store values as array('d') when all present values are JSON numbers (not str or bool)."""
+    numeric = array('d')
+    append = numeric.append
+    for value in values:
+        if value is None:
+            append(math.nan)
+        elif value.__class__ is float or value.__class__ is int:
+            append(value)
+        else:
+            return values
+    return numeric
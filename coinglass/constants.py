@@ -20,6 +20,15 @@ class PlanLevel:
         5: "Enterprise"
     }
     
+    # Requests per minute allowed for each plan level
+    LEVEL_TO_RATE_LIMIT = {
+        1: 30,
+        2: 80,
+        3: 300,
+        4: 1200,
+        5: 6000
+    }
+    
     NAME_TO_LEVEL = {
         "Hobbyist": 1,
         "Startup": 2,
@@ -38,6 +47,11 @@ class PlanLevel:
         """Get level number from plan name."""
         return cls.NAME_TO_LEVEL.get(name, 1)
     
+    @classmethod
+    def get_rate_limit(cls, level: int) -> int:
+        """Get the requests-per-minute limit for a plan level."""
+        return cls.LEVEL_TO_RATE_LIMIT.get(level, cls.LEVEL_TO_RATE_LIMIT[1])
+    
     @classmethod
     def meets_requirement(cls, user_level: int, required_level: int) -> bool:
         """Check if user's plan level meets the requirement."""
@@ -122,4 +136,21 @@ class CacheTime:
     THIRTY_SECONDS = "Every 30 seconds"
     ONE_MINUTE = "Every 1 minute"
     ONE_HOUR = "Every 1 hour"
-    DAILY = "Daily updates"
\ No newline at end of file
+    DAILY = "Daily updates"
+    
+    # Refresh period in seconds for each cache time (0 means real-time)
+    SECONDS = {
+        REALTIME: 0,
+        ONE_SECOND: 1,
+        TEN_SECONDS: 10,
+        TWENTY_SECONDS: 20,
+        THIRTY_SECONDS: 30,
+        ONE_MINUTE: 60,
+        ONE_HOUR: 3600,
+        DAILY: 86400
+    }
+    
+    @classmethod
+    def to_seconds(cls, cache_time: str) -> int:
+        """Get the refresh period in seconds for a cache time."""
+        return cls.SECONDS.get(cache_time, 0)
\ No newline at end of file
@@ -3,7 +3,7 @@ CoinGlass API Endpoints Registry
 Centralized registry of all API endpoints with their plan level requirements
 """
 from typing import Dict, List, Optional
-from .constants import PlanLevel
+from .constants import PlanLevel, CacheTime
 
 
 class EndpointRegistry:
@@ -185,6 +185,26 @@ class EndpointRegistry:
         "get_bitcoin_rainbow_chart": 1,  # All plans
     }
     
+    # Server-side cache refresh rates for endpoints that document one
+    CACHE_TIMES = {
+        "futures.get_cgdi_index": CacheTime.REALTIME,
+        "futures.get_cdri_index": CacheTime.REALTIME,
+        "futures.open_interest.get_exchange_list": CacheTime.TEN_SECONDS,
+        "futures.funding_rate.get_exchange_list": CacheTime.TWENTY_SECONDS,
+        "futures.funding_rate.get_arbitrage": CacheTime.THIRTY_SECONDS,
+        "futures.liquidation.get_order": CacheTime.ONE_SECOND,
+        "futures.orderbook.get_large_limit_order": CacheTime.TEN_SECONDS,
+        "futures.rsi.get_list": CacheTime.TEN_SECONDS,
+        "spot.get_supported_coins": CacheTime.ONE_MINUTE,
+        "spot.orderbook.get_large_limit_order": CacheTime.TEN_SECONDS,
+        "option.get_max_pain": CacheTime.ONE_MINUTE,
+        "option.get_info": CacheTime.THIRTY_SECONDS,
+        "exchange.get_assets": CacheTime.ONE_HOUR,
+        "index.get_fear_greed_history": CacheTime.DAILY,
+        "hyperliquid.get_whale_alert": CacheTime.REALTIME,
+        "hyperliquid.get_whale_position": CacheTime.REALTIME,
+    }
+    
     @classmethod
     def get_all_endpoints(cls) -> Dict[str, int]:
         """
@@ -241,6 +261,35 @@ class EndpointRegistry:
         """
         return cls.ENDPOINTS.get(endpoint_name)
     
+    @classmethod
+    def get_cache_time(cls, endpoint_name: str) -> Optional[str]:
+        """
+        Get the server-side cache refresh rate for an endpoint.
+        
+        Args:
+            endpoint_name: Name of the endpoint
+            
+        Returns:
+            CacheTime value or None if the endpoint does not document one
+        """
+        return cls.CACHE_TIMES.get(endpoint_name)
+    
+    @classmethod
+    def get_cache_seconds(cls, endpoint_name: str) -> Optional[int]:
+        """
+        Get the server-side cache refresh period of an endpoint in seconds.
+        
+        Args:
+            endpoint_name: Name of the endpoint
+            
+        Returns:
+            Refresh period in seconds (0 for real-time) or None if unknown
+        """
+        cache_time = cls.get_cache_time(endpoint_name)
+        if cache_time is None:
+            return None
+        return CacheTime.to_seconds(cache_time)
+    
     @classmethod
     def get_endpoints_by_level(cls, level: int) -> List[str]:
         """
@@ -0,0 +1,335 @@
+"""
+Concurrent fan-out helpers for CoinGlass
+Run per-symbol and per-pair endpoints across many symbols and exchanges at once
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Any, Callable, Iterable, Tuple, Sequence
+
+from .client import CoinGlassClient, RateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Keep below the default urllib3 connection pool size (10)
+DEFAULT_MAX_WORKERS = 8
+
+
+class FanOutResult(dict):
+    """
+    Combined fan-out result keyed by ``(exchange, symbol)``.
+    
+    Calls that failed are left out of the mapping and recorded in ``errors``
+    (per-coin calls use ``('*', symbol)``), so one unsupported pair does not
+    abort the batch.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.errors: Dict[Tuple[str, str], Exception] = {}
+    
+    def exchanges(self) -> List[str]:
+        """Get the distinct exchanges present in the result."""
+        return sorted({exchange for exchange, _ in self})
+    
+    def symbols(self) -> List[str]:
+        """Get the distinct symbols present in the result."""
+        return sorted({symbol for _, symbol in self})
+
+
+def run_concurrently(
+    func: Callable[..., Any],
+    calls: Sequence[Tuple[Any, Tuple[Any, ...], Dict[str, Any]]],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    rate_limiter: Optional[RateLimiter] = None
+) -> Tuple[Dict[Any, Any], Dict[Any, Exception]]:
+    """
+    Run ``func`` once per call on a thread pool.
+    
+    Calls are paced by ``rate_limiter`` when given, on top of the client's
+    own limiter (if the client was created with ``rate_limit``).
+    
+    Args:
+        func: Callable to invoke (usually a bound API method)
+        calls: Sequence of ``(key, args, kwargs)`` tuples
+        max_workers: Maximum number of concurrent requests
+        rate_limiter: Optional limiter acquired before every call
+    
+    Returns:
+        Tuple of (results by key, exceptions by key)
+    """
+    results: Dict[Any, Any] = {}
+    errors: Dict[Any, Exception] = {}
+    if not calls:
+        return results, errors
+    
+    call = func
+    if rate_limiter is not None:
+        def call(*args, **kwargs):
+            rate_limiter.acquire()
+            return func(*args, **kwargs)
+    
+    workers = max(1, min(max_workers, len(calls)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            (key, executor.submit(call, *args, **kwargs))
+            for key, args, kwargs in calls
+        ]
+        for key, future in futures:
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                logger.warning(f"Fan-out call for {key} failed: {e}")
+                errors[key] = e
+    return results, errors
+
+
+def api_rate_limiter(api: Any) -> Optional[RateLimiter]:
+    """
+    Get the limiter that paces fan-out batches of a CoinGlass instance.
+    
+    This is ``api.fanout.rate_limiter``: the plan level's per-minute limit
+    unless the client was created with its own ``rate_limit`` (which then
+    paces every request and this returns None).
+    """
+    return getattr(getattr(api, 'fanout', None), 'rate_limiter', None)
+
+
+class FanOutAPI:
+    """Multi-symbol, multi-exchange variants of per-pair endpoints."""
+    
+    def __init__(
+        self,
+        client: CoinGlassClient,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limit: Optional[int] = None
+    ):
+        """
+        Initialize Fan-out API with client.
+        
+        Args:
+            client: CoinGlass API client
+            max_workers: Maximum number of concurrent requests
+            rate_limit: Optional maximum requests per minute for fan-out calls
+                (the client's own limiter, if any, applies as well)
+        """
+        self.client = client
+        self.max_workers = max_workers
+        self.rate_limiter = RateLimiter(rate_limit) if rate_limit else None
+        
+        from .futures import FuturesAPI
+        from .spot import SpotAPI
+        self.futures = FuturesAPI(client)
+        self.spot = SpotAPI(client)
+    
+    def get_pair_index(
+        self,
+        market: str = 'futures',
+        symbols: Optional[Iterable[str]] = None,
+        exchanges: Optional[Iterable[str]] = None
+    ) -> List[Dict[str, str]]:
+        """
+        Build a flat index of supported trading pairs.
+        
+        Args:
+            market: 'futures' or 'spot'
+            symbols: Optional base assets to keep (e.g., ['BTC', 'ETH'])
+            exchanges: Optional exchange names to keep (e.g., ['Binance', 'OKX'])
+        
+        Returns:
+            List of dicts with 'exchange', 'instrument_id', 'base_asset' and 'quote_asset'
+            (plus 'margin_asset' when the index reports a settlement asset)
+        """
+        if market == 'futures':
+            supported = self.futures.get_supported_exchange_pairs()
+        elif market == 'spot':
+            supported = self.spot.get_supported_exchange_pairs()
+        else:
+            raise ValueError(f"Unknown market: {market}")
+        
+        symbol_set = _upper_set(symbols)
+        exchange_set = _upper_set(exchanges)
+        
+        index = []
+        for exchange, pairs in (supported or {}).items():
+            if exchange_set and exchange.upper() not in exchange_set:
+                continue
+            for pair in pairs or []:
+                base = pair.get('base_asset') or pair.get('base') or ''
+                if symbol_set and base.upper() not in symbol_set:
+                    continue
+                entry = {
+                    'exchange': exchange,
+                    'instrument_id': pair.get('instrument_id') or pair.get('symbol'),
+                    'base_asset': base,
+                    'quote_asset': pair.get('quote_asset') or pair.get('quote') or '',
+                }
+                margin = pair.get('margin_asset') or pair.get('settle_asset')
+                if margin:
+                    entry['margin_asset'] = margin
+                index.append(entry)
+        return index
+    
+    def get_futures_pairs_markets(
+        self,
+        symbols: Optional[Iterable[str]] = None,
+        exchanges: Optional[Iterable[str]] = None
+    ) -> FanOutResult:
+        """
+        Get futures pair markets for many coins at once.
+        
+        Min Plan Level: 1
+        
+        Args:
+            symbols: Coins to fetch (e.g., ['BTC', 'ETH']). Defaults to every base
+                asset listed on the selected exchanges.
+            exchanges: Optional exchange names to keep
+        
+        Returns:
+            FanOutResult mapping (exchange_name, instrument_id) to the pair's market data
+        """
+        return self._pairs_markets('futures', self.futures.get_pairs_markets, symbols, exchanges)
+    
+    def get_spot_pairs_markets(
+        self,
+        symbols: Optional[Iterable[str]] = None,
+        exchanges: Optional[Iterable[str]] = None
+    ) -> FanOutResult:
+        """
+        Get spot pair markets for many coins at once.
+        
+        Min Plan Level: 1
+        
+        Args:
+            symbols: Coins to fetch (e.g., ['BTC', 'ETH']). Defaults to every base
+                asset listed on the selected exchanges.
+            exchanges: Optional exchange names to keep
+        
+        Returns:
+            FanOutResult mapping (exchange_name, instrument_id) to the pair's market data
+        """
+        return self._pairs_markets('spot', self.spot.get_pairs_markets, symbols, exchanges)
+    
+    def get_open_interest_history(
+        self,
+        interval: str,
+        symbols: Optional[Iterable[str]] = None,
+        exchanges: Optional[Iterable[str]] = None,
+        pairs: Optional[Iterable[Tuple[str, str]]] = None,
+        # Optional parameters (can be passed as kwargs):
+        # startTime: int = None - Start timestamp in milliseconds
+        # endTime: int = None - End timestamp in milliseconds
+        # limit: int = None - Number of results (max: 1000)
+        **kwargs
+    ) -> FanOutResult:
+        """
+        Get futures open interest OHLC history for many pairs at once.
+        
+        Min Plan Level: 1
+        
+        Args:
+            interval: Candlestick interval (1m, 3m, 5m, 15m, 30m, 1h, 4h, 6h, 8h, 12h, 1d, 1w)
+            symbols: Base assets to expand via the supported-pairs index (e.g., ['BTC'])
+            exchanges: Exchange names to expand via the supported-pairs index
+            pairs: Explicit (exchange, instrument_id) pairs; skips the index lookup
+            **kwargs: Optional parameters passed to every call:
+                - startTime (int): Start timestamp in milliseconds
+                - endTime (int): End timestamp in milliseconds
+                - limit (int): Number of results (max: 1000)
+        
+        Returns:
+            FanOutResult mapping (exchange, instrument_id) to OI OHLC rows
+        """
+        return self._pair_history(
+            self.futures.open_interest.get_history, interval, symbols, exchanges, pairs, kwargs
+        )
+    
+    def get_liquidation_history(
+        self,
+        interval: str,
+        symbols: Optional[Iterable[str]] = None,
+        exchanges: Optional[Iterable[str]] = None,
+        pairs: Optional[Iterable[Tuple[str, str]]] = None,
+        # Optional parameters (can be passed as kwargs):
+        # startTime: int = None - Start timestamp in milliseconds
+        # endTime: int = None - End timestamp in milliseconds
+        # limit: int = None - Number of results (max: 1000)
+        **kwargs
+    ) -> FanOutResult:
+        """
+        Get pair liquidation history for many pairs at once.
+        
+        Min Plan Level: 1
+        
+        Args:
+            interval: Interval (1m, 3m, 5m, 15m, 30m, 1h, 4h, 6h, 8h, 12h, 1d, 1w)
+            symbols: Base assets to expand via the supported-pairs index (e.g., ['BTC'])
+            exchanges: Exchange names to expand via the supported-pairs index
+            pairs: Explicit (exchange, instrument_id) pairs; skips the index lookup
+            **kwargs: Optional parameters passed to every call:
+                - startTime (int): Start timestamp in milliseconds
+                - endTime (int): End timestamp in milliseconds
+                - limit (int): Number of results (max: 1000)
+        
+        Returns:
+            FanOutResult mapping (exchange, instrument_id) to liquidation rows
+        """
+        return self._pair_history(
+            self.futures.liquidation.get_history, interval, symbols, exchanges, pairs, kwargs
+        )
+    
+    def _pairs_markets(
+        self,
+        market: str,
+        func: Callable[[str], List[Dict[str, Any]]],
+        symbols: Optional[Iterable[str]],
+        exchanges: Optional[Iterable[str]]
+    ) -> FanOutResult:
+        """Fetch pairs-markets per coin and re-key the rows by (exchange, instrument)."""
+        if symbols is None:
+            index = self.get_pair_index(market, exchanges=exchanges)
+            symbols = sorted({pair['base_asset'] for pair in index if pair['base_asset']})
+        
+        calls = [(symbol, (symbol,), {}) for symbol in symbols]
+        results, errors = run_concurrently(func, calls, self.max_workers, self.rate_limiter)
+        
+        exchange_set = _upper_set(exchanges)
+        combined = FanOutResult()
+        for symbol, rows in results.items():
+            for row in rows or []:
+                exchange = row.get('exchange_name') or row.get('exchange') or ''
+                if exchange_set and exchange.upper() not in exchange_set:
+                    continue
+                instrument = row.get('instrument_id') or row.get('symbol') or symbol
+                combined[(exchange, instrument)] = row
+        for symbol, error in errors.items():
+            combined.errors[('*', symbol)] = error
+        return combined
+    
+    def _pair_history(
+        self,
+        func: Callable[..., List[Dict[str, Any]]],
+        interval: str,
+        symbols: Optional[Iterable[str]],
+        exchanges: Optional[Iterable[str]],
+        pairs: Optional[Iterable[Tuple[str, str]]],
+        kwargs: Dict[str, Any]
+    ) -> FanOutResult:
+        """Fetch a per-pair history endpoint for every selected pair."""
+        if pairs is None:
+            index = self.get_pair_index('futures', symbols=symbols, exchanges=exchanges)
+            pairs = [(pair['exchange'], pair['instrument_id']) for pair in index]
+        
+        calls = [
+            ((exchange, instrument), (exchange, instrument, interval), kwargs)
+            for exchange, instrument in pairs
+        ]
+        results, errors = run_concurrently(func, calls, self.max_workers, self.rate_limiter)
+        
+        combined = FanOutResult(results)
+        combined.errors.update(errors)
+        return combined
+
+
+def _upper_set(values: Optional[Iterable[str]]) -> set:
+    """Normalize an optional iterable of names for case-insensitive matching."""
+    return {v.upper() for v in values} if values else set()
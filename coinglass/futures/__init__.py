@@ -2,9 +2,10 @@
 CoinGlass Futures API Module
 Provides access to all futures-related endpoints
 """
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Union
 from ..client import CoinGlassClient
 from ..constants import PlanLevel, CacheTime
+from ..columnar import ColumnTable, project
 
 
 class FuturesAPI:
@@ -64,19 +65,30 @@ class FuturesAPI:
         response = self.client.get('/futures/supported-exchange-pairs')
         return response.get('data', {})
     
-    def get_coins_markets(self) -> List[Dict[str, Any]]:
+    def get_coins_markets(
+        self,
+        fields: Optional[List[str]] = None
+    ) -> Union[List[Dict[str, Any]], ColumnTable]:
         """
         Get performance metrics for all futures coins.
         
         Min Plan Level: 3
         
+        Args:
+            fields: Optional field names to keep (e.g., ['symbol', 'open_interest_usd']).
+                Other columns are dropped and the result is a compact ColumnTable.
+        
         Returns:
-            List of coin market data
+            List of coin market data, or a ColumnTable when fields are given
         """
         response = self.client.get('/futures/coins-markets')
-        return response.get('data', [])
+        return project(response.get('data', []), fields)
     
-    def get_pairs_markets(self, symbol: str) -> List[Dict[str, Any]]:
+    def get_pairs_markets(
+        self,
+        symbol: str,
+        fields: Optional[List[str]] = None
+    ) -> Union[List[Dict[str, Any]], ColumnTable]:
         """
         Get performance metrics for futures trading pairs.
         
@@ -84,13 +96,15 @@ class FuturesAPI:
         
         Args:
             symbol: Cryptocurrency symbol (e.g., 'BTC')
+            fields: Optional field names to keep (e.g., ['exchange_name', 'funding_rate']).
+                Other columns are dropped and the result is a compact ColumnTable.
         
         Returns:
-            List of pair market data
+            List of pair market data, or a ColumnTable when fields are given
         """
         params = {'symbol': symbol}
         response = self.client.get('/futures/pairs-markets', params=params)
-        return response.get('data', [])
+        return project(response.get('data', []), fields)
     
     def get_coins_price_change(self) -> List[Dict[str, Any]]:
         """
@@ -0,0 +1,196 @@
+"""
+Lazy views over CoinGlass responses
+Rows are converted to models or records only when they are accessed
+"""
+import heapq
+import math
+from collections.abc import Sequence
+from typing import Optional, List, Dict, Any, Callable, Iterator, Type, Union
+
+from .records import record_type, _to_float
+
+
+class LazyRows(Sequence):
+    """
+    Read-only sequence over raw response rows with on-access conversion.
+    
+    Indexing converts (and caches) a single row. Filters, projections and
+    top-k selection run on the raw dicts, so only the rows that are finally
+    accessed pay for validation.
+    
+    Example:
+        >>> coins = LazyRows(cg.futures.get_coins_markets(), CoinMarketData)
+        >>> top10 = coins.top(10, 'open_interest_usd')
+        >>> [coin.symbol for coin in top10]
+    """
+    
+    __slots__ = ('_rows', '_model', '_fast', '_convert', '_cache')
+    
+    def __init__(
+        self,
+        rows: List[Dict[str, Any]],
+        model: Optional[Type[Any]] = None,
+        fast: bool = True
+    ):
+        """
+        Initialize lazy view.
+        
+        Args:
+            rows: Decoded endpoint response (list of dicts)
+            model: Optional pydantic model class from coinglass.models; rows are
+                returned as plain dicts when omitted
+            fast: Convert to compact records (True) or full pydantic models (False)
+        """
+        self._rows = rows if rows is not None else []
+        self._model = model
+        self._fast = fast
+        if model is None:
+            self._convert = None
+        elif fast:
+            self._convert = record_type(model).from_dict
+        else:
+            self._convert = lambda row: model(**row)
+        self._cache: Dict[int, Any] = {}
+    
+    @property
+    def raw(self) -> List[Dict[str, Any]]:
+        """Underlying decoded rows."""
+        return self._rows
+    
+    @property
+    def converted_count(self) -> int:
+        """Number of rows converted so far."""
+        return len(self._cache)
+    
+    def __len__(self) -> int:
+        return len(self._rows)
+    
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return self._view(self._rows[index])
+        if index < 0:
+            index += len(self._rows)
+        if index < 0 or index >= len(self._rows):
+            raise IndexError("LazyRows index out of range")
+        if self._convert is None:
+            return self._rows[index]
+        cached = self._cache.get(index)
+        if cached is None:
+            cached = self._cache[index] = self._convert(self._rows[index])
+        return cached
+    
+    def __iter__(self) -> Iterator[Any]:
+        for index in range(len(self._rows)):
+            yield self[index]
+    
+    def __repr__(self):
+        model = self._model.__name__ if self._model else 'dict'
+        return f"LazyRows({len(self)} x {model}, {self.converted_count} converted)"
+    
+    def filter(self, predicate: Callable[[Dict[str, Any]], bool]) -> 'LazyRows':
+        """
+        Keep rows matching a predicate evaluated on the raw dict.
+        
+        Args:
+            predicate: Function taking a raw row and returning True to keep it
+        
+        Returns:
+            New lazy view over the matching rows
+        """
+        return self._view([row for row in self._rows if predicate(row)])
+    
+    def where(self, **conditions: Any) -> 'LazyRows':
+        """
+        Keep rows whose fields equal the given values.
+        
+        Example:
+            >>> pairs.where(exchange_name='Binance')
+        """
+        items = list(conditions.items())
+        return self.filter(lambda row: all(row.get(k) == v for k, v in items))
+    
+    def column(self, field: str, numeric: bool = True) -> List[Any]:
+        """
+        Extract one field from every row without converting rows.
+        
+        Args:
+            field: Field name
+            numeric: Coerce values to float (missing or invalid values become NaN)
+        
+        Returns:
+            List of values
+        """
+        if not numeric:
+            return [row.get(field) for row in self._rows]
+        return [_numeric(row.get(field)) for row in self._rows]
+    
+    def select(self, *fields: str) -> List[Dict[str, Any]]:
+        """
+        Project rows onto a subset of fields (raw values).
+        
+        Args:
+            *fields: Field names to keep
+        
+        Returns:
+            List of dicts holding only the requested fields
+        """
+        return [{field: row.get(field) for field in fields} for row in self._rows]
+    
+    def top(self, n: int, field: str, largest: bool = True) -> 'LazyRows':
+        """
+        Select the n rows with the largest (or smallest) numeric field value.
+        
+        Runs in O(len * log n) on the raw rows; rows with a missing value sort last.
+        
+        Args:
+            n: Number of rows to keep
+            field: Numeric field to rank by (e.g., 'open_interest_usd')
+            largest: Rank descending (True) or ascending (False)
+        
+        Returns:
+            New lazy view over the selected rows, in rank order
+        """
+        select = heapq.nlargest if largest else heapq.nsmallest
+        missing = -math.inf if largest else math.inf
+        
+        def rank(row):
+            value = _numeric(row.get(field))
+            return missing if value != value else value
+        
+        return self._view(select(n, self._rows, key=rank))
+    
+    def sort_by(self, field: str, reverse: bool = False) -> 'LazyRows':
+        """
+        Sort rows by a numeric field without converting them.
+        
+        Args:
+            field: Numeric field to sort by
+            reverse: Sort descending
+        
+        Returns:
+            New lazy view over the sorted rows
+        """
+        missing = -math.inf if reverse else math.inf
+        
+        def rank(row):
+            value = _numeric(row.get(field))
+            return missing if value != value else value
+        
+        return self._view(sorted(self._rows, key=rank, reverse=reverse))
+    
+    def materialize(self) -> List[Any]:
+        """Convert every row and return them as a list."""
+        return list(self)
+    
+    def _view(self, rows: List[Dict[str, Any]]) -> 'LazyRows':
+        """Create a view sharing this view's conversion settings."""
+        return LazyRows(rows, self._model, self._fast)
+
+
+def _numeric(value: Any) -> float:
+    """Coerce a raw value to float, mapping missing or invalid values to NaN."""
+    try:
+        result = _to_float(value)
+    except (TypeError, ValueError):
+        return math.nan
+    return math.nan if result is None else result
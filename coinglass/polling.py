@@ -0,0 +1,264 @@
+"""
+Streaming poller for CoinGlass real-time endpoints
+Polls on the endpoint's server cache cadence and yields only new or changed records
+"""
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Optional, List, Dict, Any, Callable, Hashable, Iterator, AsyncIterator
+
+from .endpoints import EndpointRegistry
+
+logger = logging.getLogger(__name__)
+
+# Fallback cadence for real-time endpoints and endpoints without a documented cache time
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_MAX_SEEN = 10000
+
+# Fields that identify a record, tried in order by default_record_key
+_ID_FIELDS = ('id', 'order_id', 'orderId')
+_TIME_FIELDS = ('time', 'timestamp', 'create_time', 'start_time', 'update_time')
+_PRICE_FIELDS = ('price', 'entry_price', 'start_price')
+_SIDE_FIELDS = ('side', 'order_side', 'position_action')
+
+
+def default_record_key(record: Dict[str, Any]) -> Hashable:
+    """
+    Derive a record identity.
+    
+    Uses the order id when present, otherwise (exchange, symbol, time, price, side).
+    """
+    for field in _ID_FIELDS:
+        value = record.get(field)
+        if value is not None:
+            return value
+    return (
+        record.get('exchange_name') or record.get('exchange'),
+        record.get('symbol'),
+        _first(record, _TIME_FIELDS),
+        _first(record, _PRICE_FIELDS),
+        _first(record, _SIDE_FIELDS),
+    )
+
+
+def whale_position_key(record: Dict[str, Any]) -> Hashable:
+    """Identify a Hyperliquid whale position by wallet and symbol."""
+    return (record.get('user') or record.get('wallet'), record.get('symbol') or record.get('asset'))
+
+
+# Record identity for endpoints whose default key would be wrong
+RECORD_KEYS = {
+    "hyperliquid.get_whale_position": whale_position_key,
+}
+
+
+class Poller:
+    """
+    Poll an endpoint and yield only records that are new or changed.
+    
+    Polls are aligned to the endpoint's server cache cadence, so each request
+    sees a fresh snapshot. Iteration is pull-based: the next request is only
+    issued once the consumer has taken every record from the previous one,
+    which gives natural backpressure. The seen-set is an LRU bounded by
+    ``max_seen`` entries.
+    
+    Example:
+        >>> poller = Poller.for_endpoint(cg, 'futures.liquidation.get_order',
+        ...                              ex='Binance', symbol='BTC')
+        >>> for order in poller:
+        ...     print(order)
+    """
+    
+    def __init__(
+        self,
+        func: Callable[..., Any],
+        *args,
+        interval: Optional[float] = None,
+        key: Optional[Callable[[Dict[str, Any]], Hashable]] = None,
+        max_seen: int = DEFAULT_MAX_SEEN,
+        emit_changes: bool = True,
+        max_errors: int = 3,
+        **kwargs
+    ):
+        """
+        Initialize poller.
+        
+        Args:
+            func: Endpoint method to call (e.g., cg.hyperliquid.get_whale_alert)
+            *args: Positional arguments for func
+            interval: Poll period in seconds (default: DEFAULT_POLL_INTERVAL)
+            key: Function returning a record's identity (default: default_record_key)
+            max_seen: Maximum number of record identities to remember
+            emit_changes: Also yield known records whose content changed
+            max_errors: Consecutive request failures tolerated before raising
+            **kwargs: Keyword arguments for func
+        """
+        if max_seen <= 0:
+            raise ValueError("max_seen must be positive")
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.interval = interval if interval and interval > 0 else DEFAULT_POLL_INTERVAL
+        self.key = key or default_record_key
+        self.max_seen = max_seen
+        self.emit_changes = emit_changes
+        self.max_errors = max_errors
+        self.polls = 0
+        self._seen: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._last_snapshot: Any = None
+        self._stopped = False
+    
+    @classmethod
+    def for_endpoint(cls, api: Any, endpoint_name: str, *args, **kwargs) -> 'Poller':
+        """
+        Create a poller for a registry endpoint name.
+        
+        The cadence and record key are looked up from the endpoint registry
+        unless given explicitly.
+        
+        Args:
+            api: CoinGlass instance
+            endpoint_name: Dotted endpoint name (e.g., 'hyperliquid.get_whale_alert')
+            *args: Positional arguments for the endpoint
+            **kwargs: Poller options and endpoint keyword arguments
+        
+        Returns:
+            Poller bound to the endpoint method
+        """
+        func = api
+        for part in endpoint_name.split('.'):
+            func = getattr(func, part)
+        if kwargs.get('interval') is None:
+            kwargs['interval'] = EndpointRegistry.get_cache_seconds(endpoint_name)
+        kwargs.setdefault('key', RECORD_KEYS.get(endpoint_name))
+        return cls(func, *args, **kwargs)
+    
+    def stop(self):
+        """Stop iteration after the current poll."""
+        self._stopped = True
+    
+    def reset(self):
+        """Forget all seen records."""
+        self._seen.clear()
+        self._last_snapshot = None
+    
+    def diff(self, snapshot: Any) -> List[Dict[str, Any]]:
+        """
+        Compare a snapshot with the records seen so far.
+        
+        Args:
+            snapshot: Endpoint response (list of records, or a single record)
+        
+        Returns:
+            Records that are new, or changed if emit_changes is set
+        """
+        if snapshot == self._last_snapshot:
+            return []
+        self._last_snapshot = snapshot
+        
+        if isinstance(snapshot, dict):
+            records = [snapshot]
+        else:
+            records = snapshot or []
+        
+        seen = self._seen
+        fresh = []
+        for record in records:
+            record_key = self.key(record)
+            fingerprint = _fingerprint(record)
+            previous = seen.get(record_key)
+            if previous is None:
+                fresh.append(record)
+            elif previous != fingerprint:
+                if self.emit_changes:
+                    fresh.append(record)
+            seen[record_key] = fingerprint
+            seen.move_to_end(record_key)
+        
+        while len(seen) > self.max_seen:
+            seen.popitem(last=False)
+        return fresh
+    
+    def poll_once(self) -> List[Dict[str, Any]]:
+        """Issue one request and return its new or changed records."""
+        self.polls += 1
+        return self.diff(self.func(*self.args, **self.kwargs))
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Yield new or changed records until stopped."""
+        errors = 0
+        while not self._stopped:
+            try:
+                batch = self.poll_once()
+                errors = 0
+            except Exception as e:
+                errors += 1
+                if errors > self.max_errors:
+                    raise
+                logger.warning(f"Poll failed ({errors}/{self.max_errors}): {e}")
+                batch = []
+            for record in batch:
+                yield record
+            if not self._stopped:
+                time.sleep(self._seconds_to_next_tick())
+    
+    async def stream(self) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Async variant of iteration.
+        
+        Requests run in the default executor so the event loop is not blocked.
+        
+        Example:
+            >>> async for alert in Poller(cg.hyperliquid.get_whale_alert).stream():
+            ...     handle(alert)
+        """
+        loop = asyncio.get_running_loop()
+        errors = 0
+        while not self._stopped:
+            try:
+                batch = await loop.run_in_executor(None, self.poll_once)
+                errors = 0
+            except Exception as e:
+                errors += 1
+                if errors > self.max_errors:
+                    raise
+                logger.warning(f"Poll failed ({errors}/{self.max_errors}): {e}")
+                batch = []
+            for record in batch:
+                yield record
+            if not self._stopped:
+                await asyncio.sleep(self._seconds_to_next_tick())
+    
+    def __aiter__(self) -> AsyncIterator[Dict[str, Any]]:
+        """Allow ``async for`` directly on the poller."""
+        return self.stream()
+    
+    def _seconds_to_next_tick(self) -> float:
+        """Time until just after the next cache refresh boundary."""
+        now = time.time()
+        offset = min(0.1 * self.interval, 0.25)
+        next_tick = (int(now // self.interval) + 1) * self.interval + offset
+        return max(0.0, next_tick - now)
+
+
+def _first(record: Dict[str, Any], fields) -> Any:
+    """Get the first present field value."""
+    for field in fields:
+        value = record.get(field)
+        if value is not None:
+            return value
+    return None
+
+
+def _fingerprint(record: Any) -> int:
+    """Hash a record's content for change detection."""
+    if isinstance(record, dict):
+        try:
+            return hash(tuple(sorted(record.items())))
+        except TypeError:
+            return hash(repr(sorted(record.items(), key=lambda item: item[0])))
+    try:
+        return hash(record)
+    except TypeError:
+        return hash(repr(record))
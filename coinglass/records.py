@@ -0,0 +1,192 @@
+"""
+Lightweight record types for high-volume CoinGlass responses
+Compact __slots__ classes generated from the pydantic models in models.py
+"""
+from typing import Optional, List, Dict, Any, Type, Union, get_type_hints
+
+from .exceptions import CoinGlassValidationError
+
+try:
+    from typing import get_origin, get_args
+except ImportError:  # Python 3.7
+    def get_origin(tp):
+        return getattr(tp, '__origin__', None)
+    
+    def get_args(tp):
+        return getattr(tp, '__args__', ())
+
+
+_NoneType = type(None)
+
+# Generated record classes, keyed by model class
+_RECORD_TYPES: Dict[type, type] = {}
+
+
+def _to_float(value: Any) -> Optional[float]:
+    """Coerce API numbers (often strings) to float, leaving floats and None as is."""
+    if value.__class__ is float or value is None:
+        return value
+    return float(value)
+
+
+def _to_int(value: Any) -> Optional[int]:
+    """Coerce API integers (e.g., timestamps) to int, leaving ints and None as is."""
+    if value.__class__ is int or value is None:
+        return value
+    return int(value)
+
+
+class Record:
+    """
+    Base class for generated records.
+    
+    Records hold the same fields as their pydantic model, stored in
+    ``__slots__`` without per-instance ``__dict__`` or validation state.
+    """
+    
+    __slots__ = ()
+    _fields: tuple = ()
+    _model: Optional[type] = None
+    
+    @classmethod
+    def from_dict(cls, row: Dict[str, Any]) -> 'Record':
+        """Build a record from an API row (generated per subclass)."""
+        raise NotImplementedError
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the record back to a dictionary."""
+        return {name: getattr(self, name) for name in self._fields}
+    
+    def to_model(self):
+        """Convert the record to its pydantic model."""
+        return self._model(**self.to_dict())
+    
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self._fields)
+    
+    def __repr__(self):
+        values = ', '.join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"{self.__class__.__name__}({values})"
+
+
+def record_type(model: Type[Any]) -> Type[Record]:
+    """
+    Get the compact record class for a pydantic model.
+    
+    The class is generated on first use and cached. String-to-float coercion
+    mirrors the model's validators: float fields (including ``Union[str, float]``)
+    are converted with a fast path for values that are already floats.
+    
+    Args:
+        model: Pydantic model class from coinglass.models (e.g., OHLCData)
+    
+    Returns:
+        Record subclass with the model's fields as slots
+    """
+    cls = _RECORD_TYPES.get(model)
+    if cls is not None:
+        return cls
+    
+    hints = get_type_hints(model)
+    hints = {name: hints[name] for name in _field_names(model)}
+    names = tuple(hints)
+    
+    namespace = {
+        '_new': object.__new__,
+        '_to_float': _to_float,
+        '_to_int': _to_int,
+        '_error': CoinGlassValidationError,
+    }
+    lines = [
+        'def from_dict(cls, row):',
+        '    self = _new(cls)',
+        '    get = row.get',
+        '    try:',
+    ]
+    for name, tp in hints.items():
+        converter = _converter_name(tp)
+        source = f"row[{name!r}]" if _is_required(model, name, tp) else f"get({name!r})"
+        if converter:
+            source = f"{converter}({source})"
+        lines.append(f"        self.{name} = {source}")
+    lines.extend([
+        '    except (KeyError, ValueError, TypeError) as e:',
+        f"        raise _error(f'Invalid {model.__name__} row: {{e.__class__.__name__}}: {{e}}')",
+        '    return self',
+    ])
+    exec('\n'.join(lines), namespace)
+    
+    cls = type(f"{model.__name__}Record", (Record,), {
+        '__slots__': names,
+        '__module__': __name__,
+        '__doc__': f"Compact record for {model.__name__}.",
+        '_fields': names,
+        '_model': model,
+        'from_dict': classmethod(namespace['from_dict']),
+    })
+    _RECORD_TYPES[model] = cls
+    return cls
+
+
+def parse_records(
+    rows: List[Dict[str, Any]],
+    model: Type[Any],
+    fast: bool = True
+) -> List[Any]:
+    """
+    Convert API rows into typed records.
+    
+    Args:
+        rows: Rows returned by an endpoint (list of dicts)
+        model: Pydantic model class describing the rows
+        fast: Build compact __slots__ records (True) or full pydantic models (False)
+    
+    Returns:
+        List of records or models
+    
+    Example:
+        >>> rows = cg.futures.price.get_history('BTCUSDT', '1m', exchange='Binance', limit=1000)
+        >>> candles = parse_records(rows, OHLCData)
+        >>> candles[0].close
+        92858.2
+    """
+    if not fast:
+        return [model(**row) for row in rows]
+    from_dict = record_type(model).from_dict
+    return [from_dict(row) for row in rows]
+
+
+def _field_names(model: Type[Any]) -> List[str]:
+    """Get a pydantic model's field names in declaration order."""
+    fields = getattr(model, 'model_fields', None)  # pydantic v2
+    if fields is None:
+        fields = getattr(model, '__fields__', {})  # pydantic v1
+    return list(fields)
+
+
+def _is_required(model: Type[Any], name: str, tp: Any) -> bool:
+    """Check whether a model field has no default and is not Optional."""
+    if _NoneType in get_args(tp):
+        return False
+    fields = getattr(model, 'model_fields', None)  # pydantic v2
+    if fields is not None:
+        return fields[name].is_required()
+    field = getattr(model, '__fields__', {}).get(name)  # pydantic v1
+    return bool(field is not None and field.required)
+
+
+def _converter_name(tp: Any) -> Optional[str]:
+    """Pick the coercion function for a field annotation."""
+    if get_origin(tp) is Union:
+        args = [arg for arg in get_args(tp) if arg is not _NoneType]
+        if float in args:
+            return '_to_float'
+        if len(args) == 1:
+            tp = args[0]
+    if tp is float:
+        return '_to_float'
+    if tp is int:
+        return '_to_int'
+    return None
@@ -1,9 +1,10 @@
 """
 Spot API for CoinGlass
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 from ..client import CoinGlassClient
 from ..constants import PlanLevel, CacheTime
+from ..columnar import ColumnTable, project
 
 
 class SpotAPI:
@@ -49,17 +50,24 @@ class SpotAPI:
         response = self.client.get('/spot/supported-exchange-pairs')
         return response.get('data', [])
     
-    def get_coins_markets(self) -> List[Dict[str, Any]]:
+    def get_coins_markets(
+        self,
+        fields: Optional[List[str]] = None
+    ) -> Union[List[Dict[str, Any]], ColumnTable]:
         """
         Get spot coin market performance metrics.
         
         Min Plan Level: 3
         
+        Args:
+            fields: Optional field names to keep (e.g., ['symbol', 'volume_usd']).
+                Other columns are dropped and the result is a compact ColumnTable.
+        
         Returns:
-            List of coin market data
+            List of coin market data, or a ColumnTable when fields are given
         """
         response = self.client.get('/spot/coins-markets')
-        return response.get('data', [])
+        return project(response.get('data', []), fields)
     
     def get_pairs_markets(self, symbol: str) -> List[Dict[str, Any]]:
         """
@@ -53,6 +53,9 @@ setup(
         "async": [
             "aiohttp>=3.8.0",
         ],
+        "analytics": [
+            "numpy>=1.21.0",
+        ],
     },
     keywords="coinglass cryptocurrency trading futures options api bitcoin ethereum crypto derivatives",
     project_urls={
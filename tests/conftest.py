@@ -0,0 +1,63 @@
+"""
+Shared fixtures for the offline tests
+Serve canned API payloads through a fake HTTP session so no network or API key is needed
+"""
+import json
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import pytest
+import requests
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from coinglass import CoinGlass
+
+# Handler receiving (endpoint path after '/api/', query params) and returning the 'data' payload
+Handler = Callable[[str, Dict[str, Any]], Any]
+
+
+class FakeResponse:
+    """Successful API response wrapping a data payload."""
+    
+    def __init__(self, data: Any):
+        self.status_code = 200
+        self.headers: Dict[str, str] = {}
+        self._body = {'code': '0', 'msg': 'success', 'data': data}
+        self.text = json.dumps(self._body)
+    
+    def raise_for_status(self):
+        pass
+    
+    def json(self) -> Dict[str, Any]:
+        return self._body
+
+
+class FakeSession(requests.Session):
+    """Session answering every request from a handler and recording the calls."""
+    
+    def __init__(self, handler: Handler):
+        super().__init__()
+        self.handler = handler
+        self.calls: List[Tuple[str, Dict[str, Any]]] = []
+    
+    def request(self, method, url, params=None, json=None, **kwargs):
+        path = url.split('/api/', 1)[1]
+        self.calls.append((path, dict(params or {})))
+        return FakeResponse(self.handler(path, dict(params or {})))
+
+
+@pytest.fixture
+def make_api() -> Callable[..., CoinGlass]:
+    """Factory building a CoinGlass client served by a handler (see Handler), unpaced by default."""
+    
+    def make(handler: Handler, paced: bool = False, **kwargs) -> CoinGlass:
+        cg = CoinGlass(api_key='test', session=FakeSession(handler), **kwargs)
+        if not paced:
+            # The plan-level fan-out limiter would space canned calls seconds apart
+            cg.fanout.rate_limiter = None
+        return cg
+    
+    return make
@@ -0,0 +1,125 @@
+"""
+Tests for the basis term structure engine
+"""
+import numpy as np
+import pytest
+
+from coinglass.analytics._pairs import expiry_code
+from coinglass.analytics.basis import BasisTermEngine, expiry_ms
+
+D = 86400 * 1000
+JUN = 1751011200000  # 2025-06-27 08:00 UTC
+SEP = JUN + 91 * D
+TIMES = [JUN - 90 * D, JUN - 89 * D, JUN + D]
+PERP = ('Binance', 'BTCUSDT')
+PAIRS = [('Deribit', 'BTC-26SEP25'), ('OKX', 'BTC-USD-250627'), PERP, ('Binance', 'BTCUSDT_250627')]
+
+# Basis in percent per contract and bar; both June contracts share one expiry
+BASIS = {
+    PERP: [0.1, 0.2, 0.3],
+    ('Binance', 'BTCUSDT_250627'): [1.0, 1.2, 1.5],
+    ('OKX', 'BTC-USD-250627'): [2.0, 2.2, 2.5],
+    ('Deribit', 'BTC-26SEP25'): [3.0, 3.4, 3.6],
+}
+
+
+def make_handler(basis, bars=3, failing=()):
+    def handler(path, params):
+        pair = (params['exchange'], params['symbol'])
+        if pair in failing:
+            raise RuntimeError('unavailable')
+        return [
+            {'time': time, 'close_basis': value, 'close_change': 0.0}
+            for time, value in zip(TIMES[:bars], basis[pair]) if time >= params.get('startTime', 0)
+        ]
+    
+    return handler
+
+
+@pytest.fixture
+def engine(make_api):
+    return BasisTermEngine(make_api(make_handler(BASIS))).load(PAIRS)
+
+
+@pytest.mark.parametrize('instrument, code', [
+    ('BTC-27JUN25', '250627'),
+    ('BTC-5SEP25', '250905'),
+    ('BTCUSDT_250627', '250627'),
+    ('BTC-USD-20250627', '250627'),
+    ('BTC-USDT-SWAP', None),
+    ('BTCUSD_PERP', None),
+])
+def test_expiry_code(instrument, code):
+    assert expiry_code(instrument) == code
+
+
+def test_contracts_are_ordered_perpetual_first_then_by_expiry(engine):
+    assert engine.pairs == [
+        PERP, ('Binance', 'BTCUSDT_250627'), ('OKX', 'BTC-USD-250627'), ('Deribit', 'BTC-26SEP25'),
+    ]
+    assert expiry_ms('BTC-26SEP25') == SEP
+    np.testing.assert_array_equal(engine.dated, [False, True, True, True])
+    assert list(engine.times) == TIMES
+    assert engine.basis.flags['C_CONTIGUOUS']
+
+
+def test_annualized_basis_and_settlement_mask(engine):
+    np.testing.assert_allclose(engine.days_to_expiry()[:, 0], [np.nan, 90, 90, 181])
+    annualized = engine.annualized()
+    np.testing.assert_allclose(annualized[:, 0], [0.1, 365 / 90, 2 * 365 / 90, 3 * 365 / 181])
+    # The June contracts have settled by the last bar
+    np.testing.assert_allclose(annualized[:, 2], [0.3, np.nan, np.nan, 3.6 * 365 / 90])
+    assert [point['instrument_id'] for point in engine.curve()] == ['BTCUSDT', 'BTC-26SEP25']
+    assert engine.curve(at=0)[1]['days_to_expiry'] == 90.0
+
+
+def test_slope_is_a_least_squares_fit(engine):
+    x = np.array([90, 90, 181]) / 365
+    y = engine.annualized()[1:, 0]
+    slope = engine.slope()
+    assert slope[0] == pytest.approx(np.polyfit(x, y, 1)[0])
+    assert np.isnan(slope[2])
+
+
+def test_roll_yield_averages_contracts_sharing_an_expiry(engine):
+    roll = engine.roll_yield()
+    # June is the mean of 1.0% and 2.0%, rolled 91 days into September at 3.0%
+    assert roll[0] == pytest.approx((1.03 / 1.015 - 1) * 365 / 91 * 100)
+    assert roll[1] == pytest.approx((1.034 / 1.017 - 1) * 365 / 91 * 100)
+    # Only one unsettled expiry is left
+    assert np.isnan(roll[2])
+
+
+def test_update_overwrites_the_last_bar(make_api):
+    basis = {pair: list(values) for pair, values in BASIS.items()}
+    okx = ('OKX', 'BTC-USD-250627')
+    engine = BasisTermEngine(make_api(make_handler(basis, bars=2))).load(PAIRS)
+    cg = make_api(make_handler(basis, failing=[okx]))
+    engine.api = cg
+    basis[PERP][1] = 0.25
+    
+    assert list(engine.update()) == TIMES[1:]
+    assert all(params['startTime'] == TIMES[1] for _, params in cg.client.session.calls)
+    assert list(engine.errors) == [okx]
+    assert list(engine.times) == TIMES
+    np.testing.assert_allclose(engine.basis[0], [0.1, 0.25, 0.3])
+    # The failed contract keeps its previous value, carried forward
+    np.testing.assert_allclose(engine.basis[2], [2.0, 2.2, 2.2])
+    assert engine.basis.flags['C_CONTIGUOUS']
+
+
+def test_discover_filters_the_pair_index(make_api):
+    supported = {
+        'Binance': [
+            {'instrument_id': 'BTCUSDT_250926', 'base_asset': 'BTC', 'quote_asset': 'USDT'},
+            {'instrument_id': 'BTCUSDT', 'base_asset': 'BTC', 'quote_asset': 'USDT'},
+            {'instrument_id': 'BTCUSD_250627', 'base_asset': 'BTC', 'quote_asset': 'USD'},
+            {'instrument_id': 'ETHUSDT', 'base_asset': 'ETH', 'quote_asset': 'USDT'},
+        ],
+    }
+    engine = BasisTermEngine(make_api(lambda path, params: supported))
+    assert engine.discover('BTC') == [
+        ('Binance', 'BTCUSDT'), ('Binance', 'BTCUSD_250627'), ('Binance', 'BTCUSDT_250926'),
+    ]
+    linear = engine.discover('BTC', include_perpetual=False, coin_margined=False)
+    assert linear == [('Binance', 'BTCUSDT_250926')]
@@ -0,0 +1,105 @@
+"""
+Tests for column projection of market snapshot endpoints
+"""
+import math
+from array import array
+
+import numpy as np
+import pytest
+
+from coinglass.columnar import ColumnTable, project
+
+ROWS = [
+    {
+        'symbol': 'BTC',
+        'current_price': 95000.5,
+        'open_interest_usd': 55002072334.93,
+        'rank': 1,
+        'note': 'a',
+    },
+    {'symbol': 'ETH', 'current_price': 3300, 'open_interest_usd': None, 'rank': 2},
+    {'symbol': 'SOL', 'current_price': 180, 'open_interest_usd': 1e9, 'rank': 3, 'note': 'c'},
+]
+
+
+def test_projection_keeps_requested_fields_only():
+    table = ColumnTable.from_rows(ROWS, ['symbol', 'open_interest_usd'])
+    assert table.fields == ['symbol', 'open_interest_usd']
+    assert len(table) == 3
+    assert 'current_price' not in table
+    assert table.row(0) == {'symbol': 'BTC', 'open_interest_usd': 55002072334.93}
+
+
+def test_numeric_columns_are_double_arrays_with_nan_gaps():
+    table = ColumnTable.from_rows(ROWS, ['current_price', 'open_interest_usd', 'symbol', 'note'])
+    prices = table['current_price']
+    assert isinstance(prices, array) and prices.typecode == 'd'
+    assert list(prices) == [95000.5, 3300.0, 180.0]
+    assert math.isnan(table['open_interest_usd'][1])
+    assert table['symbol'] == ['BTC', 'ETH', 'SOL']
+    assert table['note'] == ['a', None, 'c']
+    assert table.nbytes == 2 * 3 * 8
+
+
+def test_conversions_round_trip():
+    table = ColumnTable.from_rows(ROWS, ['symbol', 'open_interest_usd'])
+    assert table.to_dict() == {
+        'symbol': ['BTC', 'ETH', 'SOL'],
+        'open_interest_usd': [55002072334.93, None, 1e9],
+    }
+    rows = table.to_rows()
+    assert rows[2] == {'symbol': 'SOL', 'open_interest_usd': 1e9}
+    assert math.isnan(rows[1]['open_interest_usd'])
+    columns = table.to_numpy()
+    assert columns['open_interest_usd'].dtype == np.float64
+    # Numeric columns share memory with the table
+    columns['open_interest_usd'][0] = 1.0
+    assert table['open_interest_usd'][0] == 1.0
+
+
+def test_strings_and_bools_are_never_packed():
+    rows = [
+        {'id': '1', 'code': 'NAN', 'flag': True, 'price': 1},
+        {'id': '2', 'code': 'INF', 'flag': False, 'price': '2'},
+    ]
+    table = ColumnTable.from_rows(rows, ['id', 'code', 'flag', 'price'])
+    assert table['id'] == ['1', '2'] and table['code'] == ['NAN', 'INF']
+    assert table['flag'] == [True, False] and table['price'] == [1, '2']
+    assert table.nbytes == 0
+
+
+def test_fields_missing_from_every_row_raise():
+    with pytest.raises(ValueError, match='open_interset_usd'):
+        ColumnTable.from_rows(ROWS, ['symbol', 'open_interset_usd'])
+    # A field present in some rows only is kept with gaps
+    assert ColumnTable.from_rows(ROWS, ['note'])['note'] == ['a', None, 'c']
+    assert len(ColumnTable.from_rows([], ['anything'])) == 0
+
+
+def test_select_shares_columns():
+    table = ColumnTable.from_rows(ROWS, ['symbol', 'rank'])
+    subset = table.select('rank')
+    assert subset.fields == ['rank']
+    assert subset['rank'] is table['rank']
+    assert repr(subset) == "ColumnTable(3 rows x ['rank'])"
+
+
+def test_columns_must_have_equal_length():
+    with pytest.raises(ValueError):
+        ColumnTable({'a': [1, 2], 'b': [1]})
+    assert len(ColumnTable({})) == 0
+
+
+def test_project_returns_rows_unchanged_without_fields():
+    assert project(ROWS, None) is ROWS
+    assert len(project(None, ['symbol'])) == 0
+
+
+@pytest.mark.parametrize('market', ['futures', 'spot'])
+def test_market_endpoints_project_when_fields_are_given(make_api, market):
+    cg = make_api(lambda path, params: ROWS)
+    api = getattr(cg, market)
+    assert api.get_coins_markets() == ROWS
+    table = api.get_coins_markets(fields=['symbol', 'current_price'])
+    assert isinstance(table, ColumnTable)
+    assert list(table['current_price']) == [95000.5, 3300.0, 180.0]
@@ -0,0 +1,148 @@
+"""
+Tests for the ETF flow engine
+"""
+import numpy as np
+import pytest
+
+from coinglass.analytics.etf_flows import ETFFlowEngine
+
+D0 = 1699920000000  # 2023-11-14 00:00 UTC
+D = 86400 * 1000
+
+
+def day(i):
+    return D0 + i * D
+
+
+def make_data():
+    """Endpoint path to rows; rows are stamped in the afternoon of their day."""
+    return {
+        'etf/bitcoin/flow-history': [
+            {'time': day(0) + 13 * 3600000, 'etf_flows': [
+                {'etf_ticker': 'IBIT', 'flow_usd': 100}, {'etf_ticker': 'FBTC', 'flow_usd': -20},
+            ]},
+            {'time': day(1), 'etf_flows': {'IBIT': 50, 'GBTC': {'flow_usd': -30}}},
+            {'time': day(2), 'etf_flows': {'IBIT': 40, 'FBTC': 10, 'GBTC': -10}},
+        ],
+        # A day reported only as a total
+        'etf/ethereum/flow-history': [
+            {'time': day(0), 'etf_flows': [{'ticker': 'ETHA', 'flow_usd': 5}]},
+            {'time': day(2), 'flow_usd': 7},
+        ],
+        'hk-etf/bitcoin/flow-history': [
+            {'time': day(1), 'etf_flows': [{'etf_ticker': '3042.HK', 'flow_usd': 2}]},
+        ],
+    }
+
+
+def make_handler(data, failing=()):
+    def handler(path, params):
+        if path in failing:
+            raise RuntimeError('unavailable')
+        start, end = params.get('startTime', 0), params.get('endTime', float('inf'))
+        return [row for row in data[path] if start <= row['time'] <= end]
+    
+    return handler
+
+
+@pytest.fixture
+def engine(make_api):
+    return ETFFlowEngine(make_api(make_handler(make_data()))).load()
+
+
+def test_flows_are_stacked_per_ticker_with_zero_gaps(engine):
+    assert engine.labels == [
+        ('hk_btc', '3042.HK'), ('us_btc', 'FBTC'), ('us_btc', 'GBTC'), ('us_btc', 'IBIT'),
+        ('us_eth', 'ETHA'), ('us_eth', 'TOTAL'),
+    ]
+    assert list(engine.days) == [day(0), day(1), day(2)]
+    np.testing.assert_array_equal(engine.flows, [
+        [0, 2, 0], [-20, 0, 10], [0, -30, -10], [100, 50, 40], [5, 0, 0], [0, 0, 7],
+    ])
+    # Hong Kong ETH has no flow history endpoint
+    assert engine.unavailable == ['hk_eth'] and not engine.errors
+    assert engine.tickers('us_eth') == ['ETHA', 'TOTAL']
+    np.testing.assert_array_equal(engine[('us_btc', 'IBIT')], [100, 50, 40])
+
+
+def test_net_cumulative_and_rolling(engine):
+    np.testing.assert_array_equal(engine.net('us_btc'), [80, 20, 40])
+    np.testing.assert_array_equal(engine.net(), [85, 22, 47])
+    np.testing.assert_array_equal(engine.cumulative()[3], [100, 150, 190])
+    np.testing.assert_array_equal(engine.rolling(2)[3], [100, 150, 90])
+    np.testing.assert_array_equal(engine.rolling(5)[3], [100, 150, 190])
+    with pytest.raises(ValueError):
+        engine.rolling(0)
+
+
+def test_issuer_flows_and_shares(engine):
+    names, flows = engine.issuer_flows()
+    assert names == ['BlackRock', 'ChinaAMC', 'Fidelity', 'Grayscale', 'TOTAL']
+    np.testing.assert_array_equal(flows[0], [105, 50, 40])
+    
+    _, gross = engine.issuer_share()
+    # Day 0: |105| + |-20| = 125; day 1: 50 + 2 + 30 = 82
+    np.testing.assert_allclose(gross[:, 0], [105 / 125, 0, 20 / 125, 0, 0])
+    np.testing.assert_allclose(gross[:, 1], [50 / 82, 2 / 82, 0, 30 / 82, 0])
+    _, net = engine.issuer_share(gross=False)
+    np.testing.assert_allclose(net[:, 0], [105 / 85, 0, -20 / 85, 0, 0])
+    _, summed = engine.issuer_share(window=2)
+    np.testing.assert_allclose(summed[0, 1], 155 / 207)
+
+
+def test_issuer_overrides(make_api):
+    cg = make_api(make_handler(make_data()))
+    engine = ETFFlowEngine(cg, sources=['us_btc'], issuers={'ibit': 'iShares'}).load()
+    assert engine.issuer_flows()[0] == ['Fidelity', 'Grayscale', 'iShares']
+
+
+def test_load_filters_unranged_sources_by_day(make_api):
+    cg = make_api(make_handler(make_data()))
+    engine = ETFFlowEngine(cg, sources=['us_btc', 'hk_btc'])
+    engine.load(startTime=day(1) + 1, endTime=day(1))
+    params = {path: params for path, params in cg.client.session.calls}
+    assert params['etf/bitcoin/flow-history'] == {'startTime': day(1) + 1, 'endTime': day(1)}
+    assert params['hk-etf/bitcoin/flow-history'] == {}
+    # The ranged source returned nothing; Hong Kong's full history is cut to day 1
+    assert engine.labels == [('hk_btc', '3042.HK')] and list(engine.days) == [day(1)]
+
+
+def test_update_overwrites_from_the_earliest_last_day(make_api):
+    data = make_data()
+    cg = make_api(make_handler(data))
+    engine = ETFFlowEngine(cg).load()
+    
+    # Day 2 is revised (GBTC drops out), day 3 arrives and Hong Kong catches up
+    data['etf/bitcoin/flow-history'][2] = {'time': day(2), 'etf_flows': {'IBIT': 45, 'FBTC': 10}}
+    data['etf/bitcoin/flow-history'].append({'time': day(3), 'etf_flows': {'IBIT': 60}})
+    data['hk-etf/bitcoin/flow-history'].append(
+        {'time': day(2), 'etf_flows': [{'etf_ticker': '3042.HK', 'flow_usd': 4}]}
+    )
+    calls = len(cg.client.session.calls)
+    engine.update()
+    
+    # Hong Kong's last day (day 1) is the earliest
+    starts = {path: params.get('startTime') for path, params in cg.client.session.calls[calls:]}
+    assert starts == {
+        'etf/bitcoin/flow-history': day(1), 'etf/ethereum/flow-history': day(1),
+        'hk-etf/bitcoin/flow-history': None,
+    }
+    np.testing.assert_array_equal(engine[('us_btc', 'GBTC')], [0, -30, 0, 0])
+    np.testing.assert_array_equal(engine[('hk_btc', '3042.HK')], [0, 2, 4, 0])
+    
+    fresh = ETFFlowEngine(make_api(make_handler(data))).load()
+    assert engine.labels == fresh.labels
+    np.testing.assert_array_equal(engine.days, fresh.days)
+    np.testing.assert_array_equal(engine.flows, fresh.flows)
+
+
+def test_failed_sources_are_recorded(make_api):
+    cg = make_api(make_handler(make_data(), failing=('etf/ethereum/flow-history',)))
+    engine = ETFFlowEngine(cg).load()
+    assert list(engine.errors) == ['us_eth']
+    assert engine.tickers('us_eth') == [] and engine.tickers('us_btc') == ['FBTC', 'GBTC', 'IBIT']
+    
+    empty = ETFFlowEngine(cg, sources=['us_eth'])
+    assert len(empty.update().days) == 0
+    with pytest.raises(ValueError):
+        ETFFlowEngine(cg, sources=['eu_btc'])
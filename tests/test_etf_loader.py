@@ -0,0 +1,169 @@
+"""
+Tests for the ETF bulk loader
+"""
+import numpy as np
+import pytest
+
+from coinglass.analytics import etf_loader
+from coinglass.analytics.etf_loader import ETFBulkLoader
+
+D0 = 1699920000000  # 2023-11-14 00:00 UTC
+D = 86400 * 1000
+NAN = np.nan
+
+
+def day(i):
+    return D0 + i * D
+
+
+def make_data():
+    """Canned listing and per-ticker rows; IBIT's listing reports a NAV date of day 2."""
+    return {
+        'list': [
+            {'ticker': 'IBIT', 'asset_details': {'update_date': '2023-11-16'}},
+            {'ticker': 'FBTC', 'update_time': day(9)},
+        ],
+        'history': {
+            'IBIT': [
+                {'market_date': day(0), 'market_price': 10, 'nav': 10, 'premium_discount': 0.5,
+                 'net_assets': 100},
+                {'market_date': day(1), 'market_price': 11, 'nav': 10, 'net_assets': 110},
+                {'market_date': day(2), 'market_price': 12, 'nav': 12},
+            ],
+            'FBTC': [
+                {'market_date': day(1), 'market_price': 20, 'nav': 20, 'premium_discount': 0.1,
+                 'net_assets': 50},
+                {'market_date': day(2), 'market_price': 21, 'nav': 21, 'premium_discount': 0.2,
+                 'net_assets': 60},
+            ],
+        },
+        # IBIT's close is missing on day 2
+        'price': {
+            'IBIT': [{'time': day(0), 'close': 10.5}, {'time': day(1), 'close': 11}],
+            'FBTC': [{'time': day(1), 'close': 20}, {'time': day(2), 'close': 21}],
+        },
+        'net-assets': [
+            {'time': day(1), 'net_assets_usd': 160},
+            {'time': day(2), 'net_assets_usd': 310,
+             'list': [{'ticker': 'IBIT', 'net_assets_usd': 250}]},
+        ],
+    }
+
+
+def make_handler(data, failing=()):
+    def handler(path, params):
+        kind = path.split('/')[2]
+        if (kind, params.get('ticker')) in failing:
+            raise RuntimeError('unavailable')
+        start = params.get('startTime', 0)
+        if kind == 'list':
+            return data['list']
+        if kind == 'detail':
+            return {'ticker': params['ticker']}
+        if kind == 'net-assets':
+            return [row for row in data[kind] if row['time'] >= start]
+        rows = data[kind][params['ticker']]
+        return [row for row in rows if row.get('market_date', row.get('time')) >= start]
+    
+    return handler
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [(day(2) + 10 * 3600000) / 1000]
+    monkeypatch.setattr(etf_loader.time, 'time', lambda: now[0])
+    return now
+
+
+def test_refresh_merges_history_price_and_net_assets(make_api, clock):
+    cg = make_api(make_handler(make_data()))
+    loader = ETFBulkLoader(cg)
+    assert sorted(loader.refresh()) == ['FBTC', 'IBIT']
+    assert loader.tickers == ['FBTC', 'IBIT'] and loader.details['IBIT'] == {'ticker': 'IBIT'}
+    ranges = {params['ticker']: params['range'] for path, params in cg.client.session.calls
+              if path == 'etf/bitcoin/price/history'}
+    assert ranges == {'IBIT': '1y', 'FBTC': '1y'}
+    
+    data = loader.dataset()
+    assert list(data['ticker']) == ['FBTC', 'FBTC', 'IBIT', 'IBIT', 'IBIT']
+    assert list(data['date']) == [day(1), day(2), day(0), day(1), day(2)]
+    # IBIT: close first, then the history's market price; premium reported or derived
+    np.testing.assert_array_equal(data['price'][2:], [10.5, 11, 12])
+    np.testing.assert_allclose(data['premium'][2:], [0.5, 10, 0])
+    np.testing.assert_array_equal(data['premium'][:2], [0.1, 0.2])
+    # IBIT's missing day-2 AUM comes from the net assets breakdown
+    np.testing.assert_array_equal(data['aum'], [50, 60, 100, 110, 250])
+    days, total = loader.total_aum
+    assert list(days) == [day(1), day(2)] and list(total) == [160, 310]
+    
+    tickers, days, nav = loader.matrix('nav')
+    assert tickers == ['FBTC', 'IBIT'] and list(days) == [day(0), day(1), day(2)]
+    np.testing.assert_array_equal(nav, [[NAN, 20, 21], [10, 10, 12]])
+    _, _, aum = loader.matrix('aum', fill='ffill')
+    np.testing.assert_array_equal(aum[0], [NAN, 50, 60])
+    with pytest.raises(ValueError):
+        loader.matrix('volume')
+
+
+def test_staleness_follows_the_listed_nav_date(make_api, clock):
+    data = make_data()
+    cg = make_api(make_handler(data))
+    loader = ETFBulkLoader(cg)
+    loader.refresh()
+    calls = len(cg.client.session.calls)
+    
+    # A day later neither ticker is stale: IBIT's listed NAV date is day 2
+    clock[0] += 86400
+    assert loader.stale() == [] and loader.refresh() == []
+    assert len(cg.client.session.calls) == calls + 1
+    
+    # FBTC has no listed NAV date and ages out; then IBIT's listing moves to day 3
+    clock[0] += 86400
+    assert loader.stale(now=clock[0] * 1000) == ['FBTC']
+    data['list'][0] = {'ticker': 'IBIT', 'asset_details': {'update_date': '2023-11-17'}}
+    data['history']['IBIT'][2] = {'market_date': day(2), 'market_price': 12, 'nav': 12.5}
+    data['history']['IBIT'].append({'market_date': day(3), 'market_price': 13, 'nav': 13})
+    data['price']['IBIT'].append({'time': day(3), 'close': 13.5})
+    data['net-assets'].append({'time': day(3), 'net_assets_usd': 330})
+    calls = len(cg.client.session.calls)
+    assert sorted(loader.refresh()) == ['FBTC', 'IBIT']
+    
+    fetched = cg.client.session.calls[calls:]
+    starts = {(path, params.get('ticker')): params.get('startTime') for path, params in fetched}
+    assert starts[('etf/bitcoin/history', 'IBIT')] == day(2)
+    assert starts[('etf/bitcoin/history', 'FBTC')] == day(2)
+    assert starts[('etf/bitcoin/net-assets/history', None)] == day(2)
+    assert {params['range'] for path, params in fetched if 'range' in params} == {'7d'}
+    
+    # Day 2 is overwritten; the merged state matches a fresh load
+    fresh = ETFBulkLoader(make_api(make_handler(data)))
+    fresh.refresh()
+    merged, expected = loader.dataset(), fresh.dataset()
+    for name in expected:
+        np.testing.assert_array_equal(merged[name], expected[name])
+    np.testing.assert_array_equal(merged['nav'][2:], [10, 10, 12.5, 13])
+    for got, want in zip(loader.total_aum, fresh.total_aum):
+        np.testing.assert_array_equal(got, want)
+    
+    calls = len(cg.client.session.calls)
+    assert sorted(loader.refresh(force=True)) == ['FBTC', 'IBIT']
+    assert not any('startTime' in params for _, params in cg.client.session.calls[calls:])
+
+
+def test_failed_histories_are_skipped_and_recorded(make_api, clock):
+    failing = (('history', 'FBTC'), ('detail', 'IBIT'))
+    loader = ETFBulkLoader(make_api(make_handler(make_data(), failing)))
+    assert loader.refresh(tickers=['IBIT', 'FBTC']) == ['IBIT']
+    assert sorted(loader.errors) == [('detail', 'IBIT'), ('history', 'FBTC')]
+    assert loader.stale() == ['FBTC'] and 'IBIT' not in loader.details
+    with pytest.raises(ValueError):
+        ETFBulkLoader(None, price_range='2y')
+
+
+def test_refresh_is_paced_by_the_fanout_limiter(make_api, clock, monkeypatch):
+    cg = make_api(make_handler(make_data()), paced=True)
+    acquired = []
+    monkeypatch.setattr(cg.fanout.rate_limiter, 'acquire', lambda: acquired.append(1))
+    ETFBulkLoader(cg).refresh()
+    # history, price and detail per ticker plus the total AUM
+    assert len(acquired) == 7
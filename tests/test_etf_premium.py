@@ -0,0 +1,175 @@
+"""
+Tests for the ETF premium/discount monitor
+"""
+import numpy as np
+import pytest
+
+from coinglass.analytics import etf_loader, etf_premium
+from coinglass.analytics.etf_premium import ETFPremiumMonitor, premium_regimes, rolling_std
+
+D0 = 1699920000000  # 2023-11-14 00:00 UTC
+D = 86400 * 1000
+NAN = np.nan
+
+
+def day(i):
+    return D0 + i * D
+
+
+# Ticker to per-day premium history entries (GBTC's AUM is null before day 2)
+PREMIUM = {
+    'IBIT': [
+        {'premium_discount_details': 0.6, 'nav_usd': 10, 'market_price_usd': 10.06},
+        {'premium_discount_details': 0.2, 'nav_usd': 10, 'market_price_usd': 10.02},
+        {'premium_discount_details': -0.7, 'nav_usd': 11, 'market_price_usd': 10.92},
+    ],
+    'GBTC': [
+        {'premium_discount_details': -1.0, 'nav_usd': 20, 'market_price_usd': 19.8,
+         'net_assets_usd': None},
+        {'premium_discount_details': -0.6, 'nav_usd': 21, 'market_price_usd': 20.9,
+         'net_assets_usd': None},
+        {'premium_discount_details': 0.4, 'nav_usd': 21, 'market_price_usd': 21.1,
+         'net_assets_usd': 45},
+    ],
+}
+
+
+def premium_rows(layout):
+    """Premium history as per-day rows with a ticker list, or as flat per-ticker rows."""
+    if layout == 'nested':
+        return [
+            {'time': day(i), 'list': [dict(PREMIUM[t][i], ticker=t) for t in PREMIUM]}
+            for i in range(3)
+        ]
+    return [dict(PREMIUM[t][i], ticker=t, time=day(i)) for t in PREMIUM for i in range(3)]
+
+
+def make_handler(layout, failing=()):
+    listing = [
+        {'ticker': 'IBIT', 'asset_details': {'update_date': '2023-11-16', 'net_assets_usd': 999}},
+        {'ticker': 'GBTC', 'aum_usd': 77},
+    ]
+    history = {
+        'IBIT': [
+            {'market_date': day(0), 'market_price': 9, 'nav': 10, 'net_assets': 100},
+            {'market_date': day(1), 'market_price': 9, 'nav': 10, 'net_assets': 110},
+            {'market_date': day(2), 'market_price': 9, 'nav': 11},
+        ],
+        'GBTC': [
+            {'market_date': day(0), 'market_price': 19.8, 'nav': 20, 'net_assets': 50},
+            {'market_date': day(1), 'market_price': 21, 'nav': 21, 'net_assets': 40},
+            {'market_date': day(2), 'nav': 21},
+        ],
+    }
+    # GBTC has no price history
+    price = {'IBIT': [{'time': day(i), 'close': close} for i, close in enumerate([10, 10.5, 11])]}
+    
+    def handler(path, params):
+        kind = path.split('/')[2]
+        if (kind, params.get('ticker')) in failing:
+            raise RuntimeError('unavailable')
+        if kind == 'premium-discount':
+            return premium_rows(layout)
+        if kind == 'list':
+            return listing
+        if kind == 'history':
+            return history[params['ticker']]
+        if kind == 'price':
+            return price.get(params['ticker'], [])
+        if kind == 'detail':
+            return {}
+        return [{'time': day(0), 'net_assets_usd': 150}, {'time': day(2), 'net_assets_usd': 1044}]
+    
+    return handler
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [(day(2) + 10 * 3600000) / 1000]
+    monkeypatch.setattr(etf_premium.time, 'time', lambda: now[0])
+    monkeypatch.setattr(etf_loader.time, 'time', lambda: now[0])
+    return now
+
+
+@pytest.fixture(params=['nested', 'flat'])
+def monitor(request, make_api, clock):
+    monitor = ETFPremiumMonitor(make_api(make_handler(request.param)))
+    assert monitor.refresh()
+    return monitor
+
+
+def test_premium_regimes_hold_until_the_opposite_threshold():
+    premium = [0.2, 0.6, 0.3, NAN, -0.7, 0.1, 0.8]
+    np.testing.assert_array_equal(premium_regimes(np.array(premium)), [[0, 1, 1, 1, -1, -1, 1]])
+    regimes = premium_regimes(np.array([[-0.6, 0.4, 0.5], [0.1, 0.2, 0.3]]))
+    np.testing.assert_array_equal(regimes, [[-1, -1, -1], [0, 0, 0]])
+    assert regimes.dtype == np.int8
+    np.testing.assert_array_equal(premium_regimes(np.array([0.4]), threshold=0.3), [[1]])
+
+
+def test_rolling_std_skips_missing_values():
+    values = np.array([[1.0, 2.0, NAN, 4.0, 6.0]])
+    expected = [NAN, np.std([1, 2], ddof=1), np.std([1, 2], ddof=1), np.std([2, 4], ddof=1),
+                np.std([4, 6], ddof=1)]
+    np.testing.assert_allclose(rolling_std(values, 3)[0], expected)
+    assert np.isnan(rolling_std(np.array([[NAN, 1.0, NAN]]), 2)).all()
+
+
+def test_series_are_aligned_on_one_daily_index(monitor):
+    assert monitor.tickers == ['GBTC', 'IBIT']
+    assert list(monitor.days) == [day(0), day(1), day(2)]
+    np.testing.assert_allclose(monitor.premium, [[-1.0, -0.6, 0.4], [0.6, 0.2, -0.7]])
+    np.testing.assert_array_equal(monitor.nav, [[20, 21, 21], [10, 10, 11]])
+    # Price history close, then the ticker history's and the premium history's market price
+    np.testing.assert_array_equal(monitor.price, [[19.8, 21, 21.1], [10, 10.5, 11]])
+    # Daily AUM from the ticker history; the listing fills only IBIT's latest day
+    np.testing.assert_array_equal(monitor.aum, [[50, 40, 45], [100, 110, 999]])
+    np.testing.assert_array_equal(monitor.total_aum, [150, NAN, 1044])
+
+
+def test_weighted_premium_regimes_and_tracking_error(monitor):
+    expected = [
+        (50 * -1.0 + 100 * 0.6) / 150,
+        (40 * -0.6 + 110 * 0.2) / 150,
+        (45 * 0.4 + 999 * -0.7) / 1044,
+    ]
+    np.testing.assert_allclose(monitor.weighted_premium(), expected)
+    np.testing.assert_array_equal(monitor.regimes(), [[-1, -1, -1], [1, 1, -1]])
+    assert monitor.regime_changes() == [('IBIT', day(2), 1, -1)]
+    
+    # IBIT: price returns 5% and 11 / 10.5 - 1 against NAV returns 0% and 10%
+    active = [0.05, 11 / 10.5 - 1 - 0.1]
+    error = monitor.tracking_error()
+    assert error[1] == pytest.approx(np.std(active, ddof=1) * 100)
+    assert monitor.tracking_error(annualize=True)[1] == pytest.approx(error[1] * np.sqrt(252))
+    rolling = monitor.tracking_error(window=2)
+    assert np.isnan(rolling[1, :2]).all() and rolling[1, 2] == pytest.approx(error[1])
+
+
+def test_refresh_runs_once_per_day(make_api, clock):
+    cg = make_api(make_handler('nested'))
+    monitor = ETFPremiumMonitor(cg, refresh_hour_utc=6)
+    assert monitor.refresh()
+    assert monitor.expires == (day(3) + 6 * 3600000) / 1000
+    regimes = monitor.regimes()
+    calls = len(cg.client.session.calls)
+    assert not monitor.refresh() and len(cg.client.session.calls) == calls
+    assert monitor.regimes() is regimes
+    
+    clock[0] = monitor.expires
+    assert monitor.refresh()
+    premium_calls = [path for path, _ in cg.client.session.calls if 'premium-discount' in path]
+    assert len(premium_calls) == 2 and monitor.regimes() is not regimes
+    assert monitor.refresh(force=True)
+
+
+def test_failures_are_recorded(make_api, clock):
+    monitor = ETFPremiumMonitor(make_api(make_handler('flat', failing=[('detail', 'GBTC')])))
+    monitor.refresh()
+    assert list(monitor.errors) == [('detail', 'GBTC')]
+    
+    cg = make_api(make_handler('flat', failing=[('premium-discount', None)]))
+    failing = ETFPremiumMonitor(cg)
+    with pytest.raises(RuntimeError):
+        failing.refresh()
+    assert 'premium' in failing.errors
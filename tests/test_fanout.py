@@ -0,0 +1,139 @@
+"""
+Tests for the concurrent fan-out helpers
+"""
+import threading
+
+import pytest
+
+from coinglass.client import RateLimiter
+from coinglass.analytics.max_pain import MaxPainEngine
+from coinglass.fanout import FanOutResult, api_rate_limiter, run_concurrently
+
+PAIRS = {
+    'Binance': [
+        {'instrument_id': 'BTCUSDT', 'base_asset': 'BTC', 'quote_asset': 'USDT'},
+        {'instrument_id': 'ETHUSDT', 'base_asset': 'ETH', 'quote_asset': 'USDT'},
+    ],
+    'OKX': [
+        {
+            'instrument_id': 'BTC-USD-SWAP',
+            'base_asset': 'BTC',
+            'quote_asset': 'USD',
+            'margin_asset': 'BTC',
+        },
+    ],
+}
+
+
+class CountingLimiter(RateLimiter):
+    """Rate limiter that never waits and counts acquisitions."""
+    
+    def __init__(self):
+        super().__init__(60)
+        self.count = 0
+        self._count_lock = threading.Lock()
+    
+    def acquire(self):
+        with self._count_lock:
+            self.count += 1
+
+
+def test_run_concurrently_collects_results_and_errors():
+    def square(x):
+        if x < 0:
+            raise ValueError(x)
+        return x * x
+    
+    calls = [(x, (x,), {}) for x in (1, 2, -3, 4)]
+    results, errors = run_concurrently(square, calls, max_workers=3)
+    
+    assert results == {1: 1, 2: 4, 4: 16}
+    assert list(errors) == [-3]
+    assert isinstance(errors[-3], ValueError)
+
+
+def test_run_concurrently_passes_kwargs_and_handles_no_calls():
+    results, errors = run_concurrently(lambda a, b=0: a + b, [('k', (1,), {'b': 2})])
+    assert results == {'k': 3} and errors == {}
+    assert run_concurrently(lambda: None, []) == ({}, {})
+
+
+def test_run_concurrently_acquires_limiter_per_call():
+    limiter = CountingLimiter()
+    run_concurrently(lambda x: x, [(i, (i,), {}) for i in range(5)], rate_limiter=limiter)
+    assert limiter.count == 5
+
+
+def test_fanout_result_lists_exchanges_and_symbols():
+    result = FanOutResult(
+        {('OKX', 'BTC-USD-SWAP'): {}, ('Binance', 'BTCUSDT'): {}, ('Binance', 'ETHUSDT'): {}}
+    )
+    assert result.exchanges() == ['Binance', 'OKX']
+    assert result.symbols() == ['BTC-USD-SWAP', 'BTCUSDT', 'ETHUSDT']
+    assert result.errors == {}
+
+
+def test_rate_limit_is_off_by_default_on_the_client(make_api):
+    cg = make_api(lambda path, params: None, paced=True)
+    assert cg.client.rate_limiter is None
+    assert cg.fanout.rate_limiter.requests_per_minute == 30
+    assert api_rate_limiter(cg) is cg.fanout.rate_limiter
+    assert api_rate_limiter(object()) is None
+
+
+def test_engines_share_the_fanout_limiter(make_api):
+    cg = make_api(lambda path, params: [])
+    cg.fanout.rate_limiter = CountingLimiter()
+    MaxPainEngine(cg, exchanges=['Deribit', 'OKX', 'Binance']).load('BTC')
+    assert cg.fanout.rate_limiter.count == 3
+
+
+def test_client_rate_limit_replaces_the_fanout_limiter(make_api):
+    cg = make_api(lambda path, params: None, rate_limit=120)
+    assert cg.client.rate_limiter.requests_per_minute == 120
+    assert cg.fanout.rate_limiter is None
+
+
+def test_pair_index_filters_and_keeps_margin_asset(make_api):
+    cg = make_api(lambda path, params: PAIRS)
+    index = cg.fanout.get_pair_index('futures', symbols=['btc'], exchanges=['okx'])
+    assert index == [{
+        'exchange': 'OKX', 'instrument_id': 'BTC-USD-SWAP',
+        'base_asset': 'BTC', 'quote_asset': 'USD', 'margin_asset': 'BTC',
+    }]
+    assert len(cg.fanout.get_pair_index('futures', symbols=['BTC'])) == 2
+    with pytest.raises(ValueError):
+        cg.fanout.get_pair_index('options')
+
+
+def test_pairs_markets_rekeys_rows_by_exchange_and_instrument(make_api):
+    def handler(path, params):
+        if path.endswith('supported-exchange-pairs'):
+            return PAIRS
+        if params['symbol'] == 'ETH':
+            raise RuntimeError('unsupported')
+        return [
+            {'exchange_name': 'Binance', 'instrument_id': 'BTCUSDT', 'current_price': 1.0},
+            {'exchange_name': 'OKX', 'instrument_id': 'BTC-USD-SWAP', 'current_price': 2.0},
+        ]
+    
+    cg = make_api(handler)
+    result = cg.fanout.get_futures_pairs_markets(exchanges=['Binance'])
+    assert list(result) == [('Binance', 'BTCUSDT')]
+    assert list(result.errors) == [('*', 'ETH')]
+
+
+def test_pair_history_fetches_every_pair(make_api):
+    def handler(path, params):
+        if params['exchange'] == 'OKX':
+            raise RuntimeError('unsupported')
+        return [{'time': params['startTime'], 'close': params['symbol']}]
+    
+    cg = make_api(handler)
+    pairs = [('Binance', 'BTCUSDT'), ('Binance', 'ETHUSDT'), ('OKX', 'BTC-USD-SWAP')]
+    result = cg.fanout.get_open_interest_history('1h', pairs=pairs, startTime=5)
+    assert result == {
+        ('Binance', 'BTCUSDT'): [{'time': 5, 'close': 'BTCUSDT'}],
+        ('Binance', 'ETHUSDT'): [{'time': 5, 'close': 'ETHUSDT'}],
+    }
+    assert list(result.errors) == [('OKX', 'BTC-USD-SWAP')]
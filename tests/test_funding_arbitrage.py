@@ -0,0 +1,122 @@
+"""
+Tests for the funding-rate arbitrage scanner
+"""
+import numpy as np
+import pytest
+
+from coinglass.analytics.funding_arbitrage import (
+    FundingArbitrageScanner,
+    build_funding_matrix,
+    rank_opportunities,
+)
+
+CURRENT = [
+    {
+        'symbol': 'BTC',
+        'stablecoin_margin_list': [
+            {'exchange': 'Binance', 'funding_rate': 0.01, 'funding_rate_interval': 8},
+            {'exchange': 'OKX', 'funding_rate': '-0.005', 'funding_rate_interval': 8},
+            {'exchange': 'Hyperliquid', 'funding_rate': 0.002, 'funding_rate_interval': 1},
+        ],
+        'token_margin_list': [
+            {'exchange': 'Binance', 'funding_rate': 0.003, 'funding_rate_interval': 8},
+        ],
+    },
+    {
+        'symbol': 'ETH',
+        'stablecoin_margin_list': [
+            {'exchange': 'Binance', 'funding_rate': 0.005},
+            {'exchange': 'OKX', 'funding_rate': ''},
+        ],
+    },
+]
+
+ACCUMULATED = [
+    {
+        'symbol': 'BTC',
+        'stablecoin_margin_list': [
+            {'exchange': 'Binance', 'funding_rate': 0.2},
+            {'exchange': 'OKX', 'funding_rate': 0.05},
+            {'exchange': 'Hyperliquid', 'funding_rate': 0.3},
+        ],
+    },
+]
+
+
+def test_build_funding_matrix_decodes_nested_rows():
+    matrix = build_funding_matrix(CURRENT)
+    assert matrix.symbols == ['BTC', 'ETH']
+    assert matrix.exchanges == ['Binance', 'OKX', 'Hyperliquid']
+    np.testing.assert_allclose(matrix.rates[0], [0.01, -0.005, 0.002])
+    assert matrix.rates[1, 0] == 0.005 and np.isnan(matrix.rates[1, 1:]).all()
+    # 8760 hours per year over each cell's funding interval
+    np.testing.assert_allclose(matrix.annualized[0], [10.95, -5.475, 17.52])
+    token = build_funding_matrix(CURRENT, margin='token')
+    assert token.symbols == ['BTC'] and token.exchanges == ['Binance']
+    with pytest.raises(ValueError):
+        build_funding_matrix(CURRENT, margin='inverse')
+
+
+def test_build_funding_matrix_accepts_flat_rows():
+    matrix = build_funding_matrix([
+        {'symbol': 'BTC', 'exchange_name': 'Bybit', 'funding_rate': '0.001'},
+        {'symbol': 'BTC', 'exchange_name': 'OKX', 'funding_rate': None},
+    ])
+    assert matrix.shape == (1, 1) and matrix.rates[0, 0] == 0.001
+
+
+def test_rank_opportunities_orders_annualized_spreads():
+    ranked = rank_opportunities(build_funding_matrix(CURRENT), top_k=2)
+    assert [(o['short_exchange'], o['long_exchange']) for o in ranked] == [
+        ('Hyperliquid', 'OKX'),
+        ('Binance', 'OKX'),
+    ]
+    assert ranked[0]['annualized_spread'] == pytest.approx(17.52 + 5.475)
+    assert ranked[0]['spread'] == pytest.approx(0.007)
+    assert ranked[1]['short_funding_rate'] == 0.01 and ranked[1]['long_funding_rate'] == -0.005
+    assert len(rank_opportunities(build_funding_matrix(CURRENT), top_k=10)) == 3
+    assert (
+        rank_opportunities(build_funding_matrix(CURRENT), min_spread=20.0)[0]['long_exchange']
+        == 'OKX'
+    )
+    assert rank_opportunities(build_funding_matrix([]), top_k=5) == []
+
+
+def test_reindex_and_subset_fill_missing_cells():
+    matrix = build_funding_matrix(CURRENT)
+    subset = matrix.subset(symbols=['ETH', 'BTC'], exchanges=['OKX', 'Binance'])
+    assert subset.symbols == ['BTC', 'ETH'] and subset.exchanges == ['Binance', 'OKX']
+    aligned = matrix.reindex(['SOL', 'BTC'], ['OKX', 'Bybit'])
+    assert (
+        np.isnan(aligned.rates[0]).all()
+        and aligned.rates[1, 0] == -0.005
+        and np.isnan(aligned.rates[1, 1])
+    )
+
+
+def test_scanner_attaches_accumulated_spreads_and_reuses_refresh_args(make_api):
+    def handler(path, params):
+        return ACCUMULATED if path.endswith('accumulated-exchange-list') else CURRENT
+    
+    cg = make_api(handler)
+    scanner = FundingArbitrageScanner(cg)
+    scanner.refresh(symbol='BTC', accumulated_range='7d')
+    top = scanner.scan(top_k=1)
+    assert top[0]['accumulated_spread'] == pytest.approx(0.25)
+    
+    session = cg.client.session
+    session.calls.clear()
+    scanner.scan(refresh=True)
+    assert sorted(session.calls) == [
+        ('futures/funding-rate/accumulated-exchange-list', {'range': '7d', 'symbol': 'BTC'}),
+        ('futures/funding-rate/exchange-list', {'symbol': 'BTC'}),
+    ]
+    assert [o['symbol'] for o in scanner.scan(exchanges=['Binance', 'OKX'])] == ['BTC']
+
+
+def test_scanner_raises_when_current_rates_fail(make_api):
+    def handler(path, params):
+        raise RuntimeError('down')
+    
+    with pytest.raises(RuntimeError):
+        FundingArbitrageScanner(make_api(handler)).scan()
@@ -0,0 +1,87 @@
+"""
+Tests for the liquidation heatmap decoder
+"""
+import numpy as np
+import pytest
+
+from coinglass.analytics.heatmap import decode_heatmap, fetch_heatmap
+
+T0 = 1700000000000
+H = 3600 * 1000
+
+# Price axis deliberately unsorted; the duplicate (1, 1) cell is summed
+PAYLOAD = {
+    'y_axis': ['300', 100, 200],
+    'liquidation_leverage_data': [
+        [0, 0, 5],
+        [1, 1, 2],
+        [1, 0, 3],
+        [0, 2, 4],
+        [1, 1, 1],
+        [0, 7, 9],
+        [1, 0, None],
+    ],
+    'price_candlesticks': [
+        [T0, '150', '210', '140', '200', '1000'],
+        {'time': T0 + H, 'open': 200, 'high': 260, 'low': 190, 'close': 250},
+    ],
+}
+
+
+@pytest.fixture
+def heatmap():
+    return decode_heatmap(PAYLOAD)
+
+
+def test_decode_sorts_prices_and_sums_duplicate_cells(heatmap):
+    np.testing.assert_array_equal(heatmap.prices, [100.0, 200.0, 300.0])
+    assert list(heatmap.times) == [T0, T0 + H]
+    assert heatmap.shape == (3, 2) and heatmap.nnz == 5
+    np.testing.assert_array_equal(heatmap.dense(), [[0, 3], [4, 0], [5, 3]])
+    assert heatmap.candles['close'][1] == 250.0 and np.isnan(heatmap.candles['volume'][1])
+
+
+def test_csr_matches_dense(heatmap):
+    indptr, indices, data = heatmap.csr()
+    dense = np.zeros(heatmap.shape)
+    for row in range(heatmap.shape[0]):
+        np.add.at(
+            dense[row], indices[indptr[row] : indptr[row + 1]], data[indptr[row] : indptr[row + 1]]
+        )
+    np.testing.assert_array_equal(dense, heatmap.dense())
+
+
+def test_profiles_and_columns(heatmap):
+    np.testing.assert_array_equal(heatmap.profile(), [3, 4, 8])
+    np.testing.assert_array_equal(heatmap.profile(start=T0 + H), [3, 0, 3])
+    np.testing.assert_array_equal(heatmap.column(T0 + 30 * 60 * 1000), [0, 4, 5])
+    np.testing.assert_array_equal(heatmap.column(T0 - 1), [0, 0, 0])
+
+
+def test_cumulative_queries(heatmap):
+    assert heatmap.cumulative_below(200) == 3.0
+    assert heatmap.cumulative_above(200) == 12.0
+    assert heatmap.cumulative_between(150, 300) == 12.0
+    assert heatmap.cumulative_between(250, 260) == 0.0
+
+
+def test_cells_indexed_by_timestamp_without_candles():
+    heatmap = decode_heatmap(
+        {'y': [1, 2], 'z': [[1700003600, 0, 1], [1700000000, 1, 2], [1700003600, 1, 3]]}
+    )
+    assert list(heatmap.times) == [T0, T0 + H]
+    np.testing.assert_array_equal(heatmap.dense(), [[0, 1], [2, 3]])
+    assert decode_heatmap(None).shape == (0, 0)
+
+
+def test_fetch_heatmap_picks_the_endpoint(make_api):
+    cg = make_api(lambda path, params: PAYLOAD)
+    assert fetch_heatmap(cg, 'BTCUSDT', model=2, exchange='Binance').nnz == 5
+    fetch_heatmap(cg, 'BTC', model=3)
+    paths = [path for path, _ in cg.client.session.calls]
+    assert paths == [
+        'futures/liquidation/heatmap/model2',
+        'futures/liquidation/aggregated-heatmap/model3',
+    ]
+    with pytest.raises(ValueError):
+        fetch_heatmap(cg, 'BTC', model=4)
@@ -0,0 +1,141 @@
+"""
+Tests for the local indicators and their incremental updates
+"""
+import numpy as np
+import pytest
+
+from coinglass.analytics.indicators import (
+    ATR, EMA, MACD, RSI, SMA, Bollinger, IndicatorEngine, compute_indicators,
+)
+
+T0 = 1700000000000
+H = 3600 * 1000
+PAIRS = [('Binance', 'BTCUSDT'), ('OKX', 'BTC-USDT-SWAP')]
+
+
+def random_ohlc(symbols, steps, seed=0, gaps=True):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, (symbols, steps)), axis=1)
+    open_ = close + rng.normal(0, 0.5, close.shape)
+    high = np.maximum(open_, close) + rng.uniform(0, 1, close.shape)
+    low = np.minimum(open_, close) - rng.uniform(0, 1, close.shape)
+    ohlc = {'open': open_, 'high': high, 'low': low, 'close': close}
+    if gaps:
+        for values in ohlc.values():
+            values[0, 30:33] = np.nan
+            values[1, 50] = np.nan
+    return ohlc
+
+
+def small_indicators():
+    return [RSI(5), EMA(4), SMA(3), ATR(3), Bollinger(4, 1.5), MACD(3, 6, 3)]
+
+
+@pytest.mark.parametrize('index', range(6))
+def test_batch_equals_bar_by_bar_updates(index):
+    ohlc = random_ohlc(3, 80)
+    batched, stepped = small_indicators()[index], small_indicators()[index]
+    history = {field: values[:, :70] for field, values in ohlc.items()}
+    expected = {name: np.full((3, 70), np.nan) for name in stepped.outputs()}
+    for t in range(70):
+        bar = {field: values[:, t] for field, values in history.items()}
+        for name, value in stepped.update(bar).items():
+            expected[name][:, t] = value
+    result = batched.batch(history)
+    assert sorted(result) == sorted(batched.outputs())
+    for name in expected:
+        np.testing.assert_allclose(result[name], expected[name], rtol=1e-9)
+    
+    # The batch leaves the state ready to continue bar by bar
+    for t in range(70, 80):
+        bar = {field: values[:, t] for field, values in ohlc.items()}
+        left, right = batched.update(bar), stepped.update(bar)
+        for name in left:
+            np.testing.assert_allclose(left[name], right[name], rtol=1e-9)
+
+
+def test_hand_computed_values():
+    data = {field: np.array([[1.0, 2.0, 1.0, 3.0]]) for field in ('open', 'high', 'low', 'close')}
+    values = compute_indicators(data, [SMA(3), EMA(3), RSI(2), Bollinger(2, 1.0)])
+    np.testing.assert_allclose(values['sma_3'][0], [np.nan, np.nan, 4 / 3, 2.0])
+    # EMA(3) has alpha 0.5 and is seeded with the first SMA
+    np.testing.assert_allclose(values['ema_3'][0], [np.nan, np.nan, 4 / 3, 13 / 6])
+    # Wilder averages seed at gain 0.5 / loss 0.5, then move to 1.25 / 0.25
+    np.testing.assert_allclose(values['rsi_2'][0], [np.nan, np.nan, 50.0, 100 - 100 / 6])
+    np.testing.assert_allclose(values['bb_mid_2'][0], [np.nan, 1.5, 1.5, 2.0])
+    np.testing.assert_allclose(values['bb_upper_2'][0, 3], 3.0)
+    np.testing.assert_allclose(values['bb_width_2'][0, 3], 1.0)
+
+
+def make_handler(bars):
+    def handler(path, params):
+        row = PAIRS.index((params['exchange'], params['symbol']))
+        start = params.get('startTime', T0)
+        return [
+            {'time': T0 + t * H, **{field: values[row, t] for field, values in bars.items()}}
+            for t in range(bars['close'].shape[1]) if T0 + t * H >= start
+        ]
+    
+    return handler
+
+
+def test_engine_update_matches_a_fresh_load(make_api):
+    full = random_ohlc(2, 64, seed=1, gaps=False)
+    bars = {field: values[:, :60].copy() for field, values in full.items()}
+    cg = make_api(make_handler(bars))
+    engine = IndicatorEngine(cg, interval='1h', indicators=small_indicators())
+    engine.load(PAIRS)
+    assert engine.ohlc['close'].shape == (2, 60)
+    
+    # The last bar was still forming: it closes elsewhere and four new bars arrive
+    for field, values in full.items():
+        values[:, 59] += 0.7
+        bars[field] = values.copy()
+    written = engine.update()
+    assert list(written) == [T0 + t * H for t in range(59, 64)]
+    assert cg.client.session.calls[-1][1]['startTime'] == T0 + 59 * H
+    assert engine.update().tolist() == [T0 + 63 * H]
+    
+    fresh = IndicatorEngine(make_api(make_handler(bars)), indicators=small_indicators())
+    fresh.load(PAIRS)
+    np.testing.assert_array_equal(engine.times, fresh.times)
+    np.testing.assert_array_equal(engine.ohlc['close'], fresh.ohlc['close'])
+    assert sorted(engine.values) == sorted(fresh.values)
+    for name in fresh.values:
+        np.testing.assert_allclose(engine.values[name], fresh.values[name], rtol=1e-9)
+
+
+def test_unknown_market():
+    with pytest.raises(ValueError):
+        IndicatorEngine(None, market='options')
+
+
+def test_reloading_starts_from_fresh_indicators(make_api):
+    bars = random_ohlc(2, 40, seed=2, gaps=False)
+    engine = IndicatorEngine(make_api(make_handler(bars)), indicators=small_indicators())
+    first = {name: values.copy() for name, values in engine.load(PAIRS).items()}
+    second = engine.load(PAIRS)
+    for name in first:
+        np.testing.assert_array_equal(second[name], first[name])
+    # A different number of pairs
+    assert engine.load(PAIRS[:1])['rsi_5'].shape == (1, 40)
+    single = {field: values[:1] for field, values in bars.items()}
+    expected = compute_indicators(single, small_indicators())
+    np.testing.assert_allclose(engine.values['rsi_5'], expected['rsi_5'], rtol=1e-9)
+
+
+@pytest.mark.parametrize('index', range(6))
+def test_restore_undoes_one_update(index):
+    ohlc = random_ohlc(2, 60, seed=3)
+    indicator, reference = small_indicators()[index], small_indicators()[index]
+    for t in range(59):
+        bar = {field: values[:, t] for field, values in ohlc.items()}
+        indicator.update(bar)
+        reference.update(bar)
+    checkpoint = indicator.checkpoint()
+    indicator.update({field: values[:, 59] + 5.0 for field, values in ohlc.items()})
+    indicator.restore(checkpoint)
+    bar = {field: values[:, 59] for field, values in ohlc.items()}
+    left, right = indicator.update(bar), reference.update(bar)
+    for name in right:
+        np.testing.assert_array_equal(left[name], right[name])
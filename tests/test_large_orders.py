@@ -0,0 +1,141 @@
+"""
+Tests for the large limit order tracker
+"""
+import pytest
+
+from coinglass.analytics import large_orders
+from coinglass.analytics.large_orders import LargeOrderBook, LargeOrderTracker, order_key
+
+T0 = 1700000000000
+
+
+def order(key, side, price, start, current=None, **fields):
+    row = {'order_side': side, 'price': price, 'start_quantity': start, 'start_time': T0, **fields}
+    if key is not None:
+        row['id'] = key
+    if current is not None:
+        row['current_quantity'] = current
+    return row
+
+
+def summary(events):
+    return [(event['event'], event['key'], event['side'], event['price']) for event in events]
+
+
+def test_lifecycle_events_from_successive_snapshots():
+    book = LargeOrderBook(fill_tolerance=0.05)
+    wall = ('1', 105.0, T0)
+    first = [order(1, 2, 99, 10, 10), order(2, 1, 101, 5, 5), order(None, '1', '105', 5, 5)]
+    assert summary(book.apply(first, now=T0)) == [
+        ('placed', 1, 'bid', 99.0), ('placed', 2, 'ask', 101.0), ('placed', wall, 'ask', 105.0),
+    ]
+    
+    # The bid and the keyless ask are partly filled; the other ask vanishes untouched
+    events = book.apply([order(1, 2, 99, 10, 6), order(None, '1', '105', 5, 0.1)], now=T0 + 1)
+    assert summary(events) == [
+        ('partially_filled', 1, 'bid', 99.0),
+        ('partially_filled', wall, 'ask', 105.0),
+        ('cancelled', 2, 'ask', 101.0),
+    ]
+    assert events[0]['filled_quantity'] == 4.0 and events[0]['time'] == T0 + 1
+    assert events[1]['filled_quantity'] == pytest.approx(4.9)
+    
+    # An explicit filled state closes the bid; the nearly filled ask vanishes as filled
+    events = book.apply([order(1, 2, 99, 10, 0, order_state=2)], now=T0 + 2)
+    assert summary(events) == [('filled', 1, 'bid', 99.0), ('filled', wall, 'ask', 105.0)]
+    assert len(book) == 0 and book.mid() is None
+    assert book.apply([order(3, 2, 98, 1, order_state='3')], now=T0) == []
+
+
+def test_remaining_quantity_falls_back_to_executed_volume():
+    book = LargeOrderBook()
+    book.apply([order(1, 2, 99, 10, executed_volume=0)], now=T0)
+    events = book.apply([order(1, 2, 99, 10, executed_volume=3)], now=T0)
+    assert events[0]['filled_quantity'] == 3.0
+
+
+def test_walls_are_indexed_by_side_and_price():
+    book = LargeOrderBook()
+    book.apply([
+        order(1, 2, 99, 1), order(2, 2, 95, 1), order(3, 1, 101, 1),
+        order(4, 1, 104, 1), order(None, 1, 104, 1),
+    ], now=T0)
+    assert [row['price'] for row in book.walls('bid', 90, 100)] == [95, 99]
+    # Integer ids and keyless tuple identities share a price level
+    assert len(book.walls('ask', 104, 104)) == 2
+    assert book.mid() == 100.0
+    near = book.walls_near(1.0)
+    assert [row['id'] for row in near['bid']] == [1] and [row['id'] for row in near['ask']] == [3]
+    assert book.walls_near(5.0, mid=100)['ask'][-1]['price'] == 104
+    
+    book.apply([order(1, 2, 99, 1), order(4, 1, 104, 1)], now=T0)
+    assert [row['id'] for row in book.walls('ask', 0, 1000)] == [4]
+    assert book.walls('bid', 0, 1000)[0]['id'] == 1
+
+
+def test_order_key():
+    assert order_key({'order_id': 9}) == 9
+    assert order_key({'order_side': 1, 'price': '10', 'start_time': T0}) == (1, 10.0, T0)
+
+
+def test_tracker_polls_every_market(make_api):
+    snapshots = {'Binance': [order(1, 2, 99, 1)], 'OKX': [order(7, 1, 101, 1)]}
+    
+    def handler(path, params):
+        if params['exchange'] == 'Bybit':
+            raise RuntimeError('unsupported')
+        return snapshots[params['exchange']]
+    
+    cg = make_api(handler)
+    pairs = [('Binance', 'BTCUSDT'), ('OKX', 'BTC-USDT-SWAP'), ('Bybit', 'BTCUSDT')]
+    tracker = LargeOrderTracker(cg, pairs, interval=1)
+    events = tracker.poll_once()
+    assert sorted((event['exchange'], event['symbol'], event['event']) for event in events) == [
+        ('Binance', 'BTCUSDT', 'placed'), ('OKX', 'BTC-USDT-SWAP', 'placed'),
+    ]
+    assert list(tracker.errors) == [('Bybit', 'BTCUSDT')]
+    assert cg.client.session.calls[0][0] == 'futures/large-limit-order'
+    assert tracker.poll_once() == []
+    
+    snapshots['Binance'] = []
+    assert [event['event'] for event in tracker.poll_once()] == ['cancelled']
+    assert tracker.walls_near('OKX', 'BTC-USDT-SWAP', 1.0, mid=100)['ask'][0]['id'] == 7
+    with pytest.raises(ValueError):
+        LargeOrderTracker(cg, pairs, market='options')
+
+
+def test_iteration_raises_after_repeated_total_failures(make_api, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(large_orders.time, 'sleep', sleeps.append)
+    
+    def handler(path, params):
+        raise RuntimeError('down')
+    
+    tracker = LargeOrderTracker(
+        make_api(handler), [('Binance', 'BTCUSDT')], interval=5, max_errors=2
+    )
+    with pytest.raises(Exception):
+        list(tracker)
+    assert sleeps == [5, 5]
+
+
+def test_history_events_are_sorted_by_time(make_api):
+    rows = [
+        order(1, 2, 99, 1, order_state=2, current_time=T0 + 50, start_time=T0 + 10),
+        order(2, 1, 101, 1, order_state=1, start_time=T0 + 20),
+    ]
+    cg = make_api(lambda path, params: rows)
+    events = LargeOrderTracker(cg, [], interval=1).history_events(
+        'Binance', 'BTCUSDT', '4h', startTime=T0
+    )
+    assert [(event['event'], event['key'], event['time']) for event in events] == [
+        ('placed', 1, T0 + 10), ('placed', 2, T0 + 20), ('filled', 1, T0 + 50),
+    ]
+    assert events[0]['exchange'] == 'Binance'
+    path, params = cg.client.session.calls[0]
+    assert path == 'futures/large-limit-order/history' and params['interval'] == '4h'
+
+
+@pytest.mark.parametrize('market', ['futures', 'spot'])
+def test_default_interval_is_the_endpoint_cache_time(market):
+    assert LargeOrderTracker(None, [], market=market).interval == 10
@@ -0,0 +1,71 @@
+"""
+Tests for the LazyRows view
+"""
+import math
+
+import pytest
+
+from coinglass.lazy import LazyRows
+from coinglass.models import OHLCData
+
+ROWS = [
+    {'time': 1, 'open': '10', 'high': '12', 'low': '9', 'close': '11', 'volume_usd': '500'},
+    {'time': 2, 'open': '11', 'high': '13', 'low': '10', 'close': '12', 'volume_usd': None},
+    {'time': 3, 'open': '12', 'high': '12', 'low': '8', 'close': '9', 'volume_usd': '900'},
+    {'time': 4, 'open': '9', 'high': '10', 'low': '7', 'close': '7'},
+]
+
+
+def test_indexing_converts_only_accessed_rows():
+    rows = LazyRows(ROWS, OHLCData)
+    assert len(rows) == 4 and rows.converted_count == 0
+    assert rows[1].close == 12.0
+    assert rows[-1].time == 4
+    assert rows.converted_count == 2
+    assert rows[1] is rows[-3]
+    assert rows.converted_count == 2
+
+
+@pytest.mark.parametrize('index', [4, -5, 100])
+def test_indexing_out_of_range_raises(index):
+    with pytest.raises(IndexError):
+        LazyRows(ROWS, OHLCData)[index]
+
+
+def test_slices_and_iteration():
+    rows = LazyRows(ROWS, OHLCData)
+    tail = rows[2:]
+    assert isinstance(tail, LazyRows)
+    assert [row.time for row in tail] == [3, 4]
+    assert rows.converted_count == 0
+    assert [row.close for row in rows] == [11.0, 12.0, 9.0, 7.0]
+    assert len(rows.materialize()) == 4
+    assert list(LazyRows(None)) == []
+
+
+def test_plain_rows_and_pydantic_models():
+    assert LazyRows(ROWS)[0] is ROWS[0]
+    model = LazyRows(ROWS, OHLCData, fast=False)[0]
+    assert isinstance(model, OHLCData) and model.open == 10.0
+
+
+def test_raw_filters_and_projections():
+    rows = LazyRows(ROWS, OHLCData)
+    assert [row.time for row in rows.filter(lambda row: float(row['close']) > 10)] == [1, 2]
+    assert rows.where(time=3)[0].low == 8.0
+    assert rows.select('time', 'close')[0] == {'time': 1, 'close': '11'}
+    assert rows.column('close') == [11.0, 12.0, 9.0, 7.0]
+    volume = rows.column('volume_usd')
+    assert volume[0] == 500.0 and math.isnan(volume[1]) and math.isnan(volume[3])
+    assert rows.column('volume_usd', numeric=False)[1:] == [None, '900', None]
+    assert math.isnan(LazyRows([{'price': 'n/a'}]).column('price')[0])
+    assert rows.converted_count == 0
+
+
+def test_top_and_sort_put_missing_values_last():
+    rows = LazyRows(ROWS, OHLCData)
+    assert [row['time'] for row in rows.top(3, 'volume_usd').raw] == [3, 1, 2]
+    assert [row['time'] for row in rows.top(2, 'close', largest=False).raw] == [4, 3]
+    assert [row['time'] for row in rows.sort_by('volume_usd').raw][:2] == [1, 3]
+    assert [row['time'] for row in rows.sort_by('volume_usd', reverse=True).raw][:2] == [3, 1]
+    assert repr(rows.top(1, 'close')) == 'LazyRows(1 x OHLCData, 0 converted)'
@@ -0,0 +1,84 @@
+"""
+Tests for the liquidation map level index
+"""
+import numpy as np
+import pytest
+
+from coinglass.analytics.liquidation_map import build_liquidation_map, fetch_liquidation_map
+
+# Price-keyed clusters of [price, amount, leverage]; the empty amount is skipped
+PAYLOAD = {
+    '99000': [[99000, 10, 25], [99000, 5, 100]],
+    '101000': [[101000, 20, 25]],
+    '98000': [[98000, 7, 10], [98000, '', 5]],
+}
+
+
+@pytest.fixture
+def index():
+    return build_liquidation_map(PAYLOAD)
+
+
+def test_build_sorts_levels_and_leverages(index):
+    np.testing.assert_array_equal(index.prices, [98000, 99000, 101000])
+    np.testing.assert_array_equal(index.leverages, [10, 25, 100])
+    np.testing.assert_array_equal(index.amounts, [[7, 0, 0], [0, 10, 5], [0, 20, 0]])
+    np.testing.assert_array_equal(index.level_totals, [7, 15, 20])
+    assert len(index) == 3
+
+
+def test_range_sums(index):
+    assert index.range_sum(98500, 101000) == 35.0
+    assert index.range_sum(98500, 101000, leverages=[25]) == 30.0
+    assert index.range_sum(0, 1e9, leverages=[25, 50]) == 30.0
+    assert index.range_sum(101001, 120000) == 0.0
+    assert index.range_sum(100000, 99000) == 0.0
+
+
+def test_long_and_short_sides_exclude_the_reference_level(index):
+    assert index.long_liquidations(0, 1e9, price=100000) == 22.0
+    assert index.short_liquidations(0, 1e9, price=100000) == 20.0
+    assert index.long_liquidations(0, 1e9, price=99000) == 7.0
+    assert index.short_liquidations(0, 1e9, price=99000, leverages=[25]) == 20.0
+
+
+def test_nearest_and_top_clusters(index):
+    assert index.nearest_above(99000) == (101000.0, 20.0)
+    assert index.nearest_below(99000) == (98000.0, 7.0)
+    assert index.nearest_above(99000, min_amount=25) is None
+    assert index.nearest_below(98000) is None
+    assert index.top_clusters(2) == [(101000.0, 20.0), (99000.0, 15.0)]
+    assert index.top_clusters(0) == []
+
+
+def test_diff_against_an_earlier_snapshot(index):
+    previous = build_liquidation_map(
+        {'data': {'98000': [[98000, 7, 10]], '100000': [[100000, 4, 10]]}}
+    )
+    change = index.diff(previous)
+    np.testing.assert_array_equal(change['prices'], [98000, 99000, 100000, 101000])
+    np.testing.assert_array_equal(change['delta'], [0, 15, -4, 20])
+    np.testing.assert_array_equal(change['added'], [99000, 101000])
+    np.testing.assert_array_equal(change['removed'], [100000])
+    center = (98000 * 7 + 99000 * 15 + 101000 * 20) / 42
+    assert index.center() == pytest.approx(center)
+    assert change['center_shift'] == pytest.approx(center - (98000 * 7 + 100000 * 4) / 11)
+
+
+def test_flat_rows_and_empty_payloads():
+    index = build_liquidation_map([
+        {'price': '100', 'liquidation_amount': '3', 'leverage': 50},
+        {'price': 100, 'amount': 2},
+    ])
+    np.testing.assert_array_equal(index.leverages, [0, 50])
+    assert index.range_sum(100, 100) == 5.0
+    empty = build_liquidation_map(None)
+    assert len(empty) == 0 and np.isnan(empty.center()) and empty.nearest_above(1) is None
+
+
+def test_fetch_picks_the_endpoint(make_api):
+    cg = make_api(lambda path, params: PAYLOAD)
+    assert len(fetch_liquidation_map(cg, 'BTCUSDT', exchange='Binance')) == 3
+    fetch_liquidation_map(cg, 'BTC')
+    paths = [path for path, _ in cg.client.session.calls]
+    assert paths[0].endswith('liquidation/map') and paths[1].endswith('liquidation/aggregated-map')
@@ -0,0 +1,130 @@
+"""
+Tests for the incremental rolling liquidation statistics
+"""
+import random
+
+import pytest
+
+from coinglass.analytics.liquidation_stats import (
+    LiquidationStatsAggregator,
+    RollingLiquidationStats,
+    parse_side,
+)
+
+T0 = 1700000000000
+WINDOWS = {'10s': 10, '30s': 30}
+
+
+def brute_force(orders, current, width):
+    """Window statistics recomputed from every accepted order."""
+    inside = [
+        (t, side, value) for t, side, value in orders if current - width < t // 1000 <= current
+    ]
+    longs = [value for _, side, value in inside if side == 'long']
+    shorts = [value for _, side, value in inside if side == 'short']
+    return {
+        'long_usd': sum(longs),
+        'short_usd': sum(shorts),
+        'long_count': len(longs),
+        'short_count': len(shorts),
+        'net_usd': sum(longs) - sum(shorts),
+        'largest': max((value for _, _, value in inside), default=0.0),
+    }, sorted(((t, value) for t, _, value in inside), key=lambda item: -item[1])
+
+
+def test_incremental_windows_match_brute_force():
+    rng = random.Random(7)
+    stats = RollingLiquidationStats(WINDOWS, top_k=3)
+    accepted = []
+    time_ms = T0
+    for _ in range(2000):
+        # Mostly forward in time, with out-of-order, late and long-gap orders
+        time_ms += rng.choice([0, 200, 700, 1500, 4000, 45000])
+        order_time = time_ms - rng.choice([0, 0, 0, 3000, 12000, 40000])
+        side = rng.choice(['long', 'short'])
+        value = round(rng.uniform(1, 1000), 2)
+        if stats.add(order_time, side, value):
+            accepted.append((order_time, side, value))
+        current = stats._current
+        for label, width in WINDOWS.items():
+            expected, ranked = brute_force(accepted, current, width)
+            window = stats.window(label)
+            for field in ('long_count', 'short_count'):
+                assert window[field] == expected[field]
+            for field in ('long_usd', 'short_usd', 'net_usd', 'largest'):
+                assert window[field] == pytest.approx(expected[field], abs=1e-6)
+            assert stats.top(label) == ranked[:3]
+    assert stats.late > 0
+
+
+def test_late_orders_are_dropped_and_windows_expire():
+    stats = RollingLiquidationStats({'1m': 60}, resolution=1.0)
+    assert stats.add(T0, 'long', 100.0)
+    assert stats.add(T0 + 30000, 'short', 40.0)
+    assert not stats.add(T0 - 61000, 'long', 5.0)
+    assert stats.late == 1
+    assert stats.window('1m') == {
+        'long_usd': 100.0,
+        'short_usd': 40.0,
+        'long_count': 1,
+        'short_count': 1,
+        'net_usd': 60.0,
+        'largest': 100.0,
+    }
+    assert stats.snapshot(T0 + 60000)['1m']['long_count'] == 0
+    assert stats.window('1m')['largest'] == 40.0
+    assert stats.snapshot(T0 + 10 ** 6)['1m']['short_usd'] == 0.0
+    with pytest.raises(ValueError):
+        RollingLiquidationStats(resolution=0)
+
+
+@pytest.mark.parametrize(
+    'raw, side', [(1, 'long'), ('2', 'short'), ('Sell', 'long'), ('BUY', 'short'), (3, None)]
+)
+def test_parse_side(raw, side):
+    assert parse_side(raw) == side
+
+
+def test_aggregator_routes_orders_and_evicts_stalest_market():
+    aggregator = LiquidationStatsAggregator(WINDOWS, max_keys=2)
+    added = aggregator.consume(
+        [
+            {
+                'exchange_name': 'Binance',
+                'symbol': 'BTCUSDT',
+                'side': 1,
+                'usd_value': '500',
+                'time': T0,
+            },
+            {
+                'exchange_name': 'OKX',
+                'symbol': 'BTC-USDT-SWAP',
+                'side': 2,
+                'usd_value': 80,
+                'time': T0,
+            },
+            {'symbol': 'ETHUSDT', 'side': 'long', 'amount': 10, 'timestamp': T0},
+            {
+                'exchange_name': 'Binance',
+                'symbol': 'BTCUSDT',
+                'side': 9,
+                'usd_value': 1,
+                'time': T0,
+            },
+            {
+                'exchange_name': 'Binance',
+                'symbol': 'BTCUSDT',
+                'side': 2,
+                'usd_value': None,
+                'time': T0,
+            },
+        ],
+        exchange='Bybit',
+    )
+    assert added == 3 and aggregator.skipped == 2
+    assert aggregator.keys() == [('OKX', 'BTC-USDT-SWAP'), ('Bybit', 'ETHUSDT')]
+    assert aggregator.get('Binance', 'BTCUSDT') is None
+    assert aggregator.get('Bybit', 'ETHUSDT').window('10s')['long_usd'] == 10.0
+    assert aggregator.snapshot(T0 + 20000)[('OKX', 'BTC-USDT-SWAP')]['30s']['short_usd'] == 80.0
+    with pytest.raises(ValueError):
+        LiquidationStatsAggregator(max_keys=0)
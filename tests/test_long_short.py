@@ -0,0 +1,67 @@
+"""
+Tests for the long/short ratio panel
+"""
+import numpy as np
+import pytest
+
+from coinglass.analytics.long_short import LongShortPanel
+
+T0 = 1700000000000
+H = 3600 * 1000
+PAIRS = [('Binance', 'BTCUSDT'), ('OKX', 'BTC-USDT-SWAP')]
+
+# Long percent per (endpoint, exchange) and bar; None: bar missing from the response
+LONGS = {
+    ('global', 'Binance'): [60, 55, 50],
+    ('top-long-short-account', 'Binance'): [65, 60, None],
+    ('top-long-short-position', 'Binance'): [70, 70, 70],
+    ('global', 'OKX'): [40, None, 50],
+    ('top-long-short-account', 'OKX'): [45, 45, 45],
+}
+
+
+def handler(path, params):
+    source = path.split('/')[1].rsplit('-ratio', 1)[0]
+    source = 'global' if source.startswith('global') else source
+    longs = LONGS.get((source, params['exchange']))
+    if longs is None:
+        raise RuntimeError('unsupported')
+    return [
+        {'time': T0 + i * H, 'long_percent': long, 'short_percent': 100 - long,
+         'long_short_ratio': long / (100 - long)}
+        for i, long in enumerate(longs) if long is not None
+    ]
+
+
+@pytest.fixture
+def panel(make_api):
+    return LongShortPanel.fetch(make_api(handler), PAIRS, '1h')
+
+
+def test_sources_share_one_index_with_gaps_filled(panel):
+    assert list(panel.times) == [T0, T0 + H, T0 + 2 * H]
+    np.testing.assert_array_equal(panel['global_long_pct'], [[60, 55, 50], [40, 40, 50]])
+    np.testing.assert_array_equal(panel['top_account_long_pct'][0], [65, 60, 60])
+    okx = panel.row('OKX', 'BTC-USDT-SWAP')
+    np.testing.assert_array_equal(okx['top_account_short_pct'], [55, 55, 55])
+    # The failed series stays missing and is recorded
+    assert np.isnan(panel['top_position_ratio'][1]).all()
+    assert list(panel.errors) == [('top_position', 'OKX', 'BTC-USDT-SWAP')]
+
+
+def test_spreads(panel):
+    spreads = panel.spreads()
+    np.testing.assert_array_equal(spreads['top_position_vs_global'][0], [10, 15, 20])
+    np.testing.assert_array_equal(spreads['top_account_vs_global'][0], [5, 5, 10])
+    np.testing.assert_array_equal(spreads['position_vs_account'][0], [5, 10, 10])
+    assert spreads['log_ratio_spread'][0, 0] == pytest.approx(np.log(70 / 30) - np.log(60 / 40))
+    assert np.isnan(spreads['log_ratio_spread'][1]).all()
+
+
+def test_gaps_stay_missing_without_fill(make_api):
+    cg = make_api(handler)
+    panel = LongShortPanel.fetch(cg, PAIRS, '4h', fill='none', limit=3)
+    np.testing.assert_array_equal(panel['global_long_pct'][1], [40, np.nan, 50])
+    calls = cg.client.session.calls
+    assert len(calls) == 6
+    assert all(params['interval'] == '4h' and params['limit'] == 3 for _, params in calls)
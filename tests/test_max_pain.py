@@ -0,0 +1,107 @@
+"""
+Tests for the options max pain analytics
+"""
+import numpy as np
+import pytest
+
+from coinglass.analytics.max_pain import MaxPainEngine, StrikeGrid
+
+
+def row(date, call, put, max_pain, call_notional, put_notional):
+    return {
+        'date': date,
+        'call_open_interest': call,
+        'put_open_interest': put,
+        'max_pain_price': max_pain,
+        'call_open_interest_notional': call_notional,
+        'put_open_interest_notional': put_notional,
+    }
+
+
+ROWS = {
+    'Deribit': [row('250926', 10, 10, 70000, 1, 1), row('250627', 100, 50, 60000, 6, 3)],
+    'OKX': [row('250627', 20, 30, 65000, 1, 2), {'date': None, 'call_open_interest': 5}],
+}
+
+
+@pytest.fixture
+def grid():
+    # The second expiry has no open interest
+    call_oi = [[1, 0, 2], [0, 0, 0]]
+    put_oi = [[0, 3, 1], [0, 0, 0]]
+    return StrikeGrid(['250627', '250926'], [90, 100, 110], call_oi, put_oi)
+
+
+def test_payout_matrix_and_max_pain(grid):
+    payout = grid.payout()
+    # At 90 the puts pay 3 x 10 + 1 x 20; at 100 one call and one put leg; at 110 the calls
+    np.testing.assert_array_equal(payout['total'][0], [50, 20, 20])
+    np.testing.assert_array_equal(payout['call'][0], [0, 10, 20])
+    np.testing.assert_array_equal(grid.max_pain(), [100, np.nan])
+    np.testing.assert_array_equal(grid.max_pain(combined=True), [100])
+    assert grid.max_pain(settlements=[95, 105])[0] == 105
+    walls = grid.walls()
+    assert walls['call'][0, 0] == 110 and walls['put'][0, 0] == 100
+
+
+def test_scenario_and_notional(grid):
+    scenario = grid.scenario(spot=100, moves=[-0.1, 0.0, 0.1])
+    np.testing.assert_allclose(scenario['settlement'], [90, 100, 110])
+    np.testing.assert_allclose(scenario['total'][0], [50, 20, 20])
+    np.testing.assert_array_equal(grid.notional(2.0)['put'], [8, 0])
+
+
+def test_from_rows_sums_duplicates_and_combine_unions_strikes():
+    grid = StrikeGrid.from_rows([
+        {'expiry': '27JUN25', 'strike': '100', 'call_oi': 1, 'put_oi': 2},
+        {'expiry': '250328', 'strike': 90, 'call_oi': 4},
+        {'expiry': '27JUN25', 'strike': 100, 'call_oi': 3, 'put_oi': None},
+    ])
+    assert grid.expiries == ['250328', '27JUN25']
+    np.testing.assert_array_equal(grid.call_oi, [[4, 0], [0, 4]])
+    np.testing.assert_array_equal(grid.put_oi, [[0, 0], [0, 2]])
+    
+    other = StrikeGrid(['27JUN25'], [100, 120], [[1, 1]], [[0, 5]])
+    combined = StrikeGrid.combine([grid, other])
+    np.testing.assert_array_equal(combined.strikes, [90, 100, 120])
+    np.testing.assert_array_equal(combined.call_oi, [[4, 0, 0], [0, 5, 1]])
+    np.testing.assert_array_equal(combined.put_oi[1], [0, 2, 5])
+    assert len(StrikeGrid.from_rows([]).expiries) == 0
+    with pytest.raises(ValueError):
+        StrikeGrid.from_rows([{'strike': 1}])
+
+
+@pytest.fixture
+def engine(make_api):
+    def handler(path, params):
+        if params['exchange'] not in ROWS:
+            raise RuntimeError('unsupported')
+        return ROWS[params['exchange']]
+    
+    return MaxPainEngine(make_api(handler), exchanges=['Deribit', 'OKX', 'Binance']).load('BTC')
+
+
+def test_engine_aligns_exchanges_on_expiries(engine):
+    assert engine.expiries == ['250627', '250926']
+    np.testing.assert_array_equal(engine['max_pain'][:, 0], [60000, 65000, np.nan])
+    assert np.isnan(engine['call_oi'][1, 1])
+    assert list(engine.errors) == ['Binance']
+    assert engine.api.client.session.calls[0][0] == 'option/max-pain'
+
+
+def test_by_expiry_weights_max_pain_by_open_interest(engine):
+    summary = engine.by_expiry()
+    weighted = (60000 * 150 + 65000 * 50) / 200
+    np.testing.assert_allclose(summary['weighted_max_pain'], [weighted, 70000])
+    np.testing.assert_allclose(summary['put_call_ratio'], [80 / 120, 1.0])
+    np.testing.assert_allclose(summary['notional'], [12, 2])
+    np.testing.assert_array_equal(summary['max_pain_low'], [60000, 70000])
+    np.testing.assert_array_equal(summary['max_pain_high'], [65000, 70000])
+    np.testing.assert_allclose(engine.notional_share()[:, 0], [0.75, 0.25, 0.0])
+
+
+def test_distance_to_the_weighted_max_pain(engine):
+    distance = engine.distance(spot=62500, moves=[0.0, -0.02])
+    assert distance.shape == (2, 2)
+    np.testing.assert_allclose(distance[0], [61250 / 62500 - 1, 0.0], atol=1e-12)
+    np.testing.assert_allclose(engine.distance(spot=70000)[:, 0], [61250 / 70000 - 1, 0.0])
@@ -0,0 +1,89 @@
+"""
+Tests for the open interest aggregation engine
+"""
+import numpy as np
+import pytest
+
+from coinglass.analytics.open_interest import OICube, OpenInterestEngine
+
+T0 = 1700000000000
+H4 = 4 * 3600 * 1000
+
+SUPPORTED = {
+    'Binance': [
+        {'instrument_id': 'BTCUSDT', 'base_asset': 'BTC', 'quote_asset': 'USDT'},
+        {'instrument_id': 'BTCUSD_PERP', 'base_asset': 'BTC', 'quote_asset': 'USD'},
+        {'instrument_id': 'ETHUSDT', 'base_asset': 'ETH', 'quote_asset': 'USDT'},
+    ],
+    'OKX': [{'instrument_id': 'BTC-USDT-SWAP', 'base_asset': 'BTC', 'quote_asset': 'USDT'}],
+}
+
+# Closing OI per series and bar (None: bar missing from the response)
+CLOSES = {
+    ('Binance', 'BTCUSDT'): [10.0, 20.0],
+    ('Binance', 'BTCUSD_PERP'): [5.0, None],
+    ('OKX', 'BTC-USDT-SWAP'): [30.0, 40.0],
+    'aggregated-stablecoin-margin-history': [40.0, 60.0],
+    'aggregated-coin-margin-history': [5.0, 5.0],
+}
+
+
+def handler(path, params):
+    if path.endswith('supported-exchange-pairs'):
+        return SUPPORTED
+    key = path.rsplit('/', 1)[1]
+    closes = CLOSES[(params['exchange'], params['symbol'])] if key == 'history' else CLOSES[key]
+    return [
+        {
+            'time': T0 + i * H4,
+            'open': close - 1,
+            'high': close + 1,
+            'low': close - 2,
+            'close': close,
+        }
+        for i, close in enumerate(closes)
+        if close is not None
+    ]
+
+
+@pytest.fixture
+def engine(make_api):
+    engine = OpenInterestEngine(make_api(handler))
+    engine.load(['btc'])
+    return engine
+
+
+def test_pairs_are_summed_per_exchange_with_gaps_filled(engine):
+    cube = engine.exchange_cubes['BTC']
+    assert cube.labels == ['Binance', 'OKX']
+    assert cube.shape == (2, 2, 4)
+    np.testing.assert_allclose(cube.close, [[15.0, 25.0], [30.0, 40.0]])
+    np.testing.assert_allclose(cube.field('high')[0], [17.0, 27.0])
+    np.testing.assert_allclose(engine.exchange_share('BTC')[:, 1], [25 / 65, 40 / 65])
+    assert engine.errors == {}
+
+
+def test_margin_split(engine):
+    assert engine.margin_cubes['BTC'].labels == ['stablecoin', 'coin']
+    np.testing.assert_allclose(engine.margin_split('btc'), [40 / 45, 60 / 65])
+
+
+def test_gaps_stay_missing_without_fill(make_api):
+    engine = OpenInterestEngine(make_api(handler), fill='none')
+    engine.load(['BTC'], exchanges=['Binance'])
+    cube = engine.exchange_cubes['BTC']
+    assert cube.labels == ['Binance']
+    # The inverse pair has no bar at the second timestamp
+    np.testing.assert_allclose(cube.close[0], [15.0, 20.0])
+
+
+def test_cube_selection_and_time_ranges():
+    values = np.arange(2 * 3 * 4, dtype=float).reshape(2, 3, 4)
+    values[1, 2] = np.nan
+    cube = OICube(['a', 'b'], np.array([1, 2, 3]), values)
+    assert cube.select(['b']).labels == ['b']
+    np.testing.assert_array_equal(cube.loc('b'), values[1])
+    window = cube.between(2, 2)
+    assert list(window.times) == [2] and np.shares_memory(window.values, values)
+    np.testing.assert_allclose(cube.total(), [3.0 + 15.0, 7.0 + 19.0, 11.0])
+    np.testing.assert_allclose(cube.share()[:, 2], [1.0, np.nan])
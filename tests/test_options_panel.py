@@ -0,0 +1,105 @@
+"""
+Tests for the options exchange panel
+"""
+import numpy as np
+import pytest
+
+from coinglass.analytics import options_panel
+from coinglass.analytics.options_panel import ExchangeSeries, OptionsExchangePanel
+
+T0 = 1700000000000
+H = 3600 * 1000
+
+MAX_PAIN = {
+    'Deribit': [
+        {'date': '250627', 'call_open_interest': 100, 'put_open_interest': 50},
+        {'date': '250926', 'call_open_interest': 10, 'put_open_interest': 10},
+    ],
+    'OKX': [{'date': '250627', 'call_open_interest': 20, 'put_open_interest': 30}],
+}
+
+
+def handler(path, params):
+    if params['symbol'] == 'SOL':
+        raise RuntimeError('unsupported')
+    if path == 'option/max-pain':
+        return MAX_PAIN[params['exchange']]
+    return {'time_list': [T0, T0 + H], 'data_map': {'Deribit': [3, 6], 'OKX': [1, 2]}}
+
+
+def test_decode_parallel_list_payload():
+    series = ExchangeSeries.from_payload({
+        'time_list': [T0, T0 + H],
+        'price_list': [100],
+        'data_map': {'OKX': [1], 'Deribit': [3, 6, 9]},
+    })
+    assert series.exchanges == ['Deribit', 'OKX']
+    np.testing.assert_array_equal(series.values, [[3, 6], [1, np.nan]])
+    np.testing.assert_array_equal(series.price, [100, np.nan])
+    np.testing.assert_array_equal(series.total(), [4, 6])
+    np.testing.assert_allclose(series.share(), [[0.75, 1.0], [0.25, 0.0]])
+    assert series.latest_share() == {'Deribit': 1.0, 'OKX': 0.0}
+    np.testing.assert_array_equal(series['OKX'], [1, np.nan])
+
+
+def test_decode_rows_sorted_by_time():
+    series = ExchangeSeries.from_payload([
+        {'time': T0 + H, 'Deribit': 5, 'OKX': 5, 'price': 10},
+        {'time': T0, 'Deribit': 1, 'price': 9},
+    ])
+    assert list(series.times) == [T0, T0 + H]
+    np.testing.assert_array_equal(series.values, [[1, 5], [np.nan, 5]])
+    np.testing.assert_array_equal(series.price, [9, 10])
+    assert ExchangeSeries.from_payload(None).latest_share() == {}
+    with pytest.raises(ValueError):
+        ExchangeSeries.from_payload([{'Deribit': 1}])
+
+
+def test_load_fetches_each_combination_once_per_refresh_period(make_api):
+    cg = make_api(handler)
+    panel = OptionsExchangePanel(cg, exchanges=['Deribit', 'OKX'])
+    loaded = panel.load(['BTC', 'ETH'], units=['USD'], ranges=['1h', '4h'])
+    assert sorted(loaded) == sorted([
+        ('oi', 'BTC', 'USD', '1h'), ('oi', 'BTC', 'USD', '4h'), ('oi', 'ETH', 'USD', '1h'),
+        ('oi', 'ETH', 'USD', '4h'), ('volume', 'BTC'), ('volume', 'ETH'),
+    ])
+    calls = cg.client.session.calls
+    assert len(calls) == 6
+    volume_calls = [params for path, params in calls if path == 'option/exchange-vol-history']
+    assert [params['time_type'] for params in volume_calls] == ['1d', '1d']
+    
+    # Served from the cache until invalidated
+    np.testing.assert_array_equal(panel.oi('ETH', range='4h').total(), [4, 8])
+    panel.volume('BTC')
+    assert len(calls) == 6
+    panel.invalidate()
+    panel.oi('BTC')
+    assert len(calls) == 7
+
+
+def test_stale_entries_are_refetched(make_api, monkeypatch):
+    cg = make_api(handler)
+    panel = OptionsExchangePanel(cg)
+    clock = [1000.0]
+    monkeypatch.setattr(options_panel.time, 'time', lambda: clock[0])
+    panel.oi('BTC')
+    clock[0] += options_panel.DEFAULT_CACHE_SECONDS - 1
+    panel.oi('BTC')
+    assert len(cg.client.session.calls) == 1
+    clock[0] += 1
+    panel.oi('BTC')
+    assert len(cg.client.session.calls) == 2
+
+
+def test_failed_fetches_raise_and_are_recorded(make_api):
+    panel = OptionsExchangePanel(make_api(handler))
+    with pytest.raises(RuntimeError):
+        panel.oi('SOL')
+    assert list(panel.errors) == [('oi', 'SOL', 'USD', '1h')]
+    assert ('volume', 'SOL') not in panel.load(['SOL'])
+
+
+def test_put_call_ratios_from_max_pain(make_api):
+    panel = OptionsExchangePanel(make_api(handler), exchanges=['Deribit', 'OKX'])
+    ratios = panel.put_call('BTC')
+    assert ratios == pytest.approx({'Deribit': 60 / 110, 'OKX': 1.5, 'all': 90 / 130})
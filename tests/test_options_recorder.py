@@ -0,0 +1,133 @@
+"""
+Tests for the columnar options info log and recorder
+"""
+import os
+
+import numpy as np
+import pytest
+
+from coinglass.analytics import options_recorder
+from coinglass.analytics.options_recorder import ColumnLog, OptionsInfoRecorder, info_rows
+
+T0 = 1700000000000
+
+
+def test_round_trip_through_a_reopened_log(tmp_path):
+    log = ColumnLog(str(tmp_path), fields=['oi', 'volume'])
+    assert log.append(
+        [T0, T0, T0 + 1000],
+        ['BTC', 'ETH', 'BTC'],
+        ['Deribit', 'OKX', 'OKX'],
+        {'oi': [1.5, 2.5, 3.5]},
+    ) == 3
+    assert log.append([], [], [], {}) == 0
+    
+    reopened = ColumnLog(str(tmp_path))
+    assert len(reopened) == 3 and reopened.fields == ['oi', 'volume']
+    rows = reopened.read()
+    assert rows['time'].dtype == np.int64 and list(rows['time']) == [T0, T0, T0 + 1000]
+    assert list(rows['symbol']) == ['BTC', 'ETH', 'BTC']
+    assert list(rows['exchange']) == ['Deribit', 'OKX', 'OKX']
+    np.testing.assert_array_equal(rows['oi'], [1.5, 2.5, 3.5])
+    # A field missing from the append is written as NaN
+    assert np.isnan(rows['volume']).all()
+    
+    assert list(reopened.read(start=T0 + 1, symbol='BTC')['oi']) == [3.5]
+    selected = reopened.read(end=T0 + 1000, exchange='OKX', fields=['oi'])
+    assert list(selected) == ['time', 'symbol', 'exchange', 'oi'] and list(selected['symbol']) == [
+        'ETH'
+    ]
+    times, values = reopened.series('oi', 'BTC', 'Deribit')
+    assert list(times) == [T0] and list(values) == [1.5]
+    assert len(reopened.read(symbol='SOL')['time']) == 0
+
+
+def test_opening_an_existing_log_does_not_rewrite_its_meta(tmp_path, monkeypatch):
+    path = str(tmp_path)
+    writer = ColumnLog(path, fields=['oi'])
+    writer.append([T0], ['BTC'], ['Deribit'], {'oi': [1.0]})
+    
+    def forbidden(self):
+        raise AssertionError('meta.json rewritten')
+    
+    with monkeypatch.context() as patch:
+        patch.setattr(ColumnLog, '_write_meta', forbidden)
+        reader = ColumnLog(path, fields=['oi'])
+    # Labels added through another handle after opening are picked up
+    writer.append([T0 + 1], ['ETH'], ['OKX'], {'oi': [2.0]})
+    assert list(reader.read(symbol='ETH')['oi']) == [2.0]
+    assert list(reader.read()['exchange']) == ['Deribit', 'OKX']
+
+
+def test_handles_share_label_codes(tmp_path):
+    first = ColumnLog(str(tmp_path), fields=['oi'])
+    second = ColumnLog(str(tmp_path))
+    first.append([T0], ['BTC'], ['Deribit'], {'oi': [1.0]})
+    second.append([T0 + 1], ['ETH'], ['Deribit'], {'oi': [2.0]})
+    first.append([T0 + 2], ['SOL'], ['OKX'], {'oi': [3.0]})
+    rows = ColumnLog(str(tmp_path)).read()
+    assert list(rows['symbol']) == ['BTC', 'ETH', 'SOL']
+    assert list(rows['exchange']) == ['Deribit', 'Deribit', 'OKX']
+
+
+def test_torn_writes_are_ignored_and_overwritten(tmp_path):
+    log = ColumnLog(str(tmp_path), fields=['oi'])
+    log.append([T0], ['BTC'], ['Deribit'], {'oi': [1.0]})
+    with open(os.path.join(str(tmp_path), 'time.bin'), 'ab') as f:
+        f.write(b'\x01\x02\x03\x04\x05\x06\x07\x08')
+    assert len(log) == 1
+    log.append([T0 + 1], ['BTC'], ['Deribit'], {'oi': [2.0]})
+    rows = log.read()
+    assert list(rows['time']) == [T0, T0 + 1] and list(rows['oi']) == [1.0, 2.0]
+
+
+def test_invalid_logs_and_appends(tmp_path):
+    with pytest.raises(ValueError):
+        ColumnLog(str(tmp_path / 'new'))
+    log = ColumnLog(str(tmp_path), fields=['oi'])
+    with pytest.raises(ValueError):
+        ColumnLog(str(tmp_path), fields=['volume'])
+    with pytest.raises(ValueError):
+        log.append([T0, T0], ['BTC'], ['Deribit', 'OKX'], {})
+    assert len(log) == 0
+
+
+def test_info_rows():
+    assert info_rows({'open_interest_usd': 1}) == [{'open_interest_usd': 1, 'exchange': 'All'}]
+    rows = info_rows([{'exchange_name': 'Deribit'}, {}])
+    assert [row['exchange'] for row in rows] == ['Deribit', 'All']
+    assert info_rows(None) == []
+
+
+def test_record_once_appends_one_row_per_symbol_and_exchange(make_api, tmp_path):
+    payloads = {
+        'BTC': [
+            {'exchange_name': 'Deribit', 'open_interest_usd': 10.0, 'volume_usd_24h': 2.0},
+            {'exchange_name': 'OKX', 'open_interest_usd': 5.0, 'put_call_ratio_oi': 0.5},
+        ],
+        'ETH': {'total_open_interest_usd': 7.0, 'total_volume_24h_usd': 1.0},
+    }
+    
+    def handler(path, params):
+        if params['symbol'] not in payloads:
+            raise RuntimeError('unsupported')
+        return payloads[params['symbol']]
+    
+    cg = make_api(handler)
+    recorder = OptionsInfoRecorder(cg, str(tmp_path), symbols=['BTC', 'ETH', 'SOL'])
+    assert recorder.interval == 30
+    assert recorder.record_once(now=T0) == 3
+    assert list(recorder.errors) == ['SOL'] and recorder.samples == 1
+    assert cg.client.session.calls[0][0] == 'option/info'
+    
+    times, oi = recorder.log.series('open_interest_usd', 'BTC', 'Deribit')
+    assert list(times) == [T0] and list(oi) == [10.0]
+    assert list(recorder.log.series('open_interest_usd', 'ETH')[1]) == [7.0]
+    rows = recorder.log.read(symbol='BTC')
+    np.testing.assert_array_equal(rows['put_call_ratio_oi'], [np.nan, 0.5])
+
+
+def test_samples_are_aligned_just_after_cache_refreshes(make_api, tmp_path, monkeypatch):
+    recorder = OptionsInfoRecorder(make_api(lambda path, params: {}), str(tmp_path))
+    monkeypatch.setattr(options_recorder.time, 'time', lambda: 1000.0)
+    assert recorder._seconds_to_next_tick() == pytest.approx(20.25)
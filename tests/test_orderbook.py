@@ -0,0 +1,119 @@
+"""
+Tests for the orderbook depth and delta-encoded book history
+"""
+import random
+
+import numpy as np
+import pytest
+
+from coinglass.analytics.orderbook import BookHistory, DepthHistory, OrderbookEngine
+
+T0 = 1700000000000
+M = 60 * 1000
+
+# Level 98 changes size, is then removed, and the last row is a keyframe at keyframe_every=3
+ROWS = [
+    [T0, [[99, 1], [98, 2]], [[101, 1], [103, 1]]],
+    [T0 + M, [[99, 1], [98, 3]], [[101, 1], [103, 1]]],
+    {'time': T0 + 2 * M, 'bids': [[99, 1]], 'asks': [[103, 1], [101, 1], [104, 0]]},
+    [T0 + 3 * M, [[99, 1]], [[101, 1], [103, 1]]],
+]
+
+
+@pytest.fixture
+def book():
+    return BookHistory.from_rows(ROWS, keyframe_every=3)
+
+
+def test_only_changed_levels_are_stored_between_keyframes(book):
+    assert len(book) == 4
+    assert list(book.times) == [T0 + i * M for i in range(4)]
+    # Full book, one resize, one removal, then a full keyframe
+    assert book.delta_count == 4 + 1 + 1 + 3
+    assert book.nbytes > 0
+
+
+def test_snapshots_are_rebuilt_sorted_with_removed_levels_gone(book):
+    first = book.snapshot(1)
+    np.testing.assert_array_equal(first['bid_prices'], [99, 98])
+    np.testing.assert_array_equal(first['bid_quantities'], [1, 3])
+    np.testing.assert_array_equal(first['ask_prices'], [101, 103])
+    last = book.snapshot(-1)
+    np.testing.assert_array_equal(last['bid_prices'], [99])
+    np.testing.assert_array_equal(last['ask_quantities'], [1, 1])
+    with pytest.raises(IndexError):
+        book.snapshot(4)
+
+
+def test_random_books_round_trip():
+    rng = random.Random(3)
+    rows = []
+    for i in range(25):
+        bids = [[100 - level, rng.choice([0, 1, 2])] for level in range(1, 6)]
+        asks = [[100 + level, rng.choice([0, 1, 2])] for level in range(1, 6)]
+        rows.append([T0 + i * M, bids, asks])
+    book = BookHistory.from_rows(rows, keyframe_every=4)
+    for i, (_, bids, asks) in enumerate(rows):
+        snapshot = book.snapshot(i)
+        assert snapshot['bid_prices'].tolist() == [price for price, qty in bids if qty]
+        assert snapshot['ask_quantities'].tolist() == [qty for _, qty in asks if qty]
+
+
+def test_metrics_match_hand_computed_values(book):
+    metrics = book.metrics(bands=(1, 2))
+    # Snapshot 0: bids 99 x1, 98 x2 (USD 99 + 196); asks 101 x1, 103 x1 (USD 101 + 103)
+    assert metrics['mid'][0] == 100.0 and metrics['spread'][0] == 2.0
+    assert metrics['imbalance'][0] == pytest.approx((295 - 204) / 499)
+    assert metrics['weighted_mid'][0] == pytest.approx(499 / 5)
+    assert metrics['bid_liquidity_1'][0] == 99.0 and metrics['ask_liquidity_1'][0] == 101.0
+    assert metrics['imbalance_1'][0] == pytest.approx(-0.01)
+    assert metrics['slope_1'][0] == pytest.approx(100.0)
+    assert metrics['liquidity_2'][0] == pytest.approx(396.0)
+    assert metrics['bid_liquidity_2'][2] == 99.0
+    assert book.metrics(bands=(1, 2)) is metrics
+
+
+def test_metrics_do_not_depend_on_the_chunk_size(book):
+    whole = book.metrics(chunk=512)
+    book._metrics = {}
+    chunked = book.metrics(chunk=3)
+    assert whole.keys() == chunked.keys()
+    for name in whole:
+        np.testing.assert_allclose(chunked[name], whole[name])
+    assert len(BookHistory().metrics()['mid']) == 0
+    with pytest.raises(ValueError):
+        BookHistory(keyframe_every=0)
+
+
+def test_depth_imbalance():
+    depth = DepthHistory.from_rows([
+        {'time': T0, 'bids_usd': 300, 'asks_usd': 100, 'bids_quantity': 3, 'asks_quantity': 1},
+        {'time': T0 + M, 'aggregated_bids_usd': 0, 'aggregated_asks_usd': 0},
+    ])
+    assert len(depth) == 2
+    np.testing.assert_allclose(depth.imbalance, [0.5, np.nan])
+    assert depth.bid_ask_ratio[0] == 3.0
+
+
+def test_engine_endpoints(make_api):
+    def handler(path, params):
+        if path.endswith('orderbook/history'):
+            return ROWS
+        return [{'time': T0, 'bids_usd': 1, 'asks_usd': 1}]
+    
+    cg = make_api(handler)
+    engine = OrderbookEngine(cg, market='spot', keyframe_every=3)
+    assert len(engine.depth('Binance', 'BTCUSDT', '1h', limit=10)) == 1
+    engine.aggregated_depth(['Binance', 'OKX'], 'BTC', '1h')
+    assert engine.book('Binance', 'BTCUSDT').delta_count == 9
+    calls = cg.client.session.calls
+    assert [path for path, _ in calls] == [
+        'spot/orderbook/ask-bids-history',
+        'spot/orderbook/aggregated-ask-bids-history',
+        'spot/orderbook/history',
+    ]
+    assert calls[0][1]['limit'] == 10
+    assert calls[1][1]['exchange_list'] == 'Binance,OKX'
+    assert calls[2][1]['ex'] == 'Binance'
+    with pytest.raises(ValueError):
+        OrderbookEngine(cg, market='options')
@@ -0,0 +1,119 @@
+"""
+Tests for the streaming poller
+"""
+import pytest
+
+from coinglass.polling import DEFAULT_POLL_INTERVAL, Poller, default_record_key, whale_position_key
+
+
+def order(order_id, price, quantity=1.0):
+    return {'order_id': order_id, 'exchange_name': 'Binance', 'price': price, 'quantity': quantity}
+
+
+def test_diff_yields_new_and_changed_records():
+    poller = Poller(lambda: None)
+    first = [order(1, 100.0), order(2, 101.0)]
+    assert poller.diff(first) == first
+    
+    second = [order(1, 100.0), order(2, 101.0, quantity=2.0), order(3, 102.0)]
+    assert poller.diff(second) == [order(2, 101.0, quantity=2.0), order(3, 102.0)]
+    
+    assert poller.diff([order(1, 100.0), order(3, 102.0)]) == []
+
+
+def test_diff_skips_changes_unless_requested():
+    poller = Poller(lambda: None, emit_changes=False)
+    poller.diff([order(1, 100.0)])
+    assert poller.diff([order(1, 100.0, quantity=5.0), order(2, 99.0)]) == [order(2, 99.0)]
+
+
+def test_diff_ignores_a_repeated_snapshot():
+    poller = Poller(lambda: None)
+    snapshot = [order(1, 100.0)]
+    assert poller.diff(snapshot) == snapshot
+    poller._seen.clear()
+    # The identical snapshot short-circuits before the seen-set is consulted
+    assert poller.diff(list(snapshot)) == []
+
+
+def test_diff_accepts_a_single_record_and_empty_snapshots():
+    poller = Poller(lambda: None)
+    assert poller.diff(order(1, 100.0)) == [order(1, 100.0)]
+    assert poller.diff(None) == []
+    assert poller.diff([]) == []
+
+
+def test_seen_set_is_a_bounded_lru():
+    poller = Poller(lambda: None, max_seen=2)
+    poller.diff([order(1, 1.0), order(2, 2.0)])
+    poller.diff([order(1, 1.0), order(3, 3.0)])
+    assert list(poller._seen) == [1, 3]
+    # Order 2 was evicted and counts as new again
+    assert poller.diff([order(2, 2.0)]) == [order(2, 2.0)]
+    with pytest.raises(ValueError):
+        Poller(lambda: None, max_seen=0)
+
+
+def test_reset_forgets_seen_records():
+    poller = Poller(lambda: None)
+    poller.diff([order(1, 100.0)])
+    poller.reset()
+    assert poller.diff([order(1, 100.0)]) == [order(1, 100.0)]
+
+
+def test_record_keys():
+    assert default_record_key({'id': 7, 'price': 1}) == 7
+    assert default_record_key(
+        {'exchange': 'OKX', 'symbol': 'BTC', 'time': 5, 'price': 1.5, 'side': 2}
+    ) == ('OKX', 'BTC', 5, 1.5, 2)
+    assert whale_position_key({'user': '0xabc', 'symbol': 'ETH', 'size': 1}) == ('0xabc', 'ETH')
+
+
+def test_for_endpoint_uses_registry_cadence_and_key(make_api):
+    cg = make_api(lambda path, params: [])
+    poller = Poller.for_endpoint(cg, 'hyperliquid.get_whale_position')
+    assert poller.interval == DEFAULT_POLL_INTERVAL
+    assert poller.key is whale_position_key
+    assert Poller.for_endpoint(cg, 'futures.funding_rate.get_arbitrage').interval == 30
+    assert Poller.for_endpoint(cg, 'futures.funding_rate.get_arbitrage', interval=5).interval == 5
+
+
+def test_iteration_polls_until_stopped_and_tolerates_errors(monkeypatch):
+    responses = iter([
+        [order(1, 100.0)],
+        RuntimeError('timeout'),
+        [order(1, 100.0), order(2, 101.0)],
+    ])
+    
+    def fetch():
+        response = next(responses)
+        if isinstance(response, Exception):
+            raise response
+        return response
+    
+    poller = Poller(fetch, max_errors=1)
+    monkeypatch.setattr(poller, '_seconds_to_next_tick', lambda: 0.0)
+    received = []
+    for record in poller:
+        received.append(record['order_id'])
+        if record['order_id'] == 2:
+            poller.stop()
+    assert received == [1, 2]
+    assert poller.polls == 3
+
+
+def test_iteration_raises_after_too_many_errors(monkeypatch):
+    def fetch():
+        raise RuntimeError('down')
+    
+    poller = Poller(fetch, max_errors=2)
+    monkeypatch.setattr(poller, '_seconds_to_next_tick', lambda: 0.0)
+    with pytest.raises(RuntimeError):
+        list(poller)
+    assert poller.polls == 3
+
+
+def test_polls_are_aligned_after_the_cache_boundary(monkeypatch):
+    poller = Poller(lambda: None, interval=10)
+    monkeypatch.setattr('coinglass.polling.time.time', lambda: 1003.0)
+    assert poller._seconds_to_next_tick() == pytest.approx(7.25)
@@ -0,0 +1,63 @@
+"""
+Tests for the compact __slots__ record layer
+"""
+import pytest
+
+from coinglass.exceptions import CoinGlassValidationError
+from coinglass.models import LiquidationData, OHLCData
+from coinglass.records import Record, parse_records, record_type
+
+ROWS = [
+    {
+        'time': 1700000000000,
+        'open': '100.5',
+        'high': 101,
+        'low': '99',
+        'close': 100.0,
+        'volume_usd': '12.5',
+    },
+    {'time': '1700000060000', 'open': 100.0, 'high': 102.0, 'low': 100.0, 'close': '101.5'},
+]
+
+
+def test_record_type_is_generated_once_with_model_fields():
+    cls = record_type(OHLCData)
+    assert record_type(OHLCData) is cls
+    assert issubclass(cls, Record)
+    assert cls.__name__ == 'OHLCDataRecord'
+    assert cls._fields == ('time', 'open', 'high', 'low', 'close', 'volume_usd')
+    assert record_type(LiquidationData) is not cls
+
+
+def test_records_coerce_numbers_and_have_no_dict():
+    first, second = parse_records(ROWS, OHLCData)
+    assert (first.time, first.open, first.high, first.low, first.close, first.volume_usd) == (
+        1700000000000, 100.5, 101.0, 99.0, 100.0, 12.5
+    )
+    assert type(first.high) is float and type(second.time) is int
+    assert second.volume_usd is None
+    assert not hasattr(first, '__dict__')
+
+
+def test_records_match_the_pydantic_models():
+    records = parse_records(ROWS, OHLCData)
+    models = parse_records(ROWS, OHLCData, fast=False)
+    assert all(isinstance(model, OHLCData) for model in models)
+    assert [record.to_model() for record in records] == models
+    assert [record.to_dict() for record in records] == [dict(model) for model in models]
+
+
+def test_record_equality_and_repr():
+    cls = record_type(OHLCData)
+    assert cls.from_dict(ROWS[0]) == cls.from_dict(dict(ROWS[0]))
+    assert cls.from_dict(ROWS[0]) != cls.from_dict(ROWS[1])
+    assert repr(cls.from_dict(ROWS[1])).startswith('OHLCDataRecord(time=1700000060000, open=100.0')
+
+
+@pytest.mark.parametrize('row', [
+    {'open': 1, 'high': 1, 'low': 1, 'close': 1},
+    {'time': 1, 'open': 'n/a', 'high': 1, 'low': 1, 'close': 1},
+])
+def test_invalid_rows_raise_validation_errors(row):
+    with pytest.raises(CoinGlassValidationError):
+        record_type(OHLCData).from_dict(row)
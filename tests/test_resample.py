@@ -0,0 +1,118 @@
+"""
+Tests for multi-interval OHLC resampling
+"""
+import numpy as np
+import pytest
+
+from coinglass.analytics.resample import OHLCResampler, bucket_start, can_resample, resample
+
+H0 = 1699999200000  # 2023-11-14 22:00 UTC, an hour boundary
+M = 60 * 1000
+MONDAY = 1699833600000  # 2023-11-13 00:00 UTC
+
+
+def test_resample_matches_hand_computed_candles():
+    times = H0 + np.arange(6) * 15 * M
+    columns = {
+        'open': [10, 11, 12, 9, 10, 14],
+        'high': [12, 13, 12, np.nan, 15, 14],
+        'low': [9, 10, 8, 9, 10, 13],
+        'close': [11, 12, 9, 10, 14, 13],
+        'volume_usd': [1, 2, 3, 4, 5, np.nan],
+        'count': [1, 2, 3, 4, 5, 6],
+    }
+    starts, candles, complete = resample(times, columns, '1h', source='15m')
+    assert list(starts) == [H0, H0 + 60 * M]
+    np.testing.assert_array_equal(candles['open'], [10, 10])
+    np.testing.assert_array_equal(candles['high'], [13, 15])
+    np.testing.assert_array_equal(candles['low'], [8, 10])
+    np.testing.assert_array_equal(candles['close'], [10, 13])
+    np.testing.assert_array_equal(candles['volume_usd'], [10, 5])
+    np.testing.assert_array_equal(candles['count'], [4, 6])
+    # The second hour holds only two of its four quarter-hours
+    np.testing.assert_array_equal(complete, [True, False])
+    
+    counts = {'count': columns['count']}
+    _, summed, complete = resample(times, counts, '1h', aggregations={'count': 'sum'})
+    np.testing.assert_array_equal(summed['count'], [10, 11])
+    assert complete.all()
+    with pytest.raises(ValueError):
+        resample(times, {'open': columns['open']}, '1h', aggregations={'open': 'median'})
+    assert len(resample([], {'open': []}, '1h')[0]) == 0
+
+
+def test_bucket_alignment():
+    np.testing.assert_array_equal(bucket_start([H0 + 59 * M, H0 + 60 * M], '1h'), [H0, H0 + 60 * M])
+    assert bucket_start([H0], '1w')[0] == MONDAY
+    assert bucket_start([MONDAY - 1], '1w')[0] == MONDAY - 7 * 86400 * 1000
+
+
+@pytest.mark.parametrize('source, target, expected', [
+    ('1m', '5m', True),
+    ('5m', '1h', True),
+    ('5m', '5m', False),
+    ('3m', '5m', False),
+    ('1h', '15m', False),
+])
+def test_can_resample(source, target, expected):
+    assert can_resample(source, target) is expected
+
+
+def minute_handler(path, params):
+    """Two hours of 1m candles whose close is the minute number; other intervals are empty."""
+    if params['interval'] != '1m':
+        return []
+    rows = [
+        {'time': H0 + i * M, 'open': i, 'high': i + 1, 'low': i - 1, 'close': i, 'volume_usd': 1}
+        for i in range(120) if H0 + i * M >= params.get('startTime', 0)
+    ]
+    return rows[-params['limit']:] if 'limit' in params and 'startTime' not in params else rows
+
+
+def test_get_many_fetches_the_finest_interval_once(make_api):
+    cg = make_api(minute_handler)
+    resampler = OHLCResampler(cg)
+    candles = resampler.get_many('BTCUSDT', 'Binance', ['15m', '1m', '5m'], limit=3)
+    assert list(candles) == ['1m', '5m', '15m']
+    assert resampler.stats == {'api': 1, 'resampled': 2}
+    assert cg.client.session.calls[0][1]['limit'] == 45
+    
+    assert list(candles['1m'][1]['close']) == [117, 118, 119]
+    times, columns = candles['15m']
+    assert list(times) == [H0 + 75 * M, H0 + 90 * M, H0 + 105 * M]
+    np.testing.assert_array_equal(columns['open'], [75, 90, 105])
+    np.testing.assert_array_equal(columns['high'], [90, 105, 120])
+    np.testing.assert_array_equal(columns['low'], [74, 89, 104])
+    np.testing.assert_array_equal(columns['close'], [89, 104, 119])
+    np.testing.assert_array_equal(columns['volume_usd'], [15, 15, 15])
+    np.testing.assert_array_equal(candles['5m'][1]['close'], [109, 114, 119])
+
+
+def test_cache_falls_back_to_the_api_when_it_cannot_cover(make_api):
+    cg = make_api(minute_handler)
+    resampler = OHLCResampler(cg)
+    resampler.get('BTCUSDT', 'Binance', '1m', limit=45)
+    
+    times, _ = resampler.get('BTCUSDT', 'Binance', '5m', startTime=H0 + 100 * M)
+    assert list(times) == [H0 + t * M for t in (100, 105, 110, 115)]
+    assert resampler.stats == {'api': 1, 'resampled': 1}
+    # The cache begins inside the hour and after this start time
+    resampler.get('BTCUSDT', 'Binance', '1h', limit=1)
+    resampler.get('BTCUSDT', 'Binance', '5m', startTime=H0)
+    assert resampler.stats == {'api': 3, 'resampled': 1}
+    
+    resampler.clear()
+    resampler.get('BTCUSDT', 'Binance', '5m', limit=3)
+    assert resampler.stats['api'] == 4
+    assert [params['interval'] for _, params in cg.client.session.calls] == ['1m', '1h', '5m', '5m']
+
+
+def test_open_interest_and_validation(make_api):
+    cg = make_api(lambda path, params: [{'time': H0, 'open': 1, 'high': 2, 'low': 0, 'close': 1}])
+    times, columns = OHLCResampler(cg).get('BTCUSDT', 'Binance', '1h', kind='oi', limit=1)
+    assert cg.client.session.calls[0][0] == 'futures/open-interest/history'
+    assert list(times) == [H0] and sorted(columns) == ['close', 'high', 'low', 'open']
+    with pytest.raises(ValueError):
+        OHLCResampler(cg).get('BTCUSDT', 'Binance', '1h', kind='funding')
+    with pytest.raises(ValueError):
+        OHLCResampler(cg, market='options')
@@ -0,0 +1,117 @@
+"""
+Tests for the composite signal panel
+"""
+import numpy as np
+import pytest
+
+from coinglass.analytics.signal_panel import SignalPanel, payload_rows, rolling_zscore
+
+T0 = 1700000000000
+D = 86400 * 1000
+
+
+def day(i):
+    return int(T0 + i * D)
+
+
+def make_data():
+    """Source name to (day, value) observations."""
+    return {
+        'whale': [(0, 1.0), (1, 3.0), (2, 2.0), (3, 4.0)],
+        'price': [(0, 10.0), (1, 11.0), (2, 13.0), (3, 12.0)],
+        'cgdi': [(0, 100.0), (2, 102.0)],
+        'cdri': [(1, 5.0)],
+    }
+
+
+def make_handler(data):
+    def handler(path, params):
+        source = path.split('/')[1].split('-')[0]
+        start = params.get('startTime', 0)
+        rows = [(day(i), value) for i, value in data[source] if day(i) >= start]
+        if path.startswith('futures/whale'):
+            return [{'time': time, 'whale_index_value': value} for time, value in rows]
+        if path.startswith('futures/price'):
+            return [{'time': time, 'close': value} for time, value in rows]
+        if path.startswith('futures/cgdi'):
+            # Parallel-list payload
+            return {'time_list': [row[0] for row in rows], 'data_list': [row[1] for row in rows]}
+        return {'data': [{'time': time, 'cdri_index_value': value} for time, value in rows]}
+    
+    return handler
+
+
+def test_payload_rows_shapes():
+    rows = [{'time': 1, 'value': 2}]
+    assert payload_rows(rows) is rows
+    assert payload_rows({'list': rows}) is rows
+    assert payload_rows({'times': [1, 2], 'values': [3, 4], 'name': 'x'}) == [
+        {'values': 3, 'time': 1}, {'values': 4, 'time': 2},
+    ]
+    assert payload_rows({'time': 1, 'value': 2}) == [{'time': 1, 'value': 2}]
+    assert payload_rows(None) == []
+
+
+def test_rolling_zscore():
+    z = rolling_zscore(np.array([1.0, 2.0, 3.0, 3.0, 3.0, 3.0, np.nan, 5.0]), 3)
+    # Windows [1, 2, 3] (mean 2, variance 2/3) and [2, 3, 3] (mean 8/3, variance 2/9)
+    expected = [np.nan, np.nan, 1 / np.sqrt(2 / 3), (1 / 3) / np.sqrt(2 / 9)]
+    np.testing.assert_allclose(z[:4], expected)
+    # A constant window and windows with gaps are undefined
+    assert np.isnan(z[5:]).all()
+    assert rolling_zscore(np.ones((2, 2)), 3).shape == (2, 2)
+
+
+def test_sources_are_joined_as_of(make_api):
+    panel = SignalPanel(make_api(make_handler(make_data())), window=3).load(limit=10)
+    assert len(panel) == 4 and list(panel.times) == [day(i) for i in range(4)]
+    np.testing.assert_array_equal(panel['cgdi'], [100, 100, 102, 102])
+    np.testing.assert_array_equal(panel['cdri'], [np.nan, 5, 5, 5])
+    assert list(panel.to_dict()) == ['time', 'whale_index', 'cgdi', 'cdri', 'price']
+    np.testing.assert_allclose(panel.zscores()['price'], rolling_zscore(panel['price'], 3))
+    with pytest.raises(ValueError):
+        SignalPanel(None, sources=('whale_index', 'funding'))
+
+
+def test_update_overwrites_refetched_rows_and_matches_a_fresh_load(make_api):
+    data = make_data()
+    cg = make_api(make_handler(data))
+    panel = SignalPanel(cg, window=3, sources=('whale_index', 'cgdi', 'cdri', 'price')).load()
+    panel.zscores()
+    
+    # The last whale bar is revised, a new day arrives and CDRI publishes a late value
+    data['whale'][3] = (3, 4.5)
+    data['whale'].append((4, 6.0))
+    data['price'].append((4, 14.0))
+    data['cdri'].append((2, 7.0))
+    appended = panel.update()
+    
+    assert list(appended) == [day(4)]
+    calls = cg.client.session.calls[-4:]
+    starts = {path.split('/')[1]: params.get('startTime') for path, params in calls}
+    assert starts['whale-index'] == starts['price'] == day(3)
+    np.testing.assert_array_equal(panel['whale_index'], [1, 3, 2, 4.5, 6])
+    np.testing.assert_array_equal(panel['cdri'], [np.nan, 5, 7, 7, 7])
+    
+    fresh = SignalPanel(make_api(make_handler(data)), window=3).load()
+    np.testing.assert_array_equal(panel.times, fresh.times)
+    zscores, expected = panel.zscores(), fresh.zscores()
+    for name in fresh.columns:
+        np.testing.assert_array_equal(panel[name], fresh[name])
+        np.testing.assert_allclose(zscores[name], expected[name])
+    assert len(panel.update()) == 0
+
+
+def test_update_joins_a_lagging_source_inside_the_panel(make_api):
+    data = make_data()
+    panel = SignalPanel(make_api(make_handler(data)), window=3).load()
+    
+    # CDRI publishes between two joined timestamps after the panel was built
+    data['cdri'].append((2.5, 6.0))
+    assert list(panel.update()) == [day(2.5)]
+    
+    fresh = SignalPanel(make_api(make_handler(data)), window=3).load()
+    assert list(panel.times) == list(fresh.times) == [day(i) for i in (0, 1, 2, 2.5, 3)]
+    for name in fresh.columns:
+        np.testing.assert_array_equal(panel[name], fresh[name])
+    np.testing.assert_array_equal(panel['cdri'], [np.nan, 5, 5, 6, 6])
@@ -0,0 +1,101 @@
+"""
+Tests for the taker buy/sell flow panel
+"""
+import numpy as np
+import pytest
+
+from coinglass.analytics.taker_flow import TakerFlowEngine
+
+T0 = 1700000000000
+H = 3600 * 1000
+SPECS = [
+    ('futures', 'Binance', 'BTCUSDT'),
+    ('futures', ['Binance', 'OKX'], 'BTC'),
+    ('spot', 'Binance', 'BTCUSDT'),
+]
+
+# (buy, sell) per (market, exchange) and bar; None: bar missing from the response
+FLOWS = {
+    ('futures', 'Binance'): [(10, 5), (8, 8), (3, 6)],
+    ('futures', 'Binance,OKX'): [(20, 10), None, (5, 5)],
+    ('spot', 'Binance'): [(4, 6), (6, 4), (1, 1)],
+}
+
+
+def make_handler(flows, failing=()):
+    def handler(path, params):
+        key = (path.split('/', 1)[0], params.get('exchange') or params.get('exchange_list'))
+        if key in failing:
+            raise RuntimeError('unavailable')
+        rows = []
+        for i, bar in enumerate(flows[key]):
+            time = T0 + i * H
+            if bar is None or time < params.get('startTime', T0):
+                continue
+            rows.append(
+                {'time': time, 'taker_buy_volume_usd': bar[0], 'taker_sell_volume_usd': bar[1]}
+            )
+        return rows
+    
+    return handler
+
+
+@pytest.fixture
+def engine(make_api):
+    return TakerFlowEngine(make_api(make_handler(FLOWS))).load(SPECS)
+
+
+def test_series_are_aligned_with_missing_bars_as_zero(engine):
+    assert engine.labels[1] == ('futures', 'Binance,OKX', 'BTC')
+    assert list(engine.times) == [T0, T0 + H, T0 + 2 * H]
+    np.testing.assert_array_equal(engine.delta(), [[5, 0, -3], [10, 0, 0], [-2, 2, 0]])
+    np.testing.assert_array_equal(engine.cvd(), [[5, 5, 2], [10, 10, 10], [-2, 0, 0]])
+    np.testing.assert_allclose(engine.buy_ratio()[:, 0], [10 / 15, 20 / 30, 0.4])
+    assert np.isnan(engine.buy_ratio()[1, 1])
+
+
+def test_market_aggregates(engine):
+    np.testing.assert_array_equal(engine.market_cvd('futures'), [15, 15, 12])
+    np.testing.assert_array_equal(engine.market_cvd('spot'), [-2, 0, 0])
+    np.testing.assert_array_equal(engine.market_cvd(), [13, 15, 12])
+    np.testing.assert_array_equal(engine.rows(symbol='BTCUSDT'), [0, 2])
+    contribution = engine.contribution('futures')
+    np.testing.assert_allclose(contribution[:, 0], [1 / 3, 2 / 3, np.nan])
+    assert np.isnan(contribution[:, 1]).all()
+    np.testing.assert_allclose(contribution[:2, 2], [1.0, 0.0])
+
+
+def test_endpoints_by_market_and_exchange_list(engine):
+    paths = sorted(path for path, _ in engine.api.client.session.calls)
+    assert paths == [
+        'futures/aggregated-taker-buy-sell-volume/history',
+        'futures/v2/taker-buy-sell-volume/history',
+        'spot/taker-buy-sell-volume/history',
+    ]
+    with pytest.raises(ValueError):
+        TakerFlowEngine(engine.api).load([('options', 'Deribit', 'BTC')])
+
+
+def test_update_overwrites_the_last_bar_and_continues_the_cvd(make_api):
+    flows = {key: list(bars) for key, bars in FLOWS.items()}
+    fresh_cg = make_api(make_handler(flows))
+    cg = make_api(make_handler(flows, failing=[('spot', 'Binance')]))
+    engine = TakerFlowEngine(fresh_cg).load(SPECS)
+    engine.api = cg
+    
+    # The forming bar closed with different volume and a new bar opened
+    flows[('futures', 'Binance')][2] = (9, 6)
+    for bars in flows.values():
+        bars.append((2, 1))
+    written = engine.update()
+    
+    assert list(written) == [T0 + 2 * H, T0 + 3 * H]
+    assert all(params['startTime'] == T0 + 2 * H for _, params in cg.client.session.calls)
+    assert list(engine.errors) == [('spot', 'Binance', 'BTCUSDT')]
+    np.testing.assert_array_equal(engine.cvd(), [[5, 5, 8, 9], [10, 10, 10, 11], [-2, 0, 0, 0]])
+    # The failed series keeps its previous last bar
+    np.testing.assert_array_equal(engine.buy[2], [4, 6, 1, 0])
+    
+    reloaded = TakerFlowEngine(fresh_cg).load(SPECS)
+    np.testing.assert_array_equal(engine.cvd()[:2], reloaded.cvd()[:2])
+    assert len(engine.update()) == 1
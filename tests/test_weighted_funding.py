@@ -0,0 +1,145 @@
+"""
+Tests for the OI/volume-weighted funding engine
+"""
+import numpy as np
+import pytest
+
+from coinglass.analytics._pairs import is_coin_margined
+from coinglass.analytics.weighted_funding import WeightedFundingEngine, weighted_average
+
+T0 = 1700000000000
+H8 = 8 * 3600 * 1000
+PAIRS = [('Binance', 'BTCUSDT'), ('OKX', 'BTC-USDT-SWAP')]
+
+# Per exchange: funding, open interest and taker volume (buy, sell) per bar
+SERIES = {
+    'Binance': {
+        'funding': [0.01, 0.02, 0.03],
+        'oi': [100, 100, 300],
+        'volume': [(5, 5), (20, 10), (0, 0)],
+    },
+    'OKX': {
+        'funding': [0.03, 0.00, 0.01],
+        'oi': [300, 100, 100],
+        'volume': [(15, 15), (5, 5), (0, 0)],
+    },
+}
+
+
+def make_handler(series, failing=()):
+    def handler(path, params):
+        exchange = params['exchange']
+        if exchange in failing:
+            raise RuntimeError('unsupported')
+        data = series[exchange]
+        start = params.get('startTime', T0)
+        rows = []
+        for i in range(len(data['funding'])):
+            time = T0 + i * H8
+            if time < start:
+                continue
+            if 'funding-rate' in path:
+                rows.append({'time': time, 'close': str(data['funding'][i])})
+            elif 'open-interest' in path:
+                rows.append({'time': time, 'close': data['oi'][i]})
+            else:
+                buy, sell = data['volume'][i]
+                rows.append(
+                    {'time': time, 'taker_buy_volume_usd': buy, 'taker_sell_volume_usd': sell}
+                )
+        return rows
+    
+    return handler
+
+
+def test_weighted_average_ignores_missing_values_and_bad_weights():
+    values = np.array([[1.0, 2.0, np.nan], [3.0, 4.0, 5.0]])
+    weights = np.array([[1.0, -1.0, 1.0], [3.0, 0.0, np.nan]])
+    np.testing.assert_allclose(weighted_average(values, weights), [2.5, np.nan, np.nan])
+
+
+def test_weighted_series_match_hand_computed_values(make_api):
+    engine = WeightedFundingEngine(make_api(make_handler(SERIES))).load(PAIRS)
+    assert list(engine.times) == [T0, T0 + H8, T0 + 2 * H8]
+    np.testing.assert_allclose(engine.weighted('oi'), [0.025, 0.01, 0.025])
+    np.testing.assert_allclose(engine.weighted('volume'), [0.025, 0.015, np.nan])
+    np.testing.assert_allclose(engine.weighted('equal'), [0.02, 0.01, 0.02])
+    np.testing.assert_allclose(engine.weights('oi')[:, 0], [0.25, 0.75])
+    with pytest.raises(ValueError):
+        engine.weighted('price')
+
+
+def test_update_overwrites_the_last_bar_and_recomputes_it(make_api):
+    series = {
+        exchange: {name: list(values) for name, values in data.items()}
+        for exchange, data in SERIES.items()
+    }
+    cg = make_api(make_handler(series))
+    engine = WeightedFundingEngine(cg).load(PAIRS)
+    engine.weighted('oi')
+    
+    series['Binance']['funding'][2] = 0.07
+    for data in series.values():
+        data['funding'].append(0.02)
+        data['oi'].append(100)
+        data['volume'].append((1, 1))
+    written = engine.update()
+    
+    assert list(written) == [T0 + 2 * H8, T0 + 3 * H8]
+    assert all(params['startTime'] == T0 + 2 * H8 for _, params in cg.client.session.calls[-6:])
+    np.testing.assert_allclose(engine.funding[0], [0.01, 0.02, 0.07, 0.02])
+    np.testing.assert_allclose(engine.weighted('oi'), [0.025, 0.01, 0.055, 0.02])
+
+
+def test_failed_pairs_are_recorded_and_carried_forward(make_api):
+    engine = WeightedFundingEngine(make_api(make_handler(SERIES, failing=('OKX',)))).load(PAIRS)
+    assert set(engine.errors) == {(source, PAIRS[1]) for source in ('funding', 'oi', 'volume')}
+    assert np.isnan(engine.funding[1]).all()
+    np.testing.assert_allclose(engine.weighted('oi'), [0.01, 0.02, 0.03])
+
+
+def test_select_pairs_keeps_stablecoin_margined_perpetuals(make_api):
+    supported = {
+        'Binance': [
+            {'instrument_id': 'BTCUSDT', 'base_asset': 'BTC', 'quote_asset': 'USDT'},
+            {'instrument_id': 'BTCUSD_PERP', 'base_asset': 'BTC', 'quote_asset': 'USD'},
+            {'instrument_id': 'BTCUSDT_250627', 'base_asset': 'BTC', 'quote_asset': 'USDT'},
+        ],
+        'Hyperliquid': [{'instrument_id': 'BTC', 'base_asset': 'BTC', 'quote_asset': 'USD'}],
+        'OKX': [
+            {
+                'instrument_id': 'BTC-USD-SWAP',
+                'base_asset': 'BTC',
+                'quote_asset': 'USD',
+                'margin_asset': 'BTC',
+            }
+        ],
+    }
+    engine = WeightedFundingEngine(make_api(lambda path, params: supported))
+    assert engine.select_pairs('BTC') == [('Binance', 'BTCUSDT'), ('Hyperliquid', 'BTC')]
+    assert len(engine.select_pairs('BTC', exclude_coin_margined=False)) == 4
+
+
+@pytest.mark.parametrize(
+    'pair, expected',
+    [
+        ({'exchange': 'Binance', 'quote_asset': 'USD'}, True),
+        ({'exchange': 'Binance', 'quote_asset': 'USDT'}, False),
+        ({'exchange': 'dYdX', 'quote_asset': 'USD'}, False),
+        (
+            {
+                'exchange': 'Bybit',
+                'base_asset': 'BTC',
+                'quote_asset': 'USD',
+                'settle_asset': 'USDC',
+            },
+            False,
+        ),
+        ({'exchange': 'Bybit', 'base_asset': 'BTC', 'margin_asset': 'BTC'}, True),
+        ({'exchange': 'Gate', 'margin_type': 'inverse'}, True),
+        ({'exchange': 'OKX', 'instrument_id': 'BTC-USD-SWAP'}, True),
+        ({'exchange': 'OKX', 'instrument_id': 'BTC-USDT-SWAP'}, False),
+    ],
+)
+def test_is_coin_margined(pair, expected):
+    assert is_coin_margined(pair) is expected